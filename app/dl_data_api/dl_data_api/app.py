@@ -47,6 +47,7 @@ async def create_gunicorn_app(start_selfcheck: bool = True) -> web.Application:
         app_prefix=settings.app_prefix,
         use_jaeger_tracer=use_jaeger_tracer(),
         jaeger_service_name=jaeger_service_name_env_aware(settings.jaeger_service_name),
+        queue_settings=settings.LOGGING_QUEUE,
     )
     try:
         LOGGER.info("Creating application instance...")
@@ -134,6 +134,8 @@ class StandaloneDataApiAppFactory(
             "crypto_keys_config": self._settings.CRYPTO_KEYS_CONFIG,
             "ca_data": ca_data,
             "retry_policy_factory": dl_retrier.RetryPolicyFactory.from_settings(self._settings.US_CLIENT.RETRY_POLICY),
+            "dependencies_load_concurrency": self._settings.US_CLIENT.DEPENDENCIES_LOAD_CONCURRENCY,
+            "batch_get_entries": self._settings.US_CLIENT.BATCH_GET_ENTRIES_ENABLED,
         }
         service_us_kw = dict(
             common_us_kw,
@@ -52,6 +52,15 @@ class DataProcessingEndReportingRecord(DataProcessingReportingRecord):
     exception: Exception | None
 
 
+@attr.s(frozen=True, auto_attribs=True)
+class DataProcessingOperationReportingRecord(DataProcessingReportingRecord):
+    # The timeline of an operation; `timestamp` is the time it finished
+    operation_type: str
+    dest_stream_id: str
+    start_timestamp: float
+    exception: BaseException | None
+
+
 @attr.s(frozen=True, auto_attribs=True)
 class DataProcessingCacheInfoReportingRecord(DataProcessingReportingRecord):
     cache_full_hit: bool | None = None
@@ -0,0 +1,161 @@
+"""
+JSON responses of the data API.
+
+The response data is serialized with orjson. The rows of a result can be put into the data
+as a `StreamedJsonList`: if there are more of them than fit into a chunk, they are serialized
+and written chunk by chunk when the response is sent (after the middlewares are done with it),
+so neither the whole JSON text nor the serialized rows are kept in memory at once.
+The first chunk is serialized before the response is started, so the errors that show up in it
+(e.g. of the rows that are produced lazily) still get a proper error response.
+If the rows fail later, when the status is already sent, the body is finished with `TRUNCATED_BODY_MARKER`
+(which makes it invalid JSON) and the connection is closed without the end of the chunked body.
+"""
+
+from __future__ import annotations
+
+from collections.abc import (
+    Iterable,
+    Iterator,
+)
+import contextlib
+import itertools
+import json
+import logging
+from typing import Any
+import uuid
+
+from aiohttp import (
+    HttpVersion11,
+    web,
+)
+from aiohttp.abc import AbstractStreamWriter
+import attr
+import orjson
+
+import dl_json
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 1000
+
+TRUNCATED_BODY_MARKER = b"\n!response body is truncated"
+
+
+@attr.s(frozen=True)
+class StreamedJsonList:
+    """A JSON array of the response data that is serialized lazily"""
+
+    items: Iterable[Any] = attr.ib()
+
+
+def dumps_json(data: Any, default: Any = None) -> bytes:
+    try:
+        return dl_json.dumps_bytes(data, default=default, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # Not supported by orjson (e.g. integers out of the 64-bit range)
+        LOGGER.warning("Falling back to the standard JSON serialization", exc_info=True)
+        return json.dumps(data, default=default).encode("utf-8")
+
+
+class _StreamedJsonListExtractor:
+    """Replaces the `StreamedJsonList` of the data with a placeholder"""
+
+    def __init__(self) -> None:
+        self.placeholder = f"streamed-json-list-{uuid.uuid4().hex}"
+        self.streamed_list: StreamedJsonList | None = None
+
+    def __call__(self, value: Any) -> Any:
+        if isinstance(value, StreamedJsonList):
+            # The same one is met again if the serialization is retried
+            if self.streamed_list is not None and self.streamed_list is not value:
+                raise TypeError("Only one streamed list is supported in the response data")
+            self.streamed_list = value
+            return self.placeholder
+        raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _iter_chunks(items: Iterator[Any], chunk_rows: int) -> Iterator[list[Any]]:
+    while chunk := list(itertools.islice(items, chunk_rows)):
+        yield chunk
+
+
+class JsonStreamResponse(web.StreamResponse):
+    """Writes the items of a JSON array between the head and the tail of the response body"""
+
+    def __init__(
+        self,
+        *,
+        head: bytes,
+        first_items: bytes,
+        items: Iterable[Any],
+        tail: bytes,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        status: int = 200,
+    ) -> None:
+        """`first_items` are the first items serialized (without the brackets), `items` are the rest of them"""
+        super().__init__(status=status)
+        self.content_type = "application/json"
+        self.charset = "utf-8"
+        self._head = head
+        self._first_items = first_items
+        self._items: Iterable[Any] | None = items
+        self._tail = tail
+        self._chunk_rows = chunk_rows
+
+    async def prepare(self, request: web.BaseRequest) -> AbstractStreamWriter | None:
+        if request.version >= HttpVersion11:
+            # The end of the body is marked, so the truncated one is told apart by the clients
+            self.enable_chunked_encoding()
+        writer = await super().prepare(request)
+        items, self._items = self._items, None
+        if items is None:
+            return writer
+
+        await self.write(self._head + b"[" + self._first_items)
+        try:
+            for chunk in _iter_chunks(iter(items), self._chunk_rows):
+                # Without the brackets of the chunk
+                await self.write(b"," + dumps_json(chunk)[1:-1])
+        except Exception:
+            LOGGER.warning("Failed to write the response data, the response body is truncated", exc_info=True)
+            with contextlib.suppress(Exception):
+                await self.write(TRUNCATED_BODY_MARKER)
+            raise
+        await self.write(b"]" + self._tail)
+        return writer
+
+
+def make_json_response(
+    data: Any,
+    status: int = 200,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> web.StreamResponse:
+    """
+    Serialize the response data.
+    The response is streamed if there is a `StreamedJsonList` with more than `chunk_rows` items in it.
+    """
+
+    extractor = _StreamedJsonListExtractor()
+    body = dumps_json(data, default=extractor)
+    if extractor.streamed_list is None:
+        return web.Response(body=body, status=status, content_type="application/json", charset="utf-8")
+
+    head, tail = body.split(dumps_json(extractor.placeholder), 1)
+    items = iter(extractor.streamed_list.items)
+    first_chunk = list(itertools.islice(items, chunk_rows + 1))
+    if len(first_chunk) <= chunk_rows:
+        return web.Response(
+            body=head + dumps_json(first_chunk) + tail,
+            status=status,
+            content_type="application/json",
+            charset="utf-8",
+        )
+
+    return JsonStreamResponse(
+        head=head,
+        first_items=dumps_json(first_chunk)[1:-1],
+        items=items,
+        tail=tail,
+        chunk_rows=chunk_rows,
+        status=status,
+    )
@@ -4,6 +4,7 @@ from typing import Any
 
 from dl_api_commons.reporting.models import NotificationReportingRecord
 from dl_api_commons.reporting.registry import ReportingRegistry
+from dl_api_lib.aio.json_response import StreamedJsonList
 from dl_api_lib.api_common.data_types import bi_to_yql
 from dl_api_lib.common_models.data_export import (
     DataExportForbiddenReason,
@@ -90,6 +91,7 @@ class DataRequestResponseSerializer(DataRequestResponseSerializerV2Mixin):
         totals: Sequence | None = None,
         totals_query: str | None = None,
         fields_data: list[dict[str, Any]] | None = None,
+        stream_rows: bool = False,
     ) -> dict[str, Any]:
         legend_item_ids = merged_stream.legend_item_ids
         assert legend_item_ids is not None  # in v1 there is only one stream
@@ -97,10 +99,15 @@ class DataRequestResponseSerializer(DataRequestResponseSerializerV2Mixin):
         if query_type == QueryType.value_range:
             legend_item_ids = [legend_item_ids[0]]
         legend_items = [merged_stream.legend.get_item(liid) for liid in legend_item_ids]
+        data_rows: list | StreamedJsonList
+        if stream_rows:
+            data_rows = StreamedJsonList(row.data for row in merged_stream.rows)
+        else:
+            data_rows = [row.data for row in merged_stream.rows]
         data: dict[str, Any] = {
             "result": {
                 "data": {
-                    "Data": [row.data for row in merged_stream.rows],
+                    "Data": data_rows,
                     "Type": cls.get_yql_schema(legend_items),
                 },
             },
@@ -131,6 +138,7 @@ class DataRequestResponseSerializer(DataRequestResponseSerializerV2Mixin):
         data_export_info: DataExportInfo,
         merged_stream: MergedQueryDataStream,
         reporting_registry: ReportingRegistry | None = None,
+        stream_rows: bool = False,
     ) -> dict[str, Any]:
         data: dict[str, Any] = {}
 
@@ -143,7 +151,13 @@ class DataRequestResponseSerializer(DataRequestResponseSerializerV2Mixin):
 
         data["fields"] = merged_stream.legend.items
 
-        data_rows: list[dict] = [{"data": row.data, "legend": row.legend_item_ids} for row in merged_stream.rows]
+        data_rows: list[dict] | StreamedJsonList
+        if stream_rows:
+            data_rows = StreamedJsonList(
+                {"data": row.data, "legend": row.legend_item_ids} for row in merged_stream.rows
+            )
+        else:
+            data_rows = [{"data": row.data, "legend": row.legend_item_ids} for row in merged_stream.rows]
         data["result_data"] = [{"rows": data_rows}]
 
         data["blocks"] = cls.make_data_response_v2_block_meta(merged_stream=merged_stream)
@@ -62,7 +62,13 @@ from dl_api_lib.app.data_api.resources.dataset.result import (
     DatasetResultViewV2,
 )
 from dl_api_lib.app.data_api.resources.dataset.result_preflight import DatasetResultPreflightView
-from dl_api_lib.app.data_api.resources.metrics import DSDataApiMetricsView
+from dl_api_lib.app.data_api.resources.metrics import (
+    CONN_POOL_MANAGER_APP_KEY,
+    LOCAL_QUERY_CACHE_APP_KEY,
+    MUTATIONS_MEMORY_CACHE_APP_KEY,
+    QUERY_PLAN_CACHE_APP_KEY,
+    DSDataApiMetricsView,
+)
 from dl_api_lib.app.data_api.resources.ping import (
     PingReadyView,
     PingView,
@@ -76,19 +82,29 @@ from dl_api_lib.app_settings import (
     RedisSentinelSettings,
     RedisSingleHostSettings,
 )
+from dl_api_lib.dataset.query_plan_cache import QueryPlanCache
+from dl_api_lib.dataset.view import COMPENG_PROCESSOR_TYPE_APP_KEY
+from dl_cache_engine.local_cache import LocalResultCache
 from dl_compeng_pg.compeng_pg_base.data_processor_service_pg import CompEngPgConfig
+from dl_compeng_sqlite.data_processor_service import CompEngSQLiteConfig
 from dl_configs.enums import RedisMode
 from dl_constants import (
     ProcessorType,
     RedisInstanceKind,
 )
+from dl_core.aio.web_app_services.data_processing.data_processor import DataProcessorService
 from dl_core.aio.web_app_services.data_processing.factory import make_compeng_service
 from dl_core.aio.web_app_services.redis import (
     RedisSentinelService,
     SingleHostSimpleRedisService,
 )
+from dl_core.connection_executors.adapters.conn_pool_manager import (
+    ConnPoolManager,
+    set_conn_pool_manager,
+)
 from dl_core.connectors.settings.base import ConnectorSettings
 from dl_core.us_manager.factory import USMFactory
+from dl_core.us_manager.mutation_cache.usentry_mutation_cache import MemoryCacheEngine
 from dl_obfuscator import (
     OBFUSCATION_BASE_OBFUSCATORS_KEY,
     SecretKeeper,
@@ -131,6 +147,10 @@ class EnvSetupResult:
 @attr.s(kw_only=True)
 class DataApiAppFactory[TDataApiSettings: DataApiAppSettings](SRFactoryBuilder[TDataApiSettings], abc.ABC):
     _settings: TDataApiSettings = attr.ib()
+    _local_query_cache: LocalResultCache | None = attr.ib(init=False, default=None)
+    _mutations_memory_cache_engine: MemoryCacheEngine | None = attr.ib(init=False, default=None)
+    _conn_pool_manager: ConnPoolManager | None = attr.ib(init=False, default=None)
+    _query_plan_cache: QueryPlanCache | None = attr.ib(init=False, default=None)
     private_us_manager_factory_class: ClassVar[type[USMFactory]] = USMFactory
 
     @abc.abstractmethod
@@ -156,6 +176,52 @@ class DataApiAppFactory[TDataApiSettings: DataApiAppSettings](SRFactoryBuilder[T
     def _get_extra_regex_patterns(self) -> tuple[str, ...] | None:
         return None
 
+    def _get_local_query_cache(self, settings: TDataApiSettings) -> LocalResultCache | None:
+        local_cache_settings = settings.LOCAL_QUERY_CACHE
+        if not settings.CACHES_ON or not local_cache_settings.ENABLED:
+            return None
+        # One per application (i.e. per process), not per services registry factory.
+        if self._local_query_cache is None:
+            self._local_query_cache = LocalResultCache(
+                max_size_bytes=local_cache_settings.MAX_SIZE_BYTES,
+                max_entry_size_bytes=local_cache_settings.MAX_ENTRY_SIZE_BYTES,
+                max_ttl_sec=local_cache_settings.MAX_TTL_SEC,
+            )
+        return self._local_query_cache
+
+    def _get_mutations_memory_cache_engine(self, settings: TDataApiSettings) -> MemoryCacheEngine | None:
+        memory_cache_settings = settings.MUTATIONS_MEMORY_CACHE
+        if not settings.MUTATIONS_CACHES_ON or not memory_cache_settings.ENABLED:
+            return None
+        if self._mutations_memory_cache_engine is None:
+            self._mutations_memory_cache_engine = MemoryCacheEngine(
+                max_size_bytes=memory_cache_settings.MAX_SIZE_BYTES,
+                sweep_interval_sec=memory_cache_settings.SWEEP_INTERVAL_SEC,
+                store_entries=memory_cache_settings.STORE_ENTRIES,
+            )
+        return self._mutations_memory_cache_engine
+
+    def _get_conn_pool_manager(self, settings: TDataApiSettings) -> ConnPoolManager | None:
+        pool_manager_settings = settings.CONN_POOL_MANAGER
+        if not pool_manager_settings.ENABLED:
+            return None
+        if self._conn_pool_manager is None:
+            self._conn_pool_manager = ConnPoolManager(
+                max_size=pool_manager_settings.MAX_SIZE,
+                max_pools=pool_manager_settings.MAX_POOLS,
+                idle_timeout_sec=pool_manager_settings.IDLE_TIMEOUT_SEC,
+                health_check_interval_sec=pool_manager_settings.HEALTH_CHECK_INTERVAL_SEC,
+            )
+        return self._conn_pool_manager
+
+    def _get_query_plan_cache(self, settings: TDataApiSettings) -> QueryPlanCache | None:
+        query_plan_cache_settings = settings.QUERY_PLAN_CACHE
+        if not query_plan_cache_settings.ENABLED:
+            return None
+        if self._query_plan_cache is None:
+            self._query_plan_cache = QueryPlanCache(max_entries=query_plan_cache_settings.MAX_ENTRIES)
+        return self._query_plan_cache
+
     def _get_extra_routes(self) -> Iterable[tuple[str, str, type[web.View]]]:
         """Override in subclasses to register additional HTTP routes.
 
@@ -382,20 +448,54 @@ class DataApiAppFactory[TDataApiSettings: DataApiAppSettings](SRFactoryBuilder[T
             app.on_startup.append(_log_exc(invalidation_redis_server.init_hook))
             app.on_cleanup.append(_log_exc(invalidation_redis_server.tear_down_hook))
 
+        compeng_service: DataProcessorService | None = None
         if self._settings.BI_COMPENG_PG_ON and self._settings.BI_COMPENG_PG_URL is not None:
+            upload_reuse = self._settings.COMPENG_UPLOAD_REUSE
             compeng_service = make_compeng_service(
                 processor_type=ProcessorType.ASYNCPG,
                 config=CompEngPgConfig(
                     url=self._settings.BI_COMPENG_PG_URL,
+                    uploaded_table_ttl_sec=upload_reuse.TTL_SEC if upload_reuse.ENABLED else None,
+                    uploaded_tables_max_count=upload_reuse.MAX_TABLES,
+                    uploaded_tables_cleanup_interval_sec=upload_reuse.CLEANUP_INTERVAL_SEC,
                 ),
             )
             app.on_startup.append(_log_exc(compeng_service.init_hook))
             app.on_cleanup.append(_log_exc(compeng_service.tear_down_hook))
 
+        compeng_embedded = self._settings.COMPENG_EMBEDDED
+        if compeng_embedded.ENABLED:
+            # The small inputs are processed in-process, the rest is moved to the PG compeng
+            compeng_embedded_service = make_compeng_service(
+                processor_type=ProcessorType.SQLITE,
+                config=CompEngSQLiteConfig(
+                    max_input_rows=compeng_embedded.MAX_INPUT_ROWS,
+                    max_threads=compeng_embedded.MAX_THREADS,
+                    fallback_service=compeng_service,
+                ),
+            )
+            app.on_startup.append(_log_exc(compeng_embedded_service.init_hook))
+            app.on_cleanup.append(_log_exc(compeng_embedded_service.tear_down_hook))
+            app[COMPENG_PROCESSOR_TYPE_APP_KEY] = ProcessorType.SQLITE
+
         # TODO: don't use it again!
         # special hack for gettings bleeding edge users in dashsql
         app["BLEEDING_EDGE_USERS"] = self._settings.BLEEDING_EDGE_USERS
         app["DIRECTSQL_TIMEOUT_SEC"] = self._settings.DIRECTSQL_TIMEOUT_SEC
+        app[LOCAL_QUERY_CACHE_APP_KEY] = self._get_local_query_cache(self._settings)
+        app[MUTATIONS_MEMORY_CACHE_APP_KEY] = self._get_mutations_memory_cache_engine(self._settings)
+
+        conn_pool_manager = self._get_conn_pool_manager(self._settings)
+        if conn_pool_manager is not None:
+            # Connection executors are created per request, so the pools are borrowed from the process-wide manager
+            set_conn_pool_manager(conn_pool_manager)
+
+            async def close_conn_pools(app: web.Application) -> None:
+                await conn_pool_manager.close()
+
+            app.on_cleanup.append(_log_exc(close_conn_pools))
+        app[CONN_POOL_MANAGER_APP_KEY] = conn_pool_manager
+        app[QUERY_PLAN_CACHE_APP_KEY] = self._get_query_plan_cache(self._settings)
 
         self.set_up_routes(app=app)
 
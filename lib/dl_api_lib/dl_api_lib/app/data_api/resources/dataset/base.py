@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from collections.abc import (
     AsyncIterable,
+    Awaitable,
     Callable,
     Collection,
     Coroutine,
@@ -12,6 +13,7 @@ from contextlib import (
 )
 import functools
 import logging
+import time
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -31,7 +33,10 @@ from dl_api_lib.api_common.dataset_loader import (
     DatasetApiLoader,
     DatasetUpdateInfo,
 )
-from dl_api_lib.api_common.update_dataset_mutation_key import UpdateDatasetMutationKey
+from dl_api_lib.api_common.update_dataset_mutation_key import (
+    MutationKeySerializationError,
+    UpdateDatasetMutationKey,
+)
 from dl_api_lib.app.data_api.resources.base import (
     BaseView,
     requires,
@@ -49,7 +54,10 @@ from dl_api_lib.dataset.validator import (
     validate_cache_invalidation_source_fields_fill_by_mode,
     validate_cache_invalidation_sql_mode,
 )
-from dl_api_lib.dataset.view import DatasetView
+from dl_api_lib.dataset.view import (
+    COMPENG_PROCESSOR_TYPE_APP_KEY,
+    DatasetView,
+)
 from dl_api_lib.enums import USPermissionKind
 from dl_api_lib.query.formalization.block_formalizer import BlockFormalizer
 from dl_api_lib.query.formalization.legend_formalizer import (
@@ -100,6 +108,8 @@ from dl_core.us_dataset import Dataset
 from dl_core.us_manager.mutation_cache.engine_factory import CacheInitializationError
 from dl_core.us_manager.mutation_cache.mutation_key_base import MutationKey
 from dl_core.us_manager.mutation_cache.usentry_mutation_cache import (
+    GenericCacheEngine,
+    MemoryCacheEngine,
     RedisCacheEngine,
     USEntryMutationCache,
 )
@@ -111,7 +121,10 @@ from dl_query_processing.enums import (
 )
 from dl_query_processing.execution.exec_info import QueryExecutionInfo
 from dl_query_processing.legend.block_legend import BlockSpec
-from dl_query_processing.legend.field_legend import ParameterRoleSpec
+from dl_query_processing.legend.field_legend import (
+    Legend,
+    ParameterRoleSpec,
+)
 from dl_query_processing.merging.merger import DataStreamMerger
 from dl_query_processing.merging.primitives import MergedQueryDataStream
 from dl_query_processing.pagination.paginator import QueryPaginator
@@ -132,6 +145,34 @@ if TYPE_CHECKING:
 LOGGER = logging.getLogger(__name__)
 
 
+class ConcurrentTotalsStats:
+    """Process-wide counters of the totals queries executed concurrently with the main result blocks"""
+
+    def __init__(self) -> None:
+        self.executions = 0
+        # As compared to the totals executed after all the other blocks
+        self.saved_time_sec = 0.0
+
+    def get_metrics(self) -> list[tuple[str, int | float]]:
+        return [
+            ("totals_concurrent_executions_total", self.executions),
+            ("totals_concurrent_saved_time_sec_total", round(self.saved_time_sec, 4)),
+        ]
+
+
+_CONCURRENT_TOTALS_STATS = ConcurrentTotalsStats()
+
+
+def get_concurrent_totals_stats() -> ConcurrentTotalsStats:
+    return _CONCURRENT_TOTALS_STATS
+
+
+async def _run_timed[RESULT_TV](awaitable: Awaitable[RESULT_TV]) -> tuple[RESULT_TV, float, float]:
+    started = time.monotonic()
+    result = await awaitable
+    return result, started, time.monotonic()
+
+
 @requires(RequiredResourceCommon.US_MANAGER)
 class DatasetDataBaseView(BaseView):
     STORED_DATASET_REQUIRED: ClassVar[bool] = True
@@ -142,6 +183,7 @@ class DatasetDataBaseView(BaseView):
 
     dataset: Dataset
     ds_accessor: DatasetComponentAccessor
+    query_plan_dataset_key: str | None = None
 
     @property
     def dataset_id(self) -> str | None:
@@ -428,18 +470,34 @@ class DatasetDataBaseView(BaseView):
             self.dl_request.log_ctx_controller.put_to_context("dataset_id", self.dataset_id)
 
         if self.dataset_id is None:
-            return await self._prepare_dataset_from_cache_without_dataset_id(
+            update_info = await self._prepare_dataset_from_cache_without_dataset_id(
                 req_model=req_model,
             )
-        return await self._prepare_dataset_from_cache_with_dataset_id(
-            req_model=req_model,
-        )
+        else:
+            update_info = await self._prepare_dataset_from_cache_with_dataset_id(
+                req_model=req_model,
+            )
+        self.query_plan_dataset_key = self.get_query_plan_dataset_key(req_model.updates)
+        return update_info
 
     @staticmethod
     def _updates_only_fields(updates: list[Action]) -> bool:
         # Checks if updates has only field updates
         return all(isinstance(upd, FieldAction) for upd in updates)
 
+    def get_query_plan_dataset_key(self, updates: list[Action]) -> str | None:
+        """
+        Identifies the state of the prepared dataset for the query plan cache.
+        Same as for the mutation cache: only field updates of a stored dataset are supported.
+        """
+        try:
+            mutation_key = self.try_get_mutation_key(updates)
+        except MutationKeySerializationError:
+            return None
+        if mutation_key is None:
+            return None
+        return f"{self.dataset_id}:{mutation_key.get_collision_tier_breaker()}"
+
     def try_get_mutation_key(self, updates: list[Action]) -> MutationKey | None:
         return self.try_get_mutation_key_for_dataset(self.dataset_id, self.dataset.revision_id, updates)
 
@@ -458,11 +516,15 @@ class DatasetDataBaseView(BaseView):
     @generic_profiler("mutation-cache-init")
     def try_get_cache(self, allow_slave: bool) -> USEntryMutationCache | None:
         try:
-            mc_factory = self.dl_request.services_registry.get_mutation_cache_factory()
+            services_registry = self.dl_request.services_registry
+            mc_factory = services_registry.get_mutation_cache_factory()
             if mc_factory is None:
                 LOGGER.debug("Mutation cache is disabled")
                 return None
-            mce_factory = self.dl_request.services_registry.get_mutation_cache_engine_factory(RedisCacheEngine)
+            cache_type: type[GenericCacheEngine] = RedisCacheEngine
+            if services_registry.get_mutations_memory_cache_engine() is not None:
+                cache_type = MemoryCacheEngine
+            mce_factory = services_registry.get_mutation_cache_engine_factory(cache_type)
             cache_engine = mce_factory.get_cache_engine(allow_slave)
             return mc_factory.get_mutation_cache(
                 usm=self.dl_request.us_manager,
@@ -617,6 +679,7 @@ class DatasetDataBaseView(BaseView):
                 latest_revision_id=latest_revision_id,
             )
             await self.resolve_rls_groups_for_dataset(req_model, services_registry)
+            self.query_plan_dataset_key = self.get_query_plan_dataset_key(req_model.updates)
 
             if cached_dataset:
                 await self.check_for_notifications(services_registry, us_manager)
@@ -871,6 +934,8 @@ class DatasetDataBaseView(BaseView):
             block_spec=block_spec,
             rci=self.dl_request.rci,
             parameter_value_specs=parameter_value_specs,
+            query_plan_dataset_key=self.query_plan_dataset_key,
+            compeng_processor_type=self.request.app.get(COMPENG_PROCESSOR_TYPE_APP_KEY),
         )
 
         with GenericProfiler(f"{self.profiler_prefix}-query-build{profiling_postfix}"):
@@ -903,6 +968,27 @@ class DatasetDataBaseView(BaseView):
         call_post_exec_async_hook: bool = False,
         use_cache: bool = True,
     ) -> MergedQueryDataStream:
+        merged_stream, _ = await self.execute_all_queries_with_totals(
+            raw_query_spec_union=raw_query_spec_union,
+            autofill_legend=autofill_legend,
+            call_post_exec_async_hook=call_post_exec_async_hook,
+            use_cache=use_cache,
+        )
+        return merged_stream
+
+    async def execute_all_queries_with_totals(
+        self,
+        raw_query_spec_union: RawQuerySpecUnion,
+        autofill_legend: bool,
+        call_post_exec_async_hook: bool = False,
+        use_cache: bool = True,
+        totals_block_spec_factory: Callable[[Legend], BlockSpec] | None = None,
+    ) -> tuple[MergedQueryDataStream, PostprocessedQuery | None]:
+        """
+        Execute all the blocks of the request.
+        If `totals_block_spec_factory` is passed, the totals block is made with it for the request legend
+        and is executed concurrently with the other blocks (with the same cache invalidation payload).
+        """
         # TODO: Move to a separate class
 
         # Compute invalidation payload once for all blocks
@@ -930,20 +1016,61 @@ class DatasetDataBaseView(BaseView):
         post_paginator = paginator.get_post_paginator()
         block_legend = pre_paginator.pre_paginate(block_legend=block_legend)
 
+        totals_block_spec: BlockSpec | None = None
+        if totals_block_spec_factory is not None:
+            totals_block_spec = totals_block_spec_factory(legend)
+
         runner = ConcurrentTaskRunner()
+        started = time.monotonic()
         for block_spec in block_legend.blocks:
             await runner.schedule(
-                self.execute_query(
-                    block_spec=block_spec,
-                    parameter_value_specs=self._get_parameter_value_specs(raw_query_spec_union=raw_query_spec_union),
-                    allow_cache_usage=use_cache,
-                    cache_invalidation_payload=cache_invalidation_payload,
+                _run_timed(
+                    self.execute_query(
+                        block_spec=block_spec,
+                        parameter_value_specs=self._get_parameter_value_specs(
+                            raw_query_spec_union=raw_query_spec_union
+                        ),
+                        allow_cache_usage=use_cache,
+                        cache_invalidation_payload=cache_invalidation_payload,
+                    )
                 )
             )
-        executed_queries = await runner.finalize()
+        if totals_block_spec is not None:
+            await runner.schedule(
+                _run_timed(
+                    self.execute_query(
+                        block_spec=totals_block_spec,
+                        possible_data_lengths=(0, 1),
+                        profiling_postfix="-totals",
+                        allow_cache_usage=use_cache,
+                        cache_invalidation_payload=cache_invalidation_payload,
+                    )
+                )
+            )
+        timed_results: list[tuple[PostprocessedQuery, float, float]] = list(await runner.finalize())
+
+        totals_query: PostprocessedQuery | None = None
+        if totals_block_spec is not None:
+            totals_query, totals_started, totals_finished = timed_results.pop()
+            blocks_finished = max((finished for _, _, finished in timed_results), default=started)
+            # As compared to the totals executed after all the other blocks
+            saved_time = blocks_finished + (totals_finished - totals_started) - max(blocks_finished, totals_finished)
+            totals_stats = get_concurrent_totals_stats()
+            totals_stats.executions += 1
+            totals_stats.saved_time_sec += saved_time
+            LOGGER.info(
+                "Totals query was executed concurrently with %s blocks, saved %.4fs",
+                len(timed_results),
+                saved_time,
+                extra={
+                    "totals_exec_time_sec": round(totals_finished - totals_started, 4),
+                    "totals_saved_time_sec": round(saved_time, 4),
+                },
+            )
+
         postprocessed_query_blocks = [
             PostprocessedQueryBlock.from_block_spec(block_spec, postprocessed_query=postprocessed_query)
-            for block_spec, postprocessed_query in zip(block_legend.blocks, executed_queries, strict=True)
+            for block_spec, (postprocessed_query, _, _) in zip(block_legend.blocks, timed_results, strict=True)
         ]
 
         postprocessed_query_union = PostprocessedQueryUnion(
@@ -958,7 +1085,7 @@ class DatasetDataBaseView(BaseView):
         if call_post_exec_async_hook:
             await self._call_post_exec_async_hook(merged_stream.meta.target_connection_ids)
 
-        return merged_stream
+        return merged_stream, totals_query
 
     def _make_response_v1(
         self,
@@ -981,6 +1108,7 @@ class DatasetDataBaseView(BaseView):
             totals_query=totals_query,
             data_export_info=data_export_info,
             fields_data=fields_data,
+            stream_rows=True,
         )
 
     def _make_response_v2(self, merged_stream: MergedQueryDataStream) -> dict[str, Any]:
@@ -992,6 +1120,7 @@ class DatasetDataBaseView(BaseView):
                 self.dl_request.services_registry.get_reporting_registry() if self.allow_notifications else None
             ),
             data_export_info=data_export_info,
+            stream_rows=True,
         )
 
     def get_data_export_info(self) -> data_export_models.DataExportInfo:
@@ -7,8 +7,7 @@ from typing import (
     Any,
 )
 
-from aiohttp import web
-
+from dl_api_lib.aio.json_response import make_json_response
 from dl_api_lib.app.data_api.resources.base import (
     RequiredResourceDSAPI,
     requires,
@@ -21,7 +20,7 @@ from dl_constants.api_constants import DLHeadersCommon
 from dl_query_processing.merging.primitives import MergedQueryDataStream
 
 if TYPE_CHECKING:
-    from aiohttp.web_response import Response
+    from aiohttp.web_response import StreamResponse
 
     from dl_api_lib.request_model.data import DataRequestModel
 
@@ -42,7 +41,7 @@ class DatasetDistinctView(DatasetDataBaseView, abc.ABC):
     # )
     @generic_profiler_async("ds-values-distinct-full")
     @requires(RequiredResourceDSAPI.JSON_REQUEST)
-    async def post(self) -> Response:
+    async def post(self) -> StreamResponse:
         # Pass dataset_id to US from URL
         if self.dataset_id is not None:
             connection_headers = {
@@ -61,7 +60,7 @@ class DatasetDistinctView(DatasetDataBaseView, abc.ABC):
         )
 
         response_json = self.make_response(req_model=req_model, merged_stream=merged_stream)
-        return web.json_response(response_json)
+        return make_json_response(response_json)
 
     @abc.abstractmethod
     def load_req_model(self) -> DataRequestModel:
@@ -3,8 +3,7 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-from aiohttp import web
-
+from dl_api_lib.aio.json_response import make_json_response
 from dl_api_lib.api_common.data_serialization import PivotDataRequestResponseSerializer
 from dl_api_lib.app.data_api.resources.base import (
     RequiredResourceDSAPI,
@@ -23,7 +22,7 @@ from dl_pivot.pivot_legend import PivotLegend
 from dl_query_processing.merging.primitives import MergedQueryDataStream
 
 if TYPE_CHECKING:
-    from aiohttp.web_response import Response
+    from aiohttp.web_response import StreamResponse
 
     from dl_api_lib.query.formalization.raw_pivot_specs import PivotPaginationSpec
     from dl_api_lib.request_model.data import PivotDataRequestModel
@@ -49,7 +48,7 @@ class DatasetPivotView(DatasetDataBaseView):
     # )
     @generic_profiler_async("ds-pivot-full")
     @requires(RequiredResourceDSAPI.JSON_REQUEST)
-    async def post(self) -> Response:
+    async def post(self) -> StreamResponse:
         # Pass dataset_id to US from URL
         if self.dataset_id is not None:
             connection_headers = {
@@ -84,7 +83,7 @@ class DatasetPivotView(DatasetDataBaseView):
 
         # Serialize to response
         response_json = self.make_pivot_response(merged_stream=merged_stream, pivot_table=pivot_table)
-        return web.json_response(response_json)
+        return make_json_response(response_json)
 
     async def pivot_data(
         self,
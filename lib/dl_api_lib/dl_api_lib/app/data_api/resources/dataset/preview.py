@@ -8,8 +8,7 @@ from typing import (
     Any,
 )
 
-from aiohttp import web
-
+from dl_api_lib.aio.json_response import make_json_response
 from dl_api_lib.app.data_api.resources.base import (
     RequiredResourceDSAPI,
     requires,
@@ -38,7 +37,7 @@ from dl_query_processing.merging.primitives import MergedQueryDataStream
 from dl_query_processing.postprocessing.primitives import PostprocessedQuery
 
 if TYPE_CHECKING:
-    from aiohttp.web_response import Response
+    from aiohttp.web_response import StreamResponse
 
     from dl_api_lib.request_model.data import PreviewDataRequestModel
     from dl_core.us_dataset import Dataset
@@ -73,7 +72,7 @@ class DatasetPreviewView(DatasetDataBaseView, abc.ABC):
     @DatasetDataBaseView.with_dataset_us_context
     @DatasetDataBaseView.with_resolved_entities
     @requires(RequiredResourceDSAPI.JSON_REQUEST)
-    async def post(self) -> Response:
+    async def post(self) -> StreamResponse:
         req_model = self.load_req_model()
 
         req_model = await self._enforce_request_dataset_permissions(req_model)
@@ -96,7 +95,7 @@ class DatasetPreviewView(DatasetDataBaseView, abc.ABC):
         )
 
         response_json = self.make_response(req_model=req_model, merged_stream=merged_stream)
-        return web.json_response(response_json)
+        return make_json_response(response_json)
 
     async def execute_query(
         self,
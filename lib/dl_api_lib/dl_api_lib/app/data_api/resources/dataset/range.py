@@ -8,14 +8,16 @@ from typing import (
     ClassVar,
 )
 
-from aiohttp import web
-
+from dl_api_lib.aio.json_response import make_json_response
 from dl_api_lib.app.data_api.resources.base import (
     RequiredResourceDSAPI,
     requires,
 )
 from dl_api_lib.app.data_api.resources.dataset.base import DatasetDataBaseView
-from dl_api_lib.dataset.view import DatasetView
+from dl_api_lib.dataset.view import (
+    COMPENG_PROCESSOR_TYPE_APP_KEY,
+    DatasetView,
+)
 import dl_api_lib.schemas.data
 import dl_api_lib.schemas.main
 from dl_app_tools.profiling_base import generic_profiler_async
@@ -33,7 +35,7 @@ from dl_query_processing.translation.primitives import DetailedType
 from dl_utils.utils import enum_not_none
 
 if TYPE_CHECKING:
-    from aiohttp.web_response import Response
+    from aiohttp.web_response import StreamResponse
 
     from dl_api_lib.request_model.data import DataRequestModel
 
@@ -54,7 +56,7 @@ class DatasetRangeView(DatasetDataBaseView, abc.ABC):
     # )
     @generic_profiler_async("ds-values-range-full")
     @requires(RequiredResourceDSAPI.JSON_REQUEST)
-    async def post(self) -> Response:
+    async def post(self) -> StreamResponse:
         # Pass dataset_id to US from URL
         if self.dataset_id is not None:
             connection_headers = {
@@ -73,7 +75,7 @@ class DatasetRangeView(DatasetDataBaseView, abc.ABC):
         )
 
         response_json = self.make_response(req_model=req_model, merged_stream=merged_stream)
-        return web.json_response(response_json)
+        return make_json_response(response_json)
 
     @abc.abstractmethod
     def load_req_model(self) -> DataRequestModel:
@@ -104,6 +106,7 @@ class DatasetRangeView(DatasetDataBaseView, abc.ABC):
             block_spec=block_spec,
             rci=self.dl_request.rci,
             parameter_value_specs=parameter_value_specs,
+            compeng_processor_type=self.request.app.get(COMPENG_PROCESSOR_TYPE_APP_KEY),
         )
 
         # try getting cached values from source (MetricaAPI)
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 import abc
+from collections.abc import Callable
+import functools
 import logging
 from typing import (
     TYPE_CHECKING,
     Any,
 )
 
-from aiohttp import web
-
+from dl_api_lib.aio.json_response import make_json_response
 from dl_api_lib.app.data_api.resources.base import (
     RequiredResourceDSAPI,
     requires,
@@ -42,7 +43,7 @@ from dl_query_processing.merging.primitives import MergedQueryDataStream
 from dl_query_processing.postprocessing.primitives import PostprocessedRow
 
 if TYPE_CHECKING:
-    from aiohttp.web_response import Response
+    from aiohttp.web_response import StreamResponse
 
     from dl_api_lib.request_model.data import DataRequestModel
 
@@ -64,7 +65,7 @@ class DatasetResultView(DatasetDataBaseView, abc.ABC):
     # )
     @generic_profiler_async("ds-result-full")
     @requires(RequiredResourceDSAPI.JSON_REQUEST)
-    async def post(self) -> Response:
+    async def post(self) -> StreamResponse:
         # Pass dataset_id to US from URL
         if self.dataset_id is not None:
             connection_headers = {
@@ -76,18 +77,25 @@ class DatasetResultView(DatasetDataBaseView, abc.ABC):
 
         await self.prepare_dataset_with_mutation_cache(req_model=req_model)
 
-        merged_stream = await self.execute_all_queries(
+        # The totals query is executed along with the main blocks
+        totals_block_spec_factory: Callable[[Legend], BlockSpec] | None = None
+        if req_model.with_totals:
+            totals_block_spec_factory = functools.partial(
+                self._make_totals_block_spec,
+                raw_query_spec_union=req_model.raw_query_spec_union,
+            )
+        merged_stream, totals_postprocessed_query = await self.execute_all_queries_with_totals(
             raw_query_spec_union=req_model.raw_query_spec_union,
             autofill_legend=req_model.autofill_legend,
             call_post_exec_async_hook=True,
+            totals_block_spec_factory=totals_block_spec_factory,
         )
 
         totals, totals_query = None, None
-        if req_model.with_totals:
-            totals_query, totals = await self._make_totals(
-                raw_query_spec_union=req_model.raw_query_spec_union,
-                legend=merged_stream.legend,
-            )
+        if totals_postprocessed_query is not None:
+            totals_query = totals_postprocessed_query.meta.debug_query
+            if totals_postprocessed_query.postprocessed_data:
+                totals = totals_postprocessed_query.postprocessed_data[0]
 
         response_json = self.make_response(
             req_model=req_model,
@@ -95,7 +103,7 @@ class DatasetResultView(DatasetDataBaseView, abc.ABC):
             totals=totals,
             totals_query=totals_query,
         )
-        return web.json_response(response_json)
+        return make_json_response(response_json)
 
     @abc.abstractmethod
     def load_req_model(self) -> DataRequestModel:
@@ -111,12 +119,12 @@ class DatasetResultView(DatasetDataBaseView, abc.ABC):
     ) -> dict[str, Any]:
         raise NotImplementedError()
 
-    async def _make_totals(
-        self,
+    @staticmethod
+    def _make_totals_block_spec(
+        legend: Legend,
         *,
         raw_query_spec_union: RawQuerySpecUnion,
-        legend: Legend,
-    ) -> tuple[str | None, PostprocessedRow | None]:
+    ) -> BlockSpec:
         block_id = 0
         assert all(item.block_id is None or item.block_id == block_id for item in legend.items)
         streamable_items = legend.list_streamable_items()
@@ -140,7 +148,7 @@ class DatasetResultView(DatasetDataBaseView, abc.ABC):
 
         legend_for_block = Legend(items=updated_items)
 
-        block_spec = BlockSpec(  # Fake block spec just for use in the  postprocessing interface
+        return BlockSpec(  # Fake block spec just for use in the  postprocessing interface
             block_id=block_id,
             parent_block_id=None,
             legend_item_ids=[item.legend_item_id for item in streamable_items],
@@ -152,19 +160,6 @@ class DatasetResultView(DatasetDataBaseView, abc.ABC):
             allow_measure_fields=raw_query_spec_union.allow_measure_fields,
             empty_query_mode=EmptyQueryMode.empty_row,
         )
-        postprocessed_query = await self.execute_query(
-            block_spec=block_spec,
-            possible_data_lengths=(0, 1),
-        )
-
-        first_item: PostprocessedRow | None = None
-        if postprocessed_query.postprocessed_data:
-            first_item = postprocessed_query.postprocessed_data[0]
-
-        return (
-            postprocessed_query.meta.debug_query,
-            first_item,
-        )
 
 
 class DatasetResultViewV1(DatasetResultView):
@@ -1,9 +1,36 @@
 from __future__ import annotations
 
+from dl_api_lib.dataset.query_plan_cache import QueryPlanCache
+from dl_cache_engine.local_cache import LocalResultCache
 from dl_core.aio.metrics_view import MetricsView
+from dl_core.connection_executors.adapters.conn_pool_manager import ConnPoolManager
+from dl_core.us_manager.mutation_cache.usentry_mutation_cache import MemoryCacheEngine
 
 from .base import BaseView
+from .dataset.base import get_concurrent_totals_stats
+
+LOCAL_QUERY_CACHE_APP_KEY = "LOCAL_QUERY_CACHE"
+MUTATIONS_MEMORY_CACHE_APP_KEY = "MUTATIONS_MEMORY_CACHE"
+CONN_POOL_MANAGER_APP_KEY = "CONN_POOL_MANAGER"
+QUERY_PLAN_CACHE_APP_KEY = "QUERY_PLAN_CACHE"
 
 
 class DSDataApiMetricsView(MetricsView, BaseView):
     """View for solomon-agent, based on dl_core class"""
+
+    def get_extra_metrics(self) -> list[tuple[str, int | float]]:
+        metrics: list[tuple[str, int | float]] = []
+        local_query_cache: LocalResultCache | None = self.request.app.get(LOCAL_QUERY_CACHE_APP_KEY)
+        if local_query_cache is not None:
+            metrics.extend(local_query_cache.get_metrics())
+        mutations_memory_cache: MemoryCacheEngine | None = self.request.app.get(MUTATIONS_MEMORY_CACHE_APP_KEY)
+        if mutations_memory_cache is not None:
+            metrics.extend(mutations_memory_cache.get_metrics())
+        conn_pool_manager: ConnPoolManager | None = self.request.app.get(CONN_POOL_MANAGER_APP_KEY)
+        if conn_pool_manager is not None:
+            metrics.extend(conn_pool_manager.get_metrics())
+        query_plan_cache: QueryPlanCache | None = self.request.app.get(QUERY_PLAN_CACHE_APP_KEY)
+        if query_plan_cache is not None:
+            metrics.extend(query_plan_cache.get_metrics())
+        metrics.extend(get_concurrent_totals_stats().get_metrics())
+        return metrics
@@ -6,6 +6,10 @@ from typing import Any
 from aiohttp import web
 
 from dl_api_commons.aiohttp.aiohttp_wrappers import RequiredResourceCommon
+from dl_api_lib.aio.json_response import (
+    StreamedJsonList,
+    make_json_response,
+)
 from dl_api_lib.app.data_api.resources.base import (
     BaseView,
     RequiredResourceDSAPI,
@@ -166,7 +170,7 @@ class DashSQLTypedQueryView(BaseView):
 
     @generic_profiler_async("dashsql-typed-query")
     @requires(RequiredResourceDSAPI.JSON_REQUEST)
-    async def post(self) -> web.Response:
+    async def post(self) -> web.StreamResponse:
         """The main view method. Handle typed query execution"""
 
         # Formalize and validate input
@@ -183,4 +187,6 @@ class DashSQLTypedQueryView(BaseView):
         data_export_result.background.reason.append(DataExportForbiddenReason.prohibited_in_typed_query.value)
 
         # Prepare and return output
-        return web.json_response(self.make_response_data(typed_query_result, data_export_result))
+        response_data = self.make_response_data(typed_query_result, data_export_result)
+        response_data["data"]["rows"] = StreamedJsonList(response_data["data"]["rows"])
+        return make_json_response(response_data)
@@ -16,12 +16,14 @@ from dl_api_lib.app_settings import (
     ConstraintsSettings,
 )
 from dl_api_lib.connector_availability.base import ConnectorAvailabilityConfig
+from dl_api_lib.dataset.query_plan_cache import QueryPlanCache
 from dl_api_lib.i18n.registry import (
     LOCALIZATION_CONFIGS,
     register_translation_configs,
 )
 from dl_api_lib.service_registry.sr_factory import DefaultApiSRFactory
 from dl_api_lib.service_registry.supported_functions_manager import SupportedFunctionsManager
+from dl_cache_engine.local_cache import LocalResultCache
 from dl_cache_engine.primitives import CacheTTLConfig
 from dl_configs.enums import RequiredService
 from dl_core.connectors.settings.base import ConnectorSettings
@@ -33,6 +35,7 @@ from dl_core.services_registry.inst_specific_sr import (
 )
 from dl_core.services_registry.rqe_caches import RQECachesSetting
 from dl_core.services_registry.top_level import ServicesRegistry
+from dl_core.us_manager.mutation_cache.usentry_mutation_cache import MemoryCacheEngine
 from dl_core.utils import FutureRef
 import dl_extract
 from dl_i18n.localizer_base import (
@@ -117,6 +120,15 @@ class SRFactoryBuilder[TSettings: AppSettings](abc.ABC):
     def _get_extract_clickhouse_provider(self, settings: TSettings) -> dl_extract.ExtractClickhouseProvider | None:
         return None
 
+    def _get_local_query_cache(self, settings: TSettings) -> LocalResultCache | None:
+        return None
+
+    def _get_mutations_memory_cache_engine(self, settings: TSettings) -> MemoryCacheEngine | None:
+        return None
+
+    def _get_query_plan_cache(self, settings: TSettings) -> QueryPlanCache | None:
+        return None
+
     @property
     def _extra_translation_configs(self) -> set[TranslationConfig]:
         return set()
@@ -189,4 +201,7 @@ class SRFactoryBuilder[TSettings: AppSettings](abc.ABC):
             feature_flags=self._get_feature_flags(settings),
             constraints=self._get_constraints(settings),
             extract_clickhouse_provider=self._get_extract_clickhouse_provider(settings),
+            local_query_cache=self._get_local_query_cache(settings),
+            mutations_memory_cache_engine=self._get_mutations_memory_cache_engine(settings),
+            query_plan_cache=self._get_query_plan_cache(settings),
         )
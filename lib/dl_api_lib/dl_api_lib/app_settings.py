@@ -38,6 +38,7 @@ from dl_core.components.ids import FieldIdGeneratorType
 from dl_core.connectors.settings.base import ConnectorSettings
 from dl_core.us_manager.settings import USClientSettings
 from dl_formula.parser.factory import ParserType
+from dl_logging import LoggingQueueSettings
 from dl_pivot_pandas.pandas.constants import PIVOT_ENGINE_TYPE_PANDAS
 import dl_settings
 from dl_utils.utils import make_url
@@ -467,6 +468,66 @@ class CacheInvalidationSettings(dl_settings.BaseSettings):
         return self
 
 
+class LocalQueryCacheSettings(dl_settings.BaseSettings):
+    ENABLED: bool = False
+    MAX_SIZE_BYTES: int = 256 * 1024**2
+    MAX_ENTRY_SIZE_BYTES: int = 8 * 1024**2
+    MAX_TTL_SEC: float | None = None
+
+
+class MutationsMemoryCacheSettings(dl_settings.BaseSettings):
+    """
+    In-process engine of the mutation cache, used instead of Redis when enabled (with MUTATIONS_CACHES_ON).
+
+    With STORE_ENTRIES, the deserialized entries are kept too, and every hit gets a deep copy of the entry
+    instead of deserializing it. This takes about three times the memory of the serialized data
+    (within MAX_SIZE_BYTES), and relies on the entries being deep-copyable (the ones that are not
+    are restored from the serialized data).
+    """
+
+    ENABLED: bool = False
+    MAX_SIZE_BYTES: int = 64 * 1024**2
+    SWEEP_INTERVAL_SEC: float = 60.0
+    STORE_ENTRIES: bool = False
+
+
+class ConnPoolManagerSettings(dl_settings.BaseSettings):
+    """Process-wide database connection pools, shared between the requests (for the adapters that support it)"""
+
+    ENABLED: bool = False
+    MAX_SIZE: int = 10
+    MAX_POOLS: int = 100
+    IDLE_TIMEOUT_SEC: float = 300.0
+    HEALTH_CHECK_INTERVAL_SEC: float = 30.0
+
+
+class QueryPlanCacheSettings(dl_settings.BaseSettings):
+    """Process-wide cache of the compiled and translated dataset queries"""
+
+    ENABLED: bool = False
+    MAX_ENTRIES: int = 1000
+
+
+class CompengEmbeddedSettings(dl_settings.BaseSettings):
+    """
+    In-process (SQLite) data processing of the small inputs,
+    falls back to the PostgreSQL compeng (when it is on) for the rest; without it, the larger inputs fail
+    """
+
+    ENABLED: bool = False
+    MAX_INPUT_ROWS: int = 10_000
+    MAX_THREADS: int = 4
+
+
+class CompengUploadReuseSettings(dl_settings.BaseSettings):
+    """Keeping the tables uploaded to the PostgreSQL compeng to reuse them for the same source data"""
+
+    ENABLED: bool = False
+    TTL_SEC: float = 300.0
+    MAX_TABLES: int = 100
+    CLEANUP_INTERVAL_SEC: float = 30.0
+
+
 class DataApiAppSettings(AppSettings, ConnectorsSettingsMixin):
     US_CLIENT: USClientSettings = pydantic.Field(default_factory=USClientSettings)
     OBFUSCATION_ENABLED: bool = False
@@ -474,6 +535,13 @@ class DataApiAppSettings(AppSettings, ConnectorsSettingsMixin):
     DIRECTSQL_TIMEOUT_SEC: int = 80
 
     CACHE_INVALIDATION: CacheInvalidationSettings = pydantic.Field(default_factory=CacheInvalidationSettings)
+    LOCAL_QUERY_CACHE: LocalQueryCacheSettings = pydantic.Field(default_factory=LocalQueryCacheSettings)
+    MUTATIONS_MEMORY_CACHE: MutationsMemoryCacheSettings = pydantic.Field(default_factory=MutationsMemoryCacheSettings)
+    CONN_POOL_MANAGER: ConnPoolManagerSettings = pydantic.Field(default_factory=ConnPoolManagerSettings)
+    QUERY_PLAN_CACHE: QueryPlanCacheSettings = pydantic.Field(default_factory=QueryPlanCacheSettings)
+    COMPENG_EMBEDDED: CompengEmbeddedSettings = pydantic.Field(default_factory=CompengEmbeddedSettings)
+    COMPENG_UPLOAD_REUSE: CompengUploadReuseSettings = pydantic.Field(default_factory=CompengUploadReuseSettings)
+    LOGGING_QUEUE: LoggingQueueSettings = pydantic.Field(default_factory=LoggingQueueSettings)
 
 
 class AppSettingsOS(
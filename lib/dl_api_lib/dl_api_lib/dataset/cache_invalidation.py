@@ -132,6 +132,7 @@ async def get_invalidation_payload_sql(
     helper = CacheProcessingHelper(
         cache_engine=None,
         cache_invalidation_engine=inval_engine,
+        local_cache=services_registry.get_local_query_cache(),
     )
 
     try:
@@ -220,6 +221,7 @@ async def get_invalidation_payload_formula(
     helper = CacheProcessingHelper(
         cache_engine=None,
         cache_invalidation_engine=inval_engine,
+        local_cache=services_registry.get_local_query_cache(),
     )
 
     try:
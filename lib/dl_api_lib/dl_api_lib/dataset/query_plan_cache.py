@@ -0,0 +1,191 @@
+"""
+Process-wide cache of the translated queries (the "query plans").
+
+Compilation, mutation and translation of a query depend only on the dataset state,
+the formalized query spec and the environment of the query (dialect, source role, etc.),
+so the `TranslatedMultiQueryBase` built for a request can be reused by the subsequent
+requests that have the same key (e.g. the same chart opened by different users).
+
+The dataset state is identified by its revision and the updates of the request
+(see `DatasetDataBaseView.get_query_plan_dataset_key`): requests with arbitrary updates are not cached.
+The formalized query spec already contains the RLS filters and the parameter values.
+
+The key is a canonical JSON dump of all of these, with the types of the values tagged
+(so that e.g. `1`, `1.0`, `"1"` and `True` are all different), and not their `repr()`,
+which isn't guaranteed to be stable or to tell such values apart.
+Requests with the values that can't be dumped this way are not cached.
+"""
+
+from __future__ import annotations
+
+import collections
+from collections.abc import Iterable
+import datetime
+import decimal
+import enum
+import hashlib
+import json
+import logging
+from typing import Any
+import uuid
+
+import attr
+
+from dl_core.components.ids import AvatarId
+from dl_dynamic_enum import DynamicEnum
+from dl_query_processing.compilation.specs import QuerySpec
+from dl_query_processing.translation.primitives import TranslatedMultiQueryBase
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _get_type_name(value: Any) -> str:
+    return f"{type(value).__module__}.{type(value).__qualname__}"
+
+
+def _dump_key_json(data: Any) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _to_key_data(value: Any) -> Any:
+    """JSON-compatible form of the value for the key, the types other than the JSON ones are tagged"""
+    if value is None or type(value) in (bool, int, float, str):
+        return value
+    if isinstance(value, (enum.Enum, DynamicEnum)):
+        return {"enum": _get_type_name(value), "value": _to_key_data(value.value)}
+    if attr.has(type(value)):
+        return {
+            "attrs": _get_type_name(value),
+            "fields": {field.name: _to_key_data(getattr(value, field.name)) for field in attr.fields(type(value))},
+        }
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return {
+            "namedtuple": _get_type_name(value),
+            "fields": {name: _to_key_data(getattr(value, name)) for name in value._fields},
+        }
+    if type(value) is list:
+        return [_to_key_data(item) for item in value]
+    if type(value) is tuple:
+        return {"tuple": [_to_key_data(item) for item in value]}
+    if type(value) in (set, frozenset):
+        # Ordered by the dumps of the items, as the iteration order is not stable
+        return {"set": sorted(_dump_key_json(_to_key_data(item)) for item in value)}
+    if type(value) is dict:
+        return {
+            "dict": sorted(
+                [_dump_key_json(_to_key_data(item_key)), _to_key_data(item_value)]
+                for item_key, item_value in value.items()
+            )
+        }
+    if isinstance(value, (datetime.date, datetime.time)):
+        return {"type": _get_type_name(value), "value": value.isoformat()}
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return {"type": _get_type_name(value), "value": str(value)}
+    raise TypeError(f"Unsupported type of the query plan key part: {_get_type_name(value)}")
+
+
+def make_query_plan_key(
+    dataset_key: str,
+    query_spec: QuerySpec,
+    env_parts: Iterable[object],
+) -> tuple[str, str] | None:
+    """
+    Returns the `(hash, full key)` pair, or `None` if the key can't be made (the query is not cached then).
+    `env_parts` are the things, other than the dataset and the spec, that the translation depends on.
+    """
+    try:
+        key_str = _dump_key_json([dataset_key, _to_key_data(list(env_parts)), _to_key_data(query_spec)])
+    except TypeError:
+        LOGGER.info("Query plan cache key can't be made", exc_info=True)
+        return None
+    return hashlib.sha256(key_str.encode()).hexdigest(), key_str
+
+
+@attr.s(frozen=True)
+class QueryPlan:
+    translated_multi_query: TranslatedMultiQueryBase = attr.ib(kw_only=True)
+    # State of the `AvatarAliasMapper` after the translation: the executor maps the avatars it needs
+    # and the aliases have to be the same as in the translated queries
+    avatar_map: dict[AvatarId, str] = attr.ib(kw_only=True)
+    next_avatar_idx: int = attr.ib(kw_only=True)
+    build_time_sec: float = attr.ib(kw_only=True)
+
+
+@attr.s(auto_attribs=True, slots=True)
+class _QueryPlanCacheEntry:
+    key_str: str
+    plan: QueryPlan
+
+
+@attr.s(auto_attribs=True, slots=True)
+class QueryPlanCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    saved_time_sec: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@attr.s
+class QueryPlanCache:
+    """
+    LRU of the query plans, bounded by the number of entries.
+
+    Meant to be process-wide and used from the event loop only.
+    The plans are shared between requests and must not be mutated.
+    """
+
+    _max_entries: int = attr.ib(kw_only=True)
+
+    _entries: collections.OrderedDict[str, _QueryPlanCacheEntry] = attr.ib(init=False, factory=collections.OrderedDict)
+    _stats: QueryPlanCacheStats = attr.ib(init=False, factory=QueryPlanCacheStats)
+
+    @property
+    def stats(self) -> QueryPlanCacheStats:
+        return self._stats
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key_hash: str, key_str: str) -> QueryPlan | None:
+        entry = self._entries.get(key_hash)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        if entry.key_str != key_str:
+            LOGGER.info("Query plan cache key hash collision: %r", key_hash)
+            self._stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key_hash)
+        self._stats.hits += 1
+        self._stats.saved_time_sec += entry.plan.build_time_sec
+        return entry.plan
+
+    def put(self, key_hash: str, key_str: str, plan: QueryPlan) -> None:
+        self._entries.pop(key_hash, None)
+        if self._max_entries <= 0:
+            return
+        self._entries[key_hash] = _QueryPlanCacheEntry(key_str=key_str, plan=plan)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_metrics(self) -> list[tuple[str, int | float]]:
+        """In the `(label, value)` form of the `/metrics` views"""
+        stats = self._stats
+        return [
+            ("query_plan_cache_hits_total", stats.hits),
+            ("query_plan_cache_misses_total", stats.misses),
+            ("query_plan_cache_evictions_total", stats.evictions),
+            ("query_plan_cache_saved_time_sec_total", round(stats.saved_time_sec, 4)),
+            ("query_plan_cache_entries", len(self._entries)),
+        ]
@@ -2,22 +2,33 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from typing import TYPE_CHECKING
 
 from dl_api_commons.base_models import RequestContextInfo
 from dl_api_lib.dataset.base_wrapper import DatasetBaseWrapper
+from dl_api_lib.dataset.query_plan_cache import (
+    QueryPlan,
+    make_query_plan_key,
+)
 from dl_api_lib.query.formalization.query_formalizer import (
     DataQuerySpecFormalizer,
     TotalsSpecFormalizer,
     ValueDistinctSpecFormalizer,
     ValueRangeSpecFormalizer,
 )
-from dl_api_lib.query.registry import get_filter_formula_compiler_cls
+from dl_api_lib.query.registry import (
+    get_compeng_dialect,
+    get_filter_formula_compiler_cls,
+    is_compeng_enabled,
+)
+from dl_app_tools.profiling_base import GenericProfiler
 from dl_constants import (
     CalcMode,
     DataSourceRole,
     ProcessorType,
 )
+from dl_core.exc import ReferencedUSEntryNotFoundError
 from dl_core.fields import BIField
 from dl_core.us_connection_base import ClassicConnectionSQL
 from dl_core.us_dataset import Dataset
@@ -28,6 +39,7 @@ from dl_query_processing.execution.exec_info import QueryExecutionInfo
 from dl_query_processing.execution.executor import QueryExecutor
 from dl_query_processing.execution.primitives import ExecutedQuery
 from dl_query_processing.legend.block_legend import BlockSpec
+from dl_query_processing.translation.primitives import TranslatedMultiQueryBase
 
 if TYPE_CHECKING:
     from dl_constants.types import TBIDataValue
@@ -36,6 +48,9 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+# The processor type of the compeng (data processing) operations, if not the default one
+COMPENG_PROCESSOR_TYPE_APP_KEY = "COMPENG_PROCESSOR_TYPE"
+
 
 class DatasetView(DatasetBaseWrapper):
     """
@@ -138,10 +153,15 @@ class DatasetView(DatasetBaseWrapper):
         block_spec: BlockSpec,
         rci: RequestContextInfo,
         parameter_value_specs: list[ParameterValueSpec] | None = None,
+        query_plan_dataset_key: str | None = None,
+        compeng_processor_type: ProcessorType | None = None,
     ) -> None:
         self._rci = rci
         self._query_type = block_spec.query_type  # FIXME: Remove
         self._parameter_value_specs = parameter_value_specs
+        # Identifies the state of the dataset for the query plan cache, `None` disables the cache
+        self._query_plan_dataset_key = query_plan_dataset_key
+        self._compeng_processor_type = compeng_processor_type or self._COMPENG_PROCESSOR_TYPE
         self._compeng_semaphore = asyncio.Semaphore()
         super().__init__(
             ds=ds, block_spec=block_spec, us_manager=us_manager, debug_mode=self._rci.x_dl_debug_mode or False
@@ -180,7 +200,7 @@ class DatasetView(DatasetBaseWrapper):
         return QueryExecutor(
             dataset=self._ds,
             avatar_alias_mapper=self._avatar_alias_mapper,
-            compeng_processor_type=self._COMPENG_PROCESSOR_TYPE,
+            compeng_processor_type=self._compeng_processor_type,
             source_db_processor_type=self._SOURCE_DB_PROCESSOR_TYPE,
             allow_cache_usage=allow_cache_usage,
             us_manager=self._us_manager,
@@ -202,7 +222,7 @@ class DatasetView(DatasetBaseWrapper):
         assert self._formula_compiler is not None, "perhaps the sources were not reloaded properly"
         assert self.inspect_env is not None, "perhaps the sources were not reloaded properly"
 
-        translated_multi_query = self.compile_and_translate_query(query_spec=self.query_spec)
+        translated_multi_query = self._compile_and_translate_query_cached()
 
         role = self.resolve_role()
 
@@ -220,6 +240,78 @@ class DatasetView(DatasetBaseWrapper):
             target_connections=target_connections,
         )
 
+    def _make_query_plan_key(self) -> tuple[str, str] | None:
+        if self._query_plan_dataset_key is None:
+            return None
+
+        role = self.resolve_role()
+        try:
+            # Connection options (e.g. experimental features) affect the compilation too
+            connection_revisions = []
+            for source_id in self._ds_accessor.get_data_source_id_list():
+                connection = self._get_data_source_strict(source_id=source_id, role=role).connection
+                connection_revisions.append((connection.uuid, connection.revision_id))
+        except ReferencedUSEntryNotFoundError:
+            return None
+
+        return make_query_plan_key(
+            dataset_key=self._query_plan_dataset_key,
+            query_spec=self.query_spec,
+            env_parts=(
+                type(self).__qualname__,
+                self._validation_mode,
+                self._function_scopes,
+                role,
+                self.dialect,
+                self.get_backend_type() if self._has_sources else None,
+                get_compeng_dialect() if is_compeng_enabled() else None,
+                connection_revisions,
+            ),
+        )
+
+    def _compile_and_translate_query_cached(self) -> TranslatedMultiQueryBase:
+        """
+        Same as `compile_and_translate_query` for the view's query spec,
+        but reuses the translated query of a previous request with the same dataset state, spec and environment.
+        """
+        query_plan_cache = self._service_registry.get_query_plan_cache()
+        key = self._make_query_plan_key() if query_plan_cache is not None else None
+        if query_plan_cache is None or key is None:
+            return self.compile_and_translate_query(query_spec=self.query_spec)
+
+        key_hash, key_str = key
+        query_plan = query_plan_cache.get(key_hash, key_str)
+        if query_plan is not None:
+            with GenericProfiler(
+                "query-plan-cache-hit",
+                extra_data={
+                    "query_plan_saved_time_sec": round(query_plan.build_time_sec, 4),
+                    "query_plan_cache_hit_ratio": round(query_plan_cache.stats.hit_ratio, 4),
+                },
+            ):
+                # The executor has to use the same aliases for the avatars as the translated queries
+                self._avatar_alias_mapper.avatar_map = dict(query_plan.avatar_map)
+                self._avatar_alias_mapper.next_idx = query_plan.next_avatar_idx
+                return query_plan.translated_multi_query
+
+        with GenericProfiler(
+            "query-plan-cache-miss",
+            extra_data={"query_plan_cache_hit_ratio": round(query_plan_cache.stats.hit_ratio, 4)},
+        ):
+            started = time.monotonic()
+            translated_multi_query = self.compile_and_translate_query(query_spec=self.query_spec)
+            query_plan_cache.put(
+                key_hash,
+                key_str,
+                QueryPlan(
+                    translated_multi_query=translated_multi_query,
+                    avatar_map=dict(self._avatar_alias_mapper.avatar_map),
+                    next_avatar_idx=self._avatar_alias_mapper.next_idx,
+                    build_time_sec=time.monotonic() - started,
+                ),
+            )
+        return translated_multi_query
+
     def fast_get_expression_value_range(self) -> tuple[BIField, TBIDataValue, TBIDataValue]:
         """Try to get fast (cached or pre-defined) range from data source"""
 
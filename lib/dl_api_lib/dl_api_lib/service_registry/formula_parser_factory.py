@@ -4,6 +4,7 @@ import logging
 
 import attr
 
+from dl_formula.definitions.registry import OPERATION_REGISTRY
 from dl_formula.parser.base import FormulaParser
 from dl_formula.parser.factory import (
     ParserType,
@@ -49,9 +50,17 @@ class FormulaParserFactory:
             "Formula parser global statistics (%s)", parser_type.name, extra={"function_parser_statistics": data}
         )
 
+    def log_operation_registry_stats(self) -> None:
+        stats = OPERATION_REGISTRY.get_usage_stats()
+        LOGGER.info(
+            "Formula operation registry global statistics", extra={"function_registry_statistics": stats._asdict()}
+        )
+
     def log_parser_stats_for_all_used_parsers(self) -> None:
         for parser_type in self._saved_parsers:
             self.log_parser_stats_for_type(parser_type=parser_type)
+        if self._saved_parsers:
+            self.log_operation_registry_stats()
 
     def close(self) -> None:
         self.log_parser_stats_for_all_used_parsers()
@@ -36,6 +36,7 @@ from dl_pivot.base.transformer_factory import PivotTransformerFactory
 from dl_rls.subject_resolver import BaseSubjectResolver
 
 if TYPE_CHECKING:
+    from dl_api_lib.dataset.query_plan_cache import QueryPlanCache
     from dl_api_lib.service_registry.dataset_validator_factory import DatasetValidatorFactory
 
 
@@ -100,6 +101,10 @@ class ApiServiceRegistry(ServicesRegistry, metaclass=abc.ABCMeta):
     def get_extract_clickhouse_provider(self) -> dl_extract.ExtractClickhouseProvider:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_query_plan_cache(self) -> QueryPlanCache | None:
+        raise NotImplementedError
+
 
 @attr.s
 class DefaultApiServiceRegistry(DefaultServicesRegistry, ApiServiceRegistry):
@@ -118,6 +123,7 @@ class DefaultApiServiceRegistry(DefaultServicesRegistry, ApiServiceRegistry):
     _feature_flags: FeatureFlags = attr.ib(kw_only=True, factory=FeatureFlags)
     _constraints: ConstraintsSettings = attr.ib(kw_only=True, factory=ConstraintsSettings)
     _extract_clickhouse_provider: dl_extract.ExtractClickhouseProvider | None = attr.ib(kw_only=True, default=None)
+    _query_plan_cache: QueryPlanCache | None = attr.ib(kw_only=True, default=None)
 
     _multi_query_mutator_factory_factory: SRMultiQueryMutatorFactory = attr.ib(
         init=False,
@@ -200,6 +206,9 @@ class DefaultApiServiceRegistry(DefaultServicesRegistry, ApiServiceRegistry):
         assert self._extract_clickhouse_provider is not None
         return self._extract_clickhouse_provider
 
+    def get_query_plan_cache(self) -> QueryPlanCache | None:
+        return self._query_plan_cache
+
     def close(self) -> None:
         if self._formula_parser_factory is not None:
             self._formula_parser_factory.close()
@@ -29,6 +29,7 @@ from dl_pivot.base.transformer_factory import PivotTransformerFactory
 
 if TYPE_CHECKING:
     from dl_api_commons.base_models import RequestContextInfo
+    from dl_api_lib.dataset.query_plan_cache import QueryPlanCache
 
 
 @attr.s
@@ -45,6 +46,7 @@ class DefaultApiSRFactory(DefaultSRFactory[DefaultApiServiceRegistry]):
     _feature_flags: FeatureFlags = attr.ib(kw_only=True, factory=FeatureFlags)
     _constraints: ConstraintsSettings = attr.ib(kw_only=True, factory=ConstraintsSettings)
     _extract_clickhouse_provider: dl_extract.ExtractClickhouseProvider | None = attr.ib(kw_only=True, default=None)
+    _query_plan_cache: QueryPlanCache | None = attr.ib(kw_only=True, default=None)
 
     def additional_sr_constructor_kwargs(
         self,
@@ -66,4 +68,5 @@ class DefaultApiSRFactory(DefaultSRFactory[DefaultApiServiceRegistry]):
             "feature_flags": self._feature_flags,
             "constraints": self._constraints,
             "extract_clickhouse_provider": self._extract_clickhouse_provider,
+            "query_plan_cache": self._query_plan_cache,
         }
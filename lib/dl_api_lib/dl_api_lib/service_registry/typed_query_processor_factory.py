@@ -67,6 +67,7 @@ class DefaultQueryProcessorFactory(TypedQueryProcessorFactory):
                 cache_engine=cache_engine,
                 refresh_ttl_on_read=False,
                 cache_ttl_config=self.service_registry.default_cache_ttl_config,
+                use_locked_cache=connection.use_locked_cache,
             )
 
         return tq_processor
@@ -0,0 +1,185 @@
+import itertools
+
+import pytest
+
+from dl_constants import (
+    FieldType,
+    OrderDirection,
+    PivotHeaderRole,
+    PivotItemType,
+    PivotRole,
+    UserDataType,
+)
+from dl_pivot.compact import transformer as compact_transformer
+from dl_pivot.compact.transformer import CompactPivotTransformer
+from dl_pivot.hashable_packing import JsonHashableValuePacker
+from dl_pivot.pivot_legend import (
+    PivotDimensionRoleSpec,
+    PivotLegend,
+    PivotLegendItem,
+    PivotMeasureRoleSpec,
+)
+from dl_pivot.primitives import (
+    PivotHeaderRoleSpec,
+    PivotHeaderValue,
+    PivotMeasureSorting,
+    PivotMeasureSortingSettings,
+)
+from dl_pivot.table import PivotTable
+from dl_pivot_pandas.pandas.transformer import PdPivotTransformer
+import dl_query_processing.exc
+from dl_query_processing.legend.field_legend import (
+    FieldObjSpec,
+    Legend,
+    LegendItem,
+    MeasureNameObjSpec,
+)
+from dl_query_processing.merging.primitives import MergedQueryDataRow
+
+CITIES = [f"City {idx}" for idx in range(20)]
+CATEGORIES = [f"Category {idx}" for idx in range(5)]
+FID_CITY, FID_CTGRY, FID_SALES, FID_PROFIT = ("123", "456", "789", "000")
+LIID_CTGRY, LIID_CITY, LIID_MNAMES, LIID_SALES, LIID_PROFIT = (0, 1, 2, 3, 4)
+PIID_MNAMES, PIID_CITY, PIID_CTGRY, PIID_SALES, PIID_PROFIT = (10, 20, 30, 40, 50)
+LEGEND_ITEM_IDS = (LIID_CITY, LIID_CTGRY, LIID_SALES, LIID_PROFIT)
+
+
+def _make_data(skip_every: int = 3) -> list[MergedQueryDataRow]:
+    # Some of the cells are missing, all measure values are distinct
+    return [
+        MergedQueryDataRow(data=(city, ctgry, idx * 7 % 101, -idx), legend_item_ids=LEGEND_ITEM_IDS)
+        for idx, (city, ctgry) in enumerate(itertools.product(CITIES, CATEGORIES))
+        if idx % skip_every
+    ]
+
+
+def _make_legends(sorting: PivotMeasureSorting | None = None) -> tuple[Legend, PivotLegend]:
+    legend = Legend(
+        items=[
+            LegendItem(
+                legend_item_id=LIID_CTGRY,
+                obj=FieldObjSpec(id=FID_CTGRY, title="Category"),
+                field_type=FieldType.DIMENSION,
+                data_type=UserDataType.string,
+            ),
+            LegendItem(
+                legend_item_id=LIID_CITY,
+                obj=FieldObjSpec(id=FID_CITY, title="City"),
+                field_type=FieldType.DIMENSION,
+                data_type=UserDataType.string,
+            ),
+            LegendItem(
+                legend_item_id=LIID_MNAMES,
+                obj=MeasureNameObjSpec(),
+                field_type=FieldType.DIMENSION,
+                data_type=UserDataType.string,
+            ),
+            LegendItem(
+                legend_item_id=LIID_SALES,
+                obj=FieldObjSpec(id=FID_SALES, title="Sales"),
+                field_type=FieldType.MEASURE,
+                data_type=UserDataType.integer,
+            ),
+            LegendItem(
+                legend_item_id=LIID_PROFIT,
+                obj=FieldObjSpec(id=FID_PROFIT, title="Profit"),
+                field_type=FieldType.MEASURE,
+                data_type=UserDataType.integer,
+            ),
+        ]
+    )
+    pivot_legend = PivotLegend(
+        items=[
+            PivotLegendItem(
+                pivot_item_id=PIID_CTGRY,
+                legend_item_ids=[LIID_CTGRY],
+                role_spec=PivotDimensionRoleSpec(role=PivotRole.pivot_column, direction=OrderDirection.desc),
+                title="Category",
+            ),
+            PivotLegendItem(
+                pivot_item_id=PIID_CITY,
+                legend_item_ids=[LIID_CITY],
+                role_spec=PivotDimensionRoleSpec(role=PivotRole.pivot_row, direction=OrderDirection.asc),
+                title="City",
+            ),
+            PivotLegendItem(
+                pivot_item_id=PIID_MNAMES,
+                item_type=PivotItemType.measure_name,
+                legend_item_ids=[LIID_MNAMES],
+                role_spec=PivotDimensionRoleSpec(role=PivotRole.pivot_row),
+                title="Measure Name",
+            ),
+            PivotLegendItem(
+                pivot_item_id=PIID_SALES,
+                legend_item_ids=[LIID_SALES],
+                role_spec=PivotMeasureRoleSpec(role=PivotRole.pivot_measure, sorting=sorting),
+                title="Sales",
+            ),
+            PivotLegendItem(
+                pivot_item_id=PIID_PROFIT,
+                legend_item_ids=[LIID_PROFIT],
+                role_spec=PivotMeasureRoleSpec(role=PivotRole.pivot_measure),
+                title="Profit",
+            ),
+        ],
+    )
+    return legend, pivot_legend
+
+
+def _pivot_both(
+    data: list[MergedQueryDataRow], sorting: PivotMeasureSorting | None = None
+) -> tuple[PivotTable, PivotTable]:
+    legend, pivot_legend = _make_legends(sorting=sorting)
+    tables = []
+    for transformer_cls in (CompactPivotTransformer, PdPivotTransformer):
+        transformer = transformer_cls(legend=legend, pivot_legend=pivot_legend, cell_packer=JsonHashableValuePacker())
+        pivot_table = transformer.pivot(data)
+        pivot_table.facade.sort()
+        tables.append(pivot_table)
+    return tables[0], tables[1]
+
+
+def _assert_same_tables(actual: PivotTable, expected: PivotTable) -> None:
+    assert actual.get_column_count() == expected.get_column_count()
+    assert actual.get_row_count() == expected.get_row_count()
+    assert actual.get_columns() == expected.get_columns()
+    assert list(actual.get_rows()) == list(expected.get_rows())
+
+
+@pytest.mark.parametrize("sparse", [False, True], ids=["dense", "sparse"])
+def test_same_as_pandas(monkeypatch: pytest.MonkeyPatch, sparse: bool) -> None:
+    if sparse:
+        monkeypatch.setattr(compact_transformer, "SPARSE_CELLS_RATIO", 0)
+
+    compact_table, pd_table = _pivot_both(_make_data())
+    _assert_same_tables(compact_table, pd_table)
+
+    compact_table.facade.paginate(offset_rows=5, limit_rows=10)
+    pd_table.facade.paginate(offset_rows=5, limit_rows=10)
+    _assert_same_tables(compact_table, pd_table)
+
+
+def test_measure_sort_same_as_pandas() -> None:
+    sorting = PivotMeasureSorting(
+        column=PivotMeasureSortingSettings(
+            header_values=[PivotHeaderValue(value="Category 1")],
+            direction=OrderDirection.desc,
+            role_spec=PivotHeaderRoleSpec(role=PivotHeaderRole.data),
+        ),
+        row=PivotMeasureSortingSettings(
+            header_values=[PivotHeaderValue(value="City 3"), PivotHeaderValue(value="Sales")],
+            direction=OrderDirection.asc,
+            role_spec=PivotHeaderRoleSpec(role=PivotHeaderRole.data),
+        ),
+    )
+    # No missing cells: the ties (empty cells) are ordered differently by pandas
+    compact_table, pd_table = _pivot_both(_make_data(skip_every=len(CITIES) * len(CATEGORIES)), sorting=sorting)
+    _assert_same_tables(compact_table, pd_table)
+
+
+def test_duplicate_dimension_values() -> None:
+    data = _make_data()
+    legend, pivot_legend = _make_legends()
+    transformer = CompactPivotTransformer(legend=legend, pivot_legend=pivot_legend)
+    with pytest.raises(dl_query_processing.exc.PivotDuplicateDimensionValueError):
+        transformer.pivot([*data, data[0]])
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+import json
+from typing import Any
+
+from aiohttp import (
+    ClientPayloadError,
+    web,
+)
+from aiohttp.test_utils import (
+    TestClient,
+    TestServer,
+)
+from aiohttp.typedefs import Handler
+import pytest
+
+from dl_api_lib.aio.json_response import (
+    TRUNCATED_BODY_MARKER,
+    JsonStreamResponse,
+    StreamedJsonList,
+    make_json_response,
+)
+
+CHUNK_ROWS = 10
+
+
+def _make_data(row_count: int) -> dict[str, Any]:
+    rows = ({"data": [str(idx), None, "тест"], "legend": [0, 1, 2]} for idx in range(row_count))
+    return {"fields": [{"title": "a"}], "result_data": [{"rows": StreamedJsonList(rows)}], "blocks": []}
+
+
+def _expected(row_count: int) -> dict[str, Any]:
+    data = _make_data(row_count)
+    data["result_data"][0]["rows"] = list(data["result_data"][0]["rows"].items)
+    return data
+
+
+@web.middleware
+async def header_middleware(request: web.Request, handler: Handler) -> web.StreamResponse:
+    # As the CORS middleware does
+    response = await handler(request)
+    response.headers["X-Test"] = "test"
+    return response
+
+
+async def _request(row_count: int) -> tuple[web.StreamResponse, Any, str]:
+    responses = []
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        response = make_json_response(_make_data(row_count), chunk_rows=CHUNK_ROWS)
+        responses.append(response)
+        return response
+
+    app = web.Application(middlewares=[header_middleware])
+    app.router.add_post("/", handler)
+    async with TestClient(TestServer(app)) as client:
+        resp = await client.post("/")
+        assert resp.status == 200
+        assert resp.content_type == "application/json"
+        assert resp.headers["X-Test"] == "test"
+        return responses[0], await resp.json(), resp.headers.get("Transfer-Encoding", "")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("row_count", [0, 1, CHUNK_ROWS])
+async def test_small_response_is_not_streamed(row_count: int) -> None:
+    response, body, transfer_encoding = await _request(row_count)
+    assert not isinstance(response, JsonStreamResponse)
+    assert transfer_encoding != "chunked"
+    assert body == _expected(row_count)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("row_count", [CHUNK_ROWS + 1, CHUNK_ROWS * 5, CHUNK_ROWS * 5 + 3])
+async def test_large_response_is_streamed(row_count: int) -> None:
+    response, body, transfer_encoding = await _request(row_count)
+    assert isinstance(response, JsonStreamResponse)
+    assert transfer_encoding == "chunked"
+    assert body == _expected(row_count)
+
+
+def test_response_without_streamed_list() -> None:
+    data = {"a": [1, 2.5, None, "тест"], 1: True, "big": 2**70}
+    response = make_json_response(data)
+    assert isinstance(response, web.Response)
+    assert response.body is not None
+    assert json.loads(response.body) == {"a": [1, 2.5, None, "тест"], "1": True, "big": 2**70}
+
+
+def test_only_one_streamed_list() -> None:
+    with pytest.raises(TypeError):
+        make_json_response({"a": StreamedJsonList([]), "b": StreamedJsonList([])})
+
+
+class RowError(Exception):
+    pass
+
+
+def _make_failing_rows(fail_at: int) -> Iterator[list[int]]:
+    for idx in range(fail_at):
+        yield [idx]
+    raise RowError()
+
+
+async def _request_failing(fail_at: int) -> tuple[int, bytes, bool]:
+    async def handler(request: web.Request) -> web.StreamResponse:
+        return make_json_response({"rows": StreamedJsonList(_make_failing_rows(fail_at))}, chunk_rows=CHUNK_ROWS)
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    async with TestClient(TestServer(app)) as client:
+        resp = await client.post("/")
+        body = b""
+        try:
+            async for data in resp.content.iter_any():
+                body += data
+        except ClientPayloadError:
+            return resp.status, body, False
+        return resp.status, body, True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fail_at", [3, CHUNK_ROWS])
+async def test_early_error_response(fail_at: int) -> None:
+    status, _, complete = await _request_failing(fail_at)
+    assert status == 500
+    assert complete
+
+
+@pytest.mark.asyncio
+async def test_truncated_response() -> None:
+    status, body, complete = await _request_failing(CHUNK_ROWS * 3)
+    assert status == 200
+    assert not complete
+    assert body.startswith(b'{"rows":[[0],[1],')
+    assert body.endswith(TRUNCATED_BODY_MARKER)
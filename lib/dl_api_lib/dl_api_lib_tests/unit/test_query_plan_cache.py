@@ -0,0 +1,131 @@
+import datetime
+from decimal import Decimal
+from typing import Any
+
+from dl_api_lib.dataset.query_plan_cache import (
+    QueryPlan,
+    QueryPlanCache,
+    make_query_plan_key,
+)
+from dl_constants import WhereClauseOperation
+from dl_query_processing.compilation.specs import (
+    FilterFieldSpec,
+    ParameterValueSpec,
+    QuerySpec,
+    SelectFieldSpec,
+)
+from dl_query_processing.translation.primitives import TranslatedMultiQuery
+
+from dl_connector_postgresql.formula.constants import PostgreSQLDialect
+
+
+def _make_query_spec(
+    filter_values: list[str],
+    parameter_value: Any = 1,
+    required_avatar_ids: tuple[str, ...] = ("a", "b", "c"),
+) -> QuerySpec:
+    return QuerySpec(
+        select_specs=[SelectFieldSpec(field_id="f1"), SelectFieldSpec(field_id="f2")],
+        group_by_specs=[],
+        order_by_specs=[],
+        filter_specs=[FilterFieldSpec(field_id="f1", operation=WhereClauseOperation.IN, values=filter_values)],
+        relation_specs=[],
+        source_column_filter_specs=[],
+        parameter_value_specs=[ParameterValueSpec(field_id="p1", value=parameter_value)],
+        limit=100,
+        offset=None,
+        required_avatar_ids=frozenset(required_avatar_ids),
+    )
+
+
+def _make_plan(build_time_sec: float = 0.5) -> QueryPlan:
+    return QueryPlan(
+        translated_multi_query=TranslatedMultiQuery(queries=[]),
+        avatar_map={"a": "t1"},
+        next_avatar_idx=2,
+        build_time_sec=build_time_sec,
+    )
+
+
+def test_query_plan_key() -> None:
+    key = make_query_plan_key("ds:rev", _make_query_spec(["x"]), env_parts=("dialect", 1))
+    assert make_query_plan_key("ds:rev", _make_query_spec(["x"]), env_parts=("dialect", 1)) == key
+    assert (
+        make_query_plan_key(
+            "ds:rev", _make_query_spec(["x"], required_avatar_ids=("c", "b", "a")), env_parts=("dialect", 1)
+        )
+        == key
+    )
+
+    # Everything the translation depends on is a part of the key
+    other_keys = [
+        make_query_plan_key("ds:other_rev", _make_query_spec(["x"]), env_parts=("dialect", 1)),
+        make_query_plan_key("ds:rev", _make_query_spec(["y"]), env_parts=("dialect", 1)),
+        make_query_plan_key("ds:rev", _make_query_spec(["x"], parameter_value=2), env_parts=("dialect", 1)),
+        make_query_plan_key("ds:rev", _make_query_spec(["x"]), env_parts=("dialect", 2)),
+    ]
+    assert len({key, *other_keys}) == len(other_keys) + 1
+
+
+def test_query_plan_key_typed() -> None:
+    # The values that have the same `repr()` or are equal in Python are still different
+    parameter_values = [
+        1,
+        1.0,
+        "1",
+        True,
+        Decimal(1),
+        datetime.date(2024, 1, 1),
+        datetime.datetime(2024, 1, 1),
+        "datetime.date(2024, 1, 1)",
+        (1,),
+        [1],
+        frozenset([1]),
+        {1: 1},
+    ]
+    keys = [
+        make_query_plan_key("ds:rev", _make_query_spec(["x"], parameter_value=value), env_parts=("dialect",))
+        for value in parameter_values
+    ]
+    assert len(set(keys)) == len(parameter_values)
+    assert make_query_plan_key("ds:rev", _make_query_spec(["x"]), env_parts=["1"]) != make_query_plan_key(
+        "ds:rev", _make_query_spec(["x"]), env_parts=[1]
+    )
+
+    # Stable for the sets and the dicts
+    assert make_query_plan_key(
+        "ds:rev", _make_query_spec(["x"], parameter_value={"b": {3, 2, 1}, "a": 1}), env_parts=()
+    ) == make_query_plan_key("ds:rev", _make_query_spec(["x"], parameter_value={"a": 1, "b": {1, 2, 3}}), env_parts=())
+
+    # The environment of the real requests
+    assert make_query_plan_key(
+        "ds:rev", _make_query_spec(["x"]), env_parts=(PostgreSQLDialect.POSTGRESQL_9_4, PostgreSQLDialect.COMPENG)
+    ) != make_query_plan_key(
+        "ds:rev", _make_query_spec(["x"]), env_parts=(PostgreSQLDialect.POSTGRESQL_9_4, PostgreSQLDialect.POSTGRESQL)
+    )
+
+    # Not cached
+    assert make_query_plan_key("ds:rev", _make_query_spec(["x"], parameter_value=object()), env_parts=()) is None
+
+
+def test_query_plan_cache() -> None:
+    cache = QueryPlanCache(max_entries=2)
+    plan = _make_plan()
+
+    assert cache.get("h1", "key_1") is None
+    cache.put("h1", "key_1", plan)
+    assert cache.get("h1", "key_1") is plan
+    # Hash collision
+    assert cache.get("h1", "key_2") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+    assert cache.stats.saved_time_sec == plan.build_time_sec
+
+    cache.put("h2", "key_2", _make_plan())
+    cache.get("h1", "key_1")
+    cache.put("h3", "key_3", _make_plan())
+    # The least recently used entry is evicted
+    assert cache.get("h2", "key_2") is None
+    assert cache.get("h1", "key_1") is plan
+    assert len(cache) == 2
+    assert dict(cache.get_metrics())["query_plan_cache_evictions_total"] == 1
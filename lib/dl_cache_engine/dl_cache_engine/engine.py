@@ -16,7 +16,9 @@ Logging fields:
     * cache_row_count
     * cache_serializer_timing  # for both serialize and deserialize
     * cache_compressor_timing  # for both compress and decompress
+    * cache_dump_timing  # save only: serialize + compress, including the wait for the dump executor
     * cache_ttl_sec  # required on save, optional update on read
+    * cache_chunk_count  # streamed (chunked) entries only
 
   * Save: INFO "Cache saved at {key}"
 
@@ -26,6 +28,10 @@ Logging fields:
   * Read miss: "Cache miss: …: …"
     * cache_miss_reason
 
+Streamed (chunked) entries, see `ChunkedCacheWriter`, are kept under their own keys
+next to the regular entry key (`…/stream-v1`), so the readers that don't know them never see them.
+The regular entry is read first, the streamed one is only looked up on a miss.
+
   * Pre-del (sync, async): INFO "Invalidating cache for entity %s"
 
 
@@ -70,16 +76,30 @@ from __future__ import annotations
 
 import asyncio
 import collections
-from collections.abc import AsyncGenerator
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Sequence,
+)
+from concurrent.futures import (
+    Executor,
+    ThreadPoolExecutor,
+)
 import contextlib
 import enum
+import functools
 import gzip
 import logging
+import threading
+import time
 from typing import (
     TYPE_CHECKING,
     Any,
     Self,
+    TypeVar,
 )
+import uuid
 
 import attr
 import lz4.frame
@@ -90,7 +110,11 @@ from dl_app_tools.profiling_base import (
     GenericProfiler,
     generic_profiler_async,
 )
-from dl_cache_engine.exc import CachedEntryPackageVersionMismatchError
+from dl_cache_engine.exc import (
+    CachedEntryPackageVersionMismatchError,
+    CacheEntryChunkMissingError,
+)
+from dl_cache_engine.local_cache import LocalResultCache
 from dl_cache_engine.primitives import LocalKeyRepresentation
 from dl_constants.types import TJSONExt
 from dl_model_tools.serialization import (
@@ -98,6 +122,10 @@ from dl_model_tools.serialization import (
     common_dumps,
     common_loads,
 )
+from dl_utils.streaming import (
+    AsyncChunked,
+    AsyncChunkedBase,
+)
 
 if TYPE_CHECKING:
     from redis.asyncio import Redis
@@ -105,6 +133,31 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+_INIT_RESULT_TV = TypeVar("_INIT_RESULT_TV")
+
+_DUMP_EXECUTOR_MAX_WORKERS = 4
+_dump_executor: Executor | None = None
+_dump_executor_lock = threading.Lock()
+
+
+def get_default_dump_executor() -> Executor:
+    """
+    Process-wide bounded pool for the CPU-bound cache entry dumping (serialization + compression),
+    to keep it off the event loop.
+
+    Note: intentionally not a `ContextVarExecutor`: the profiler stack is kept in context vars,
+    and sharing it with a worker thread would mix up the stages.
+    """
+    global _dump_executor
+    if _dump_executor is None:
+        with _dump_executor_lock:
+            if _dump_executor is None:
+                _dump_executor = ThreadPoolExecutor(
+                    max_workers=_DUMP_EXECUTOR_MAX_WORKERS,
+                    thread_name_prefix="QCACHE_DUMP_",
+                )
+    return _dump_executor
+
 
 @enum.unique
 class CompressAlg(enum.Enum):
@@ -162,6 +215,26 @@ class ResultCacheEntry:
         # TODO: require the key presence:
         # return self.metadata['error'] is not None
 
+    @property
+    def is_chunked(self) -> bool:
+        """Whether this entry is a manifest of a streamed (chunked) entry rather than the data itself"""
+        assert self.metadata is not None
+        return self.metadata.get("chunked") is not None
+
+    @property
+    def chunk_stream_id(self) -> str:
+        assert self.metadata is not None
+        stream_id = self.metadata["chunked"]["stream_id"]
+        assert isinstance(stream_id, str)
+        return stream_id
+
+    @property
+    def chunk_count(self) -> int:
+        assert self.metadata is not None
+        chunk_count = self.metadata["chunked"]["chunk_count"]
+        assert isinstance(chunk_count, int)
+        return chunk_count
+
     def make_result_data(self) -> TJSONExt:
         """Deserialize the result data (if not saved) and update the details"""
         if self._result_data is not None:
@@ -240,7 +313,10 @@ class ResultCacheEntry:
         )
 
     def to_redis_data_and_log_details(
-        self, compress: bool = False, compress_alg: CompressAlg | None = None
+        self,
+        compress: bool = False,
+        compress_alg: CompressAlg | None = None,
+        min_bytes_to_compress: int = 0,
     ) -> tuple[bytes, dict[str, Any]]:
         result_data = self._result_data
         assert result_data is not None
@@ -252,6 +328,9 @@ class ResultCacheEntry:
 
         result_data_to_store = serialized_result_data
 
+        # Not worth it for the small entries.
+        compress = compress and len(serialized_result_data) >= min_bytes_to_compress
+
         prof_compress = None
         if compress:
             if compress_alg is None:
@@ -297,6 +376,79 @@ class ResultCacheEntry:
         return result
 
 
+@attr.s(auto_attribs=True, slots=True)
+class ChunkedCacheWriter:
+    """
+    Saves a result into the cache chunk by chunk, while it is being generated.
+
+    Every chunk is saved under its own key (see `_get_key_query_cache_chunk`) with the entry TTL,
+    so the chunks of a stream that is never committed expire by themselves
+    (and are deleted right away by `abort`).
+    The manifest (the chunk count and the stream id) is saved under the stream key only on `commit`,
+    so it is also the commit marker: readers never see a partially written stream.
+    """
+
+    cache_engine: EntityCacheEngineAsync
+    local_key_rep: LocalKeyRepresentation
+    ttl_sec: float
+    stream_id: str = attr.Factory(lambda: uuid.uuid4().hex)
+
+    _chunk_keys: list[str] = attr.Factory(list)
+    _row_count: int = 0
+    _failed: bool = False
+    _done: bool = False
+
+    @property
+    def failed(self) -> bool:
+        return self._failed
+
+    async def add_chunk(self, chunk: Sequence[TJSONExt]) -> None:
+        if self._failed:
+            return  # no point in saving the rest of the chunks
+        assert not self._done, "Already committed or aborted"
+
+        cache_engine = self.cache_engine
+        chunk_key = cache_engine._get_key_query_cache_chunk(
+            local_key_rep=self.local_key_rep,
+            stream_id=self.stream_id,
+            chunk_idx=len(self._chunk_keys),
+        )
+        update_request = await cache_engine._make_cache_update_request_offloaded(
+            local_key_rep=self.local_key_rep,
+            result=chunk if isinstance(chunk, list) else list(chunk),
+            ttl_sec=self.ttl_sec,
+            full_key=chunk_key,
+        )
+        if not await cache_engine._redis_set_chunk(update_request):
+            self._failed = True
+            return
+
+        self._chunk_keys.append(chunk_key)
+        self._row_count += len(chunk)
+
+    async def commit(self) -> None:
+        assert not self._done, "Already committed or aborted"
+        self._done = True
+        if self._failed:
+            LOGGER.info("Not committing a streamed cache entry %s: some chunks were not saved", self.stream_id)
+            await self.cache_engine._delete_chunks(self._chunk_keys)
+            return
+        await self.cache_engine._commit_chunked_cache(
+            local_key_rep=self.local_key_rep,
+            stream_id=self.stream_id,
+            chunk_keys=self._chunk_keys,
+            row_count=self._row_count,
+            ttl_sec=self.ttl_sec,
+        )
+
+    async def abort(self) -> None:
+        """Delete the chunks saved so far (the stream is not going to be committed)"""
+        if self._done:
+            return
+        self._done = True
+        await self.cache_engine._delete_chunks(self._chunk_keys)
+
+
 @attr.s(auto_attribs=True, slots=True)
 class EntityCacheEntryManagerAsyncBase:
     """
@@ -312,6 +464,10 @@ class EntityCacheEntryManagerAsyncBase:
     read_extend_ttl_sec: float | None = None
     allow_cache_read: bool = True
 
+    # The result of the last `initialize` was generated by a concurrent request
+    # that held the lock, while this one was waiting for it.
+    coalesced: bool = attr.ib(default=False, init=False)
+
     _starting: bool = False
     _started: bool = False
 
@@ -319,10 +475,20 @@ class EntityCacheEntryManagerAsyncBase:
         return attr.evolve(self, **updates)
 
     async def initialize(self) -> TJSONExt | None:
+        return await self._initialize_with(self._initialize)
+
+    async def initialize_stream(self) -> AsyncChunkedBase[TJSONExt] | None:
+        """Same as `initialize`, but returns the cached result (if any) as a stream of chunks"""
+        return await self._initialize_with(self._initialize_stream)
+
+    async def _initialize_with(
+        self,
+        initialize_func: Callable[[], Awaitable[_INIT_RESULT_TV]],
+    ) -> _INIT_RESULT_TV:
         if self._starting or self._started:
             raise Exception("Already initialized and not finalized")
         self._starting = True
-        result = await self._initialize()
+        result = await initialize_func()
         self._started = True
         self._starting = False
         return result
@@ -330,6 +496,23 @@ class EntityCacheEntryManagerAsyncBase:
     async def _initialize(self) -> TJSONExt | None:
         raise NotImplementedError
 
+    async def _initialize_stream(self) -> AsyncChunkedBase[TJSONExt] | None:
+        result = await self._initialize()
+        if result is None:
+            return None
+        assert isinstance(result, list)
+        return AsyncChunked.from_chunked_iterable([result])
+
+    def make_chunked_writer(self) -> ChunkedCacheWriter | None:
+        """
+        Make a writer for saving the result chunk by chunk while it is being generated.
+        `None` means that streamed saving is not supported by this manager
+        (e.g. the locked one, which passes the whole result to the waiting requests).
+
+        The manager should still be finalized after the writer is committed (or aborted).
+        """
+        return None
+
     async def finalize(
         self,
         result: TJSONExt | None,
@@ -380,6 +563,21 @@ class EntityCacheEntryManagerAsync(EntityCacheEntryManagerAsyncBase):
             ttl_sec=ttl_sec or self.write_ttl_sec,
         )
 
+    async def _initialize_stream(self) -> AsyncChunkedBase[TJSONExt] | None:
+        if not self.allow_cache_read:
+            return None
+        return await self.cache_engine._get_stream_from_cache(
+            local_key_rep=self.local_key_rep,
+            new_ttl_sec=self.read_extend_ttl_sec,
+        )
+
+    def make_chunked_writer(self) -> ChunkedCacheWriter | None:
+        return ChunkedCacheWriter(
+            cache_engine=self.cache_engine,
+            local_key_rep=self.local_key_rep,
+            ttl_sec=self.write_ttl_sec,
+        )
+
 
 class RedisCacheLockWrapped(RedisCacheLock):
     """Local profiling additions to the RCL"""
@@ -401,6 +599,7 @@ class RedisCacheLockWrapped(RedisCacheLock):
 class EntityCacheEntryLockedManagerAsync(EntityCacheEntryManagerAsyncBase):
     _rcl: RedisCacheLock | None = None
     _history_holder: HistoryHolder | None = None
+    _local_cache_hit: bool = False
 
     @contextlib.asynccontextmanager
     async def _with_redis(self, *, master: bool = True, exclusive: bool = True) -> AsyncGenerator[Redis, None]:
@@ -456,6 +655,14 @@ class EntityCacheEntryLockedManagerAsync(EntityCacheEntryManagerAsyncBase):
         """
         local_key_rep = self.local_key_rep
         cache_engine = self.cache_engine
+        self.coalesced = False
+
+        local_result = cache_engine._get_from_local_cache(local_key_rep=local_key_rep)
+        if local_result is not None:
+            # No need for the lock at all.
+            self._local_cache_hit = True
+            return local_result
+
         rcl = self.rcl
 
         full_key, details = cache_engine._make_full_key_and_log_details(
@@ -467,6 +674,7 @@ class EntityCacheEntryLockedManagerAsync(EntityCacheEntryManagerAsyncBase):
 
         situation = rcl._situation
         LOGGER.debug("Cache-locked situation=%r, have result: %r", situation, result is not None)
+        self.coalesced = situation == rcl.req_situation.cache_hit_after_wait
 
         cache_entry = self.cache_engine._make_result_cache_entry(
             local_key_rep=self.local_key_rep,
@@ -478,6 +686,11 @@ class EntityCacheEntryLockedManagerAsync(EntityCacheEntryManagerAsyncBase):
 
         result_data = cache_entry.make_result_data()
         cache_engine._log_after_read(full_key=full_key, cache_entry=cache_entry)
+        cache_engine._save_read_to_local_cache(
+            local_key_rep=local_key_rep,
+            cache_entry=cache_entry,
+            new_ttl_sec=self.read_extend_ttl_sec,
+        )
         return result_data
 
     @generic_profiler_async("qcache-locked-finalize")  # type: ignore  # TODO: fix
@@ -487,6 +700,10 @@ class EntityCacheEntryLockedManagerAsync(EntityCacheEntryManagerAsyncBase):
         error: Any | None = None,
         ttl_sec: float | None = None,
     ) -> None:
+        if self._local_cache_hit:
+            self._local_cache_hit = False
+            return  # the lock was not touched
+
         rcl = self._rcl
         assert rcl is not None, "should have been created by now"
 
@@ -494,14 +711,14 @@ class EntityCacheEntryLockedManagerAsync(EntityCacheEntryManagerAsyncBase):
         if result is None:
             result = []  # TODO: allow an actually null result (metadata-only)
 
-        update_request = self.cache_engine._make_cache_update_request(
+        update_request = await self.cache_engine._make_cache_update_request_offloaded(
             local_key_rep=self.local_key_rep,
             result=result,
-            compress=False,
-            compress_alg=None,  # `compress=False` to prevent CPU-bound operation in event loop
             metadata={"error": error},
             ttl_sec=ttl_sec,
         )
+        # The data is saved only by the lock holder (and the situation is reset by the `finalize`).
+        is_lock_holder = rcl.situation == rcl.req_situation.successfully_locked
         try:
             await rcl.finalize(update_request.entry_data, ttl_sec=ttl_sec)
         except BaseException as err:
@@ -511,6 +728,13 @@ class EntityCacheEntryLockedManagerAsync(EntityCacheEntryManagerAsyncBase):
 
         self.cache_engine._log_after_finalize(update_request=update_request)
         self.save_history(error=error, save_error=None)
+        if is_lock_holder:
+            self.cache_engine._save_update_to_local_cache(
+                local_key_rep=self.local_key_rep,
+                result=result,
+                metadata={"error": error},
+                update_request=update_request,
+            )
 
     def save_history(self, error: Any = None, save_error: Any = None) -> None:
         history_holder = self._history_holder
@@ -553,6 +777,22 @@ class EntityCacheEngineBase:
         local_key_rep.validate()
         return f"{self._get_key_root()}/{local_key_rep.key_parts_hash}"
 
+    def _get_key_query_cache_stream(self, local_key_rep: LocalKeyRepresentation) -> str:
+        """
+        The manifest of a streamed entry. Not the regular entry key, so that the readers
+        that don't know the streamed entries don't take the manifest for an (empty) result.
+        Under the entry key, so that `invalidate_all` matches it (and the chunks) too.
+        """
+        return f"{self._get_key_query_cache_entry(local_key_rep)}/stream-v1"
+
+    def _get_key_query_cache_chunk(
+        self,
+        local_key_rep: LocalKeyRepresentation,
+        stream_id: str,
+        chunk_idx: int,
+    ) -> str:
+        return f"{self._get_key_query_cache_stream(local_key_rep)}/{stream_id}/{chunk_idx}"
+
     def _get_all_keys_pattern(self) -> str:
         """Returns pattern for all cached keys for the entity"""
         return self._get_key_root() + self.data_keys_suffix + "*"
@@ -565,6 +805,7 @@ class EntityCacheEngineBase:
         compress_alg: CompressAlg | None = None,
         ttl_sec: float | None = None,
         metadata: dict[str, Any] | None = None,
+        full_key: str | None = None,
     ) -> _CacheUpdateRequest:
         if ttl_sec is None:
             ttl_sec = self.DEFAULT_TTL_SEC
@@ -572,15 +813,18 @@ class EntityCacheEngineBase:
         if compress_alg is None:
             compress_alg = self.DEFAULT_COMPRESS_ALG
 
-        full_key = self._get_key_query_cache_entry(local_key_rep=local_key_rep)
+        if full_key is None:
+            full_key = self._get_key_query_cache_entry(local_key_rep=local_key_rep)
 
         entry_data, details = ResultCacheEntry(
             key_parts_str=local_key_rep.key_parts_str,
             result_data=result,
-            metadata=metadata,
+            # The expiration time lets the local cache readers do without asking the redis for the TTL
+            metadata=dict(metadata or {}, expires_at=time.time() + ttl_sec),
         ).to_redis_data_and_log_details(
             compress,
             compress_alg=compress_alg,
+            min_bytes_to_compress=self.MIN_BYTES_TO_COMPRESS,
         )
 
         # Enrich the debug/stats details for after-success log:
@@ -588,7 +832,7 @@ class EntityCacheEngineBase:
             details,
             cache_key=full_key,
             cache_ttl_sec=ttl_sec,
-            cache_compress_alg=compress_alg.name,
+            cache_compress_alg=compress_alg.name if details["cache_was_compressed"] else None,
         )
 
         return _CacheUpdateRequest(
@@ -691,16 +935,25 @@ class EntityCacheEngineAsync(EntityCacheEngineBase):
 
     WARNING: this is, mostly, an async+await copy of the `EntityCacheEngine`,
     requires a different class of the redis client,
-    does not compress on save.
+    serializes and compresses on save in the `dump_executor` rather than in the event loop.
+
+    Compresses with LZ4 by default (rather than GZIP), which is much cheaper to decompress on every hit;
+    the entries compressed with GZIP are still read, as the algorithm is stored in the entry metadata.
     """
 
     rc: Redis = attr.ib(kw_only=True)
     rc_slave: Redis | None = None
+    # `None` for the process-wide default one, see `get_default_dump_executor`.
+    dump_executor: Executor | None = attr.ib(kw_only=True, default=None)
+    # In-process tier in front of the redis; shared between the entities.
+    local_cache: LocalResultCache | None = attr.ib(kw_only=True, default=None)
 
     CACHE_GET_TIMEOUT_SEC: float = 5.0
     CACHE_SAVE_TIMEOUT_SEC: float = 30.0  # should not be a problem since it happens in background
     CACHE_SAVE_BACKGROUND: bool = True
     CACHE_CHECK_SLAVE: bool = False  # does not go well when the slave is in another country.
+    CACHE_COMPRESS_ON_SAVE: bool = True
+    DEFAULT_COMPRESS_ALG: CompressAlg = CompressAlg.LZ4
 
     entity_cache_entry_manager_cls: type[EntityCacheEntryManagerAsyncBase] = EntityCacheEntryManagerAsync
 
@@ -716,6 +969,98 @@ class EntityCacheEngineAsync(EntityCacheEngineBase):
             data_keys_suffix="/data:*",
         )
 
+    async def _make_cache_update_request_offloaded(
+        self,
+        local_key_rep: LocalKeyRepresentation,
+        result: TJSONExt,
+        ttl_sec: float | None = None,
+        metadata: dict[str, Any] | None = None,
+        full_key: str | None = None,
+    ) -> _CacheUpdateRequest:
+        """`_make_cache_update_request` in the `dump_executor`, to prevent CPU-bound operation in event loop"""
+        make_update_request = functools.partial(
+            self._make_cache_update_request,
+            local_key_rep=local_key_rep,
+            result=result,
+            compress=self.CACHE_COMPRESS_ON_SAVE,
+            ttl_sec=ttl_sec,
+            metadata=metadata,
+            full_key=full_key,
+        )
+        dump_executor = self.dump_executor or get_default_dump_executor()
+        with GenericProfiler("qcache-dump-offloaded") as prof_dump:
+            update_request = await asyncio.get_running_loop().run_in_executor(dump_executor, make_update_request)
+        update_request.details.update(cache_dump_timing=prof_dump.exec_time_sec)
+        return update_request
+
+    # Local cache helpers
+    def _get_from_local_cache(self, local_key_rep: LocalKeyRepresentation) -> list[TJSONExt] | None:
+        local_cache = self.local_cache
+        if local_cache is None:
+            return None
+        result = local_cache.get(self.entity_id, local_key_rep)
+        if result is not None:
+            LOGGER.info(
+                "Cache read from the local cache: %r",
+                local_key_rep.key_parts_hash,
+                extra={"cache_local_hit": True, "cache_row_count": len(result)},
+            )
+        return result
+
+    def _save_update_to_local_cache(
+        self,
+        local_key_rep: LocalKeyRepresentation,
+        result: TJSONExt,
+        metadata: dict[str, Any] | None,
+        update_request: _CacheUpdateRequest,
+    ) -> None:
+        local_cache = self.local_cache
+        if local_cache is None or (metadata or {}).get("error") is not None:
+            return
+        assert isinstance(result, list)
+        local_cache.put(
+            self.entity_id,
+            local_key_rep,
+            result_data=result,
+            size_bytes=update_request.details["cache_serialized_bytesize"],
+            ttl_sec=update_request.ttl_sec,
+        )
+
+    def _save_read_to_local_cache(
+        self,
+        local_key_rep: LocalKeyRepresentation,
+        cache_entry: ResultCacheEntry,
+        new_ttl_sec: float | None = None,
+    ) -> None:
+        """
+        Should be called after `cache_entry.make_result_data()`.
+        Takes the remaining TTL from the expiration time saved with the entry
+        (unless the TTL was just set to `new_ttl_sec`), so that the local entry does not outlive the redis one.
+        """
+        local_cache = self.local_cache
+        if local_cache is None:
+            return
+
+        ttl_sec = new_ttl_sec
+        if ttl_sec is None:
+            assert cache_entry.metadata is not None
+            expires_at = cache_entry.metadata.get("expires_at")
+            if expires_at is None:  # saved by an older version
+                return
+            ttl_sec = expires_at - time.time()
+
+        details = cache_entry.details
+        assert details is not None
+        result = cache_entry.make_result_data()
+        assert isinstance(result, list)
+        local_cache.put(
+            self.entity_id,
+            local_key_rep,
+            result_data=result,
+            size_bytes=details["cache_serialized_bytesize"],
+            ttl_sec=ttl_sec,
+        )
+
     # Redis helpers
     @generic_profiler_async("qcache-invalidate")  # type: ignore  # TODO: fix
     async def _delete_keys_by_pattern(self, pattern: str) -> None:
@@ -743,12 +1088,17 @@ class EntityCacheEngineAsync(EntityCacheEngineBase):
         metadata: dict[str, Any] | None = None,
         ttl_sec: float | None = None,
     ) -> None:
-        update_request = self._make_cache_update_request(
+        update_request = await self._make_cache_update_request_offloaded(
             local_key_rep=local_key_rep,
             result=result,
-            compress=False,
-            compress_alg=None,  # `compress=False` to prevent CPU-bound operation in event loop
             ttl_sec=ttl_sec,
+            metadata=metadata,
+        )
+        self._save_update_to_local_cache(
+            local_key_rep=local_key_rep,
+            result=result,
+            metadata=metadata,
+            update_request=update_request,
         )
 
         if self.CACHE_SAVE_BACKGROUND:
@@ -776,12 +1126,106 @@ class EntityCacheEngineAsync(EntityCacheEngineBase):
         else:
             self._log_after_save(update_request=update_request)
 
-    @generic_profiler_async("qcache-get")  # type: ignore  # TODO: fix
-    async def _get_from_cache(
+    @generic_profiler_async("qcache-write-redis-chunk")  # type: ignore  # TODO: fix
+    async def _redis_set_chunk(self, update_request: _CacheUpdateRequest) -> bool:
+        """Save a single chunk of a streamed entry; returns whether it was saved"""
+        try:
+            await asyncio.wait_for(
+                self.rc.set(
+                    update_request.full_key,
+                    update_request.entry_data,
+                    px=int(update_request.ttl_sec * 1000),
+                ),
+                timeout=self.CACHE_SAVE_TIMEOUT_SEC,
+            )
+        except Exception as err:
+            self._log_save_failed(update_request=update_request, err=err)
+            return False
+        LOGGER.debug("Cache chunk saved at %r", update_request.full_key)
+        return True
+
+    async def _delete_chunks(self, chunk_keys: Sequence[str]) -> None:
+        """Best effort: the chunks expire anyway"""
+        if not chunk_keys:
+            return
+        try:
+            await asyncio.wait_for(self.rc.delete(*chunk_keys), timeout=self.CACHE_GET_TIMEOUT_SEC)
+        except Exception:
+            LOGGER.info("Failed to delete %s chunks of an uncommitted streamed cache entry", len(chunk_keys))
+
+    async def _commit_chunked_cache(
+        self,
+        local_key_rep: LocalKeyRepresentation,
+        stream_id: str,
+        chunk_keys: Sequence[str],
+        row_count: int,
+        ttl_sec: float,
+    ) -> None:
+        update_request = self._make_cache_update_request(
+            local_key_rep=local_key_rep,
+            result=[],
+            ttl_sec=ttl_sec,
+            metadata={
+                "error": None,
+                "chunked": {"stream_id": stream_id, "chunk_count": len(chunk_keys), "row_count": row_count},
+            },
+            full_key=self._get_key_query_cache_stream(local_key_rep),
+        )
+        update_request.details.update(
+            cache_row_count=row_count,
+            cache_chunk_count=len(chunk_keys),
+        )
+        regular_key = self._get_key_query_cache_entry(local_key_rep)
+
+        if self.CACHE_SAVE_BACKGROUND:
+            task_tmp = asyncio.create_task(
+                self._redis_set_manifest(update_request, chunk_keys=chunk_keys, regular_key=regular_key)
+            )
+            await asyncio.shield(task_tmp)
+        else:
+            try:
+                await asyncio.wait_for(
+                    self._redis_set_manifest(update_request, chunk_keys=chunk_keys, regular_key=regular_key),
+                    timeout=self.CACHE_SAVE_TIMEOUT_SEC,
+                )
+            except TimeoutError as err:
+                self._log_save_failed(update_request=update_request, err=err)
+
+    @generic_profiler_async("qcache-write-redis-manifest")  # type: ignore  # TODO: fix
+    async def _redis_set_manifest(
+        self,
+        update_request: _CacheUpdateRequest,
+        chunk_keys: Sequence[str],
+        regular_key: str,
+    ) -> None:
+        ttl_msec = int(update_request.ttl_sec * 1000)
+        try:
+            # The earlier chunks were saved earlier, so align their expiration with the manifest's.
+            pipe = self.rc.pipeline()
+            for chunk_key in chunk_keys:
+                pipe.pexpire(chunk_key, ttl_msec)
+            chunks_extended = await pipe.execute()
+            if not all(chunks_extended):
+                self._log_save_failed(update_request=update_request, err=CacheEntryChunkMissingError("Chunks expired"))
+                await self._delete_chunks(chunk_keys)
+                return
+
+            pipe = self.rc.pipeline()
+            pipe.set(update_request.full_key, update_request.entry_data, px=ttl_msec)
+            # Read before the streamed one: an error marker there would hide the result.
+            pipe.delete(regular_key)
+            await pipe.execute()
+        except Exception as err:
+            self._log_save_failed(update_request=update_request, err=err)
+        else:
+            self._log_after_save(update_request=update_request)
+
+    async def _read_cache_entry(
         self,
         local_key_rep: LocalKeyRepresentation,
         new_ttl_sec: float | None = None,
-    ) -> TJSONExt | None:
+    ) -> tuple[str, ResultCacheEntry | None]:
+        """The regular entry or, if there is none, the manifest of the streamed one"""
         full_key, details = self._make_full_key_and_log_details(local_key_rep=local_key_rep, new_ttl_sec=new_ttl_sec)
 
         read_timeout = self.CACHE_GET_TIMEOUT_SEC
@@ -790,24 +1234,162 @@ class EntityCacheEngineAsync(EntityCacheEngineBase):
                 self._redis_get(full_key, new_ttl_sec=new_ttl_sec),
                 timeout=read_timeout,
             )
+            if not cache_entry_redis_data:
+                stream_key = self._get_key_query_cache_stream(local_key_rep)
+                stream_redis_data = await asyncio.wait_for(
+                    self._redis_get(stream_key, new_ttl_sec=new_ttl_sec),
+                    timeout=read_timeout,
+                )
+                if stream_redis_data:
+                    full_key, cache_entry_redis_data = stream_key, stream_redis_data
+                    details = dict(details, cache_key=stream_key)
         except TimeoutError:
             self._log_cache_timeout(timeout=read_timeout, details=details)
-            return None
+            return full_key, None
 
         cache_entry = self._make_result_cache_entry(
             local_key_rep=local_key_rep,
             cache_entry_redis_data=cache_entry_redis_data,
             details=details,
         )
+        return full_key, cache_entry
+
+    @generic_profiler_async("qcache-get")  # type: ignore  # TODO: fix
+    async def _get_from_cache(
+        self,
+        local_key_rep: LocalKeyRepresentation,
+        new_ttl_sec: float | None = None,
+    ) -> TJSONExt | None:
+        local_result = self._get_from_local_cache(local_key_rep=local_key_rep)
+        if local_result is not None:
+            return local_result
 
+        full_key, cache_entry = await self._read_cache_entry(local_key_rep=local_key_rep, new_ttl_sec=new_ttl_sec)
         if cache_entry is None:  # cache miss, supposed to be logged by now.
             return None
 
+        if cache_entry.is_chunked:
+            result_stream = await self._make_chunked_result_stream(
+                local_key_rep=local_key_rep,
+                full_key=full_key,
+                cache_entry=cache_entry,
+                new_ttl_sec=new_ttl_sec,
+            )
+            if result_stream is None:
+                return None
+            return await result_stream.all()
+
         # deserializes data and also mutates `cache_entry.details`.
         result = cache_entry.make_result_data()
         self._log_after_read(full_key=full_key, cache_entry=cache_entry)
+        self._save_read_to_local_cache(
+            local_key_rep=local_key_rep,
+            cache_entry=cache_entry,
+            new_ttl_sec=new_ttl_sec,
+        )
         return result
 
+    @generic_profiler_async("qcache-get-stream")  # type: ignore  # TODO: fix
+    async def _get_stream_from_cache(
+        self,
+        local_key_rep: LocalKeyRepresentation,
+        new_ttl_sec: float | None = None,
+    ) -> AsyncChunkedBase[TJSONExt] | None:
+        local_result = self._get_from_local_cache(local_key_rep=local_key_rep)
+        if local_result is not None:
+            return AsyncChunked.from_chunked_iterable([local_result])
+
+        full_key, cache_entry = await self._read_cache_entry(local_key_rep=local_key_rep, new_ttl_sec=new_ttl_sec)
+        if cache_entry is None:
+            return None
+
+        if cache_entry.is_chunked:
+            return await self._make_chunked_result_stream(
+                local_key_rep=local_key_rep,
+                full_key=full_key,
+                cache_entry=cache_entry,
+                new_ttl_sec=new_ttl_sec,
+            )
+
+        result = cache_entry.make_result_data()
+        assert isinstance(result, list)
+        self._log_after_read(full_key=full_key, cache_entry=cache_entry)
+        self._save_read_to_local_cache(
+            local_key_rep=local_key_rep,
+            cache_entry=cache_entry,
+            new_ttl_sec=new_ttl_sec,
+        )
+        return AsyncChunked.from_chunked_iterable([result])
+
+    async def _make_chunked_result_stream(
+        self,
+        local_key_rep: LocalKeyRepresentation,
+        full_key: str,
+        cache_entry: ResultCacheEntry,
+        new_ttl_sec: float | None = None,
+    ) -> AsyncChunkedBase[TJSONExt] | None:
+        """
+        Check that all the chunks of a committed streamed entry are still there
+        (and extend their TTL along with the manifest's, if requested),
+        and make a stream that reads them one by one.
+        """
+        details = cache_entry.details
+        assert details is not None
+        chunk_keys = [
+            self._get_key_query_cache_chunk(
+                local_key_rep=local_key_rep,
+                stream_id=cache_entry.chunk_stream_id,
+                chunk_idx=chunk_idx,
+            )
+            for chunk_idx in range(cache_entry.chunk_count)
+        ]
+        assert cache_entry.metadata is not None
+        details.update(
+            cache_chunk_count=len(chunk_keys),
+            cache_row_count=cache_entry.metadata["chunked"].get("row_count"),
+        )
+
+        if chunk_keys:
+            pipe = self.rc.pipeline()
+            pipe.exists(*chunk_keys)
+            if new_ttl_sec is not None:
+                for chunk_key in chunk_keys:
+                    pipe.pexpire(chunk_key, int(new_ttl_sec * 1000))
+            try:
+                existing_count, *_ = await asyncio.wait_for(pipe.execute(), timeout=self.CACHE_GET_TIMEOUT_SEC)
+            except TimeoutError:
+                self._log_cache_timeout(timeout=self.CACHE_GET_TIMEOUT_SEC, details=details)
+                return None
+            if existing_count != len(chunk_keys):
+                self._log_cache_miss(
+                    reason="chunks_missing",
+                    details=details,
+                    message=f"{len(chunk_keys) - existing_count} of {len(chunk_keys)} chunks are missing",
+                )
+                return None
+
+        self._log_after_read(full_key=full_key, cache_entry=cache_entry)
+
+        async def chunk_gen() -> AsyncGenerator[list[TJSONExt], None]:
+            for chunk_key in chunk_keys:
+                chunk_redis_data = await asyncio.wait_for(
+                    self._redis_get(chunk_key),
+                    timeout=self.CACHE_GET_TIMEOUT_SEC,
+                )
+                chunk_entry = self._make_result_cache_entry(
+                    local_key_rep=local_key_rep,
+                    cache_entry_redis_data=chunk_redis_data,
+                    details=dict(details, cache_key=chunk_key),
+                )
+                if chunk_entry is None:
+                    # Too late for a cache miss: some chunks were already returned.
+                    raise CacheEntryChunkMissingError(f"Cache entry chunk disappeared: {chunk_key!r}")
+                chunk_data = chunk_entry.make_result_data()
+                assert isinstance(chunk_data, list)
+                yield chunk_data
+
+        return AsyncChunked(chunked_data=chunk_gen())
+
     @generic_profiler_async("qcache-read-redis-exec")  # type: ignore  # TODO: fix
     async def _redis_get(
         self,
@@ -831,6 +1413,12 @@ class EntityCacheEngineAsync(EntityCacheEngineBase):
         return await rcli.get(full_key)
 
     async def invalidate_all(self) -> None:
+        """
+        Note: the local cache entries are dropped in this process only,
+        the other processes' ones expire by themselves (see `LocalResultCache`).
+        """
+        if self.local_cache is not None:
+            self.local_cache.invalidate_entity(self.entity_id)
         await self._delete_keys_by_pattern(self._get_all_keys_pattern())
 
     def get_cache_entry_manager(
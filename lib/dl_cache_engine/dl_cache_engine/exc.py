@@ -15,3 +15,7 @@ class CacheKeyValidationError(CacheError):
 
 class CachePreparationFailedError(CacheError):
     pass
+
+
+class CacheEntryChunkMissingError(CacheError):
+    pass
@@ -0,0 +1,232 @@
+"""
+In-process (L1) tier of the query cache, in front of the Redis (L2) one.
+
+Saves the Redis round trip, the decompression and the deserialization
+for the results that are requested over and over again by the same process.
+
+Consistency with L2:
+  * an entry never outlives the L2 entry it was saved or read with
+    (the L2 TTL is passed in by the cache engine);
+  * the cache invalidation payload is a part of the cache key, so a new payload
+    means new keys; the entries saved with an outdated payload are dropped
+    as soon as the new payload is known (see `apply_invalidation_payload`);
+  * `EntityCacheEngineAsync.invalidate_all` drops the entity's entries too, but only
+    in the process it is called in: the other processes keep serving theirs until they expire,
+    so `max_ttl_sec` bounds the staleness after an invalidation.
+"""
+
+from __future__ import annotations
+
+import collections
+from collections.abc import (
+    Callable,
+    Sequence,
+)
+import logging
+import time
+import types
+
+import attr
+
+from dl_cache_engine.primitives import (
+    DataKeyPart,
+    LocalKeyRepresentation,
+)
+from dl_constants.types import TJSONExt
+
+LOGGER = logging.getLogger(__name__)
+
+# As added to the data keys by the query executor (see `dl_query_processing.execution.executor`).
+CACHE_INVALIDATION_PAYLOAD_KEY_PART_TYPE = "cache_invalidation_payload"
+
+
+def get_invalidation_payload_from_key(local_key_rep: LocalKeyRepresentation) -> str | None:
+    parts: list[DataKeyPart] = list(local_key_rep.key_parts)
+    while parts:
+        part = parts.pop()
+        if part.part_type == CACHE_INVALIDATION_PAYLOAD_KEY_PART_TYPE:
+            assert isinstance(part.part_content, str)
+            return part.part_content
+        if isinstance(part.part_content, DataKeyPart):
+            parts.append(part.part_content)
+    return None
+
+
+@attr.s(auto_attribs=True, slots=True)
+class _LocalCacheEntry:
+    entity_id: str
+    key_parts_str: str
+    invalidation_payload: str | None
+    # Frozen, so that the callers can't change the shared data
+    result_data: tuple[TJSONExt, ...]
+    size_bytes: int
+    expires_at: float
+
+
+class _FrozenList(tuple):
+    """Stands for a list in the frozen result data (to tell it apart from a tuple)"""
+
+
+def _freeze_value(value: TJSONExt) -> TJSONExt:
+    if isinstance(value, list):
+        return _FrozenList(_freeze_value(item) for item in value)
+    if isinstance(value, tuple):
+        return tuple(_freeze_value(item) for item in value)
+    if isinstance(value, dict):
+        return types.MappingProxyType({key: _freeze_value(item) for key, item in value.items()})  # type: ignore
+    return value
+
+
+def _thaw_value(value: TJSONExt) -> TJSONExt:
+    if isinstance(value, _FrozenList):
+        return [_thaw_value(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_thaw_value(item) for item in value)
+    if isinstance(value, types.MappingProxyType):
+        return {key: _thaw_value(item) for key, item in value.items()}
+    return value
+
+
+def _freeze_result_data(result_data: Sequence[TJSONExt]) -> tuple[TJSONExt, ...]:
+    return tuple(_freeze_value(row) for row in result_data)
+
+
+def _thaw_result_data(result_data: tuple[TJSONExt, ...]) -> list[TJSONExt]:
+    return [_thaw_value(row) for row in result_data]
+
+
+@attr.s(auto_attribs=True, slots=True)
+class LocalResultCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # size-bound evictions only
+    expirations: int = 0
+    invalidations: int = 0
+
+
+@attr.s
+class LocalResultCache:
+    """
+    LRU of the deserialized query results, bounded by their total size
+    (as serialized, which is a reasonable estimate for comparing entries with each other).
+
+    Meant to be process-wide and used from the event loop only.
+    The results are kept frozen (along with the nested lists and dicts), and each `get` returns
+    a new copy of them, which is still much cheaper than reading them from L2.
+    """
+
+    _max_size_bytes: int = attr.ib(kw_only=True)
+    _max_entry_size_bytes: int = attr.ib(kw_only=True)
+    _max_ttl_sec: float | None = attr.ib(kw_only=True, default=None)
+    _clock: Callable[[], float] = attr.ib(kw_only=True, default=time.monotonic)
+
+    _entries: collections.OrderedDict[tuple[str, str], _LocalCacheEntry] = attr.ib(
+        init=False, factory=collections.OrderedDict
+    )
+    _size_bytes: int = attr.ib(init=False, default=0)
+    _stats: LocalResultCacheStats = attr.ib(init=False, factory=LocalResultCacheStats)
+
+    @property
+    def stats(self) -> LocalResultCacheStats:
+        return self._stats
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, entity_id: str, local_key_rep: LocalKeyRepresentation) -> list[TJSONExt] | None:
+        key = (entity_id, local_key_rep.key_parts_hash)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        if entry.expires_at <= self._clock():
+            self._remove(key)
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+
+        if entry.key_parts_str != local_key_rep.key_parts_str:
+            LOGGER.info("Local cache key hash collision: %r", local_key_rep.key_parts_hash)
+            self._stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return _thaw_result_data(entry.result_data)
+
+    def put(
+        self,
+        entity_id: str,
+        local_key_rep: LocalKeyRepresentation,
+        result_data: list[TJSONExt],
+        size_bytes: int,
+        ttl_sec: float,
+    ) -> None:
+        """`ttl_sec` is the remaining TTL of the corresponding L2 entry"""
+        key = (entity_id, local_key_rep.key_parts_hash)
+        if key in self._entries:
+            self._remove(key)
+
+        if self._max_ttl_sec is not None:
+            ttl_sec = min(ttl_sec, self._max_ttl_sec)
+        if ttl_sec <= 0 or size_bytes > self._max_entry_size_bytes:
+            return
+
+        self._entries[key] = _LocalCacheEntry(
+            entity_id=entity_id,
+            key_parts_str=local_key_rep.key_parts_str,
+            invalidation_payload=get_invalidation_payload_from_key(local_key_rep),
+            result_data=_freeze_result_data(result_data),
+            size_bytes=size_bytes,
+            expires_at=self._clock() + ttl_sec,
+        )
+        self._size_bytes += size_bytes
+
+        while self._size_bytes > self._max_size_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._stats.evictions += 1
+
+    def invalidate_entity(self, entity_id: str) -> None:
+        self._remove_where(lambda entry: entry.entity_id == entity_id)
+
+    def apply_invalidation_payload(self, entity_id: str, payload: str) -> None:
+        """
+        Drop the entity's entries that were saved with an invalidation payload other than the actual one.
+        Not strictly required for the correctness, but frees the memory early.
+        """
+        self._remove_where(
+            lambda entry: (
+                entry.entity_id == entity_id
+                and entry.invalidation_payload is not None
+                and entry.invalidation_payload != payload
+            )
+        )
+
+    def get_metrics(self) -> list[tuple[str, int]]:
+        """In the `(label, value)` form of the `/metrics` views"""
+        stats = self._stats
+        return [
+            ("qcache_local_hits_total", stats.hits),
+            ("qcache_local_misses_total", stats.misses),
+            ("qcache_local_evictions_total", stats.evictions),
+            ("qcache_local_expirations_total", stats.expirations),
+            ("qcache_local_invalidations_total", stats.invalidations),
+            ("qcache_local_entries", len(self._entries)),
+            ("qcache_local_size_bytes", self._size_bytes),
+        ]
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        entry = self._entries.pop(key)
+        self._size_bytes -= entry.size_bytes
+
+    def _remove_where(self, predicate: Callable[[_LocalCacheEntry], bool]) -> None:
+        keys_to_remove = [key for key, entry in self._entries.items() if predicate(entry)]
+        for key in keys_to_remove:
+            self._remove(key)
+        self._stats.invalidations += len(keys_to_remove)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import (
+    AsyncGenerator,
     Awaitable,
     Callable,
 )
@@ -18,6 +19,7 @@ from dl_constants.types import TJSONExt
 from dl_utils.streaming import (
     AsyncChunked,
     AsyncChunkedBase,
+    TChunk,
 )
 
 if TYPE_CHECKING:
@@ -27,9 +29,11 @@ if TYPE_CHECKING:
     )
     from dl_cache_engine.cache_invalidation.primitives import CacheInvalidationKey
     from dl_cache_engine.engine import (
+        ChunkedCacheWriter,
         EntityCacheEngineAsync,
         EntityCacheEntryManagerAsyncBase,
     )
+    from dl_cache_engine.local_cache import LocalResultCache
     from dl_cache_engine.primitives import BIQueryCacheOptions
 
 
@@ -51,10 +55,40 @@ class CacheSituation(enum.IntEnum):
     #    * cache lock timeout
 
 
+class LockedCacheStats:
+    """
+    Process-wide counters of the locked cache usage.
+
+    The requests coalesced are the ones that got the result generated by a concurrent request,
+    i.e. the duplicate source executions that were avoided.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.generated = 0
+        self.coalesced = 0
+
+    def get_metrics(self) -> list[tuple[str, int | float]]:
+        return [
+            ("qcache_locked_requests_total", self.requests),
+            ("qcache_locked_generated_total", self.generated),
+            ("qcache_locked_coalesced_total", self.coalesced),
+        ]
+
+
+_LOCKED_CACHE_STATS = LockedCacheStats()
+
+
+def get_locked_cache_stats() -> LockedCacheStats:
+    return _LOCKED_CACHE_STATS
+
+
 @attr.s
 class CacheProcessingHelper:
     _cache_engine: EntityCacheEngineAsync | None = attr.ib(kw_only=True)
     _cache_invalidation_engine: CacheInvalidationEngine | None = attr.ib(kw_only=True, default=None)
+    # To drop the entries with an outdated invalidation payload
+    _local_cache: LocalResultCache | None = attr.ib(kw_only=True, default=None)
 
     error_ttl_sec: ClassVar[float] = 1.5
 
@@ -101,15 +135,75 @@ class CacheProcessingHelper:
             LOGGER.debug("Invalidation cache engine is not configured, skipping (key=%s)", key.to_redis_key())
             return None
 
-        return await engine.get_stale_and_generate(
+        result = await engine.get_stale_and_generate(
             key=key,
             throttling_interval_sec=throttling_interval_sec,
             generate_func=generate_func,
         )
+        if result is not None and self._local_cache is not None:
+            self._local_cache.apply_invalidation_payload(entity_id=key.dataset_id, payload=result)
+        return result
 
     def _dump_error_for_cache(self, err: BaseException) -> Any:
         return str(err)
 
+    async def _save_error_to_cache(self, cem: EntityCacheEntryManagerAsyncBase, err: BaseException) -> None:
+        err_serializable = self._dump_error_for_cache(err)
+        try:
+            await cem.finalize(
+                result=None,
+                # short-lived error-result cache,
+                # to make it possible to make an informed decision,
+                # and to unlock the cache lock (if necessary)
+                error=err_serializable,
+                ttl_sec=self.error_ttl_sec,
+            )
+        except Exception:
+            LOGGER.exception("Error during finalizing cache (after a generate error)")
+
+    def _make_write_through_stream(
+        self,
+        *,
+        cem: EntityCacheEntryManagerAsyncBase,
+        chunked_writer: ChunkedCacheWriter,
+        result_iter: TJSONExtChunkStream,
+    ) -> TJSONExtChunkStream:
+        """
+        Pass the generated chunks through to the caller while saving them to the cache.
+
+        The cache entry is committed only if the stream is consumed completely.
+        The chunks of a failed or abandoned (closed or cancelled) stream are deleted,
+        and the cache entry manager is finalized in any case.
+        """
+
+        async def write_through_chunks() -> AsyncGenerator[TChunk[TJSONExt], None]:
+            try:
+                async for chunk in result_iter.chunks:
+                    await chunked_writer.add_chunk(chunk)
+                    yield chunk
+            except Exception as err:
+                LOGGER.info("Error during streaming generate_func, saving an error marker to cache")
+                await chunked_writer.abort()
+                await self._save_error_to_cache(cem=cem, err=err)
+                raise
+            except BaseException:
+                LOGGER.info("Streamed result was not consumed completely, not saving it to cache")
+                try:
+                    await chunked_writer.abort()
+                    await cem.finalize(result=None)
+                except Exception:
+                    LOGGER.exception("Error during finalizing cache (after an abandoned stream)")
+                raise
+
+            try:
+                await chunked_writer.commit()
+                await cem.finalize(result=None)
+                LOGGER.info("Saved to cache (streamed)")
+            except Exception:
+                LOGGER.exception("Error during finalizing cache (after a streamed generate success)")
+
+        return AsyncChunked(chunked_data=write_through_chunks())
+
     async def run_with_cache(
         self,
         *,
@@ -117,7 +211,14 @@ class CacheProcessingHelper:
         cache_options: BIQueryCacheOptions,
         allow_cache_read: bool = True,
         use_locked_cache: bool = False,
+        use_streaming_cache: bool = False,
     ) -> tuple[CacheSituation, TJSONExtChunkStream | None]:
+        """
+        With `use_streaming_cache`, a generated result is not collected in memory:
+        its chunks are returned as they come while also being saved to the cache
+        (if the cache entry manager supports it, i.e. not for the locked cache).
+        Note that in this mode the result gets saved only after it is consumed completely.
+        """
         cem = await self.get_cache_entry_manager(
             cache_options=cache_options,
             allow_cache_read=allow_cache_read,
@@ -127,6 +228,10 @@ class CacheProcessingHelper:
             result = await generate_func()
             return CacheSituation.cache_disabled, result
 
+        locked_cache_stats = get_locked_cache_stats() if use_locked_cache else None
+        if locked_cache_stats is not None:
+            locked_cache_stats.requests += 1
+
         # As a reference, the `cem` usage should be equivalent to this:
         #     result = None
         #     try:
@@ -138,9 +243,9 @@ class CacheProcessingHelper:
         # The rest is just for verbosity.
 
         result_iter: TJSONExtChunkStream | None
-        sync_result_iter = None
+        cached_result_iter = None
         try:
-            sync_result_iter = await cem.initialize()
+            cached_result_iter = await cem.initialize_stream()
         except BaseException as err:
             LOGGER.exception("Error during checking cache")
             try:
@@ -152,41 +257,41 @@ class CacheProcessingHelper:
             result = await generate_func()
             return CacheSituation.cache_error, result
 
-        if sync_result_iter is not None:
-            result_data_inmem = list(sync_result_iter)  # type: ignore  # TODO: fix
-            result_iter = AsyncChunked.from_chunked_iterable([result_data_inmem])
+        if cached_result_iter is not None:
+            if locked_cache_stats is not None and cem.coalesced:
+                locked_cache_stats.coalesced += 1
             try:
                 await cem.finalize(result=None)
             except Exception:  # Not skipping `CancelledError` here
                 LOGGER.exception("Error during finalizing cache (after a cache hit)")
-            return CacheSituation.full_hit, result_iter
+            return CacheSituation.full_hit, cached_result_iter
 
         LOGGER.info("Got selector result from cache engine: not found")
+        if locked_cache_stats is not None:
+            locked_cache_stats.generated += 1
 
+        chunked_writer = cem.make_chunked_writer() if use_streaming_cache else None
         result_as_list = None
         try:
             result_iter = await generate_func()
-            if result_iter is not None:
-                # Cache is not (currently) streamed, so have to collect the data.
+            if result_iter is not None and chunked_writer is None:
+                # Cache is not streamed, so have to collect the data.
                 # And just in case, do this within the db-query try-block.
                 result_as_list = await result_iter.all()
                 result_iter = AsyncChunked.from_chunked_iterable([result_as_list])
         except BaseException as err:
             LOGGER.info("Error during generate_func, saving an error marker to cache")
-            err_serializable = self._dump_error_for_cache(err)
-            try:
-                await cem.finalize(
-                    result=None,
-                    # short-lived error-result cache,
-                    # to make it possible to make an informed decision,
-                    # and to unlock the cache lock (if necessary)
-                    error=err_serializable,
-                    ttl_sec=self.error_ttl_sec,
-                )
-            except Exception:
-                LOGGER.exception("Error during finalizing cache (after a generate error)")
+            await self._save_error_to_cache(cem=cem, err=err)
             raise
 
+        if result_iter is not None and chunked_writer is not None:
+            result_iter = self._make_write_through_stream(
+                cem=cem,
+                chunked_writer=chunked_writer,
+                result_iter=result_iter,
+            )
+            return CacheSituation.generated, result_iter
+
         try:
             await cem.finalize(
                 result=result_as_list,
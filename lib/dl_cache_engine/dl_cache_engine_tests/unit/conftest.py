@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+
+class FakeRedisPipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._calls: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def _add_call(*args: Any, **kwargs: Any) -> FakeRedisPipeline:
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return _add_call
+
+    async def execute(self) -> list[Any]:
+        return [await getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+
+
+class FakeRedis:
+    """A minimal in-memory stand-in for `redis.asyncio.Redis` (no expiration)"""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: bytes, px: int | None = None) -> bool:
+        self.data[key] = value
+        if px is not None:
+            self.ttls[key] = px
+        return True
+
+    async def pexpire(self, key: str, ttl_msec: int) -> bool:
+        if key not in self.data:
+            return False
+        self.ttls[key] = ttl_msec
+        return True
+
+    async def exists(self, *keys: str) -> int:
+        return sum(1 for key in keys if key in self.data)
+
+    async def delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    def pipeline(self) -> FakeRedisPipeline:
+        return FakeRedisPipeline(self)
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    return FakeRedis()
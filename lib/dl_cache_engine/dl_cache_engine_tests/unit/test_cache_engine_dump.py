@@ -0,0 +1,96 @@
+from collections.abc import Callable
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+import threading
+from typing import Any
+
+import pytest
+
+from dl_cache_engine.engine import (
+    CompressAlg,
+    EntityCacheEngineAsync,
+    ResultCacheEntry,
+)
+from dl_cache_engine.primitives import (
+    DataKeyPart,
+    LocalKeyRepresentation,
+)
+from dl_cache_engine_tests.unit.conftest import FakeRedis
+
+
+class _RecordingExecutor(ThreadPoolExecutor):
+    def __init__(self) -> None:
+        super().__init__(max_workers=1)
+        self.thread_idents: list[int] = []
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        def _wrapped() -> Any:
+            self.thread_idents.append(threading.get_ident())
+            return fn(*args, **kwargs)
+
+        return super().submit(_wrapped)
+
+
+@pytest.fixture
+def local_key_rep() -> LocalKeyRepresentation:
+    return LocalKeyRepresentation(key_parts=(DataKeyPart("test", "value"),))
+
+
+def test_small_entry_is_not_compressed() -> None:
+    entry = ResultCacheEntry(key_parts_str="k", result_data=[[1]])
+    redis_data, details = entry.to_redis_data_and_log_details(
+        compress=True,
+        compress_alg=CompressAlg.LZ4,
+        min_bytes_to_compress=100,
+    )
+    assert details["cache_was_compressed"] is False
+    assert details["cache_compressor_timing"] is None
+    loaded = ResultCacheEntry.from_redis_data(redis_data)
+    assert loaded.make_result_data() == [[1]]
+
+
+@pytest.mark.parametrize("compress_alg", list(CompressAlg))
+def test_large_entry_is_compressed(compress_alg: CompressAlg) -> None:
+    result_data = [[idx, "some repeated value"] for idx in range(1000)]
+    entry = ResultCacheEntry(key_parts_str="k", result_data=result_data)
+    redis_data, details = entry.to_redis_data_and_log_details(
+        compress=True,
+        compress_alg=compress_alg,
+        min_bytes_to_compress=100,
+    )
+    assert details["cache_was_compressed"] is True
+    assert details["cache_compressor_timing"] is not None
+    assert details["cache_dumped_bytesize"] < details["cache_serialized_bytesize"]
+    loaded = ResultCacheEntry.from_redis_data(redis_data)
+    assert loaded.make_result_data() == result_data
+
+
+@pytest.mark.asyncio
+async def test_update_cache_dumps_in_executor(
+    fake_redis: FakeRedis,
+    local_key_rep: LocalKeyRepresentation,
+) -> None:
+    executor = _RecordingExecutor()
+    cache_engine = EntityCacheEngineAsync(
+        entity_id="entity_1",
+        rc=fake_redis,
+        dump_executor=executor,
+        CACHE_SAVE_BACKGROUND=False,
+    )
+    result_data = [[idx, "some repeated value"] for idx in range(1000)]
+    try:
+        await cache_engine._update_cache(local_key_rep=local_key_rep, result=result_data, ttl_sec=10)
+    finally:
+        executor.shutdown()
+
+    assert executor.thread_idents
+    assert threading.get_ident() not in executor.thread_idents
+
+    full_key = cache_engine._get_key_query_cache_entry(local_key_rep)
+    loaded = ResultCacheEntry.from_redis_data(fake_redis.data[full_key])
+    assert loaded.make_result_data() == result_data
+    assert loaded.details is not None
+    assert loaded.details["cache_was_compressed"] is True
+    assert await cache_engine._get_from_cache(local_key_rep=local_key_rep) == result_data
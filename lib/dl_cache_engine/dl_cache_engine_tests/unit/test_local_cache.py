@@ -0,0 +1,196 @@
+import pytest
+
+from dl_cache_engine.engine import EntityCacheEngineAsync
+from dl_cache_engine.local_cache import (
+    CACHE_INVALIDATION_PAYLOAD_KEY_PART_TYPE,
+    LocalResultCache,
+)
+from dl_cache_engine.primitives import (
+    BIQueryCacheOptions,
+    DataKeyPart,
+    LocalKeyRepresentation,
+)
+from dl_cache_engine.processing_helper import (
+    CacheProcessingHelper,
+    CacheSituation,
+)
+from dl_cache_engine_tests.unit.conftest import FakeRedis
+from dl_utils.streaming import AsyncChunked
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_key(value: str, payload: str | None = None) -> LocalKeyRepresentation:
+    key = LocalKeyRepresentation(key_parts=(DataKeyPart("test", value),))
+    if payload is not None:
+        key = key.extend(part_type=CACHE_INVALIDATION_PAYLOAD_KEY_PART_TYPE, part_content=payload)
+    return key
+
+
+@pytest.fixture
+def clock() -> _Clock:
+    return _Clock()
+
+
+@pytest.fixture
+def local_cache(clock: _Clock) -> LocalResultCache:
+    return LocalResultCache(max_size_bytes=100, max_entry_size_bytes=50, clock=clock)
+
+
+def test_get_put_and_expiration(local_cache: LocalResultCache, clock: _Clock) -> None:
+    key = _make_key("a")
+    assert local_cache.get("entity_1", key) is None
+
+    local_cache.put("entity_1", key, result_data=[[1]], size_bytes=10, ttl_sec=5)
+    assert local_cache.get("entity_1", key) == [[1]]
+    assert local_cache.get("entity_2", key) is None
+
+    clock.now += 5
+    assert local_cache.get("entity_1", key) is None
+    assert len(local_cache) == 0
+    assert local_cache.size_bytes == 0
+    assert local_cache.stats.hits == 1
+    assert local_cache.stats.misses == 3
+    assert local_cache.stats.expirations == 1
+
+
+def test_result_data_is_not_shared(local_cache: LocalResultCache) -> None:
+    key = _make_key("a")
+    result_data = [[1, "a"], [2, "b"]]
+    local_cache.put("entity_1", key, result_data=result_data, size_bytes=10, ttl_sec=5)
+    result_data[0].append("changed")
+
+    hit = local_cache.get("entity_1", key)
+    assert hit == [[1, "a"], [2, "b"]]
+    assert hit is not None
+    hit.pop()
+    hit[0].append("changed")
+    assert local_cache.get("entity_1", key) == [[1, "a"], [2, "b"]]
+
+
+def test_nested_result_data_is_not_shared(local_cache: LocalResultCache) -> None:
+    key = _make_key("a")
+    result_data = [[1, [2, 3], {"a": [4]}, (5, [6])]]
+    local_cache.put("entity_1", key, result_data=result_data, size_bytes=10, ttl_sec=5)
+    result_data[0][1].append("changed")  # type: ignore
+    result_data[0][2]["a"].append("changed")  # type: ignore
+
+    hit = local_cache.get("entity_1", key)
+    assert hit == [[1, [2, 3], {"a": [4]}, (5, [6])]]
+    assert hit is not None
+    hit[0][1].append("changed")  # type: ignore
+    hit[0][2]["b"] = "changed"  # type: ignore
+    hit[0][3][1].append("changed")  # type: ignore
+    assert local_cache.get("entity_1", key) == [[1, [2, 3], {"a": [4]}, (5, [6])]]
+
+
+def test_size_bound_lru_eviction(local_cache: LocalResultCache) -> None:
+    local_cache.put("entity_1", _make_key("a"), result_data=[[1]], size_bytes=40, ttl_sec=60)
+    local_cache.put("entity_1", _make_key("b"), result_data=[[2]], size_bytes=40, ttl_sec=60)
+    assert local_cache.get("entity_1", _make_key("a")) is not None  # now "b" is the least recently used
+
+    local_cache.put("entity_1", _make_key("c"), result_data=[[3]], size_bytes=40, ttl_sec=60)
+    assert local_cache.get("entity_1", _make_key("b")) is None
+    assert local_cache.get("entity_1", _make_key("a")) is not None
+    assert local_cache.get("entity_1", _make_key("c")) is not None
+    assert local_cache.size_bytes == 80
+    assert local_cache.stats.evictions == 1
+
+    # Too large for a single entry
+    local_cache.put("entity_1", _make_key("d"), result_data=[[4]], size_bytes=51, ttl_sec=60)
+    assert local_cache.get("entity_1", _make_key("d")) is None
+
+
+def test_max_ttl(clock: _Clock) -> None:
+    local_cache = LocalResultCache(max_size_bytes=100, max_entry_size_bytes=50, max_ttl_sec=1, clock=clock)
+    key = _make_key("a")
+    local_cache.put("entity_1", key, result_data=[[1]], size_bytes=10, ttl_sec=60)
+    clock.now += 1
+    assert local_cache.get("entity_1", key) is None
+
+
+def test_invalidation(local_cache: LocalResultCache) -> None:
+    old_key = _make_key("a", payload="v1")
+    new_key = _make_key("a", payload="v2")
+    other_key = _make_key("b", payload="v1")
+    local_cache.put("entity_1", old_key, result_data=[[1]], size_bytes=10, ttl_sec=60)
+    local_cache.put("entity_1", new_key, result_data=[[2]], size_bytes=10, ttl_sec=60)
+    local_cache.put("entity_2", other_key, result_data=[[3]], size_bytes=10, ttl_sec=60)
+
+    local_cache.apply_invalidation_payload(entity_id="entity_1", payload="v2")
+    assert local_cache.get("entity_1", old_key) is None
+    assert local_cache.get("entity_1", new_key) == [[2]]
+    assert local_cache.get("entity_2", other_key) == [[3]]
+
+    local_cache.invalidate_entity("entity_2")
+    assert local_cache.get("entity_2", other_key) is None
+    assert local_cache.stats.invalidations == 2
+    assert dict(local_cache.get_metrics())["qcache_local_entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_engine_local_tier(fake_redis: FakeRedis) -> None:
+    local_cache = LocalResultCache(max_size_bytes=10**6, max_entry_size_bytes=10**6)
+    cache_engine = EntityCacheEngineAsync(
+        entity_id="entity_1",
+        rc=fake_redis,
+        local_cache=local_cache,
+        CACHE_SAVE_BACKGROUND=False,
+    )
+    key = _make_key("a")
+    cache_options = BIQueryCacheOptions(cache_enabled=True, key=key, ttl_sec=60, refresh_ttl_on_read=False)
+    helper = CacheProcessingHelper(cache_engine=cache_engine)
+    call_count = 0
+
+    async def generate() -> AsyncChunked:
+        nonlocal call_count
+        call_count += 1
+        return AsyncChunked.from_chunked_iterable([[[1, "a"], [2, "b"]]])
+
+    situation, _ = await helper.run_with_cache(generate_func=generate, cache_options=cache_options)
+    assert situation == CacheSituation.generated
+    assert len(local_cache) == 1
+
+    # Served from the local tier, even with redis being empty
+    fake_redis.data.clear()
+    situation, result = await helper.run_with_cache(generate_func=generate, cache_options=cache_options)
+    assert situation == CacheSituation.full_hit
+    assert result is not None
+    assert await result.all() == [[1, "a"], [2, "b"]]
+    assert call_count == 1
+
+    # Populated on a redis read, with the remaining TTL saved with the entry (no extra redis request for it)
+    local_cache.invalidate_entity("entity_1")
+    await cache_engine._update_cache(local_key_rep=key, result=[[3, "c"]], ttl_sec=30)
+    local_cache.invalidate_entity("entity_1")
+    assert await cache_engine._get_from_cache(local_key_rep=key) == [[3, "c"]]
+    fake_redis.data.clear()
+    assert await cache_engine._get_from_cache(local_key_rep=key) == [[3, "c"]]
+
+
+@pytest.mark.asyncio
+async def test_locked_cache_local_hit_skips_lock(fake_redis: FakeRedis) -> None:
+    local_cache = LocalResultCache(max_size_bytes=10**6, max_entry_size_bytes=10**6)
+    cache_engine = EntityCacheEngineAsync(entity_id="entity_1", rc=fake_redis, local_cache=local_cache)
+    key = _make_key("a")
+    local_cache.put("entity_1", key, result_data=[[1, "a"]], size_bytes=10, ttl_sec=60)
+    cache_options = BIQueryCacheOptions(cache_enabled=True, key=key, ttl_sec=60, refresh_ttl_on_read=False)
+
+    async def generate() -> AsyncChunked:
+        raise AssertionError("Should not be called")
+
+    situation, result = await CacheProcessingHelper(cache_engine=cache_engine).run_with_cache(
+        generate_func=generate,
+        cache_options=cache_options,
+        use_locked_cache=True,
+    )
+    assert situation == CacheSituation.full_hit
+    assert result is not None
+    assert await result.all() == [[1, "a"]]
+    assert not fake_redis.data
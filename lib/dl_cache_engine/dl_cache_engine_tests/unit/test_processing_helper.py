@@ -1,6 +1,13 @@
+from typing import Any
+
 import attr
 import pytest
 
+from dl_cache_engine.engine import (
+    EntityCacheEngineAsync,
+    EntityCacheEntryManagerAsyncBase,
+    ResultCacheEntry,
+)
 from dl_cache_engine.primitives import (
     BIQueryCacheOptions,
     DataKeyPart,
@@ -10,7 +17,10 @@ from dl_cache_engine.processing_helper import (
     CacheProcessingHelper,
     CacheSituation,
     TJSONExtChunkStream,
+    get_locked_cache_stats,
 )
+from dl_cache_engine_tests.unit.conftest import FakeRedis
+from dl_constants.types import TJSONExt
 from dl_utils.streaming import AsyncChunked
 
 
@@ -177,3 +187,79 @@ async def test_run_with_cache_no_read(
     assert result is not None
     data = await result.all()
     assert data == [1, 2, 3]
+
+
+@attr.s(auto_attribs=True, slots=True)
+class FakeLockedEntryManager(EntityCacheEntryManagerAsyncBase):
+    """Behaves as a locked manager that waited for the result of a concurrent request (if there is one)"""
+
+    cached_result: TJSONExt | None = None
+
+    async def _initialize(self) -> TJSONExt | None:
+        self.coalesced = self.cached_result is not None
+        return self.cached_result
+
+    async def _finalize(self, result: TJSONExt | None, error: Any | None = None, ttl_sec: float | None = None) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_run_with_cache_locked_stats(
+    monkeypatch: pytest.MonkeyPatch,
+    cache_helper: CacheProcessingHelper,
+    cache_options: BIQueryCacheOptions,
+) -> None:
+    """Should count the locked requests that reused the result generated by a concurrent one"""
+
+    async def generate_func() -> TJSONExtChunkStream | None:
+        return AsyncChunked.from_chunked_iterable([[1, 2, 3]])
+
+    stats = get_locked_cache_stats()
+    requests, generated, coalesced = stats.requests, stats.generated, stats.coalesced
+    for cached_result in (None, [1, 2, 3], [1, 2, 3]):
+        cem = FakeLockedEntryManager(
+            local_key_rep=cache_options.key,
+            cache_engine=None,  # type: ignore  # not used
+            write_ttl_sec=60,
+            cached_result=cached_result,
+        )
+
+        async def get_cache_entry_manager(cem: EntityCacheEntryManagerAsyncBase = cem, **_: Any) -> Any:
+            return cem
+
+        monkeypatch.setattr(cache_helper, "get_cache_entry_manager", get_cache_entry_manager)
+        situation, result = await cache_helper.run_with_cache(
+            generate_func=generate_func,
+            cache_options=cache_options,
+            use_locked_cache=True,
+        )
+        assert situation == (CacheSituation.generated if cached_result is None else CacheSituation.full_hit)
+        assert result is not None
+        assert await result.all() == [1, 2, 3]
+
+    assert (stats.requests, stats.generated, stats.coalesced) == (requests + 3, generated + 1, coalesced + 2)
+
+
+@pytest.mark.asyncio
+async def test_run_with_cache_saves_and_reads(fake_redis: FakeRedis, cache_options: BIQueryCacheOptions) -> None:
+    cache_engine = EntityCacheEngineAsync(entity_id="entity_1", rc=fake_redis, CACHE_SAVE_BACKGROUND=False)
+    cache_helper = CacheProcessingHelper(cache_engine=cache_engine)
+    full_key = cache_engine._get_key_query_cache_entry(cache_options.key)  # type: ignore
+
+    async def failing_generate_func() -> TJSONExtChunkStream | None:
+        raise ValueError("source failed")
+
+    with pytest.raises(ValueError, match="source failed"):
+        await cache_helper.run_with_cache(generate_func=failing_generate_func, cache_options=cache_options)
+    # Saved as an error marker, not as an empty result
+    assert ResultCacheEntry.from_redis_data(fake_redis.data[full_key]).is_error
+    del fake_redis.data[full_key]
+
+    async def generate_func() -> TJSONExtChunkStream | None:
+        return AsyncChunked.from_chunked_iterable([[[1, "a"]], [[2, "b"]]])
+
+    for expected_situation in (CacheSituation.generated, CacheSituation.full_hit):
+        situation, result = await cache_helper.run_with_cache(generate_func=generate_func, cache_options=cache_options)
+        assert situation == expected_situation
+        assert result is not None
+        assert await result.all() == [[1, "a"], [2, "b"]]
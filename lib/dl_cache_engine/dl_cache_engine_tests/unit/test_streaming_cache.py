@@ -0,0 +1,222 @@
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from dl_cache_engine.engine import EntityCacheEngineAsync
+from dl_cache_engine.exc import CacheEntryChunkMissingError
+from dl_cache_engine.primitives import (
+    BIQueryCacheOptions,
+    DataKeyPart,
+    LocalKeyRepresentation,
+)
+from dl_cache_engine.processing_helper import (
+    CacheProcessingHelper,
+    CacheSituation,
+    TJSONExtChunkStream,
+)
+from dl_cache_engine_tests.unit.conftest import FakeRedis
+from dl_utils.streaming import AsyncChunked
+
+CHUNKS = [[[1, "a"], [2, "b"]], [[3, "c"]], [[4, "d"], [5, "e"]]]
+
+
+@pytest.fixture
+def cache_engine(fake_redis: FakeRedis) -> EntityCacheEngineAsync:
+    return EntityCacheEngineAsync(entity_id="entity_1", rc=fake_redis, CACHE_SAVE_BACKGROUND=False)
+
+
+@pytest.fixture
+def cache_options() -> BIQueryCacheOptions:
+    return BIQueryCacheOptions(
+        cache_enabled=True,
+        key=LocalKeyRepresentation(key_parts=(DataKeyPart("test", "value"),)),
+        ttl_sec=60,
+        refresh_ttl_on_read=False,
+    )
+
+
+class _Source:
+    def __init__(self, chunks: list, fail_after: int | None = None) -> None:
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.call_count = 0
+
+    async def generate(self) -> TJSONExtChunkStream | None:
+        self.call_count += 1
+
+        async def chunk_gen() -> AsyncGenerator[list, None]:
+            for idx, chunk in enumerate(self.chunks):
+                if self.fail_after is not None and idx >= self.fail_after:
+                    raise ValueError("source failed")
+                yield chunk
+
+        return AsyncChunked(chunked_data=chunk_gen())
+
+
+def _chunk_keys(
+    cache_engine: EntityCacheEngineAsync, cache_options: BIQueryCacheOptions, fake_redis: FakeRedis
+) -> list:
+    assert cache_options.key is not None
+    stream_key = cache_engine._get_key_query_cache_stream(cache_options.key)
+    return [key for key in fake_redis.data if key.startswith(f"{stream_key}/")]
+
+
+@pytest.mark.asyncio
+async def test_streaming_write_through_and_chunked_hit(
+    cache_engine: EntityCacheEngineAsync,
+    cache_options: BIQueryCacheOptions,
+    fake_redis: FakeRedis,
+) -> None:
+    helper = CacheProcessingHelper(cache_engine=cache_engine)
+    source = _Source(CHUNKS)
+    assert cache_options.key is not None
+    stream_key = cache_engine._get_key_query_cache_stream(cache_options.key)
+
+    situation, result = await helper.run_with_cache(
+        generate_func=source.generate,
+        cache_options=cache_options,
+        use_streaming_cache=True,
+    )
+    assert situation == CacheSituation.generated
+    assert result is not None
+    # Nothing is committed until the stream is consumed.
+    assert stream_key not in fake_redis.data
+    assert [list(chunk) async for chunk in result.chunks] == CHUNKS
+    assert stream_key in fake_redis.data
+    assert len(_chunk_keys(cache_engine, cache_options, fake_redis)) == len(CHUNKS)
+    # The readers of the regular entries only don't see the streamed one.
+    assert cache_engine._get_key_query_cache_entry(cache_options.key) not in fake_redis.data
+
+    situation, result = await helper.run_with_cache(
+        generate_func=source.generate,
+        cache_options=cache_options,
+        use_streaming_cache=True,
+    )
+    assert situation == CacheSituation.full_hit
+    assert result is not None
+    # Read back chunk by chunk
+    chunk_iter = aiter(result.chunks)
+    for expected_chunk in CHUNKS:
+        assert await anext(chunk_iter) == expected_chunk
+    with pytest.raises(StopAsyncIteration):
+        await anext(chunk_iter)
+    assert source.call_count == 1
+
+    # The non-streaming read of a chunked entry gets the whole data.
+    situation, result = await helper.run_with_cache(generate_func=source.generate, cache_options=cache_options)
+    assert situation == CacheSituation.full_hit
+    assert result is not None
+    assert await result.all() == [row for chunk in CHUNKS for row in chunk]
+
+
+@pytest.mark.asyncio
+async def test_streaming_abandoned_stream_is_not_committed(
+    cache_engine: EntityCacheEngineAsync,
+    cache_options: BIQueryCacheOptions,
+    fake_redis: FakeRedis,
+) -> None:
+    helper = CacheProcessingHelper(cache_engine=cache_engine)
+    cem = await helper.get_cache_entry_manager(cache_options=cache_options)
+    assert cem is not None
+    helper.get_cache_entry_manager = lambda **kwargs: _as_awaitable(cem)  # type: ignore
+
+    _, result = await helper.run_with_cache(
+        generate_func=_Source(CHUNKS).generate,
+        cache_options=cache_options,
+        use_streaming_cache=True,
+    )
+    assert result is not None
+    chunk_iter = aiter(result.chunks)
+    await anext(chunk_iter)
+    await anext(chunk_iter)
+    assert len(_chunk_keys(cache_engine, cache_options, fake_redis)) == 2
+    await chunk_iter.aclose()  # type: ignore
+
+    assert fake_redis.data == {}
+    # Finalized, so it can be used again
+    assert await cem.initialize() is None
+
+
+async def _as_awaitable(value: object) -> object:
+    return value
+
+
+@pytest.mark.asyncio
+async def test_streaming_source_error(
+    cache_engine: EntityCacheEngineAsync,
+    cache_options: BIQueryCacheOptions,
+    fake_redis: FakeRedis,
+) -> None:
+    helper = CacheProcessingHelper(cache_engine=cache_engine)
+    source = _Source(CHUNKS, fail_after=1)
+
+    _, result = await helper.run_with_cache(
+        generate_func=source.generate,
+        cache_options=cache_options,
+        use_streaming_cache=True,
+    )
+    assert result is not None
+    with pytest.raises(ValueError, match="source failed"):
+        await result.all()
+    assert _chunk_keys(cache_engine, cache_options, fake_redis) == []
+
+    situation, _ = await helper.run_with_cache(
+        generate_func=_Source(CHUNKS).generate,
+        cache_options=cache_options,
+        use_streaming_cache=True,
+    )
+    assert situation == CacheSituation.generated
+
+
+@pytest.mark.asyncio
+async def test_chunked_entry_with_missing_chunks(
+    cache_engine: EntityCacheEngineAsync,
+    cache_options: BIQueryCacheOptions,
+    fake_redis: FakeRedis,
+) -> None:
+    helper = CacheProcessingHelper(cache_engine=cache_engine)
+    _, result = await helper.run_with_cache(
+        generate_func=_Source(CHUNKS).generate,
+        cache_options=cache_options,
+        use_streaming_cache=True,
+    )
+    assert result is not None
+    await result.all()
+
+    del fake_redis.data[_chunk_keys(cache_engine, cache_options, fake_redis)[0]]
+
+    # Missing chunks are detected before anything is returned, so it is a regular cache miss.
+    source = _Source(CHUNKS)
+    situation, result = await helper.run_with_cache(generate_func=source.generate, cache_options=cache_options)
+    assert situation == CacheSituation.generated
+    assert source.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_chunk_disappearing_while_streaming(
+    cache_engine: EntityCacheEngineAsync,
+    cache_options: BIQueryCacheOptions,
+    fake_redis: FakeRedis,
+) -> None:
+    helper = CacheProcessingHelper(cache_engine=cache_engine)
+    _, result = await helper.run_with_cache(
+        generate_func=_Source(CHUNKS).generate,
+        cache_options=cache_options,
+        use_streaming_cache=True,
+    )
+    assert result is not None
+    await result.all()
+
+    situation, result = await helper.run_with_cache(
+        generate_func=_Source(CHUNKS).generate,
+        cache_options=cache_options,
+        use_streaming_cache=True,
+    )
+    assert situation == CacheSituation.full_hit
+    assert result is not None
+    chunk_iter = aiter(result.chunks)
+    assert await anext(chunk_iter) == CHUNKS[0]
+    for key in _chunk_keys(cache_engine, cache_options, fake_redis):
+        del fake_redis.data[key]
+    with pytest.raises(CacheEntryChunkMissingError):
+        await anext(chunk_iter)
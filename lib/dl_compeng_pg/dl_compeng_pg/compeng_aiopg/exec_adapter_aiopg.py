@@ -84,7 +84,7 @@ class AiopgExecAdapter(PostgreSQLExecAdapterAsync[aiopg.sa.SAConnection]):
 
         return AsyncChunked(chunked_data=chunked_data_gen())
 
-    async def insert_data_into_table(
+    async def _insert_data_into_table(
         self,
         *,
         table_name: str,
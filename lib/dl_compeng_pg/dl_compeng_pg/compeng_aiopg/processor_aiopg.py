@@ -17,10 +17,15 @@ class AiopgOperationProcessor(PostgreSQLOperationProcessor[AiopgPoolWrapper, aio
             reporting_enabled=self._reporting_enabled,
             conn=self._pg_conn,
             cache_options_builder=self._cache_options_builder,
+            uploaded_table_registry=self._uploaded_table_registry,
         )
 
     async def end(self) -> None:
+        db_ex_adapter = self.db_ex_adapter if self._db_ex_adapter is not None else None
         self._db_ex_adapter = None
         if self._pg_conn is not None:
             await self._pg_conn.close()
         self._pg_conn = None
+        if db_ex_adapter is not None:
+            # No transaction: everything is committed right away
+            db_ex_adapter.finish_uploaded_tables(committed=True)
@@ -24,4 +24,5 @@ class AsyncpgCompEngService(CompEngPgService[AsyncpgPoolWrapper]):
             reporting_registry=reporting_registry,
             pg_pool=self.pool,
             reporting_enabled=reporting_enabled,
+            uploaded_table_registry=self._uploaded_table_registry,
         )
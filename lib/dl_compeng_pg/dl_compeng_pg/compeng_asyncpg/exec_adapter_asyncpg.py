@@ -126,7 +126,7 @@ class AsyncpgExecAdapter(PostgreSQLExecAdapterAsync[asyncpg.pool.PoolConnectionP
 
         return AsyncChunked(chunked_data=chunked_data_gen())
 
-    async def insert_data_into_table(
+    async def _insert_data_into_table(
         self,
         *,
         table_name: str,
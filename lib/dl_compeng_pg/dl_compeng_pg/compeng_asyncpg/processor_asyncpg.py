@@ -27,12 +27,18 @@ class AsyncpgOperationProcessor(PostgreSQLOperationProcessor[AsyncpgPoolWrapper,
             reporting_enabled=self._reporting_enabled,
             conn=pg_conn,
             cache_options_builder=self._cache_options_builder,
+            uploaded_table_registry=self._uploaded_table_registry,
         )
 
     async def end(self) -> None:
-        assert self._db_ex_adapter is not None
         assert self._cmstack is not None
+        db_ex_adapter = self.db_ex_adapter
         self._db_ex_adapter = None
-        await self._cmstack.aclose()
-        self._pg_conn = None
-        self._cmstack = None
+        committed = False
+        try:
+            await self._cmstack.aclose()
+            committed = True
+        finally:
+            self._pg_conn = None
+            self._cmstack = None
+            db_ex_adapter.finish_uploaded_tables(committed=committed)
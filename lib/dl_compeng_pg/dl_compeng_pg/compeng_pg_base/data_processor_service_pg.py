@@ -2,7 +2,11 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+from collections.abc import AsyncIterator
+import contextlib
 import logging
+import time
 from typing import (
     ClassVar,
     TypeVar,
@@ -10,12 +14,17 @@ from typing import (
 
 import attr
 
+from dl_api_commons.base_models import RequestContextInfo
+from dl_api_commons.reporting.registry import DefaultReportingRegistry
+from dl_compeng_pg.compeng_pg_base.exec_adapter_base import PostgreSQLExecAdapterAsync
 from dl_compeng_pg.compeng_pg_base.pool_base import (
     DEFAULT_OPERATION_TIMEOUT,
     DEFAULT_POOL_MAX_SIZE,
     DEFAULT_POOL_MIN_SIZE,
     BasePgPoolWrapper,
 )
+from dl_compeng_pg.compeng_pg_base.processor_base import PostgreSQLOperationProcessor
+from dl_compeng_pg.compeng_pg_base.uploaded_tables import UploadedTableRegistry
 from dl_core.aio.web_app_services.data_processing.data_processor import (
     DataProcessorConfig,
     DataProcessorService,
@@ -24,10 +33,24 @@ from dl_core.utils import secrepr_db_url
 
 LOGGER = logging.getLogger(__name__)
 
+DEFAULT_UPLOADED_TABLES_MAX_COUNT = 100
+DEFAULT_UPLOADED_TABLES_CLEANUP_INTERVAL_SEC = 30.0
+# A table left behind by another process is dropped when it is older than its TTL and this margin
+# (for the data processings that are still reading it)
+UPLOADED_TABLES_STALE_MARGIN_SEC = 3600.0
+UPLOADED_TABLES_STALE_CHECK_INTERVAL_SEC = 600.0
+
 
 @attr.s(frozen=True)
 class CompEngPgConfig(DataProcessorConfig):
     url: str = attr.ib(kw_only=True)
+    # Keep the uploaded tables for this long to reuse them in the other data processings, `None` disables it
+    uploaded_table_ttl_sec: float | None = attr.ib(kw_only=True, default=None)
+    uploaded_tables_max_count: int = attr.ib(kw_only=True, default=DEFAULT_UPLOADED_TABLES_MAX_COUNT)
+    uploaded_tables_cleanup_interval_sec: float = attr.ib(
+        kw_only=True,
+        default=DEFAULT_UPLOADED_TABLES_CLEANUP_INTERVAL_SEC,
+    )
 
 
 _COMPENG_PR_SRV_TV = TypeVar("_COMPENG_PR_SRV_TV", bound="CompEngPgService")
@@ -42,6 +65,14 @@ class CompEngPgService[POOL_TV: BasePgPoolWrapper](DataProcessorService, metacla
     _pool_max_size: int = attr.ib(default=DEFAULT_POOL_MAX_SIZE)
     _operation_timeout: float = attr.ib(default=DEFAULT_OPERATION_TIMEOUT)
     _pool: POOL_TV | None = attr.ib(init=False, default=None)
+    _uploaded_table_ttl_sec: float | None = attr.ib(kw_only=True, default=None)
+    _uploaded_tables_max_count: int = attr.ib(kw_only=True, default=DEFAULT_UPLOADED_TABLES_MAX_COUNT)
+    _uploaded_tables_cleanup_interval_sec: float = attr.ib(
+        kw_only=True,
+        default=DEFAULT_UPLOADED_TABLES_CLEANUP_INTERVAL_SEC,
+    )
+    _uploaded_table_registry: UploadedTableRegistry | None = attr.ib(init=False, default=None)
+    _cleanup_task: asyncio.Task | None = attr.ib(init=False, default=None)
 
     @property
     def pool(self) -> POOL_TV:
@@ -49,8 +80,73 @@ class CompEngPgService[POOL_TV: BasePgPoolWrapper](DataProcessorService, metacla
             raise ValueError("Pool was not created")
         return self._pool
 
+    @property
+    def uploaded_table_registry(self) -> UploadedTableRegistry | None:
+        return self._uploaded_table_registry
+
     async def initialize(self) -> None:
         await self._init_pool()
+        if self._uploaded_table_ttl_sec is not None:
+            self._uploaded_table_registry = UploadedTableRegistry(
+                ttl_sec=self._uploaded_table_ttl_sec,
+                max_tables=self._uploaded_tables_max_count,
+            )
+            self._cleanup_task = asyncio.create_task(self._run_uploaded_tables_cleanup())
+
+    @contextlib.asynccontextmanager
+    async def _make_service_exec_adapter(self) -> AsyncIterator[PostgreSQLExecAdapterAsync]:
+        processor = self.get_data_processor(
+            reporting_registry=DefaultReportingRegistry(rci=RequestContextInfo.create_empty()),
+            reporting_enabled=False,
+        )
+        assert isinstance(processor, PostgreSQLOperationProcessor)
+        await processor.start()
+        try:
+            yield processor.db_ex_adapter
+        finally:
+            await processor.end()
+
+    async def _drop_uploaded_tables(self, table_names: list[str]) -> None:
+        async with self._make_service_exec_adapter() as db_ex_adapter:
+            for table_name in table_names:
+                await db_ex_adapter.drop_table(table_name, if_exists=True)
+
+    async def _drop_stale_uploaded_tables(self) -> None:
+        """Drop the tables left behind by the processes that were killed before dropping them"""
+        registry = self._uploaded_table_registry
+        assert registry is not None
+        assert self._uploaded_table_ttl_sec is not None
+        async with self._make_service_exec_adapter() as db_ex_adapter:
+            table_names = registry.select_stale_tables(
+                await db_ex_adapter.get_reusable_table_names(),
+                max_age_sec=self._uploaded_table_ttl_sec + UPLOADED_TABLES_STALE_MARGIN_SEC,
+            )
+        if table_names:
+            LOGGER.info("Dropping %s stale uploaded compeng tables", len(table_names))
+            await self._drop_uploaded_tables(table_names)
+
+    async def _run_uploaded_tables_cleanup(self) -> None:
+        registry = self._uploaded_table_registry
+        assert registry is not None
+        next_stale_check = time.monotonic()  # Right away on startup
+        while True:
+            if time.monotonic() >= next_stale_check:
+                next_stale_check = time.monotonic() + UPLOADED_TABLES_STALE_CHECK_INTERVAL_SEC
+                try:
+                    await self._drop_stale_uploaded_tables()
+                except Exception:
+                    LOGGER.exception("Failed to drop stale uploaded compeng tables")
+            await asyncio.sleep(self._uploaded_tables_cleanup_interval_sec)
+            table_names = registry.pop_tables_to_drop()
+            if not table_names:
+                continue
+            LOGGER.info("Dropping %s uploaded compeng tables", len(table_names))
+            try:
+                await self._drop_uploaded_tables(table_names)
+            except Exception:
+                LOGGER.exception("Failed to drop uploaded compeng tables, will retry")
+                for table_name in table_names:
+                    registry.discard(table_name)
 
     @abc.abstractmethod
     def _get_pool_wrapper_cls(self) -> type[BasePgPoolWrapper]:
@@ -65,6 +161,19 @@ class CompEngPgService[POOL_TV: BasePgPoolWrapper](DataProcessorService, metacla
         )
 
     async def finalize(self) -> None:
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._cleanup_task
+            self._cleanup_task = None
+        if self._uploaded_table_registry is not None:
+            table_names = self._uploaded_table_registry.pop_all_tables()
+            self._uploaded_table_registry = None
+            if table_names and self._pool is not None:
+                try:
+                    await self._drop_uploaded_tables(table_names)
+                except Exception:
+                    LOGGER.exception("Failed to drop uploaded compeng tables: %s", table_names)
         if self._pool is not None:
             await self._deinit_pool()
 
@@ -80,4 +189,7 @@ class CompEngPgService[POOL_TV: BasePgPoolWrapper](DataProcessorService, metacla
         assert isinstance(config, CompEngPgConfig)
         return cls(
             pg_url=config.url,
+            uploaded_table_ttl_sec=config.uploaded_table_ttl_sec,
+            uploaded_tables_max_count=config.uploaded_tables_max_count,
+            uploaded_tables_cleanup_interval_sec=config.uploaded_tables_cleanup_interval_sec,
         )
@@ -15,9 +15,20 @@ from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
 from sqlalchemy.engine.default import DefaultDialect
 from sqlalchemy.sql.base import Executable
 
+from dl_cache_engine.primitives import LocalKeyRepresentation
+from dl_compeng_pg.compeng_pg_base.uploaded_tables import (
+    UploadedTableKey,
+    UploadedTableRegistry,
+    make_uploaded_table_key,
+)
 from dl_constants import UserDataType
 from dl_core.connectors.base.query_compiler import QueryCompiler
-from dl_core.data_processing.processing.db_base.exec_adapter_base import ProcessorDbExecAdapterBase
+from dl_core.data_processing.processing.context import OpExecutionContext
+from dl_core.data_processing.processing.db_base.exec_adapter_base import (
+    REUSABLE_TABLE_NAME_PREFIX,
+    ProcessorDbExecAdapterBase,
+)
+from dl_core.utils import make_id
 from dl_type_transformer.sa_types import make_sa_type
 from dl_utils.streaming import AsyncChunkedBase
 
@@ -38,6 +49,11 @@ class PostgreSQLExecAdapterAsync(Generic[_CONN_TV], ProcessorDbExecAdapterBase,
 
     _conn: _CONN_TV = attr.ib(kw_only=True)
     _tt: PostgreSQLTypeTransformer = attr.ib(factory=PostgreSQLTypeTransformer, init=False)
+    _uploaded_table_registry: UploadedTableRegistry | None = attr.ib(kw_only=True, default=None)
+    # Uploaded tables of the data processing
+    _acquired_table_names: list[str] = attr.ib(init=False, factory=list)
+    _reusable_table_keys: dict[str, UploadedTableKey] = attr.ib(init=False, factory=dict)
+    _filled_table_names: set[str] = attr.ib(init=False, factory=set)
 
     _log: ClassVar[logging.Logger] = LOGGER.getChild("PostgreSQLExecAdapterAsync")
 
@@ -55,7 +71,13 @@ class PostgreSQLExecAdapterAsync(Generic[_CONN_TV], ProcessorDbExecAdapterBase,
         """Execute a DDL statement"""
         await self._execute(query)
 
-    def _make_sa_table(self, table_name: str, names: Sequence[str], user_types: Sequence[UserDataType]) -> sa.Table:
+    def _make_sa_table(
+        self,
+        table_name: str,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+        temporary: bool = True,
+    ) -> sa.Table:
         assert len(names) == len(user_types)
         backend_type = BACKEND_TYPE_POSTGRES
         columns = [
@@ -68,7 +90,38 @@ class PostgreSQLExecAdapterAsync(Generic[_CONN_TV], ProcessorDbExecAdapterBase,
             )
             for name, user_t in zip(names, user_types, strict=True)
         ]
-        return sa.Table(table_name, sa.MetaData(), *columns, prefixes=["TEMPORARY"])
+        # The kept tables are not needed after a crash, so there is no point in writing them to the WAL
+        return sa.Table(table_name, sa.MetaData(), *columns, prefixes=["TEMPORARY"] if temporary else ["UNLOGGED"])
+
+    async def get_uploaded_table(
+        self,
+        *,
+        data_key: LocalKeyRepresentation,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+    ) -> str | None:
+        if self._uploaded_table_registry is None:
+            return None
+        table_name = self._uploaded_table_registry.acquire(make_uploaded_table_key(data_key, names, user_types))
+        if table_name is not None:
+            self._acquired_table_names.append(table_name)
+        return table_name
+
+    async def get_reusable_table_names(self) -> list[str]:
+        """All the reusable tables in the database, including the ones of the other processes"""
+        pg_tables = sa.table("pg_tables", sa.column("schemaname"), sa.column("tablename"))
+        query = (
+            sa.select([pg_tables.c.tablename])
+            .where(pg_tables.c.schemaname == sa.func.current_schema())
+            .where(pg_tables.c.tablename.startswith(REUSABLE_TABLE_NAME_PREFIX, autoescape=True))
+        )
+        data = await self.fetch_data_from_select(
+            query=query,
+            user_types=[UserDataType.string],
+            query_id=make_id(),
+            ctx=OpExecutionContext(processing_id=make_id(), streams=[], operations=[]),
+        )
+        return [row[0] for row in await data.all()]
 
     async def create_table(
         self,
@@ -76,24 +129,29 @@ class PostgreSQLExecAdapterAsync(Generic[_CONN_TV], ProcessorDbExecAdapterBase,
         table_name: str,
         names: Sequence[str],
         user_types: Sequence[UserDataType],
+        data_key: LocalKeyRepresentation | None = None,
     ) -> None:
         """Create table in database"""
 
-        table = self._make_sa_table(table_name=table_name, names=names, user_types=user_types)
+        reusable = data_key is not None and self._uploaded_table_registry is not None
+        table = self._make_sa_table(table_name=table_name, names=names, user_types=user_types, temporary=not reusable)
         self._log.info(f"Creating PG processor table {table_name}: {table}")
         await self._execute_ddl(sa.schema.CreateTable(table))
+        if reusable:
+            assert data_key is not None
+            self._reusable_table_keys[table_name] = make_uploaded_table_key(data_key, names, user_types)
 
-    async def _drop_table(self, table_name: str) -> None:
-        await self._execute_ddl(sa.schema.DropTable(sa.table(table_name)))
+    async def _drop_table(self, table_name: str, if_exists: bool = False) -> None:
+        await self._execute_ddl(sa.schema.DropTable(sa.table(table_name), if_exists=if_exists))
 
-    async def drop_table(self, table_name: str) -> None:
+    async def drop_table(self, table_name: str, if_exists: bool = False) -> None:
         """Drop table in database"""
 
         self._log.info(f"Dropping PG processor table {table_name}")
-        await self._drop_table(table_name=table_name)
+        await self._drop_table(table_name=table_name, if_exists=if_exists)
 
     @abc.abstractmethod
-    async def insert_data_into_table(
+    async def _insert_data_into_table(
         self,
         *,
         table_name: str,
@@ -103,5 +161,36 @@ class PostgreSQLExecAdapterAsync(Generic[_CONN_TV], ProcessorDbExecAdapterBase,
     ) -> None:
         """,,,"""
 
+    async def insert_data_into_table(
+        self,
+        *,
+        table_name: str,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+        data: AsyncChunkedBase,
+    ) -> None:
+        await self._insert_data_into_table(table_name=table_name, names=names, user_types=user_types, data=data)
+        if table_name in self._reusable_table_keys:
+            self._filled_table_names.add(table_name)
+
+    def finish_uploaded_tables(self, committed: bool) -> None:
+        """
+        Publish the reusable tables uploaded by the data processing
+        (if they are committed) and release the ones it has read.
+        """
+        registry = self._uploaded_table_registry
+        if registry is None:
+            return
+        for table_name in self._acquired_table_names:
+            registry.release(table_name)
+        for table_name, table_key in self._reusable_table_keys.items():
+            if committed and table_name in self._filled_table_names:
+                registry.publish(table_key, table_name)
+            else:
+                registry.discard(table_name)
+        self._acquired_table_names.clear()
+        self._reusable_table_keys.clear()
+        self._filled_table_names.clear()
+
     def get_query_compiler(self) -> QueryCompiler:
         return QueryCompiler(dialect=self.dialect)
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import abc
+from typing import ClassVar
 
 import attr
 
 from dl_cache_engine.primitives import CacheTTLConfig
 from dl_compeng_pg.compeng_pg_base.exec_adapter_base import PostgreSQLExecAdapterAsync
 from dl_compeng_pg.compeng_pg_base.pool_base import BasePgPoolWrapper
+from dl_compeng_pg.compeng_pg_base.uploaded_tables import UploadedTableRegistry
 from dl_constants import UserDataType
 from dl_core.data_processing.cache.utils import (
     CompengOptionsBuilder,
@@ -25,6 +27,10 @@ class PostgreSQLOperationProcessor[POOL_TV: BasePgPoolWrapper, CONN_TV](
     _task_timeout: int | None = attr.ib(default=None)
     _pg_conn: CONN_TV | None = attr.ib(init=False, default=None)
     _default_cache_ttl_config: CacheTTLConfig = attr.ib(factory=CacheTTLConfig)
+    _uploaded_table_registry: UploadedTableRegistry | None = attr.ib(kw_only=True, default=None)
+
+    # All the operations use the same connection
+    max_concurrent_operations: ClassVar[int] = 1
 
     def _make_cache_options_builder(self) -> DatasetOptionsBuilder:
         assert self._default_cache_ttl_config is not None
@@ -0,0 +1,154 @@
+"""
+Registry of the compeng tables that are kept after the data processing to be reused by the others.
+
+An uploaded table is identified by the data key of its data (and the columns): the same key means the same data,
+as for the query cache. The tables are regular (not temporary) unlogged ones, so they are visible to all the connections
+of the pool. A table is published after the data processing that uploaded it is committed, can be read by
+the others while it is not expired, and is dropped (by the janitor of the service) when it is expired
+and not read by anyone.
+The registry is process-wide, so the tables are shared between the requests of the same process only.
+The tables left behind by the processes that didn't drop them (e.g. were killed) are found by their names
+(see `make_reusable_table_name`) and dropped once they are too old to be used by anyone.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import (
+    Iterable,
+    Sequence,
+)
+import time
+
+import attr
+
+from dl_cache_engine.primitives import LocalKeyRepresentation
+from dl_constants import UserDataType
+from dl_core.data_processing.processing.db_base.exec_adapter_base import get_reusable_table_created_at
+
+UploadedTableKey = tuple[str, tuple[str, ...], tuple[UserDataType, ...]]
+
+
+def make_uploaded_table_key(
+    data_key: LocalKeyRepresentation,
+    names: Sequence[str],
+    user_types: Sequence[UserDataType],
+) -> UploadedTableKey:
+    return data_key.key_parts_hash, tuple(names), tuple(user_types)
+
+
+@attr.s
+class _UploadedTable:
+    table_name: str = attr.ib()
+    expires_at: float = attr.ib()
+    # Data processings reading the table
+    refcount: int = attr.ib(default=0)
+
+
+class UploadedTableRegistryStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.published = 0
+
+
+class UploadedTableRegistry:
+    def __init__(self, ttl_sec: float, max_tables: int) -> None:
+        self.ttl_sec = ttl_sec
+        self.max_tables = max_tables
+        self.stats = UploadedTableRegistryStats()
+        # In the order of the publication
+        self._tables: OrderedDict[UploadedTableKey, _UploadedTable] = OrderedDict()
+        self._keys_by_name: dict[str, UploadedTableKey] = {}
+        # Replaced or evicted, but still read by someone
+        self._retired: dict[str, _UploadedTable] = {}
+        self._tables_to_drop: list[str] = []
+
+    def acquire(self, table_key: UploadedTableKey) -> str | None:
+        """The name of a table with the data, which is not dropped until it is released"""
+        table = self._tables.get(table_key)
+        if table is None or table.expires_at <= time.monotonic():
+            self.stats.misses += 1
+            return None
+        table.refcount += 1
+        self.stats.hits += 1
+        return table.table_name
+
+    def release(self, table_name: str) -> None:
+        table_key = self._keys_by_name.get(table_name)
+        if table_key is not None:
+            self._tables[table_key].refcount -= 1
+            return
+        retired = self._retired.get(table_name)
+        if retired is not None:
+            retired.refcount -= 1
+            if retired.refcount == 0:
+                del self._retired[table_name]
+                self._tables_to_drop.append(table_name)
+
+    def publish(self, table_key: UploadedTableKey, table_name: str) -> None:
+        """Make an uploaded (and committed) table available for the other data processings"""
+        existing = self._tables.get(table_key)
+        if existing is not None and existing.expires_at > time.monotonic():
+            # Uploaded by several data processings at once, keep the first one
+            self._tables_to_drop.append(table_name)
+            return
+        if len(self._tables) >= self.max_tables and not self._evict():
+            self._tables_to_drop.append(table_name)
+            return
+        if existing is not None:
+            # Expired: can't be acquired anymore, the new one replaces it
+            self._remove(table_key)
+        self._tables[table_key] = _UploadedTable(table_name=table_name, expires_at=time.monotonic() + self.ttl_sec)
+        self._keys_by_name[table_name] = table_key
+        self.stats.published += 1
+
+    def discard(self, table_name: str) -> None:
+        """Drop a table that is not going to be published"""
+        self._tables_to_drop.append(table_name)
+
+    def _remove(self, table_key: UploadedTableKey) -> None:
+        table = self._tables.pop(table_key)
+        del self._keys_by_name[table.table_name]
+        if table.refcount > 0:
+            # Still read by someone, dropped when released
+            self._retired[table.table_name] = table
+        else:
+            self._tables_to_drop.append(table.table_name)
+
+    def _evict(self) -> bool:
+        for table_key, table in self._tables.items():
+            if table.refcount == 0:
+                self._remove(table_key)
+                return True
+        return False
+
+    def has_table(self, table_name: str) -> bool:
+        return table_name in self._keys_by_name or table_name in self._retired or table_name in self._tables_to_drop
+
+    def select_stale_tables(self, table_names: Iterable[str], max_age_sec: float) -> list[str]:
+        """The tables (found in the database) that are not known here and were created more than `max_age_sec` ago"""
+        created_before = time.time() - max_age_sec
+        result = []
+        for table_name in table_names:
+            created_at = get_reusable_table_created_at(table_name)
+            if created_at is not None and created_at < created_before and not self.has_table(table_name):
+                result.append(table_name)
+        return result
+
+    def pop_tables_to_drop(self) -> list[str]:
+        """The tables that are not needed anymore: expired and not read, or not published"""
+        now = time.monotonic()
+        for table_key, table in list(self._tables.items()):
+            if table.expires_at <= now and table.refcount == 0:
+                self._remove(table_key)
+        result, self._tables_to_drop = self._tables_to_drop, []
+        return result
+
+    def pop_all_tables(self) -> list[str]:
+        result = [table.table_name for table in self._tables.values()] + list(self._retired) + self._tables_to_drop
+        self._tables.clear()
+        self._keys_by_name.clear()
+        self._retired.clear()
+        self._tables_to_drop = []
+        return result
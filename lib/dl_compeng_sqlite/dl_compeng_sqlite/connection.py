@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor
+import functools
+import logging
+import sqlite3
+from typing import (
+    Any,
+    TypeVar,
+)
+
+import attr
+
+LOGGER = logging.getLogger(__name__)
+
+_RESULT_TV = TypeVar("_RESULT_TV")
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+    # `LIKE` is case-sensitive in PostgreSQL
+    conn.execute("PRAGMA case_sensitive_like = ON")
+    return conn
+
+
+@attr.s
+class SQLiteConnection:
+    """
+    An in-memory database of a single data processing.
+    `sqlite3` calls block, so they are made in the threads of the executor, one at a time.
+    """
+
+    _executor: Executor = attr.ib(kw_only=True)
+    _conn: sqlite3.Connection | None = attr.ib(init=False, default=None)
+    _lock: asyncio.Lock = attr.ib(init=False, factory=asyncio.Lock)
+
+    async def _run_in_executor(self, func: Callable[..., _RESULT_TV], *args: Any) -> _RESULT_TV:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def open(self) -> None:
+        assert self._conn is None, "should not double-open"
+        self._conn = await self._run_in_executor(_connect)
+
+    async def close(self) -> None:
+        if self._conn is None:
+            return
+        conn = self._conn
+        self._conn = None
+        async with self._lock:
+            await self._run_in_executor(conn.close)
+
+    async def run(self, func: Callable[[sqlite3.Connection], _RESULT_TV]) -> _RESULT_TV:
+        """Call `func` with the connection in a thread of the executor"""
+        assert self._conn is not None, "connection is not open"
+        async with self._lock:
+            return await self._run_in_executor(func, self._conn)
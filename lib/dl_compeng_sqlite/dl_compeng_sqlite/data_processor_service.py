@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+from typing import (
+    ClassVar,
+    TypeVar,
+)
+
+import attr
+
+from dl_api_commons.reporting.registry import ReportingRegistry
+from dl_compeng_sqlite.processor import SQLiteOperationProcessor
+from dl_core.aio.web_app_services.data_processing.data_processor import (
+    DataProcessorConfig,
+    DataProcessorService,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_INPUT_ROWS = 10_000
+DEFAULT_MAX_THREADS = 4
+
+
+@attr.s(frozen=True)
+class CompEngSQLiteConfig(DataProcessorConfig):
+    max_input_rows: int = attr.ib(kw_only=True, default=DEFAULT_MAX_INPUT_ROWS)
+    max_threads: int = attr.ib(kw_only=True, default=DEFAULT_MAX_THREADS)
+    # The service the data processing is moved to when it is too large or not supported here
+    fallback_service: DataProcessorService | None = attr.ib(kw_only=True, default=None)
+
+
+_COMPENG_SQLITE_SRV_TV = TypeVar("_COMPENG_SQLITE_SRV_TV", bound="SQLiteCompEngService")
+
+
+@attr.s
+class SQLiteCompEngService(DataProcessorService):
+    """In-process data processing of the small inputs: no round trips to the PostgreSQL compeng"""
+
+    APP_KEY: ClassVar[str] = "compeng_sqlite_service"
+
+    _max_input_rows: int = attr.ib(kw_only=True, default=DEFAULT_MAX_INPUT_ROWS)
+    _max_threads: int = attr.ib(kw_only=True, default=DEFAULT_MAX_THREADS)
+    _fallback_service: DataProcessorService | None = attr.ib(kw_only=True, default=None)
+    _executor: ThreadPoolExecutor | None = attr.ib(init=False, default=None)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            raise ValueError("Executor was not created")
+        return self._executor
+
+    async def initialize(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=self._max_threads, thread_name_prefix="compeng_sqlite")
+
+    async def finalize(self) -> None:
+        if self._executor is not None:
+            LOGGER.info("Tear down compeng sqlite executor %r...", self)
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def get_data_processor(
+        self,
+        reporting_registry: ReportingRegistry,
+        reporting_enabled: bool,
+    ) -> SQLiteOperationProcessor:
+        return SQLiteOperationProcessor(
+            reporting_registry=reporting_registry,
+            reporting_enabled=reporting_enabled,
+            executor=self.executor,
+            max_input_rows=self._max_input_rows,
+            fallback_service=self._fallback_service,
+        )
+
+    @classmethod
+    def from_config(
+        cls: type[_COMPENG_SQLITE_SRV_TV],
+        config: DataProcessorConfig,
+    ) -> _COMPENG_SQLITE_SRV_TV:
+        assert isinstance(config, CompEngSQLiteConfig)
+        return cls(
+            max_input_rows=config.max_input_rows,
+            max_threads=config.max_threads,
+            fallback_service=config.fallback_service,
+        )
@@ -0,0 +1,349 @@
+"""
+SQLite dialect for the queries built for the PostgreSQL compeng.
+
+The queries are translated with the compeng (PostgreSQL) formula dialect, so only the part of them
+that means the same in SQLite can be executed here. SQLite doesn't fail on much of the rest,
+but gives a different result (`lower()` of non-ASCII text, `CAST('abc' AS INTEGER)`, ...),
+so the queries are checked against the allowlists of the constructs, functions and operators
+that behave the same in both engines before they are executed.
+The ordering is made explicit to place the NULLs as PostgreSQL does (last in the ascending order).
+
+The text is compared with the BINARY collation by SQLite and with the locale one by PostgreSQL,
+so the strings are only checked for equality here: their ordering, range comparisons and MIN/MAX
+are left to PostgreSQL. The columns of the uploaded tables are not typed in the queries,
+so the text ones are looked up by name (`text_columns`).
+`LIKE` gets an explicit backslash escape, which is the default one in PostgreSQL.
+"""
+
+from __future__ import annotations
+
+from collections.abc import (
+    Collection,
+    Sequence,
+)
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.sqlite.base import (
+    SQLiteCompiler,
+    SQLiteTypeCompiler,
+)
+from sqlalchemy.dialects.sqlite.pysqlite import SQLiteDialect_pysqlite
+from sqlalchemy.sql import (
+    elements,
+    functions,
+    operators,
+    selectable,
+    visitors,
+)
+from sqlalchemy.sql.ddl import DDLElement
+from sqlalchemy.sql.elements import (
+    ClauseElement,
+    ClauseList,
+    Over,
+    UnaryExpression,
+)
+
+# The types that are stored and compared by SQLite the same way as by PostgreSQL
+SUPPORTED_SA_TYPES: tuple[type[sa.types.TypeEngine], ...] = (
+    sa.types.NullType,
+    sa.Integer,
+    sa.Float,
+    sa.Boolean,
+    sa.String,
+)
+
+# The constructs that are compiled to the same SQL (or to the SQL that means the same).
+# Casts, functions and operators are checked separately.
+SUPPORTED_ELEMENTS: tuple[type[ClauseElement], ...] = (
+    selectable.Select,
+    selectable.TableClause,
+    selectable.Alias,
+    selectable.Join,
+    selectable.FromGrouping,
+    selectable.ScalarSelect,
+    elements.ColumnClause,
+    elements.Label,
+    elements._label_reference,
+    elements._textual_label_reference,
+    elements.BindParameter,
+    elements.Null,
+    elements.True_,
+    elements.False_,
+    elements.Grouping,
+    elements.ClauseList,
+    elements.BinaryExpression,
+    elements.UnaryExpression,
+    elements.Case,
+    elements.Over,
+    elements.TypeCoerce,
+    elements.TypeClause,
+    elements.Cast,
+    functions.FunctionElement,
+)
+
+SUPPORTED_FUNCTIONS: frozenset[str] = frozenset(
+    (
+        "count",
+        "sum",
+        "min",
+        "max",
+        "coalesce",
+        "nullif",
+        "abs",
+        "length",
+        "row_number",
+        "rank",
+        "dense_rank",
+        "lag",
+        "lead",
+        "first_value",
+        "last_value",
+    )
+)
+
+# `LIKE` is made case-sensitive by the connection, `ILIKE` is not here: it's compiled with `lower()`
+SUPPORTED_OPERATORS: frozenset[Any] = frozenset(
+    (
+        operators.eq,
+        operators.ne,
+        operators.lt,
+        operators.le,
+        operators.gt,
+        operators.ge,
+        operators.and_,
+        operators.or_,
+        operators.inv,
+        operators.neg,
+        operators.add,
+        operators.sub,
+        operators.mul,
+        operators.truediv,
+        operators.div,
+        operators.concat_op,
+        operators.is_,
+        operators.is_not,
+        operators.is_distinct_from,
+        operators.is_not_distinct_from,
+        operators.in_op,
+        operators.not_in_op,
+        operators.between_op,
+        operators.not_between_op,
+        operators.like_op,
+        operators.not_like_op,
+        operators.exists,
+        operators.distinct_op,
+        operators.comma_op,
+        operators.asc_op,
+        operators.desc_op,
+        operators.nulls_first_op,
+        operators.nulls_last_op,
+    )
+)
+
+# Compare the strings by their collation
+_STRING_ORDERING_OPERATORS: frozenset[Any] = frozenset(
+    (
+        operators.lt,
+        operators.le,
+        operators.gt,
+        operators.ge,
+        operators.between_op,
+        operators.not_between_op,
+    )
+)
+
+_STRING_ORDERING_FUNCTIONS: frozenset[str] = frozenset(("min", "max"))
+
+LIKE_ESCAPE = "\\"
+
+# Python types of the constants that are cast to their own types
+_LITERAL_CAST_TYPES: dict[type, tuple[type[sa.types.TypeEngine], ...]] = {
+    bool: (sa.Boolean,),
+    int: (sa.Integer, sa.Float),
+    float: (sa.Float,),
+    str: (sa.String,),
+}
+
+
+def _with_pg_nulls_order(element: ClauseElement) -> ClauseElement:
+    if isinstance(element, UnaryExpression):
+        if element.modifier in (operators.nulls_first_op, operators.nulls_last_op):
+            return element
+        if element.modifier is operators.desc_op:
+            return sa.nullsfirst(element)
+    return sa.nullslast(element)
+
+
+class CompengSQLiteCompiler(SQLiteCompiler):
+    def order_by_clause(self, select: Any, **kw: Any) -> str:
+        order_by = ", ".join(
+            _with_pg_nulls_order(element)._compiler_dispatch(self, **kw) for element in select._order_by_clauses
+        )
+        if order_by:
+            return " ORDER BY " + order_by
+        return ""
+
+    def visit_over(self, over: Over, **kwargs: Any) -> str:
+        if over.order_by is not None and len(over.order_by):
+            over = over._clone()
+            over.order_by = ClauseList(*(_with_pg_nulls_order(element) for element in over.order_by.clauses))
+        return super().visit_over(over, **kwargs)
+
+    def visit_like_op_binary(self, binary: elements.BinaryExpression, operator: Any, **kw: Any) -> str:
+        return super().visit_like_op_binary(_with_like_escape(binary), operator, **kw)
+
+    def visit_not_like_op_binary(self, binary: elements.BinaryExpression, operator: Any, **kw: Any) -> str:
+        return super().visit_not_like_op_binary(_with_like_escape(binary), operator, **kw)
+
+
+def _with_like_escape(binary: elements.BinaryExpression) -> elements.BinaryExpression:
+    if binary.modifiers.get("escape") is not None:
+        return binary
+    binary = binary._clone()
+    binary.modifiers = {**binary.modifiers, "escape": LIKE_ESCAPE}
+    return binary
+
+
+class CompengSQLiteTypeCompiler(SQLiteTypeCompiler):
+    def visit_DOUBLE_PRECISION(self, type_: sa.types.TypeEngine, **kw: Any) -> str:  # noqa: N802
+        # Float literals and division of the compeng dialect
+        return "REAL"
+
+
+class CompengSQLiteDialect(SQLiteDialect_pysqlite):
+    statement_compiler = CompengSQLiteCompiler
+    type_compiler = CompengSQLiteTypeCompiler
+
+
+def _is_supported_cast(cast: elements.Cast) -> bool:
+    target_type = cast.type
+    if isinstance(cast.clause, elements.BindParameter):
+        if cast.clause.value is None:
+            return True
+        return isinstance(target_type, _LITERAL_CAST_TYPES.get(type(cast.clause.value), ()))
+    source_type = cast.clause.type
+    if isinstance(target_type, sa.Float):
+        # `CAST('abc' AS REAL)` is 0.0 in SQLite, so only the numbers
+        return isinstance(source_type, (sa.Integer, sa.Float))
+    # Unknown (untyped) expressions are not cast to anything else
+    return not isinstance(source_type, sa.types.NullType) and source_type._type_affinity is target_type._type_affinity
+
+
+def _get_operator_name(operator: Any) -> str:
+    return getattr(operator, "__name__", None) or getattr(operator, "opstring", repr(operator))
+
+
+def _may_be_string(element: Any, string_names: Collection[str]) -> bool:
+    """Whether the expression can be of a text type, `string_names` are the names of the untyped text columns"""
+    if isinstance(element, elements._textual_label_reference):
+        return element.element in string_names
+    if isinstance(element, elements._label_reference):
+        return _may_be_string(element.element, string_names)
+    type_ = getattr(element, "type", None)
+    if isinstance(type_, sa.String):
+        return True
+    if isinstance(type_, sa.types.TypeEngine) and not isinstance(type_, sa.types.NullType):
+        return False
+    if isinstance(element, elements.ColumnClause):
+        return element.name in string_names
+    if isinstance(element, selectable.ScalarSelect):
+        return any(_may_be_string(column, string_names) for column in element.element.selected_columns)
+    # Of an unknown type: as anything it's made of
+    return any(_may_be_string(child, string_names) for child in element.get_children())
+
+
+def _get_string_names(query: ClauseElement, text_columns: Collection[str]) -> set[str]:
+    """The names of the text columns and of the labels of the text expressions (that are the columns of the subqueries)"""
+    string_names = set(text_columns)
+    labels = [element for element in visitors.iterate(query) if isinstance(element, elements.Label)]
+    while True:
+        new_names = {
+            label.name
+            for label in labels
+            if label.name not in string_names and _may_be_string(label.element, string_names)
+        }
+        if not new_names:
+            return string_names
+        string_names |= new_names
+
+
+def _get_string_ordering(element: ClauseElement, string_names: Collection[str]) -> str | None:
+    if isinstance(element, selectable.Select):
+        order_by = element._order_by_clauses
+    elif isinstance(element, Over):
+        order_by = element.order_by.clauses if element.order_by is not None else ()
+    elif isinstance(element, elements.BinaryExpression):
+        if element.operator in _STRING_ORDERING_OPERATORS and (
+            _may_be_string(element.left, string_names) or _may_be_string(element.right, string_names)
+        ):
+            return f"comparison of strings ({_get_operator_name(element.operator)})"
+        return None
+    elif isinstance(element, functions.FunctionElement):
+        name = getattr(element, "name", "")
+        if name.lower() in _STRING_ORDERING_FUNCTIONS and _may_be_string(element.clauses, string_names):
+            return f"{name} of strings"
+        return None
+    else:
+        return None
+
+    for order_element in order_by:
+        while isinstance(order_element, UnaryExpression) and order_element.modifier is not None:
+            order_element = order_element.element
+        if _may_be_string(order_element, string_names):
+            return "ordering by strings"
+    return None
+
+
+def get_unsupported_constructs(query: ClauseElement, text_columns: Collection[str] = ()) -> list[str]:
+    """
+    Descriptions of the parts of the query that are not executed by SQLite the same way as by PostgreSQL.
+    `text_columns` are the names of the columns of the text type in the tables the query reads.
+    """
+    result = []
+    string_names = _get_string_names(query, text_columns)
+    for element in visitors.iterate(query):
+        if not isinstance(element, SUPPORTED_ELEMENTS):
+            result.append(f"construct {type(element).__name__}")
+            continue
+        type_ = getattr(element, "type", None)
+        if isinstance(type_, sa.types.TypeEngine) and not isinstance(type_, SUPPORTED_SA_TYPES):
+            result.append(f"type {type_!r}")
+        if isinstance(element, selectable.Select) and element._distinct_on:
+            result.append("DISTINCT ON")
+        elif isinstance(element, elements.Cast) and not _is_supported_cast(element):
+            result.append(f"cast of {element.clause.type!r} to {element.type!r}")
+        elif isinstance(element, functions.FunctionElement):
+            name = getattr(element, "name", type(element).__name__)
+            if name.lower() not in SUPPORTED_FUNCTIONS:
+                result.append(f"function {name}")
+        elif isinstance(element, (elements.BinaryExpression, ClauseList)):
+            if element.operator is not None and element.operator not in SUPPORTED_OPERATORS:
+                result.append(f"operator {_get_operator_name(element.operator)}")
+        elif isinstance(element, UnaryExpression):
+            result.extend(
+                f"operator {_get_operator_name(operator)}"
+                for operator in (element.operator, element.modifier)
+                if operator is not None and operator not in SUPPORTED_OPERATORS
+            )
+        string_ordering = _get_string_ordering(element, string_names)
+        if string_ordering is not None:
+            result.append(string_ordering)
+    return result
+
+
+def compile_sqlite_query(query: str | ClauseElement, dialect: sa.engine.Dialect) -> tuple[str, Sequence[Any]]:
+    """The query text with the `qmark` placeholders and the parameters for `sqlite3`"""
+    if isinstance(query, str):
+        return query, ()
+    if isinstance(query, DDLElement):
+        return str(query.compile(dialect=dialect)), ()
+    compiled = query.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    bind_processors = compiled._bind_processors
+    values = []
+    for name in compiled.positiontup or ():
+        value = params[name]
+        processor = bind_processors.get(name)
+        values.append(processor(value) if processor is not None and value is not None else value)
+    return str(compiled), values
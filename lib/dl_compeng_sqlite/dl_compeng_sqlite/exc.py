@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from dl_core.exc import DatabaseQueryError
+
+
+class EmbeddedCompengError(DatabaseQueryError):
+    """The query can't be executed by the embedded engine (but it can be by the fallback one)"""
+
+    err_code = (*DatabaseQueryError.err_code, "COMPENG_EMBEDDED")
+    default_message = "Query is not supported by the embedded data processing engine."
+
+
+class EmbeddedCompengUnsupportedTypeError(EmbeddedCompengError):
+    err_code = (*EmbeddedCompengError.err_code, "UNSUPPORTED_TYPE")
+    default_message = "Data type is not supported by the embedded data processing engine."
+
+
+class EmbeddedCompengUnsupportedQueryError(EmbeddedCompengError):
+    err_code = (*EmbeddedCompengError.err_code, "UNSUPPORTED_QUERY")
+    default_message = "Query is not executed by the embedded data processing engine the same way."
+
+
+class EmbeddedCompengInputTooLargeError(EmbeddedCompengError):
+    err_code = (*EmbeddedCompengError.err_code, "INPUT_TOO_LARGE")
+    default_message = "Input data is too large for the embedded data processing engine."
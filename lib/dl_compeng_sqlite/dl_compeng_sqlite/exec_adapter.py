@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Sequence,
+)
+import logging
+import sqlite3
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+)
+
+import attr
+import sqlalchemy as sa
+from sqlalchemy.sql.base import Executable
+
+from dl_cache_engine.primitives import LocalKeyRepresentation
+from dl_compeng_sqlite.connection import SQLiteConnection
+from dl_compeng_sqlite.dialect import (
+    CompengSQLiteDialect,
+    compile_sqlite_query,
+    get_unsupported_constructs,
+)
+from dl_compeng_sqlite.exc import (
+    EmbeddedCompengError,
+    EmbeddedCompengUnsupportedQueryError,
+    EmbeddedCompengUnsupportedTypeError,
+)
+from dl_constants import UserDataType
+from dl_core.connectors.base.query_compiler import QueryCompiler
+from dl_core.data_processing.prepared_components.primitives import PreparedFromInfo
+from dl_core.data_processing.processing.context import OpExecutionContext
+from dl_core.data_processing.processing.db_base.exec_adapter_base import ProcessorDbExecAdapterBase
+from dl_type_transformer.type_transformer import TypeTransformer
+from dl_utils.streaming import (
+    AsyncChunked,
+    AsyncChunkedBase,
+)
+
+if TYPE_CHECKING:
+    from dl_constants.types import TBIDataValue
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class SQLiteTypeTransformer(TypeTransformer):
+    """Only the types that are stored and compared by SQLite the same way as by PostgreSQL"""
+
+    user_to_sa_type: ClassVar[dict[UserDataType, type[sa.types.TypeEngine]]] = {
+        UserDataType.integer: sa.BigInteger,
+        UserDataType.float: sa.Float,
+        UserDataType.boolean: sa.Boolean,
+        UserDataType.string: sa.Text,
+    }
+
+    @classmethod
+    def supports_user_types(cls, user_types: Sequence[UserDataType]) -> bool:
+        return all(user_t in cls.user_to_sa_type for user_t in user_types)
+
+
+@attr.s
+class SQLiteExecAdapter(ProcessorDbExecAdapterBase):
+    """Executes the operations in an in-memory SQLite database"""
+
+    _conn: SQLiteConnection = attr.ib(kw_only=True)
+    _tt: SQLiteTypeTransformer = attr.ib(factory=SQLiteTypeTransformer, init=False)
+    # Of all the tables created, the queries don't have the types of the columns
+    _text_columns: set[str] = attr.ib(factory=set, init=False)
+
+    _dialect: ClassVar[CompengSQLiteDialect] = CompengSQLiteDialect()
+    _log: ClassVar[logging.Logger] = LOGGER.getChild("SQLiteExecAdapter")
+
+    @property
+    def dialect(self) -> CompengSQLiteDialect:
+        return self._dialect
+
+    def _check_user_types(self, user_types: Sequence[UserDataType]) -> None:
+        if not self._tt.supports_user_types(user_types):
+            raise EmbeddedCompengUnsupportedTypeError(
+                db_message=f"Unsupported types: {sorted(set(user_types) - set(self._tt.user_to_sa_type))}"
+            )
+
+    def _check_query(self, query: sa.sql.selectable.Select) -> None:
+        unsupported = get_unsupported_constructs(query, text_columns=self._text_columns)
+        if unsupported:
+            raise EmbeddedCompengUnsupportedQueryError(db_message=f"Unsupported: {', '.join(unsupported)}")
+
+    def _compile(self, query: str | Executable) -> tuple[str, Sequence[Any]]:
+        try:
+            return compile_sqlite_query(query, self.dialect)
+        except sa.exc.CompileError as err:
+            # e.g. a type that SQLite doesn't have
+            raise EmbeddedCompengError(db_message=str(err), orig=err) from err
+
+    async def _execute(self, query: str | Executable) -> None:
+        query_text, params = self._compile(query)
+        try:
+            await self._conn.run(lambda conn: conn.execute(query_text, params).close())
+        except sqlite3.Error as err:
+            raise EmbeddedCompengError(db_message=str(err), query=query_text, orig=err) from err
+
+    async def create_table(
+        self,
+        *,
+        table_name: str,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+        data_key: LocalKeyRepresentation | None = None,
+    ) -> None:
+        self._check_user_types(user_types)
+        columns = [
+            sa.Column(name=name, type_=self._tt.user_to_sa_type[user_t]())
+            for name, user_t in zip(names, user_types, strict=True)
+        ]
+        self._text_columns.update(
+            name for name, user_t in zip(names, user_types, strict=True) if user_t == UserDataType.string
+        )
+        self._log.info(f"Creating SQLite processor table {table_name}")
+        await self._execute(sa.schema.CreateTable(sa.Table(table_name, sa.MetaData(), *columns)))
+
+    async def drop_table(self, table_name: str) -> None:
+        self._log.info(f"Dropping SQLite processor table {table_name}")
+        await self._execute(sa.schema.DropTable(sa.table(table_name)))
+
+    async def insert_data_into_table(
+        self,
+        *,
+        table_name: str,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+        data: AsyncChunkedBase,
+    ) -> None:
+        self._log.info(f"Inserting data into table {table_name}")
+        self._check_user_types(user_types)
+        # `INSERT INTO ... VALUES (?, ...)` for `executemany`
+        query_text = str(
+            sa.table(table_name, *(sa.column(name) for name in names)).insert().compile(dialect=self.dialect)
+        )
+        async for raw_chunk in data.chunks:
+            chunk = [
+                [
+                    self._tt.cast_for_input(value=value, user_t=user_t)
+                    for value, user_t in zip(row, user_types, strict=True)
+                ]
+                for row in raw_chunk
+            ]
+            try:
+                await self._conn.run(lambda conn, chunk=chunk: conn.executemany(query_text, chunk).close())
+            except sqlite3.Error as err:
+                raise EmbeddedCompengError(db_message=str(err), query=query_text, orig=err) from err
+
+    async def _execute_and_fetch(
+        self,
+        *,
+        query: str | sa.sql.selectable.Select,
+        user_types: Sequence[UserDataType],
+        chunk_size: int,
+        joint_dsrc_info: PreparedFromInfo | None = None,
+        query_id: str,
+        ctx: OpExecutionContext,
+        data_key: LocalKeyRepresentation,
+        preparation_callback: Callable[[], Awaitable[None]] | None,
+    ) -> AsyncChunked[Sequence[TBIDataValue]]:
+        self._check_user_types(user_types)
+        if not isinstance(query, str):
+            self._check_query(query)
+        query_text, params = self._compile(query)
+
+        if preparation_callback is not None:
+            await preparation_callback()
+
+        # Fetch everything right away: the input is small, and the errors are raised here rather than on iteration
+        try:
+            rows = await self._conn.run(lambda conn: conn.execute(query_text, params).fetchall())
+        except sqlite3.Error as err:
+            raise EmbeddedCompengError(db_message=str(err), query=query_text, orig=err) from err
+
+        data = [
+            [
+                self._tt.cast_for_output(value=value, user_t=user_t)
+                for value, user_t in zip(row, user_types, strict=True)
+            ]
+            for row in rows
+        ]
+        return AsyncChunked.from_chunked_iterable(
+            [data[idx : idx + chunk_size] for idx in range(0, len(data), chunk_size)]
+        )
+
+    def get_query_compiler(self) -> QueryCompiler:
+        return QueryCompiler(dialect=self.dialect)
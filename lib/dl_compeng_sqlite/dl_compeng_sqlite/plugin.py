@@ -0,0 +1,8 @@
+from dl_compeng_sqlite.data_processor_service import SQLiteCompEngService
+from dl_constants import ProcessorType
+from dl_core.data_processors.base.plugin import DataProcessorPlugin
+
+
+class SQLiteCompengPlugin(DataProcessorPlugin):
+    data_processor_type = ProcessorType.SQLITE
+    data_processor_service_cls = SQLiteCompEngService
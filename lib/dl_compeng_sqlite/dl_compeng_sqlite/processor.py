@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from typing import ClassVar
+
+import attr
+
+from dl_cache_engine.primitives import CacheTTLConfig
+from dl_compeng_sqlite.connection import SQLiteConnection
+from dl_compeng_sqlite.exec_adapter import SQLiteExecAdapter
+from dl_compeng_sqlite.routing import RoutingCompengExecAdapter
+from dl_core.aio.web_app_services.data_processing.data_processor import DataProcessorService
+from dl_core.data_processing.cache.utils import (
+    CompengOptionsBuilder,
+    DatasetOptionsBuilder,
+)
+from dl_core.data_processing.processing.db_base.exec_adapter_base import ProcessorDbExecAdapterBase
+from dl_core.data_processing.processing.db_base.processor_base import ExecutorBasedOperationProcessor
+from dl_core.data_processing.processing.processor import OperationProcessorAsyncBase
+
+
+@attr.s
+class SQLiteOperationProcessor(ExecutorBasedOperationProcessor):
+    _executor: Executor = attr.ib(kw_only=True)
+    _max_input_rows: int = attr.ib(kw_only=True)
+    _fallback_service: DataProcessorService | None = attr.ib(kw_only=True, default=None)
+    _default_cache_ttl_config: CacheTTLConfig = attr.ib(kw_only=True, factory=CacheTTLConfig)
+    _sqlite_conn: SQLiteConnection | None = attr.ib(init=False, default=None)
+    _fallback_processor: OperationProcessorAsyncBase | None = attr.ib(init=False, default=None)
+
+    # All the operations use the same connection
+    max_concurrent_operations: ClassVar[int] = 1
+
+    def _make_cache_options_builder(self) -> DatasetOptionsBuilder:
+        return CompengOptionsBuilder(default_ttl_config=self._default_cache_ttl_config)
+
+    def _make_db_ex_adapter(self) -> ProcessorDbExecAdapterBase | None:
+        # The adapter has to be initialized asynchronously, so don't create it here yet
+        return None
+
+    async def _start_fallback(self) -> ProcessorDbExecAdapterBase:
+        assert self._fallback_service is not None
+        assert self._fallback_processor is None
+        fallback_processor = self._fallback_service.get_data_processor(
+            reporting_registry=self._reporting_registry,
+            reporting_enabled=self._reporting_enabled,
+        )
+        await fallback_processor.start()
+        self._fallback_processor = fallback_processor
+        return fallback_processor.db_ex_adapter
+
+    async def start(self) -> None:
+        assert self._sqlite_conn is None, "should not double-enter"
+        sqlite_conn = SQLiteConnection(executor=self._executor)
+        await sqlite_conn.open()
+        self._sqlite_conn = sqlite_conn
+        self._db_ex_adapter = RoutingCompengExecAdapter(
+            reporting_registry=self._reporting_registry,
+            reporting_enabled=self._reporting_enabled,
+            cache_options_builder=self._cache_options_builder,
+            embedded=SQLiteExecAdapter(
+                reporting_registry=self._reporting_registry,
+                reporting_enabled=self._reporting_enabled,
+                cache_options_builder=self._cache_options_builder,
+                conn=sqlite_conn,
+            ),
+            start_fallback=self._start_fallback if self._fallback_service is not None else None,
+            max_input_rows=self._max_input_rows,
+        )
+
+    async def end(self) -> None:
+        self._db_ex_adapter = None
+        try:
+            if self._fallback_processor is not None:
+                await self._fallback_processor.end()
+        finally:
+            self._fallback_processor = None
+            if self._sqlite_conn is not None:
+                await self._sqlite_conn.close()
+                self._sqlite_conn = None
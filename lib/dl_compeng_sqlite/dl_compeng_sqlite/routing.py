@@ -0,0 +1,250 @@
+"""
+Routing of the data processing between the embedded engine and the fallback one (PostgreSQL).
+
+The uploaded tables are kept by the embedded engine while they are small enough and of the supported types,
+and the queries are executed there while SQLite executes them the same way as PostgreSQL. Once it doesn't,
+all the tables are moved to the fallback engine, and the rest of the data processing is done there.
+Without the fallback engine, the inputs that are too large or of the unsupported types are refused.
+"""
+
+from __future__ import annotations
+
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Sequence,
+)
+import logging
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+)
+
+import attr
+import sqlalchemy as sa
+
+from dl_cache_engine.primitives import LocalKeyRepresentation
+from dl_compeng_sqlite.exc import (
+    EmbeddedCompengError,
+    EmbeddedCompengInputTooLargeError,
+    EmbeddedCompengUnsupportedTypeError,
+)
+from dl_compeng_sqlite.exec_adapter import (
+    SQLiteExecAdapter,
+    SQLiteTypeTransformer,
+)
+from dl_constants import UserDataType
+from dl_core.connectors.base.query_compiler import QueryCompiler
+from dl_core.data_processing.prepared_components.primitives import PreparedFromInfo
+from dl_core.data_processing.processing.context import OpExecutionContext
+from dl_core.data_processing.processing.db_base.exec_adapter_base import ProcessorDbExecAdapterBase
+from dl_core.data_processing.types import TValuesChunkStream
+from dl_utils.streaming import (
+    AsyncChunked,
+    AsyncChunkedBase,
+)
+
+if TYPE_CHECKING:
+    from dl_constants.types import TBIDataValue
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+@attr.s
+class _UploadedTable:
+    names: Sequence[str] = attr.ib()
+    user_types: Sequence[UserDataType] = attr.ib()
+    # Lets the fallback engine keep the table for reuse
+    data_key: LocalKeyRepresentation | None = attr.ib(default=None)
+    # Kept to be moved to the fallback engine, `None` until inserted
+    rows: list[Sequence[TBIDataValue]] | None = attr.ib(default=None)
+
+
+async def _read_rows(
+    data: AsyncChunkedBase,
+    max_rows: int,
+) -> tuple[list[Sequence[TBIDataValue]], AsyncChunkedBase | None]:
+    """
+    Read up to `max_rows` rows (and a chunk more).
+    Returns the rows and the whole data if there is more than `max_rows` of it.
+    """
+    chunks: AsyncIterator[Sequence[Any]] = aiter(data.chunks)
+    rows: list[Sequence[TBIDataValue]] = []
+    async for chunk in chunks:
+        rows.extend(chunk)
+        if len(rows) > max_rows:
+            break
+    else:
+        return rows, None
+
+    async def whole_data() -> AsyncGenerator[Sequence[Any], None]:
+        yield rows
+        async for chunk in chunks:
+            yield chunk
+
+    return rows, AsyncChunked(chunked_data=whole_data())
+
+
+@attr.s
+class RoutingCompengExecAdapter(ProcessorDbExecAdapterBase):
+    _embedded: SQLiteExecAdapter = attr.ib(kw_only=True)
+    # Starts the fallback data processing, `None` if there is no fallback engine
+    _start_fallback: Callable[[], Awaitable[ProcessorDbExecAdapterBase]] | None = attr.ib(kw_only=True)
+    _max_input_rows: int = attr.ib(kw_only=True)
+    _tables: dict[str, _UploadedTable] = attr.ib(init=False, factory=dict)
+    _fallback: ProcessorDbExecAdapterBase | None = attr.ib(init=False, default=None)
+
+    _log: ClassVar[logging.Logger] = LOGGER.getChild("RoutingCompengExecAdapter")
+
+    @property
+    def uses_fallback(self) -> bool:
+        return self._fallback is not None
+
+    async def _switch_to_fallback(self, reason: str) -> ProcessorDbExecAdapterBase:
+        assert self._start_fallback is not None
+        assert self._fallback is None
+        self._log.info(f"Switching to the fallback data processing engine: {reason}")
+        fallback = await self._start_fallback()
+        for table_name, table in self._tables.items():
+            await fallback.create_table(
+                table_name=table_name,
+                names=table.names,
+                user_types=table.user_types,
+                data_key=table.data_key,
+            )
+            if table.rows is not None:
+                await fallback.insert_data_into_table(
+                    table_name=table_name,
+                    names=table.names,
+                    user_types=table.user_types,
+                    data=AsyncChunked.from_chunked_iterable([table.rows]),
+                )
+        self._tables.clear()
+        self._fallback = fallback
+        return fallback
+
+    async def create_table(
+        self,
+        *,
+        table_name: str,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+        data_key: LocalKeyRepresentation | None = None,
+    ) -> None:
+        if self._fallback is not None:
+            await self._fallback.create_table(
+                table_name=table_name,
+                names=names,
+                user_types=user_types,
+                data_key=data_key,
+            )
+            return
+        # Created on insertion, when it is known which engine the data goes to
+        self._tables[table_name] = _UploadedTable(names=names, user_types=user_types, data_key=data_key)
+
+    async def get_uploaded_table(
+        self,
+        *,
+        data_key: LocalKeyRepresentation,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+    ) -> str | None:
+        # The tables of the embedded engine are not kept, it's cheap to upload the small inputs again
+        if self._fallback is not None:
+            return await self._fallback.get_uploaded_table(data_key=data_key, names=names, user_types=user_types)
+        return None
+
+    async def insert_data_into_table(
+        self,
+        *,
+        table_name: str,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+        data: AsyncChunkedBase,
+    ) -> None:
+        fallback = self._fallback
+        if fallback is None:
+            # Without the fallback engine the same limits apply, the data that doesn't fit is not processed at all
+            if not SQLiteTypeTransformer.supports_user_types(user_types):
+                if self._start_fallback is None:
+                    raise EmbeddedCompengUnsupportedTypeError(
+                        db_message=f"Unsupported types of table {table_name}: {list(user_types)}"
+                    )
+                fallback = await self._switch_to_fallback(reason=f"unsupported types of table {table_name}")
+            else:
+                rows, whole_data = await _read_rows(data, max_rows=self._max_input_rows)
+                if whole_data is None:
+                    await self._insert_into_embedded(table_name=table_name, rows=rows)
+                    return
+                if self._start_fallback is None:
+                    raise EmbeddedCompengInputTooLargeError(
+                        db_message=f"Table {table_name} has more than {self._max_input_rows} rows"
+                    )
+                data = whole_data
+                fallback = await self._switch_to_fallback(reason=f"table {table_name} is too large")
+
+        await fallback.insert_data_into_table(table_name=table_name, names=names, user_types=user_types, data=data)
+
+    async def _insert_into_embedded(self, table_name: str, rows: list[Sequence[TBIDataValue]]) -> None:
+        table = self._tables[table_name]
+        await self._embedded.create_table(table_name=table_name, names=table.names, user_types=table.user_types)
+        await self._embedded.insert_data_into_table(
+            table_name=table_name,
+            names=table.names,
+            user_types=table.user_types,
+            data=AsyncChunked.from_chunked_iterable([rows]),
+        )
+        table.rows = rows
+
+    async def _execute_and_fetch(
+        self,
+        *,
+        query: str | sa.sql.selectable.Select,
+        user_types: Sequence[UserDataType],
+        chunk_size: int,
+        joint_dsrc_info: PreparedFromInfo | None = None,
+        query_id: str,
+        ctx: OpExecutionContext,
+        data_key: LocalKeyRepresentation,
+        preparation_callback: Callable[[], Awaitable[None]] | None,
+    ) -> TValuesChunkStream:
+        # Upload the data first: it decides which engine the query goes to
+        if preparation_callback is not None:
+            await preparation_callback()
+
+        fallback = self._fallback
+        if fallback is None:
+            try:
+                return await self._embedded._execute_and_fetch(
+                    query=query,
+                    user_types=user_types,
+                    chunk_size=chunk_size,
+                    joint_dsrc_info=joint_dsrc_info,
+                    query_id=query_id,
+                    ctx=ctx,
+                    data_key=data_key,
+                    preparation_callback=None,
+                )
+            except EmbeddedCompengError as err:
+                if self._start_fallback is None:
+                    raise
+                fallback = await self._switch_to_fallback(reason=f"query {query_id} failed: {err}")
+
+        return await fallback._execute_and_fetch(
+            query=query,
+            user_types=user_types,
+            chunk_size=chunk_size,
+            joint_dsrc_info=joint_dsrc_info,
+            query_id=query_id,
+            ctx=ctx,
+            data_key=data_key,
+            preparation_callback=None,
+        )
+
+    def get_query_compiler(self) -> QueryCompiler:
+        # Only quotes the identifiers, the same way in both engines
+        return self._embedded.get_query_compiler()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from collections.abc import (
+    AsyncGenerator,
+    Generator,
+)
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import pytest_asyncio
+
+from dl_compeng_sqlite.connection import SQLiteConnection
+from dl_formula.connectors.registration import CONN_REG_FORMULA
+from dl_formula.definitions.ll_registry_loader import (
+    populate_ll_op_registry,
+    populate_translation_registry,
+)
+
+from dl_connector_postgresql.formula.connector import PostgreSQLFormulaConnector
+
+
+@pytest.fixture(scope="session")
+def compeng_formula_dialect() -> None:
+    """The formulas are translated with the compeng dialect of the PostgreSQL connector, as in the data API"""
+    CONN_REG_FORMULA.register_connector(PostgreSQLFormulaConnector)
+    populate_translation_registry()
+    populate_ll_op_registry()
+
+
+@pytest.fixture(scope="module")
+def executor() -> Generator[ThreadPoolExecutor, None, None]:
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+@pytest_asyncio.fixture
+async def sqlite_conn(executor: ThreadPoolExecutor) -> AsyncGenerator[SQLiteConnection, None]:
+    conn = SQLiteConnection(executor=executor)
+    await conn.open()
+    yield conn
+    await conn.close()
@@ -0,0 +1,87 @@
+import sqlalchemy as sa
+
+from dl_compeng_sqlite.dialect import (
+    CompengSQLiteDialect,
+    compile_sqlite_query,
+    get_unsupported_constructs,
+)
+
+
+def test_nulls_order() -> None:
+    table = sa.table("tbl", sa.column("a"), sa.column("b"))
+    query = sa.select(
+        [table.c.a, sa.func.row_number().over(order_by=[table.c.b.desc(), table.c.a])],
+    ).order_by(table.c.a, table.c.b.desc(), sa.nullsfirst(table.c.b))
+    query_text, _ = compile_sqlite_query(query, CompengSQLiteDialect())
+    assert "OVER (ORDER BY tbl.b DESC NULLS FIRST, tbl.a NULLS LAST)" in query_text
+    assert query_text.endswith("ORDER BY tbl.a NULLS LAST, tbl.b DESC NULLS FIRST, tbl.b NULLS FIRST")
+
+
+def test_params() -> None:
+    table = sa.table("tbl", sa.column("a"))
+    query = sa.select([table.c.a]).where(table.c.a.in_([1, 2])).limit(5)
+    query_text, params = compile_sqlite_query(query, CompengSQLiteDialect())
+    assert query_text.count("?") == len(params)
+    assert list(params) == [1, 2, 5, 0]
+
+
+def test_unsupported_types() -> None:
+    table = sa.table("tbl", sa.column("a", sa.Integer), sa.column("b", sa.Text))
+    assert get_unsupported_constructs(sa.select([table.c.a + 1, sa.cast(table.c.b, sa.String)])) == []
+    unsupported = get_unsupported_constructs(sa.select([table.c.a]).where(sa.cast(table.c.b, sa.Date) > sa.func.now()))
+    assert "type Date()" in unsupported
+    assert "function now" in unsupported
+
+
+def test_unsupported_constructs() -> None:
+    table = sa.table("tbl", sa.column("a", sa.Integer), sa.column("b", sa.Text), sa.column("c"))
+    supported = sa.select(
+        [
+            sa.func.count(sa.distinct(table.c.b)),
+            sa.func.max(sa.cast(table.c.a, sa.Float) / sa.func.nullif(table.c.a, 0)),
+            sa.cast(sa.literal(1.5), sa.Float),
+            sa.cast(sa.literal("x"), sa.Text),
+        ]
+    ).where(sa.and_(table.c.b.like("x%"), table.c.a.in_([1, 2]), table.c.c.is_(None)))
+    assert get_unsupported_constructs(supported) == []
+
+    assert get_unsupported_constructs(sa.select([sa.func.lower(table.c.b)])) == ["function lower"]
+    assert get_unsupported_constructs(sa.select([table.c.b.ilike("x%")])) == ["operator ilike_op"]
+    assert get_unsupported_constructs(sa.select([table.c.a]).distinct(table.c.b)) == ["DISTINCT ON"]
+    assert get_unsupported_constructs(sa.select([sa.text("1")])) == ["construct TextClause"]
+    for cast in (sa.cast(table.c.b, sa.Integer), sa.cast(table.c.b, sa.Float), sa.cast(table.c.c, sa.Text)):
+        assert get_unsupported_constructs(sa.select([cast])) == [f"cast of {cast.clause.type!r} to {cast.type!r}"]
+
+
+def test_string_ordering() -> None:
+    table = sa.table("tbl", sa.column("a", sa.Integer), sa.column("b", sa.Text), sa.column("c"), sa.column("d"))
+    assert (
+        get_unsupported_constructs(
+            sa.select([table.c.a, table.c.c, sa.func.max(table.c.a)])
+            .where(sa.and_(table.c.b == "x", table.c.c.in_(["y"]), table.c.a > 1, table.c.d < 2))
+            .group_by(table.c.a, table.c.c)
+            .order_by(table.c.a, table.c.d),
+            text_columns=["c"],
+        )
+        == []
+    )
+
+    def check(query: sa.sql.Select, expected: str) -> None:
+        assert get_unsupported_constructs(query, text_columns=["c"]) == [expected]
+
+    check(sa.select([table.c.b]).order_by(table.c.b), "ordering by strings")
+    check(sa.select([table.c.c]).order_by(sa.nullsfirst(table.c.c.desc())), "ordering by strings")
+    check(sa.select([sa.func.rank().over(order_by=table.c.c + "x")]), "ordering by strings")
+    check(sa.select([sa.func.min(table.c.c)]), "min of strings")
+    check(sa.select([table.c.a]).where(table.c.c >= "x"), "comparison of strings (ge)")
+    check(sa.select([table.c.a]).where(table.c.d.between("x", "y")), "comparison of strings (between_op)")
+    check(sa.select([table.c.c.label("x")]).order_by("x"), "ordering by strings")
+    check(sa.select([sa.func.coalesce(table.c.c, "").label("x")]).order_by("x"), "ordering by strings")
+
+
+def test_like_escape() -> None:
+    table = sa.table("tbl", sa.column("b"))
+    query = sa.select([table.c.b]).where(sa.and_(table.c.b.like("x\\%"), table.c.b.notlike("y%", escape="!")))
+    query_text, _ = compile_sqlite_query(query, CompengSQLiteDialect())
+    assert "tbl.b LIKE ? ESCAPE '\\'" in query_text
+    assert "tbl.b NOT LIKE ? ESCAPE '!'" in query_text
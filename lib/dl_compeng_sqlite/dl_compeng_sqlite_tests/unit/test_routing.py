@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import (
+    Any,
+    ClassVar,
+)
+
+import attr
+import pytest
+import sqlalchemy as sa
+
+from dl_api_commons.base_models import RequestContextInfo
+from dl_api_commons.reporting.registry import DefaultReportingRegistry
+from dl_cache_engine.primitives import CacheTTLConfig
+from dl_compeng_sqlite.connection import SQLiteConnection
+from dl_compeng_sqlite.exc import (
+    EmbeddedCompengError,
+    EmbeddedCompengInputTooLargeError,
+    EmbeddedCompengUnsupportedQueryError,
+    EmbeddedCompengUnsupportedTypeError,
+)
+from dl_compeng_sqlite.exec_adapter import (
+    SQLiteExecAdapter,
+    SQLiteTypeTransformer,
+)
+from dl_compeng_sqlite.routing import RoutingCompengExecAdapter
+from dl_constants import UserDataType
+from dl_core.data_processing.cache.utils import CompengOptionsBuilder
+from dl_core.data_processing.processing.context import OpExecutionContext
+from dl_core.data_processing.processing.db_base.exec_adapter_base import ProcessorDbExecAdapterBase
+from dl_formula.core.datatype import DataType
+from dl_formula.parser.factory import get_parser
+from dl_formula.translation.translator import translate
+from dl_utils.streaming import AsyncChunked
+
+from dl_connector_postgresql.formula.constants import PostgreSQLDialect as D
+
+NAMES = ["a", "b"]
+
+
+class FallbackTypeTransformer(SQLiteTypeTransformer):
+    user_to_sa_type: ClassVar[dict[UserDataType, type[sa.types.TypeEngine]]] = {
+        **SQLiteTypeTransformer.user_to_sa_type,
+        UserDataType.uuid: sa.Text,
+    }
+
+
+@attr.s
+class FallbackExecAdapter(SQLiteExecAdapter):
+    """Another SQLite database (with more types) that records the queries it gets"""
+
+    _tt: SQLiteTypeTransformer = attr.ib(factory=FallbackTypeTransformer, init=False)
+    queries: list[str] = attr.ib(init=False, factory=list)
+
+    async def _execute_and_fetch(self, *, query: Any, **kwargs: Any) -> Any:
+        self.queries.append(str(query))
+        return await super()._execute_and_fetch(query=query, **kwargs)
+
+    def _check_query(self, query: sa.sql.selectable.Select) -> None:
+        # Executes everything, as PostgreSQL does
+        pass
+
+
+def _make_adapter_kwargs() -> dict[str, Any]:
+    return {
+        "reporting_registry": DefaultReportingRegistry(rci=RequestContextInfo.create_empty()),
+        "cache_options_builder": CompengOptionsBuilder(default_ttl_config=CacheTTLConfig()),
+    }
+
+
+@attr.s
+class RoutingSetup:
+    adapter: RoutingCompengExecAdapter = attr.ib()
+    fallback: FallbackExecAdapter = attr.ib()
+
+
+@pytest.fixture
+def routing(sqlite_conn: SQLiteConnection, executor: Any) -> RoutingSetup:
+    fallback = FallbackExecAdapter(conn=SQLiteConnection(executor=executor), **_make_adapter_kwargs())
+
+    async def start_fallback() -> ProcessorDbExecAdapterBase:
+        await fallback._conn.open()
+        return fallback
+
+    adapter = RoutingCompengExecAdapter(
+        embedded=SQLiteExecAdapter(conn=sqlite_conn, **_make_adapter_kwargs()),
+        start_fallback=start_fallback,
+        max_input_rows=10,
+        **_make_adapter_kwargs(),
+    )
+    return RoutingSetup(adapter=adapter, fallback=fallback)
+
+
+async def _upload(
+    adapter: ProcessorDbExecAdapterBase,
+    table_name: str,
+    rows: Sequence[Sequence[Any]],
+    user_types: Sequence[UserDataType] = (UserDataType.integer, UserDataType.string),
+) -> None:
+    await adapter.create_table(table_name=table_name, names=NAMES, user_types=user_types)
+    await adapter.insert_data_into_table(
+        table_name=table_name,
+        names=NAMES,
+        user_types=user_types,
+        data=AsyncChunked.from_chunked_iterable([rows[idx : idx + 3] for idx in range(0, len(rows), 3)]),
+    )
+
+
+async def _fetch(adapter: ProcessorDbExecAdapterBase, query: Any, user_types: Sequence[UserDataType]) -> list:
+    data = await adapter.fetch_data_from_select(
+        query=query,
+        user_types=user_types,
+        query_id="q",
+        ctx=OpExecutionContext(processing_id="", streams=[], operations=[]),
+    )
+    return await data.all()
+
+
+def _make_rows(count: int) -> list[list[Any]]:
+    return [[idx if idx % 4 else None, f"v{idx % 3}"] for idx in range(count)]
+
+
+def _make_query(table_name: str) -> sa.sql.Select:
+    table = sa.table(table_name, sa.column("a"), sa.column("b"))
+    # Not ordered by the strings: that's left to the fallback engine
+    return (
+        sa.select([table.c.b, sa.func.sum(table.c.a), sa.func.max(table.c.a)])
+        .group_by(table.c.b)
+        .order_by(sa.func.max(table.c.a))
+    )
+
+
+QUERY_USER_TYPES = [UserDataType.string, UserDataType.integer, UserDataType.integer]
+
+
+@pytest.mark.asyncio
+async def test_small_input_processed_embedded(routing: RoutingSetup) -> None:
+    await _upload(routing.adapter, "t1", _make_rows(9))
+    assert await _fetch(routing.adapter, _make_query("t1"), QUERY_USER_TYPES) == [
+        ["v2", 7, 5],
+        ["v0", 9, 6],
+        ["v1", 8, 7],
+    ]
+    assert not routing.adapter.uses_fallback
+    assert routing.fallback.queries == []
+
+
+@pytest.mark.asyncio
+async def test_nulls_ordered_as_in_postgresql(routing: RoutingSetup) -> None:
+    await _upload(routing.adapter, "t1", _make_rows(5))
+    table = sa.table("t1", sa.column("a"))
+    assert await _fetch(routing.adapter, sa.select([table.c.a]).order_by(table.c.a), [UserDataType.integer]) == [
+        [1],
+        [2],
+        [3],
+        [None],
+        [None],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_large_input_moved_to_fallback(routing: RoutingSetup) -> None:
+    await _upload(routing.adapter, "t1", _make_rows(5))
+    await _upload(routing.adapter, "t2", _make_rows(30))
+    assert routing.adapter.uses_fallback
+
+    table_1 = sa.table("t1", sa.column("a"))
+    table_2 = sa.table("t2", sa.column("a"))
+    query = sa.select([sa.select([sa.func.count()]).select_from(table_1).scalar_subquery(), sa.func.count()])
+    query = query.select_from(table_2)
+    assert await _fetch(routing.adapter, query, [UserDataType.integer, UserDataType.integer]) == [[5, 30]]
+    assert len(routing.fallback.queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_unsupported_types_moved_to_fallback(routing: RoutingSetup) -> None:
+    await _upload(routing.adapter, "t1", _make_rows(5))
+    uuid = "a0eebc99-9c0b-4ef8-bb6d-6bb9bd380a11"
+    await _upload(routing.adapter, "t2", [[1, uuid]], user_types=[UserDataType.integer, UserDataType.uuid])
+    assert routing.adapter.uses_fallback
+
+    table = sa.table("t2", sa.column("b"))
+    assert await _fetch(routing.adapter, sa.select([table.c.b]), [UserDataType.uuid]) == [[uuid]]
+    assert len(routing.fallback.queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_query_moved_to_fallback(routing: RoutingSetup) -> None:
+    await _upload(routing.adapter, "t1", _make_rows(5))
+    table = sa.table("t1", sa.column("a"))
+    query = sa.select([sa.func.count()]).select_from(table)
+    assert await _fetch(routing.adapter, query, [UserDataType.integer]) == [[5]]
+    assert not routing.adapter.uses_fallback
+
+    # A function SQLite doesn't have: fails in the fallback too, but after the tables are moved there
+    with pytest.raises(EmbeddedCompengError):
+        await _fetch(routing.adapter, sa.select([sa.func.no_such_function(table.c.a)]), [UserDataType.integer])
+    assert routing.adapter.uses_fallback
+    assert await _fetch(routing.adapter, query, [UserDataType.integer]) == [[5]]
+
+
+@pytest.mark.asyncio
+async def test_no_fallback(sqlite_conn: SQLiteConnection) -> None:
+    adapter = RoutingCompengExecAdapter(
+        embedded=SQLiteExecAdapter(conn=sqlite_conn, **_make_adapter_kwargs()),
+        start_fallback=None,
+        max_input_rows=10,
+        **_make_adapter_kwargs(),
+    )
+    await _upload(adapter, "t1", _make_rows(9))
+    assert await _fetch(adapter, _make_query("t1"), QUERY_USER_TYPES) == [
+        ["v2", 7, 5],
+        ["v0", 9, 6],
+        ["v1", 8, 7],
+    ]
+    with pytest.raises(EmbeddedCompengInputTooLargeError):
+        await _upload(adapter, "t2", _make_rows(30))
+    with pytest.raises(EmbeddedCompengUnsupportedTypeError):
+        await _upload(adapter, "t3", [[1, "2020-01-01"]], user_types=[UserDataType.integer, UserDataType.date])
+    table = sa.table("t1", sa.column("b"))
+    with pytest.raises(EmbeddedCompengUnsupportedQueryError):
+        await _fetch(adapter, sa.select([table.c.b]).order_by(table.c.b), [UserDataType.string])
+
+
+def _make_formula_query(table_name: str, formula: str) -> sa.sql.Select:
+    ctx = translate(
+        get_parser().parse(formula),
+        dialect=D.COMPENG,
+        field_types={"a": DataType.INTEGER, "b": DataType.STRING},
+        field_names={"a": (table_name, "a"), "b": (table_name, "b")},
+    )
+    return sa.select([ctx.expression]).select_from(sa.table(table_name))
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("compeng_formula_dialect")
+@pytest.mark.parametrize(
+    ("formula", "user_type", "expected"),
+    [
+        ("[a] + 1.5", UserDataType.float, [None, 2.5, 3.5, 4.5, None]),
+        ("IFNULL([a], 0) * 2 - 1", UserDataType.integer, [-1, 1, 3, 5, -1]),
+        ('IF [a] > 1 THEN "x" ELSE [b] + "!" END', UserDataType.string, ["v0!", "v1!", "x", "x", "v1!"]),
+        ('CONTAINS([b], "1")', UserDataType.boolean, [False, True, False, False, True]),
+        ('STARTSWITH([b], "V")', UserDataType.boolean, [False] * 5),
+        ('CONTAINS([b] + "%", "1%")', UserDataType.boolean, [False, True, False, False, True]),
+        ('CONTAINS([b], "_")', UserDataType.boolean, [False] * 5),
+        ("[a] IN (1, 3) OR ISNULL([a])", UserDataType.boolean, [True, True, False, True, True]),
+    ],
+)
+async def test_formula_processed_embedded(
+    routing: RoutingSetup,
+    formula: str,
+    user_type: UserDataType,
+    expected: list[Any],
+) -> None:
+    await _upload(routing.adapter, "t1", _make_rows(5))
+    rows = await _fetch(routing.adapter, _make_formula_query("t1", formula), [user_type])
+    assert [value for value, in rows] == expected
+    assert not routing.adapter.uses_fallback
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("compeng_formula_dialect")
+@pytest.mark.parametrize(
+    ("formula", "user_type"),
+    [
+        # Non-ASCII text is not changed by SQLite
+        ("LOWER([b])", UserDataType.string),
+        ('ICONTAINS([b], "V")', UserDataType.boolean),
+        # `CAST('v0' AS INTEGER)` is 0 in SQLite
+        ("INT([b])", UserDataType.integer),
+        ("FLOAT([b])", UserDataType.float),
+        # The same cast of a column of an unknown type
+        ("[a] / 2", UserDataType.float),
+        ("AVG([a])", UserDataType.float),
+        ("[a] % 3", UserDataType.integer),
+    ],
+)
+async def test_formula_moved_to_fallback(routing: RoutingSetup, formula: str, user_type: UserDataType) -> None:
+    await _upload(routing.adapter, "t1", _make_rows(5))
+    query = _make_formula_query("t1", formula)
+    await _fetch(routing.adapter, query, [user_type])
+    assert routing.adapter.uses_fallback
+    assert routing.fallback.queries == [str(query)]
+
+
+@pytest.mark.asyncio
+async def test_distinct_on_moved_to_fallback(routing: RoutingSetup) -> None:
+    await _upload(routing.adapter, "t1", _make_rows(5))
+    table = sa.table("t1", sa.column("a"), sa.column("b"))
+    query = sa.select([table.c.b, table.c.a]).distinct(table.c.b).order_by(table.c.b, table.c.a)
+    await _fetch(routing.adapter, query, [UserDataType.string, UserDataType.integer])
+    assert routing.adapter.uses_fallback
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "make_query",
+    [
+        lambda table: sa.select([table.c.b]).order_by(table.c.b.desc()),
+        lambda table: sa.select([sa.func.row_number().over(order_by=table.c.b)]),
+        lambda table: sa.select([sa.func.max(table.c.b)]),
+        lambda table: sa.select([table.c.a]).where(table.c.b > "V"),
+        lambda table: sa.select([table.c.a]).where(table.c.b.between("A", "z")),
+        lambda table: sa.select([sa.func.coalesce(table.c.b, "").label("x")]).order_by("x"),
+    ],
+)
+async def test_string_ordering_moved_to_fallback(routing: RoutingSetup, make_query: Any) -> None:
+    # "V" < "v" with the BINARY collation of SQLite, but not with the locale ones of PostgreSQL
+    await _upload(routing.adapter, "t1", _make_rows(5))
+    await _fetch(routing.adapter, make_query(sa.table("t1", sa.column("a"), sa.column("b"))), [UserDataType.string])
+    assert routing.adapter.uses_fallback
+
+
+@pytest.mark.asyncio
+async def test_string_equality_processed_embedded(routing: RoutingSetup) -> None:
+    await _upload(routing.adapter, "t1", _make_rows(5))
+    table = sa.table("t1", sa.column("a"), sa.column("b"))
+    query = sa.select([table.c.a]).where(sa.and_(table.c.b == "v1", table.c.a > 0)).order_by(table.c.a)
+    assert await _fetch(routing.adapter, query, [UserDataType.integer]) == [[1]]
+    assert not routing.adapter.uses_fallback
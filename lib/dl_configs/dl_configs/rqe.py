@@ -18,6 +18,8 @@ from dl_configs.utils import validate_one_of
 
 class RQEExecuteRequestMode(enum.Enum):
     STREAM = "stream"
+    # Same as `STREAM`, but asks the RQE for the framed binary format (falls back to `STREAM` if not supported).
+    STREAM_FRAMED = "stream_framed"
     NON_STREAM = "non_stream"
 
 
@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import (
+    AsyncGenerator,
+    Generator,
+    Sequence,
+)
+import contextlib
 import datetime
 import json
 import logging
@@ -10,6 +16,7 @@ from typing import (
 )
 import uuid
 
+from aiohttp import ClientResponse
 import attr
 from redis_cache_lock.types import TClientACM
 from redis_cache_lock.utils import wrap_generate_func
@@ -53,6 +60,10 @@ from dl_connector_bitrix_gds.core.constants import (
     DEFAULT_DB,
 )
 from dl_connector_bitrix_gds.core.error_transformer import bitrix_error_transformer
+from dl_connector_bitrix_gds.core.response_parser import (
+    JSONArrayStreamParser,
+    RowsProjection,
+)
 from dl_connector_bitrix_gds.core.tables import (
     BITRIX_TABLES_MAP,
     CRM_DYNAMIC_ITEMS_TABLE,
@@ -138,6 +149,13 @@ class BitrixGDSDefaultAdapter(AiohttpDBAdapter, ETBasedExceptionMaker):
     @generic_profiler_async("db-query")
     async def _run_query(self, dba_query: DBAdapterQuery) -> Any:
         query_text = self.compile_query_for_execution(dba_query.query)
+        # TODO: BI-6448 check it works and replace
+        # debug_query = compile_query_for_debug(dba_query.query, self.get_dialect())
+        with self.handle_execution_error(debug_query=query_text, inspector_query=query_text):
+            resp = await self._send_query(dba_query, query_text)
+            return await resp.json()
+
+    async def _send_query(self, dba_query: DBAdapterQuery, query_text: str) -> ClientResponse:
         payload = self._build_request_payload(dba_query)
 
         api_url = f"https://{self._target_dto.portal}/bitrix/tools/biconnector/pbi.php"
@@ -160,44 +178,46 @@ class BitrixGDSDefaultAdapter(AiohttpDBAdapter, ETBasedExceptionMaker):
         if limit is not None:
             request_params["limit"] = limit
 
-        # TODO: BI-6448 check it works and replace
-        # debug_query = compile_query_for_debug(dba_query.query, self.get_dialect())
-        with self.handle_execution_error(debug_query=query_text, inspector_query=query_text):
-            resp = await self._session.post(
-                url=api_url,
-                params=request_params,
-                json=payload.json_body,
-                allow_redirects=False,
-            )
-
-            if resp.status != 200:
-                body = await resp.text()
-                raise DatabaseQueryError(db_message=body, query=query_text)
+        resp = await self._session.post(
+            url=api_url,
+            params=request_params,
+            json=payload.json_body,
+            allow_redirects=False,
+        )
 
-            return await resp.json()
+        if resp.status != 200:
+            body = await resp.text()
+            raise DatabaseQueryError(db_message=body, query=query_text)
 
-    def _parse_response_body_data(self, body: list, selected_columns: list | None = None) -> dict:
-        if not len(body):
-            raise ValueError("empty response")
-        cols = body[0]
-        rows = body[1:]
+        return resp
 
+    async def _iter_response_items(self, resp: ClientResponse) -> AsyncGenerator[list[Any], None]:
+        """Items of the response array (the header and the rows), in batches as they are received"""
+        parser = JSONArrayStreamParser()
+        try:
+            async for data in resp.content.iter_chunked(self._http_read_chunk_size):
+                items = parser.receive_data(data)
+                if items:
+                    yield items
+            items = parser.finish()
+            if items:
+                yield items
+        finally:
+            resp.release()
+
+    def _make_cursor_cols(self, columns: Sequence[str]) -> list[dict[str, Any]]:
         assert self.table is not None
         columns_type = self.table.get_columns_type()
-        if selected_columns is None:
-            selected_columns = cols
+        return [{"id": col, "label": col, "type": columns_type.get(col, "string")} for col in columns]
 
-        try:
-            normalized_data = {
-                "cols": [
-                    {"id": col, "label": col, "type": columns_type.get(col, "string")} for col in selected_columns
-                ],
-                "rows": [[dict(zip(cols, row, strict=True))[col] for col in selected_columns] for row in rows],
-            }
-        except (KeyError, TypeError, ValueError) as e:
-            raise ValueError("unexpected data structure") from e
-
-        return normalized_data
+    def _parse_response_body_data(self, body: list, selected_columns: list | None = None) -> dict:
+        if not len(body):
+            raise ValueError("empty response")
+        projection = RowsProjection.from_header(body[0], selected_columns)
+        return {
+            "cols": self._make_cursor_cols(projection.columns),
+            "rows": projection.project(body[1:]),
+        }
 
     def _table_schema(self, table: str) -> BitrixGDSTable:
         if table.startswith(SMART_PROCESS_TABLE_PREFIX):
@@ -228,19 +248,22 @@ class BitrixGDSDefaultAdapter(AiohttpDBAdapter, ETBasedExceptionMaker):
         assert isinstance(query, sa.sql.Select)
         return query._limit  # type: ignore  # TODO: "Select" has no attribute "_limit"  [attr-defined]
 
-    def _parse_response_body(self, body: Any, dba_query: DBAdapterQuery) -> dict:
+    def _get_selected_columns(self, dba_query: DBAdapterQuery) -> list[str] | None:
         assert isinstance(dba_query.query, sa.sql.Select)
         selected_columns_values = dba_query.query.selected_columns.values()
-        selected_columns: list[str] | None = None
-        if "*" not in {column.name for column in selected_columns_values}:
-            selected_columns = [extract_select_column_name(column) for column in selected_columns_values]
-            # 'table."COLUMN_NAME"' -> 'COLUMN_NAME'
-            selected_columns = [col.split(".")[-1].replace('"', "").replace("`", "") for col in selected_columns]
-
+        if "*" in {column.name for column in selected_columns_values}:
+            return None
+        selected_columns = [extract_select_column_name(column) for column in selected_columns_values]
+        # 'table."COLUMN_NAME"' -> 'COLUMN_NAME'
+        return [col.split(".")[-1].replace('"', "").replace("`", "") for col in selected_columns]
+
+    @contextlib.contextmanager
+    def _handle_unexpected_response_body(self, dba_query: DBAdapterQuery) -> Generator[None, None, None]:
         try:
-            if not isinstance(body, list):
-                raise TypeError("Unexpected response format")
-            return self._parse_response_body_data(body, selected_columns=selected_columns)
+            yield
+        except json.JSONDecodeError:
+            # Not a JSON at all, handled by the error transformer
+            raise
         except (ValueError, TypeError) as err:
             LOGGER.debug("Unexpected API response")
             raise DatabaseQueryError(
@@ -252,28 +275,76 @@ class BitrixGDSDefaultAdapter(AiohttpDBAdapter, ETBasedExceptionMaker):
                 details={},
             ) from err
 
-    @generic_profiler_async("db-full")  # type: ignore  # TODO: fix
-    async def execute(self, query: DBAdapterQuery) -> AsyncRawExecutionResult:
+    def _parse_response_body(self, body: Any, dba_query: DBAdapterQuery) -> dict:
+        selected_columns = self._get_selected_columns(dba_query)
+        with self._handle_unexpected_response_body(dba_query):
+            if not isinstance(body, list):
+                raise TypeError("Unexpected response format")
+            return self._parse_response_body_data(body, selected_columns=selected_columns)
+
+    async def _execute_cached(self, query: DBAdapterQuery) -> AsyncRawExecutionResult:
+        # The cached result is the whole response body
         with self.wrap_execute_excs(query=query, stage="request"):
-            if self._redis_cli_acm is not None:
-                resp_body = await self._run_query_cached(query)
-            else:
-                resp_body = await self._run_query(query)
+            resp_body = await self._run_query_cached(query)
 
         rd = self._parse_response_body(resp_body, query)
 
         async def chunk_gen(chunk_size=query.chunk_size or self._default_chunk_size):  # type: ignore  # TODO: fix
             data = rd["rows"]
-            while data:
-                chunk = data[:chunk_size]
-                data = data[chunk_size:]
-                yield chunk
+            for start in range(0, len(data), chunk_size):
+                yield data[start : start + chunk_size]
 
         return AsyncRawExecutionResult(
             raw_cursor_info={"cols": rd["cols"]},
             raw_chunk_generator=chunk_gen(),
         )
 
+    @generic_profiler_async("db-full")  # type: ignore  # TODO: fix
+    async def execute(self, query: DBAdapterQuery) -> AsyncRawExecutionResult:
+        if self._redis_cli_acm is not None:
+            return await self._execute_cached(query)
+
+        query_text = self.compile_query_for_execution(query.query)
+        with (
+            self.wrap_execute_excs(query=query, stage="request"),
+            self.handle_execution_error(debug_query=query_text, inspector_query=query_text),
+        ):
+            resp = await self._send_query(query, query_text)
+
+        items_generator = self._iter_response_items(resp)
+        with (
+            self.wrap_execute_excs(query=query, stage="meta"),
+            self.handle_execution_error(debug_query=query_text, inspector_query=query_text),
+            self._handle_unexpected_response_body(query),
+        ):
+            try:
+                first_items = await items_generator.__anext__()
+            except StopAsyncIteration:
+                raise ValueError("empty response") from None
+            projection = RowsProjection.from_header(first_items[0], self._get_selected_columns(query))
+            cols = self._make_cursor_cols(projection.columns)
+
+        async def chunk_gen(chunk_size=query.chunk_size or self._default_chunk_size):  # type: ignore  # TODO: fix
+            rows = first_items[1:]
+            with (
+                self.wrap_execute_excs(query=query, stage="rows"),
+                self.handle_execution_error(debug_query=query_text, inspector_query=query_text),
+                self._handle_unexpected_response_body(query),
+            ):
+                async for items in items_generator:
+                    rows.extend(items)
+                    if len(rows) >= chunk_size:
+                        for start in range(0, len(rows) - chunk_size + 1, chunk_size):
+                            yield projection.project(rows[start : start + chunk_size])
+                        del rows[: len(rows) - len(rows) % chunk_size]
+                if rows:
+                    yield projection.project(rows)
+
+        return AsyncRawExecutionResult(
+            raw_cursor_info={"cols": cols},
+            raw_chunk_generator=chunk_gen(),
+        )
+
     async def get_tables(self, schema_ident: SchemaIdent, page_ident: PageIdent | None = None) -> list[TableIdent]:
         known_general_tables = BITRIX_TABLES_MAP.keys()
         user_tables = await self._get_user_tables(schema_ident)
@@ -0,0 +1,174 @@
+"""
+Parsing of the `pbi.php` responses: a JSON array of the rows, the first one being the header (the column names).
+
+The array is parsed incrementally, so that the rows can be passed on as the response is being received,
+and the selected columns are looked up in the header once, not per row.
+"""
+
+from __future__ import annotations
+
+import codecs
+from collections.abc import Sequence
+import enum
+import json
+import re
+from typing import Any
+
+import attr
+
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+
+
+@enum.unique
+class _ParserState(enum.Enum):
+    START = "START"
+    FIRST_ITEM = "FIRST_ITEM"  # an item or the end of the array
+    ITEM = "ITEM"  # an item after a comma
+    AFTER_ITEM = "AFTER_ITEM"  # a comma or the end of the array
+    FINISHED = "FINISHED"
+    NOT_ARRAY = "NOT_ARRAY"
+
+
+class JSONArrayStreamParser:
+    """
+    Incremental parser of a top-level JSON array, returns the items as soon as they are received entirely.
+
+    The items are decoded by `json.JSONDecoder.raw_decode` right from the buffer; an item that is not received
+    entirely is decoded again once a closing bracket is received (which is required to finish the array anyway).
+    Anything but an array is buffered up to the end and then fails the same way as `ClientResponse.json()` would.
+    """
+
+    def __init__(self) -> None:
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._state = _ParserState.START
+        self._buffer = ""
+        self._incomplete_item = False
+
+    @property
+    def finished(self) -> bool:
+        return self._state is _ParserState.FINISHED
+
+    def receive_data(self, data: bytes) -> list[Any]:
+        return self._process(self._text_decoder.decode(data))
+
+    def finish(self) -> list[Any]:
+        """To be called at the end of the response, returns the remaining items"""
+        items = self._process(self._text_decoder.decode(b"", final=True))
+        buffer = self._buffer
+        if self._state is _ParserState.START or self._state is _ParserState.NOT_ARRAY:
+            if not buffer.strip():
+                # `ClientResponse.json()` returns `None` for an empty body
+                raise TypeError("Unexpected response format")
+            json.loads(buffer)
+            raise TypeError("Unexpected response format")
+        if self._state is not _ParserState.FINISHED:
+            raise json.JSONDecodeError("Unexpected end of the array", buffer, len(buffer))
+        return items
+
+    def _process(self, text: str) -> list[Any]:
+        if self._incomplete_item and "]" not in text and "}" not in text:
+            # Can't be complete yet
+            self._buffer += text
+            return []
+
+        buffer = self._buffer + text if self._buffer else text
+        if self._state is _ParserState.NOT_ARRAY:
+            self._buffer = buffer
+            return []
+
+        items: list[Any] = []
+        decode = self._json_decoder.raw_decode
+        match_whitespace = _WHITESPACE_RE.match
+        end = len(buffer)
+        pos = 0
+        state = self._state
+        self._incomplete_item = False
+        while True:
+            pos = match_whitespace(buffer, pos).end()  # type: ignore  # always matches
+            if pos == end:
+                break
+            char = buffer[pos]
+
+            if state is _ParserState.AFTER_ITEM:
+                if char == ",":
+                    state = _ParserState.ITEM
+                elif char == "]":
+                    state = _ParserState.FINISHED
+                else:
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                pos += 1
+            elif state is _ParserState.ITEM or state is _ParserState.FIRST_ITEM:
+                if char == "]" and state is _ParserState.FIRST_ITEM:
+                    state = _ParserState.FINISHED
+                    pos += 1
+                    continue
+                try:
+                    item, item_end = decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Either not received entirely or malformed, the latter is reported by `finish`
+                    self._incomplete_item = True
+                    break
+                if item_end == end and char not in "[{":
+                    # A number (or a string) at the end of the buffer might be continued by the next data
+                    self._incomplete_item = True
+                    break
+                items.append(item)
+                pos = item_end
+                state = _ParserState.AFTER_ITEM
+            elif state is _ParserState.START:
+                if char != "[":
+                    state = _ParserState.NOT_ARRAY
+                    break
+                state = _ParserState.FIRST_ITEM
+                pos += 1
+            else:
+                raise json.JSONDecodeError("Extra data", buffer, pos)
+
+        self._state = state
+        self._buffer = buffer[pos:]
+        return items
+
+
+@attr.s(frozen=True)
+class RowsProjection:
+    """Positions of the selected columns in the rows, looked up in the header of the response"""
+
+    columns: tuple[str, ...] = attr.ib()
+    row_length: int = attr.ib()
+    # `None` when the rows are taken as they are
+    indices: tuple[int, ...] | None = attr.ib()
+    missing_columns: tuple[str, ...] = attr.ib(default=())
+
+    @classmethod
+    def from_header(cls, header: Any, selected_columns: Sequence[str] | None = None) -> RowsProjection:
+        if not isinstance(header, list):
+            raise ValueError("unexpected data structure")
+        try:
+            # The last one of the duplicate columns takes precedence, as in `dict(zip(header, row))`
+            positions = {col: idx for idx, col in enumerate(header)}
+        except TypeError as e:
+            raise ValueError("unexpected data structure") from e
+
+        if selected_columns is None:
+            if len(positions) == len(header):
+                return cls(columns=tuple(header), row_length=len(header), indices=None)
+            selected_columns = header
+
+        return cls(
+            columns=tuple(selected_columns),
+            row_length=len(header),
+            indices=tuple(positions.get(col, -1) for col in selected_columns),
+            missing_columns=tuple(col for col in selected_columns if col not in positions),
+        )
+
+    def project(self, rows: list[Any]) -> list[list[Any]]:
+        if not rows:
+            return []
+        row_length = self.row_length
+        if self.missing_columns or any(type(row) is not list or len(row) != row_length for row in rows):
+            raise ValueError("unexpected data structure")
+        indices = self.indices
+        if indices is None:
+            return rows
+        return [[row[idx] for idx in indices] for row in rows]
@@ -0,0 +1,158 @@
+"""
+Parsing of synthetic wide `pbi.php` responses (half of the columns selected), by the number of the columns,
+for the implementation that used to be used (the whole body decoded at once, a `dict(zip(header, row))`
+per selected value, the chunks sliced off the rest of the rows) and the streaming one
+(the body decoded as it is received, the columns looked up in the header once); each case in a separate process.
+
+The body is produced in the chunks of the size of the ones read from the response by the adapter,
+the time to the first chunk of the rows is the latency of the first rows with the data already received.
+
+    python -m dl_connector_bitrix_gds_tests.benchmarks.response_parsing [--columns N ...] [--rows N]
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import (
+    Callable,
+    Iterator,
+)
+import concurrent.futures
+import json
+import multiprocessing
+import random
+import resource
+import time
+from typing import Any
+
+from dl_connector_bitrix_gds.core.response_parser import (
+    JSONArrayStreamParser,
+    RowsProjection,
+)
+
+HTTP_READ_CHUNK_SIZE = 64 * 1024
+ROWS_CHUNK_SIZE = 1000
+_ROWS_BLOCK_SIZE = 500
+
+
+def _make_value(rnd: random.Random, col_idx: int) -> Any:
+    kind = col_idx % 5
+    if kind == 0:
+        return str(rnd.randrange(10**6))
+    if kind == 1:
+        return f"Сделка №{rnd.randrange(10**4)} ({rnd.choice(['новая', 'в работе', 'закрыта'])})"
+    if kind == 2:
+        return round(rnd.uniform(0, 10**6), 2)
+    if kind == 3:
+        return f"2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} 12:00:00"
+    return None if rnd.random() < 0.3 else "Y"
+
+
+def make_header(columns: int) -> list[str]:
+    return [f"UF_CRM_COLUMN_{idx}" for idx in range(columns)]
+
+
+def make_selected_columns(columns: int) -> list[str]:
+    return make_header(columns)[::2]
+
+
+def iter_response_body(columns: int, rows: int, seed: int = 0) -> Iterator[bytes]:
+    rnd = random.Random(seed)
+    encoded_rows = [
+        ("," + json.dumps([_make_value(rnd, col_idx) for col_idx in range(columns)], ensure_ascii=False)).encode()
+        for _ in range(_ROWS_BLOCK_SIZE)
+    ]
+    block = b"".join(encoded_rows)
+
+    def iter_parts() -> Iterator[bytes]:
+        yield b"[" + json.dumps(make_header(columns)).encode()
+        full_blocks, rest = divmod(rows, _ROWS_BLOCK_SIZE)
+        for _ in range(full_blocks):
+            yield block
+        yield b"".join(encoded_rows[:rest])
+        yield b"]"
+
+    pending = b""
+    for part in iter_parts():
+        pending += part
+        while len(pending) >= HTTP_READ_CHUNK_SIZE:
+            yield pending[:HTTP_READ_CHUNK_SIZE]
+            pending = pending[HTTP_READ_CHUNK_SIZE:]
+    if pending:
+        yield pending
+
+
+def parse_legacy(chunks: Iterator[bytes], selected_columns: list[str]) -> Iterator[list[list[Any]]]:
+    body = json.loads(b"".join(chunks))
+    cols = body[0]
+    data = [[dict(zip(cols, row, strict=True))[col] for col in selected_columns] for row in body[1:]]
+    while data:
+        chunk = data[:ROWS_CHUNK_SIZE]
+        data = data[ROWS_CHUNK_SIZE:]
+        yield chunk
+
+
+def parse_streaming(chunks: Iterator[bytes], selected_columns: list[str]) -> Iterator[list[list[Any]]]:
+    parser = JSONArrayStreamParser()
+    projection: RowsProjection | None = None
+    rows: list[Any] = []
+    for data in chunks:
+        rows.extend(parser.receive_data(data))
+        if projection is None and rows:
+            projection = RowsProjection.from_header(rows.pop(0), selected_columns)
+        if projection is not None and len(rows) >= ROWS_CHUNK_SIZE:
+            for start in range(0, len(rows) - ROWS_CHUNK_SIZE + 1, ROWS_CHUNK_SIZE):
+                yield projection.project(rows[start : start + ROWS_CHUNK_SIZE])
+            del rows[: len(rows) - len(rows) % ROWS_CHUNK_SIZE]
+    rows.extend(parser.finish())
+    assert projection is not None
+    if rows:
+        yield projection.project(rows)
+
+
+PARSERS: dict[str, Callable[[Iterator[bytes], list[str]], Iterator[list[list[Any]]]]] = {
+    "legacy": parse_legacy,
+    "streaming": parse_streaming,
+}
+
+
+def run_case(case_name: str, columns: int, rows: int) -> tuple[float, float, int, int]:
+    parse = PARSERS[case_name]
+    selected_columns = make_selected_columns(columns)
+    sample = list(iter_response_body(columns, ROWS_CHUNK_SIZE + 7))
+    assert list(parse(iter(sample), selected_columns)) == list(parse_legacy(iter(sample), selected_columns))
+
+    parsed_rows = 0
+    first_chunk_elapsed = 0.0
+    started = time.perf_counter()
+    for chunk in parse(iter_response_body(columns, rows), selected_columns):
+        if not parsed_rows:
+            first_chunk_elapsed = time.perf_counter() - started
+        parsed_rows += len(chunk)
+    elapsed = time.perf_counter() - started
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, first_chunk_elapsed, parsed_rows, max_rss_kb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--columns", type=int, action="append", help="number of columns (default: 10, 50, 200)")
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    mp_context = multiprocessing.get_context("spawn")
+    for columns in args.columns or [10, 50, 200]:
+        print(f"{columns} columns ({len(make_selected_columns(columns))} selected), {args.rows} rows")
+        for case_name in PARSERS:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as executor:
+                elapsed, first_chunk_elapsed, parsed_rows, max_rss_kb = executor.submit(
+                    run_case, case_name, columns, args.rows
+                ).result()
+            print(
+                f"{case_name:>12}: {parsed_rows / elapsed:>12,.1f} rows/sec, {elapsed:.3f} sec, "
+                f"first chunk in {first_chunk_elapsed:.3f} sec, peak RSS {max_rss_kb / 1024:.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import json
+from typing import Any
+
+import pytest
+
+from dl_connector_bitrix_gds.core.response_parser import (
+    JSONArrayStreamParser,
+    RowsProjection,
+)
+
+BODY: list[Any] = [
+    ["ID", "TITLE", "AMOUNT", "DATE_CREATE"],
+    ["1", 'Сделка "первая" [x]', 10.5, "2024-01-01 00:00:00"],
+    ["2", None, -1e3, "2024-01-02 00:00:00"],
+    ["3", "🙂, {}", 0, None],
+]
+
+
+def _parse_in_chunks(data: bytes, chunk_size: int) -> list[Any]:
+    parser = JSONArrayStreamParser()
+    items = []
+    for start in range(0, len(data), chunk_size):
+        items.extend(parser.receive_data(data[start : start + chunk_size]))
+    items.extend(parser.finish())
+    return items
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_stream_parser_any_chunk_size(indent: int | None) -> None:
+    data = json.dumps(BODY, ensure_ascii=False, indent=indent).encode("utf-8")
+    for chunk_size in range(1, len(data) + 1):
+        assert _parse_in_chunks(data, chunk_size) == BODY
+
+
+def test_stream_parser_returns_items_as_received() -> None:
+    parser = JSONArrayStreamParser()
+    assert parser.receive_data(b'[["ID", "TITLE"], ["1", "a"], ["2", "b') == [["ID", "TITLE"], ["1", "a"]]
+    assert parser.receive_data(b'"]') == [["2", "b"]]
+    assert parser.receive_data(b", [3, 4") == []
+    assert parser.receive_data(b"5]]") == [[3, 45]]
+    assert parser.finished
+    assert parser.finish() == []
+
+
+@pytest.mark.parametrize(
+    ("data", "exc_cls"),
+    [
+        (b"", TypeError),
+        (b'{"error": "access denied"}', TypeError),
+        (b"<html>Bad Gateway</html>", json.JSONDecodeError),
+        (b'[["ID"], ["1"]', json.JSONDecodeError),
+        (b'[["ID"] ["1"]]', json.JSONDecodeError),
+        (b'[["ID"], ["1]]', json.JSONDecodeError),
+        (b'[["ID"]] []', json.JSONDecodeError),
+    ],
+)
+def test_stream_parser_errors(data: bytes, exc_cls: type[Exception]) -> None:
+    with pytest.raises(exc_cls):
+        _parse_in_chunks(data, chunk_size=4)
+
+
+def test_rows_projection() -> None:
+    header, *rows = BODY
+    projection = RowsProjection.from_header(header, ["DATE_CREATE", "ID"])
+    assert projection.columns == ("DATE_CREATE", "ID")
+    assert projection.project(rows) == [[row[3], row[0]] for row in rows]
+
+    projection = RowsProjection.from_header(header)
+    assert projection.columns == tuple(header)
+    assert projection.project(rows) == rows
+
+    # The last one of the duplicates is taken, as by the lookup of the value in `dict(zip(header, row))`
+    projection = RowsProjection.from_header(["A", "B", "A"])
+    assert projection.columns == ("A", "B", "A")
+    assert projection.project([[1, 2, 3]]) == [[3, 2, 3]]
+
+
+@pytest.mark.parametrize(
+    ("header", "selected_columns", "rows"),
+    [
+        (["ID", "TITLE"], ["ID", "UNKNOWN"], [["1", "a"]]),
+        (["ID", "TITLE"], None, [["1"]]),
+        (["ID", "TITLE"], ["ID"], [{"ID": "1", "TITLE": "a"}]),
+        ({"ID": "TITLE"}, None, []),
+        ([["ID"], "TITLE"], None, []),
+    ],
+)
+def test_rows_projection_unexpected_data(header: Any, selected_columns: list[str] | None, rows: list[Any]) -> None:
+    with pytest.raises(ValueError, match="unexpected data structure"):
+        RowsProjection.from_header(header, selected_columns).project(rows)
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from collections.abc import (
     AsyncGenerator,
-    Callable,
     Generator,
     Sequence,
 )
@@ -25,7 +24,6 @@ from aiohttp.client import (
 import attr
 from clickhouse_sqlalchemy import exceptions as ch_exc
 from clickhouse_sqlalchemy import types as ch_types
-from clickhouse_sqlalchemy.drivers.http.transport import _get_type
 from clickhouse_sqlalchemy.parsers.jsoncompact import JSONCompactChunksParser
 import requests
 import sqlalchemy as sa
@@ -78,6 +76,10 @@ from dl_connector_clickhouse.core.clickhouse_base.ch_commons import (
     ClickHouseUtils,
     get_ch_settings,
 )
+from dl_connector_clickhouse.core.clickhouse_base.column_converters import (
+    ColumnarChunkConverter,
+    ValueConversionError,
+)
 from dl_connector_clickhouse.core.clickhouse_base.constants import CONNECTION_TYPE_CLICKHOUSE
 from dl_connector_clickhouse.core.clickhouse_base.exc import CHRowTooLarge
 
@@ -592,14 +594,6 @@ class BaseAsyncClickHouseAdapter(AiohttpDBAdapter):
                 raw_chunk_generator=empty_chunk_gen(),
             )
 
-        def _safe_col_converter(col_conv: Callable[[str], Any], val: str) -> Any:
-            try:
-                return col_conv(val)
-            except ValueError as err:
-                raise exc.DataParseError(
-                    f"Cannot convert {val!r}", query=query.debug_compiled_query, inspector_query=query.inspector_query
-                ) from err
-
         events_generator = self._parse_response_body(resp)
         with self.wrap_execute_excs(query=query, stage="meta"):
             first_evt_type, first_evt_data = await events_generator.__anext__()
@@ -621,10 +615,10 @@ class BaseAsyncClickHouseAdapter(AiohttpDBAdapter):
                 raw_chunk_generator=empty_chunk_gen(),
             )
         assert first_evt_type == et.META
-        if self._target_dto.disable_value_processing:
-            row_converters = tuple(None for _ in first_evt_data)
-        else:
-            row_converters = tuple(_get_type(field["type"]) for field in first_evt_data)
+        chunk_converter = ColumnarChunkConverter.from_type_names(
+            [field["type"] for field in first_evt_data],
+            disable_value_processing=self._target_dto.disable_value_processing,
+        )
 
         # TODO FIX: Here we ignore requested size of chunk
         # TODO FIX: Handle to large row exception
@@ -639,13 +633,13 @@ class BaseAsyncClickHouseAdapter(AiohttpDBAdapter):
                         raise exc.SourceProtocolError()
 
                     if evt_type == et.DATACHUNK:
-                        yield tuple(
-                            tuple(
-                                (_safe_col_converter(col_converter, val) if col_converter is not None else val)
-                                for val, col_converter in zip(raw_row, row_converters, strict=True)
-                            )
-                            for raw_row in evt_data
-                        )
+                        try:
+                            chunk = chunk_converter.convert_chunk(evt_data)
+                        except ValueConversionError as err:
+                            raise exc.DataParseError(
+                                str(err), query=query.debug_compiled_query, inspector_query=query.inspector_query
+                            ) from err
+                        yield chunk
                     elif evt_type == et.STATS:
                         LOGGER.info(
                             "Dumping clickhouse statistics from response",
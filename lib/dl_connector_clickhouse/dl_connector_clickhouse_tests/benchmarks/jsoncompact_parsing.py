@@ -0,0 +1,121 @@
+"""
+Parsing + value conversion throughput of the ClickHouse `JSONCompact` responses,
+for the per-cell conversion (as it used to be done in the adapter) and the column-wise one;
+each case in a separate process. The data rows of the recorded responses in `fixtures/`
+are repeated up to the requested number of rows.
+
+    python -m dl_connector_clickhouse_tests.benchmarks.jsoncompact_parsing [--rows N] [--fixture NAME]
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import (
+    Callable,
+    Iterable,
+)
+import concurrent.futures
+import multiprocessing
+import os
+import resource
+import time
+from typing import Any
+
+from clickhouse_sqlalchemy.drivers.http.transport import _get_type
+from clickhouse_sqlalchemy.parsers.jsoncompact import JSONCompactChunksParser
+
+from dl_connector_clickhouse.core.clickhouse_base.column_converters import ColumnarChunkConverter
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+NETWORK_CHUNK_SIZE = 64 * 1024
+
+_DATA_START = b'\n\t"data":\n\t[\n'
+_DATA_END = b"\n\t],\n"
+
+
+def make_body(fixture_name: str, rows: int) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, fixture_name), "rb") as fobj:
+        body = fobj.read()
+    head, rest = body.split(_DATA_START, 1)
+    data, tail = rest.split(_DATA_END, 1)
+    data_lines = data.split(b",\n")
+    lines = [data_lines[idx % len(data_lines)] for idx in range(rows)]
+    return head + _DATA_START + b",\n".join(lines) + _DATA_END + tail
+
+
+def _iter_events(body: bytes) -> Iterable[tuple[Any, Any]]:
+    network_chunks = (body[pos : pos + NETWORK_CHUNK_SIZE] for pos in range(0, len(body), NETWORK_CHUNK_SIZE))
+    return JSONCompactChunksParser.as_generator(network_chunks)
+
+
+def run_per_cell(body: bytes) -> int:
+    et = JSONCompactChunksParser.parts
+    row_count = 0
+    row_converters: tuple[Callable[[Any], Any], ...] = ()
+    for evt_type, evt_data in _iter_events(body):
+        if evt_type == et.META:
+            row_converters = tuple(_get_type(field["type"]) for field in evt_data)
+        elif evt_type == et.DATACHUNK:
+            rows = tuple(
+                tuple(col_converter(val) for val, col_converter in zip(raw_row, row_converters, strict=True))
+                for raw_row in evt_data
+            )
+            row_count += len(rows)
+    return row_count
+
+
+def run_columnar(body: bytes) -> int:
+    et = JSONCompactChunksParser.parts
+    row_count = 0
+    chunk_converter = ColumnarChunkConverter(())
+    for evt_type, evt_data in _iter_events(body):
+        if evt_type == et.META:
+            chunk_converter = ColumnarChunkConverter.from_type_names([field["type"] for field in evt_data])
+        elif evt_type == et.DATACHUNK:
+            row_count += len(chunk_converter.convert_chunk(evt_data))
+    return row_count
+
+
+def run_parse_only(body: bytes) -> int:
+    et = JSONCompactChunksParser.parts
+    return sum(len(evt_data) for evt_type, evt_data in _iter_events(body) if evt_type == et.DATACHUNK)
+
+
+CASES: dict[str, Callable[[bytes], int]] = {
+    "parse_only": run_parse_only,
+    "per_cell": run_per_cell,
+    "columnar": run_columnar,
+}
+
+
+def run_case(case_name: str, fixture_name: str, rows: int) -> tuple[float, int, int]:
+    body = make_body(fixture_name, rows=rows)
+    started = time.perf_counter()
+    row_count = CASES[case_name](body)
+    elapsed = time.perf_counter() - started
+    assert row_count == rows
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, row_count, max_rss_kb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--fixture", action="append", help="fixture file name (default: all)")
+    args = parser.parse_args()
+
+    fixture_names = args.fixture or sorted(os.listdir(FIXTURES_DIR))
+    mp_context = multiprocessing.get_context("spawn")
+    for fixture_name in fixture_names:
+        print(fixture_name)
+        for case_name in CASES:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as executor:
+                elapsed, row_count, max_rss_kb = executor.submit(run_case, case_name, fixture_name, args.rows).result()
+            print(
+                f"{case_name:>12}: {row_count / elapsed:>12,.0f} rows/sec, "
+                f"{elapsed:.3f} sec, peak RSS {max_rss_kb / 1024:.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
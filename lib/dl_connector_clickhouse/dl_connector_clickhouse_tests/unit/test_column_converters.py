@@ -0,0 +1,126 @@
+from typing import Any
+
+from clickhouse_sqlalchemy.drivers.http.transport import _get_type
+import pytest
+
+from dl_connector_clickhouse.core.clickhouse_base import column_converters
+from dl_connector_clickhouse.core.clickhouse_base.column_converters import (
+    ColumnarChunkConverter,
+    ValueConversionError,
+)
+
+TYPE_NAMES = [
+    "UInt64",
+    "Nullable(Int32)",
+    "Float64",
+    "Nullable(Float32)",
+    "String",
+    "LowCardinality(Nullable(String))",
+    "Date",
+    "Nullable(Date32)",
+    "DateTime",
+    "DateTime('Europe/Moscow')",
+    "Nullable(DateTime64(3, 'UTC'))",
+    "Decimal(18, 2)",
+    "Bool",
+    "Array(Int64)",
+    "IPv4",
+]
+RAW_ROWS: list[list[Any]] = [
+    [
+        "18446744073709551615",
+        -1,
+        1,
+        0.5,
+        "a",
+        "x",
+        "2024-01-01",
+        "2024-01-01",
+        "2024-01-01 12:00:00",
+        "2024-03-31 02:30:00",
+        "2024-01-01 12:00:00.123",
+        "1.50",
+        True,
+        ["1", "2"],
+        "127.0.0.1",
+    ],
+    [
+        "0",
+        None,
+        None,
+        None,
+        "",
+        None,
+        "0000-00-00",
+        None,
+        "2024-01-01 12:00:00",
+        "2024-03-31 02:30:00",
+        None,
+        10,
+        False,
+        [],
+        "10.0.0.1",
+    ],
+    [
+        "1",
+        2,
+        1e300,
+        "nan",
+        "b",
+        "x",
+        "2024-01-01",
+        "1900-01-01",
+        "0000-00-00 00:00:00",
+        "2024-10-27 02:30:00",
+        "2024-01-02 00:00:00.000",
+        "-0.01",
+        True,
+        ["3"],
+        "127.0.0.1",
+    ],
+]
+
+
+def _convert_per_cell(type_names: list[str], raw_rows: list[list[Any]]) -> list[tuple[Any, ...]]:
+    converters = [_get_type(type_name) for type_name in type_names]
+    return [tuple(conv(val) for val, conv in zip(row, converters, strict=True)) for row in raw_rows]
+
+
+def _normalize(rows: tuple[tuple[Any, ...], ...] | list[tuple[Any, ...]]) -> list[Any]:
+    # `nan != nan`, and the timezone-aware values should be compared with their timezones
+    return [[repr(value) for value in row] for row in rows]
+
+
+def test_same_as_per_cell_conversion() -> None:
+    converter = ColumnarChunkConverter.from_type_names(TYPE_NAMES)
+    result = converter.convert_chunk(RAW_ROWS)
+    assert isinstance(result, tuple)
+    assert all(isinstance(row, tuple) for row in result)
+    assert _normalize(result) == _normalize(_convert_per_cell(TYPE_NAMES, RAW_ROWS))
+    assert converter.convert_chunk([]) == ()
+
+
+def test_memo_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(column_converters, "MEMO_MAX_SIZE", 2)
+    converter = ColumnarChunkConverter.from_type_names(["Date"])
+    for chunk in (
+        [["2024-01-01"], ["2024-01-02"]],
+        [["2024-01-02"], ["2024-01-03"]],
+        [["2024-01-04"], ["2024-01-04"]],
+    ):
+        assert converter.convert_chunk(chunk) == tuple(_convert_per_cell(["Date"], chunk))
+
+
+def test_disabled_value_processing() -> None:
+    converter = ColumnarChunkConverter.from_type_names(TYPE_NAMES, disable_value_processing=True)
+    assert converter.convert_chunk(RAW_ROWS) == tuple(tuple(row) for row in RAW_ROWS)
+
+
+def test_conversion_error() -> None:
+    converter = ColumnarChunkConverter.from_type_names(["String", "Date"])
+    with pytest.raises(ValueConversionError) as exc_info:
+        converter.convert_chunk([["a", "2024-01-01"], ["b", "2024-13-01"]])
+    assert exc_info.value.value == "2024-13-01"
+
+    with pytest.raises(ValueError, match="Unexpected number of columns"):
+        converter.convert_chunk([["a"]])
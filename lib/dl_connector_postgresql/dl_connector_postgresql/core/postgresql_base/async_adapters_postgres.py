@@ -8,7 +8,7 @@ from collections.abc import (
 )
 import contextlib
 from contextlib import asynccontextmanager
-from datetime import datetime
+import hashlib
 import logging
 import typing
 from typing import (
@@ -16,12 +16,10 @@ from typing import (
     ClassVar,
     TypeVar,
 )
-import uuid
 
 import asyncpg
 import asyncpg.exceptions
 import attr
-from dateutil import parser as dateutil_parser
 import sqlalchemy as sa
 
 from dl_app_tools.profiling_base import generic_profiler_async
@@ -38,6 +36,7 @@ from dl_core.connection_executors.adapters.async_adapters_base import (
     AsyncDirectDBAdapter,
     AsyncRawExecutionResult,
 )
+from dl_core.connection_executors.adapters.conn_pool_manager import get_conn_pool_manager
 from dl_core.connection_executors.adapters.mixins import (
     SATypeTransformer,
     WithDatabaseNameOverride,
@@ -66,6 +65,10 @@ from dl_connector_postgresql.core.postgresql_base.adapters_base_postgres import
     OID_KNOWLEDGE,
     BasePostgresAdapter,
 )
+from dl_connector_postgresql.core.postgresql_base.codecs import (
+    reset_connection_type_codecs,
+    set_connection_type_codecs,
+)
 from dl_connector_postgresql.core.postgresql_base.error_transformer import make_async_pg_error_transformer
 from dl_connector_postgresql.core.postgresql_base.target_dto import PostgresConnTargetDTO
 from dl_connector_postgresql.core.postgresql_base.utils import compile_pg_query
@@ -94,6 +97,8 @@ class AsyncPostgresAdapter(
     _conn_pools: AsyncCache[asyncpg.Pool] = attr.ib(default=attr.Factory(AsyncCache))
 
     _error_transformer = make_async_pg_error_transformer()
+    # Decode date-like values from the binary representation instead of parsing the text one
+    BINARY_DATE_CODECS: ClassVar[bool] = True
     __dialect: AsyncBIPGDialect | None = None
 
     EXTRA_EXC_CLS: ClassVar[tuple[type[Exception], ...]] = (
@@ -124,7 +129,7 @@ class AsyncPostgresAdapter(
 
     def get_conn_line(self, db_name: str | None = None, params: dict[str, Any] | None = None) -> str:
         params = params or {}
-        params["sslrootcert"] = self.get_ssl_cert_path(self._target_dto.ssl_ca)
+        params.setdefault("sslrootcert", self.get_ssl_cert_path(self._target_dto.ssl_ca))
         return AsyncPGConnLineConstructor(
             dsn_template=self.dsn_template,
             target_dto=self._target_dto,
@@ -137,72 +142,83 @@ class AsyncPostgresAdapter(
     def get_target_host(self) -> str | None:
         return self._target_dto.host
 
-    def _convert_date(self, s: str, ignoretz: bool) -> datetime:
-        try:
-            d = dateutil_parser.parse(s, ignoretz=ignoretz)
-        except (dateutil_parser.ParserError, OverflowError) as e:
-            LOGGER.info("Can't parse date %s by %s", s, ignoretz)
-            # its impossible to get extra info about the position in stream
-            # because it's a callback for asyncpg
-            raise exc.DataStreamValidationError(value=s) from e
-        return d
-
-    async def create_conn_pool(self, db_name_from_query: str) -> asyncpg.Pool:
+    async def create_conn_pool(
+        self,
+        db_name_from_query: str,
+        max_size: int = 10,
+        ssl_cert_path: str | None = None,
+    ) -> asyncpg.Pool:
         db_name = self.get_db_name_for_query(db_name_from_query)
-        conn_line = self.get_conn_line(db_name=db_name)
-        return await asyncpg.create_pool(conn_line, min_size=1, statement_cache_size=0, command_timeout=80)  # type: ignore  # 2024-01-24 # TODO: Incompatible return value type (got "Pool[Record] | None", expected "Pool[Any]")  [return-value]
+        params = {"sslrootcert": ssl_cert_path} if ssl_cert_path is not None else None
+        conn_line = self.get_conn_line(db_name=db_name, params=params)
+        return await asyncpg.create_pool(
+            conn_line,
+            min_size=1,
+            max_size=max_size,
+            statement_cache_size=0,
+            command_timeout=80,
+            init=self._init_connection,
+            reset=self._reset_connection,
+        )  # type: ignore  # 2024-01-24 # TODO: Incompatible return value type (got "Pool[Record] | None", expected "Pool[Any]")  [return-value]
         # TODO ^ bind command_timeout value to the COMMON_TIMEOUT_SEC app setting or create a new one
 
+    @classmethod
+    async def _init_connection(cls, connection: asyncpg.Connection) -> None:
+        # Called once per connection of the pool (and not per query)
+        await set_connection_type_codecs(connection, binary_dates=cls.BINARY_DATE_CODECS)
+
+    @classmethod
+    async def _reset_connection(cls, connection: asyncpg.Connection) -> None:
+        # Replaces the default reset of the pool (`RESET ALL` and the rest of it)
+        await connection.reset()
+        await reset_connection_type_codecs(connection, binary_dates=cls.BINARY_DATE_CODECS)
+
+    def _get_shared_conn_pool_key(self, db_name_from_query: str) -> tuple[str, str]:
+        """Everything the pool connections depend on; the credentials are only hashed"""
+        dto = self._target_dto
+        conn_ident = repr(
+            (
+                dto.host,
+                dto.port,
+                self.get_db_name_for_query(db_name_from_query),
+                dto.username,
+                dto.password,
+                dto.ssl_enable,
+                dto.ssl_ca,
+            )
+        )
+        return type(self).__qualname__, hashlib.sha256(conn_ident.encode()).hexdigest()
+
+    @staticmethod
+    async def _close_conn_pool(pool: asyncpg.Pool) -> None:
+        await pool.close()
+
+    @staticmethod
+    async def _check_conn_pool(pool: asyncpg.Pool) -> None:
+        await pool.fetchval("SELECT 1")
+
+    @asynccontextmanager
+    async def _borrow_conn_pool(self, db_name_from_query: str) -> AsyncIterator[asyncpg.Pool]:
+        conn_pool_manager = get_conn_pool_manager()
+        if conn_pool_manager is None:
+            yield await self._conn_pools.get(db_name_from_query, generator=self.create_conn_pool)
+            return
+
+        # The pool outlives the adapter, so it can't use the adapter's temporary root CA file
+        ssl_cert_path = self.get_shared_ssl_cert_path(self._target_dto.ssl_ca)
+        async with conn_pool_manager.borrow(
+            key=self._get_shared_conn_pool_key(db_name_from_query),
+            factory=lambda max_size: self.create_conn_pool(
+                db_name_from_query, max_size=max_size, ssl_cert_path=ssl_cert_path
+            ),
+            closer=self._close_conn_pool,
+            health_check=self._check_conn_pool,
+        ) as conn_pool:
+            yield conn_pool
+
     @asynccontextmanager
     async def _get_connection(self, db_name_from_query: str) -> AsyncIterator[asyncpg.Connection]:
-        conn_pool = await self._conn_pools.get(db_name_from_query, generator=self.create_conn_pool)
-        async with conn_pool.acquire() as connection:
-            # Fix for the "asyncpg.exceptions.InvalidSQLStatementNameError: unnamed prepared statement does not exist"
-            # We have already disabled cache by statement_cache_size=0, but it still works,
-            # so let's try to use cache inside a transaction.
-            async with connection.transaction(readonly=True):
-                # There is some decimal-magic in asyncpg
-                # and this magic is incompatible with magic in sqlalchemy-psycopg2
-                # so let's disable it
-                await connection.set_type_codec(
-                    "numeric",
-                    encoder=str,
-                    decoder=lambda x: x,
-                    schema="pg_catalog",
-                    format="text",
-                )
-                # asyncpg uses a custom wrapper for UUID, and we can't serialize it
-                # so use builtin UUID explicitly
-                await connection.set_type_codec(
-                    "uuid",
-                    encoder=str,
-                    decoder=lambda x: uuid.UUID(x),
-                    schema="pg_catalog",
-                    format="text",
-                )
-                # we set date-like values to params as strings
-                # but asyncpg expects python-objects
-                await connection.set_type_codec(
-                    "date",
-                    encoder=str,
-                    decoder=lambda x: self._convert_date(x, ignoretz=True).date(),
-                    schema="pg_catalog",
-                    format="text",
-                )
-                await connection.set_type_codec(
-                    "timestamp",
-                    encoder=str,
-                    decoder=lambda x: self._convert_date(x, ignoretz=True),
-                    schema="pg_catalog",
-                    format="text",
-                )
-                await connection.set_type_codec(
-                    "timestamptz",
-                    encoder=str,
-                    decoder=lambda x: self._convert_date(x, ignoretz=False),
-                    schema="pg_catalog",
-                    format="text",
-                )
+        async with self._borrow_conn_pool(db_name_from_query) as conn_pool, conn_pool.acquire() as connection:
             yield connection  # type: ignore  # 2024-01-24 # TODO: Incompatible types in "yield" (actual type "PoolConnectionProxy[Any]", expected type "Connection[Any]")  [misc]
 
     async def test(self) -> None:
@@ -0,0 +1,269 @@
+"""
+Type codecs of the asyncpg connections.
+
+The codecs are registered once per connection (in the `init` hook of the pool).
+Date-like values are decoded either from the text representation (with `dateutil`)
+or from the binary one (the "tuple" format of asyncpg, i.e. the raw day/microsecond counts),
+both give the same Python values.
+
+The binary `timestamptz` codec is made for the session time zone of the connection.
+It is checked again when the connection is returned to the pool (`reset_connection_type_codecs`),
+so a change of `TimeZone` within a query is only picked up by the next ones.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import datetime
+import logging
+from typing import Any
+import uuid
+import weakref
+import zoneinfo
+
+import asyncpg
+from dateutil import parser as dateutil_parser
+
+from dl_core import exc
+
+LOGGER = logging.getLogger(__name__)
+
+PG_EPOCH_DATE = datetime.date(2000, 1, 1)
+PG_EPOCH_DATETIME = datetime.datetime(2000, 1, 1)
+PG_EPOCH_DATETIME_UTC = datetime.datetime(2000, 1, 1, tzinfo=datetime.UTC)
+_PG_EPOCH_ORDINAL = PG_EPOCH_DATE.toordinal()
+
+# `infinity` and `-infinity` in the binary representation
+_PG_DATE_INFINITIES = {2**31 - 1: "infinity", -(2**31): "-infinity"}
+_PG_TIMESTAMP_INFINITIES = {2**63 - 1: "infinity", -(2**63): "-infinity"}
+
+# The special input values of PostgreSQL that don't depend on the current time
+_PG_EPOCH_INPUT = "epoch"
+UNIX_EPOCH_DATETIME_UTC = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+
+# The session time zones the binary `timestamptz` codecs of the connections are made for
+_SESSION_TZ_NAMES: weakref.WeakKeyDictionary[asyncpg.Connection, str] = weakref.WeakKeyDictionary()
+
+
+def convert_date(s: str, ignoretz: bool) -> datetime.datetime:
+    try:
+        d = dateutil_parser.parse(s, ignoretz=ignoretz)
+    except (dateutil_parser.ParserError, OverflowError) as e:
+        LOGGER.info("Can't parse date %s by %s", s, ignoretz)
+        # its impossible to get extra info about the position in stream
+        # because it's a callback for asyncpg
+        raise exc.DataStreamValidationError(value=s) from e
+    return d
+
+
+def _parse_input(value: str) -> datetime.datetime:
+    if value.strip().lower() == _PG_EPOCH_INPUT:
+        return UNIX_EPOCH_DATETIME_UTC
+    try:
+        return dateutil_parser.parse(value)
+    except (dateutil_parser.ParserError, OverflowError) as e:
+        # e.g. `today` or `now`, which are resolved by the server at the time of the query
+        raise exc.DataStreamValidationError(value=value) from e
+
+
+def _get_input_infinity(value: Any, infinities: dict[int, str]) -> int | None:
+    """The binary representation of `infinity` or `-infinity` given as text"""
+    if not isinstance(value, str):
+        return None
+    text = value.strip().lower().removeprefix("+")
+    for binary_value, name in infinities.items():
+        if text == name:
+            return binary_value
+    return None
+
+
+def _to_date(value: Any) -> datetime.date:
+    if isinstance(value, str):
+        return _parse_input(value).date()
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+
+def _to_datetime(value: Any) -> datetime.datetime:
+    if isinstance(value, str):
+        return _parse_input(value)
+    if not isinstance(value, datetime.datetime):
+        return datetime.datetime.combine(value, datetime.time())
+    return value
+
+
+def _invalid_binary_value(value: int, infinities: dict[int, str]) -> exc.DataStreamValidationError:
+    # Same as for the text representation, which can't be parsed in these cases
+    return exc.DataStreamValidationError(value=infinities.get(value, str(value)))
+
+
+def decode_date_binary(value: tuple[int]) -> datetime.date:
+    (days,) = value
+    try:
+        return datetime.date.fromordinal(days + _PG_EPOCH_ORDINAL)
+    except (ValueError, OverflowError) as e:
+        raise _invalid_binary_value(days, _PG_DATE_INFINITIES) from e
+
+
+def encode_date_binary(value: Any) -> tuple[int]:
+    infinity = _get_input_infinity(value, _PG_DATE_INFINITIES)
+    if infinity is not None:
+        return (infinity,)
+    return (_to_date(value).toordinal() - _PG_EPOCH_ORDINAL,)
+
+
+def decode_timestamp_binary(value: tuple[int]) -> datetime.datetime:
+    (microseconds,) = value
+    try:
+        return PG_EPOCH_DATETIME + datetime.timedelta(microseconds=microseconds)
+    except OverflowError as e:
+        raise _invalid_binary_value(microseconds, _PG_TIMESTAMP_INFINITIES) from e
+
+
+def encode_timestamp_binary(value: Any) -> tuple[int]:
+    infinity = _get_input_infinity(value, _PG_TIMESTAMP_INFINITIES)
+    if infinity is not None:
+        return (infinity,)
+    delta = _to_datetime(value).replace(tzinfo=None) - PG_EPOCH_DATETIME
+    return (delta // datetime.timedelta(microseconds=1),)
+
+
+def make_timestamptz_binary_codec(
+    session_tz: datetime.tzinfo,
+) -> tuple[Callable[[Any], tuple[int]], Callable[[tuple[int]], datetime.datetime]]:
+    """
+    The server renders `timestamptz` in the session time zone,
+    so the binary values (which are always in UTC) are converted to it.
+    """
+
+    def decode(value: tuple[int]) -> datetime.datetime:
+        (microseconds,) = value
+        try:
+            return (PG_EPOCH_DATETIME_UTC + datetime.timedelta(microseconds=microseconds)).astimezone(session_tz)
+        except OverflowError as e:
+            raise _invalid_binary_value(microseconds, _PG_TIMESTAMP_INFINITIES) from e
+
+    def encode(value: Any) -> tuple[int]:
+        infinity = _get_input_infinity(value, _PG_TIMESTAMP_INFINITIES)
+        if infinity is not None:
+            return (infinity,)
+        dt = _to_datetime(value)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=session_tz)
+        return ((dt - PG_EPOCH_DATETIME_UTC) // datetime.timedelta(microseconds=1),)
+
+    return encode, decode
+
+
+def get_session_tz(tz_name: str) -> datetime.tzinfo | None:
+    if tz_name.upper() in ("UTC", "ETC/UTC", "GMT", "Z"):
+        return datetime.UTC
+    try:
+        return zoneinfo.ZoneInfo(tz_name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        # POSIX-style zones (e.g. `<+03>-03`) are not supported, fall back to the text representation
+        return None
+
+
+async def _get_session_tz_name(connection: asyncpg.Connection) -> str:
+    try:
+        # Reported by the server on connection and on every change, no need to query it
+        return connection.get_settings().TimeZone
+    except AttributeError:
+        return await connection.fetchval("SHOW TimeZone")
+
+
+async def set_connection_type_codecs(connection: asyncpg.Connection, binary_dates: bool = True) -> None:
+    # Fix for the "asyncpg.exceptions.InvalidSQLStatementNameError: unnamed prepared statement does not exist"
+    # We have already disabled cache by statement_cache_size=0, but it still works,
+    # so let's try to use cache inside a transaction.
+    async with connection.transaction(readonly=True):
+        # There is some decimal-magic in asyncpg
+        # and this magic is incompatible with magic in sqlalchemy-psycopg2
+        # so let's disable it
+        # (the text representation is passed as is, so there is nothing to gain from the binary one here)
+        await connection.set_type_codec(
+            "numeric",
+            encoder=str,
+            decoder=lambda x: x,
+            schema="pg_catalog",
+            format="text",
+        )
+        # asyncpg uses a custom wrapper for UUID, and we can't serialize it
+        # so use builtin UUID explicitly
+        await connection.set_type_codec(
+            "uuid",
+            encoder=str,
+            decoder=lambda x: uuid.UUID(x),
+            schema="pg_catalog",
+            format="text",
+        )
+
+        session_tz: datetime.tzinfo | None = None
+        if binary_dates:
+            session_tz_name = await _get_session_tz_name(connection)
+            session_tz = get_session_tz(session_tz_name)
+            _SESSION_TZ_NAMES[connection] = session_tz_name
+        if binary_dates:
+            # we set date-like values to params as strings,
+            # so the encoders accept both strings and python objects
+            await connection.set_type_codec(
+                "date",
+                encoder=encode_date_binary,
+                decoder=decode_date_binary,
+                schema="pg_catalog",
+                format="tuple",
+            )
+            await connection.set_type_codec(
+                "timestamp",
+                encoder=encode_timestamp_binary,
+                decoder=decode_timestamp_binary,
+                schema="pg_catalog",
+                format="tuple",
+            )
+        else:
+            # we set date-like values to params as strings
+            # but asyncpg expects python-objects
+            await connection.set_type_codec(
+                "date",
+                encoder=str,
+                decoder=lambda x: convert_date(x, ignoretz=True).date(),
+                schema="pg_catalog",
+                format="text",
+            )
+            await connection.set_type_codec(
+                "timestamp",
+                encoder=str,
+                decoder=lambda x: convert_date(x, ignoretz=True),
+                schema="pg_catalog",
+                format="text",
+            )
+
+        if session_tz is not None:
+            timestamptz_encoder, timestamptz_decoder = make_timestamptz_binary_codec(session_tz)
+            await connection.set_type_codec(
+                "timestamptz",
+                encoder=timestamptz_encoder,
+                decoder=timestamptz_decoder,
+                schema="pg_catalog",
+                format="tuple",
+            )
+        else:
+            await connection.set_type_codec(
+                "timestamptz",
+                encoder=str,
+                decoder=lambda x: convert_date(x, ignoretz=False),
+                schema="pg_catalog",
+                format="text",
+            )
+
+
+async def reset_connection_type_codecs(connection: asyncpg.Connection, binary_dates: bool = True) -> None:
+    """
+    Registers the codecs again if the session time zone is not the one they are made for.
+    Called when the connection is returned to the pool, after the session is reset.
+    """
+    if binary_dates and _SESSION_TZ_NAMES.get(connection) != await _get_session_tz_name(connection):
+        LOGGER.info("Session time zone of the connection has changed, registering the type codecs again")
+        await set_connection_type_codecs(connection, binary_dates=binary_dates)
@@ -0,0 +1,157 @@
+"""
+Decoding of the date-like values from the text (`dateutil`) and the binary representations:
+decoding throughput (each case in a separate process) and, with `--dsn`,
+the per-query setup overhead of the codecs (registered on every acquire vs in the pool `init` hook)
+and the end-to-end rows/sec of a `SELECT` with the date-like columns.
+
+    python -m dl_connector_postgresql_tests.benchmarks.type_codecs [--rows N] [--dsn postgres://...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import concurrent.futures
+import datetime
+import multiprocessing
+import resource
+import time
+from typing import Any
+
+import asyncpg
+
+from dl_connector_postgresql.core.postgresql_base.codecs import (
+    PG_EPOCH_DATE,
+    PG_EPOCH_DATETIME,
+    PG_EPOCH_DATETIME_UTC,
+    convert_date,
+    decode_date_binary,
+    decode_timestamp_binary,
+    make_timestamptz_binary_codec,
+    set_connection_type_codecs,
+)
+
+QUERY_COUNT = 200
+US = datetime.timedelta(microseconds=1)
+SELECT_QUERY = """
+SELECT
+    DATE '2000-01-01' + (n % 10000) AS d,
+    TIMESTAMP '2000-01-01' + n * INTERVAL '1 minute' AS ts,
+    TIMESTAMPTZ '2000-01-01 00:00:00+00' + n * INTERVAL '1 second' AS tstz
+FROM generate_series(1, $1::int) AS n
+"""
+
+
+def _make_datetimes(rows: int) -> list[datetime.datetime]:
+    start = datetime.datetime(2020, 1, 1, 0, 0, 0, 123456)
+    return [start + datetime.timedelta(minutes=idx) for idx in range(rows)]
+
+
+def run_decode_text(rows: int) -> int:
+    values = _make_datetimes(rows)
+    date_values = [dt.date().isoformat() for dt in values]
+    ts_values = [dt.isoformat(sep=" ") for dt in values]
+    tstz_values = [f"{dt.isoformat(sep=' ')}+03" for dt in values]
+    count = 0
+    for date_value, ts_value, tstz_value in zip(date_values, ts_values, tstz_values, strict=True):
+        convert_date(date_value, ignoretz=True).date()
+        convert_date(ts_value, ignoretz=True)
+        convert_date(tstz_value, ignoretz=False)
+        count += 1
+    return count
+
+
+def run_decode_binary(rows: int) -> int:
+    values = _make_datetimes(rows)
+    date_values = [((dt.date() - PG_EPOCH_DATE).days,) for dt in values]
+    ts_values = [((dt - PG_EPOCH_DATETIME) // US,) for dt in values]
+    tstz_values = [((dt.replace(tzinfo=datetime.UTC) - PG_EPOCH_DATETIME_UTC) // US,) for dt in values]
+    _, decode_timestamptz = make_timestamptz_binary_codec(datetime.timezone(datetime.timedelta(hours=3)))
+    count = 0
+    for date_value, ts_value, tstz_value in zip(date_values, ts_values, tstz_values, strict=True):
+        decode_date_binary(date_value)
+        decode_timestamp_binary(ts_value)
+        decode_timestamptz(tstz_value)
+        count += 1
+    return count
+
+
+async def _run_queries(dsn: str, rows: int, per_acquire: bool, binary_dates: bool) -> int:
+    async def init(connection: asyncpg.Connection) -> None:
+        await set_connection_type_codecs(connection, binary_dates=binary_dates)
+
+    pool = await asyncpg.create_pool(
+        dsn, min_size=1, max_size=1, statement_cache_size=0, init=None if per_acquire else init
+    )
+    count = 0
+    try:
+        for _ in range(QUERY_COUNT):
+            async with pool.acquire() as connection:
+                if per_acquire:  # as it used to be done in `AsyncPostgresAdapter._get_connection`
+                    await set_connection_type_codecs(connection, binary_dates=binary_dates)
+                async with connection.transaction(readonly=True):
+                    count += len(await connection.fetch(SELECT_QUERY, rows))
+    finally:
+        await pool.close()
+    return count
+
+
+DECODE_CASES: dict[str, Callable[[int], int]] = {
+    "decode text": run_decode_text,
+    "decode binary": run_decode_binary,
+}
+DB_CASES: dict[str, tuple[bool, bool]] = {
+    # (per_acquire, binary_dates)
+    "setup per acquire, text": (True, False),
+    "setup in init, text": (False, False),
+    "setup in init, binary": (False, True),
+}
+
+
+def run_case(case_name: str, rows: int, dsn: str | None) -> tuple[float, int, int]:
+    started = time.perf_counter()
+    if dsn is None:
+        row_count = DECODE_CASES[case_name](rows)
+    else:
+        per_acquire, binary_dates = DB_CASES[case_name]
+        row_count = asyncio.run(_run_queries(dsn, rows, per_acquire=per_acquire, binary_dates=binary_dates))
+    elapsed = time.perf_counter() - started
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, row_count, max_rss_kb
+
+
+def _run_cases(case_names: list[str], rows: int, dsn: str | None) -> dict[str, Any]:
+    mp_context = multiprocessing.get_context("spawn")
+    results = {}
+    for case_name in case_names:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as executor:
+            results[case_name] = executor.submit(run_case, case_name, rows, dsn).result()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--dsn", default=None, help="PostgreSQL to run the per-query cases against")
+    args = parser.parse_args()
+
+    for case_name, (elapsed, row_count, max_rss_kb) in _run_cases(list(DECODE_CASES), args.rows, None).items():
+        print(
+            f"{case_name:>24}: {row_count / elapsed:>12,.0f} rows/sec, "
+            f"{elapsed:.3f} sec, peak RSS {max_rss_kb / 1024:.1f} MiB"
+        )
+    if args.dsn is None:
+        return
+
+    # One-row queries show the setup overhead, the full ones show the decoding throughput
+    for rows in (1, args.rows // QUERY_COUNT or 1):
+        for case_name, (elapsed, row_count, _) in _run_cases(list(DB_CASES), rows, args.dsn).items():
+            print(
+                f"{case_name:>24}: {rows:>8} rows x {QUERY_COUNT} queries, "
+                f"{elapsed / QUERY_COUNT * 1000:.2f} ms/query, {row_count / elapsed:>12,.0f} rows/sec"
+            )
+
+
+if __name__ == "__main__":
+    main()
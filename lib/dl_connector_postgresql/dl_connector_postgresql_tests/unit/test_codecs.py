@@ -0,0 +1,140 @@
+from collections.abc import AsyncIterator
+import contextlib
+import datetime
+from typing import Any
+import zoneinfo
+
+import pytest
+
+from dl_core import exc
+
+from dl_connector_postgresql.core.postgresql_base.codecs import (
+    PG_EPOCH_DATE,
+    PG_EPOCH_DATETIME,
+    PG_EPOCH_DATETIME_UTC,
+    convert_date,
+    decode_date_binary,
+    decode_timestamp_binary,
+    encode_date_binary,
+    encode_timestamp_binary,
+    get_session_tz,
+    make_timestamptz_binary_codec,
+    reset_connection_type_codecs,
+    set_connection_type_codecs,
+)
+
+US = datetime.timedelta(microseconds=1)
+
+
+@pytest.mark.parametrize("text_value", ["2000-01-01", "1970-01-01", "1999-12-31", "2024-02-29", "0001-01-01"])
+def test_date_binary_same_as_text(text_value: str) -> None:
+    days = (convert_date(text_value, ignoretz=True).date() - PG_EPOCH_DATE).days
+    assert decode_date_binary((days,)) == convert_date(text_value, ignoretz=True).date()
+    assert encode_date_binary(text_value) == (days,)
+
+
+@pytest.mark.parametrize(
+    "text_value", ["2000-01-01 00:00:00", "1969-07-20 20:17:40.123456", "2024-10-18 12:34:56.000001"]
+)
+def test_timestamp_binary_same_as_text(text_value: str) -> None:
+    expected = convert_date(text_value, ignoretz=True)
+    microseconds = (expected - PG_EPOCH_DATETIME) // US
+    assert decode_timestamp_binary((microseconds,)) == expected
+    assert encode_timestamp_binary(text_value) == (microseconds,)
+
+
+@pytest.mark.parametrize(
+    ("tz_name", "text_value"),
+    [
+        ("UTC", "2024-10-18 12:34:56.5+00"),
+        ("Europe/Moscow", "2024-10-18 15:34:56.5+03"),
+        ("America/New_York", "2024-01-18 07:34:56+00:00"),
+    ],
+)
+def test_timestamptz_binary_same_as_text(tz_name: str, text_value: str) -> None:
+    session_tz = get_session_tz(tz_name)
+    assert session_tz is not None
+    encode, decode = make_timestamptz_binary_codec(session_tz)
+
+    expected = convert_date(text_value, ignoretz=False)
+    microseconds = (expected - PG_EPOCH_DATETIME_UTC) // US
+    decoded = decode((microseconds,))
+    assert decoded == expected
+    assert decoded.utcoffset() == expected.astimezone(zoneinfo.ZoneInfo(tz_name)).utcoffset()
+    assert encode(text_value) == (microseconds,)
+
+
+def test_infinity() -> None:
+    _, decode_timestamptz = make_timestamptz_binary_codec(datetime.UTC)
+    for decode, infinity in (
+        (decode_date_binary, 2**31 - 1),
+        (decode_timestamp_binary, 2**63 - 1),
+        (decode_timestamptz, -(2**63)),
+    ):
+        with pytest.raises(exc.DataStreamValidationError):
+            decode((infinity,))
+    with pytest.raises(exc.DataStreamValidationError):
+        convert_date("infinity", ignoretz=True)
+
+
+def test_unsupported_session_tz() -> None:
+    assert get_session_tz("<+03>-03") is None
+
+
+def test_special_input_values() -> None:
+    encode_timestamptz, _ = make_timestamptz_binary_codec(zoneinfo.ZoneInfo("Europe/Moscow"))
+    assert encode_date_binary("infinity") == (2**31 - 1,)
+    assert encode_date_binary(" -Infinity") == (-(2**31),)
+    assert encode_timestamp_binary("+infinity") == (2**63 - 1,)
+    assert encode_timestamptz("-infinity") == (-(2**63),)
+
+    epoch = datetime.datetime(1970, 1, 1)
+    assert encode_date_binary("epoch") == encode_date_binary(epoch.date())
+    assert encode_timestamp_binary("EPOCH") == encode_timestamp_binary(epoch)
+    assert encode_timestamptz("epoch") == encode_timestamptz(epoch.replace(tzinfo=datetime.UTC))
+
+    # Depend on the time of the query on the server
+    for encode in (encode_date_binary, encode_timestamp_binary, encode_timestamptz):
+        with pytest.raises(exc.DataStreamValidationError):
+            encode("today")
+
+
+class FakeSettings:
+    def __init__(self, tz_name: str) -> None:
+        self.TimeZone = tz_name
+
+
+class FakeConnection:
+    def __init__(self, tz_name: str) -> None:
+        self.settings = FakeSettings(tz_name)
+        self.codecs: dict[str, Any] = {}
+
+    def get_settings(self) -> FakeSettings:
+        return self.settings
+
+    @contextlib.asynccontextmanager
+    async def transaction(self, readonly: bool) -> AsyncIterator[None]:
+        yield
+
+    async def set_type_codec(self, typename: str, **kwargs: Any) -> None:
+        self.codecs[typename] = kwargs
+
+
+@pytest.mark.asyncio
+async def test_session_tz_change() -> None:
+    connection: Any = FakeConnection("UTC")
+    await set_connection_type_codecs(connection)
+    utc_codec = connection.codecs["timestamptz"]
+    assert utc_codec["decoder"]((0,)).utcoffset() == datetime.timedelta(0)
+
+    await reset_connection_type_codecs(connection)
+    assert connection.codecs["timestamptz"] is utc_codec
+
+    connection.settings.TimeZone = "Europe/Moscow"
+    await reset_connection_type_codecs(connection)
+    assert connection.codecs["timestamptz"]["decoder"]((0,)).utcoffset() == datetime.timedelta(hours=3)
+
+    # Not supported in the binary codec
+    connection.settings.TimeZone = "<+03>-03"
+    await reset_connection_type_codecs(connection)
+    assert connection.codecs["timestamptz"]["format"] == "text"
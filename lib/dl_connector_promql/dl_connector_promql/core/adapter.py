@@ -5,8 +5,10 @@ from datetime import (
     datetime,
 )
 import logging
+import time
 from typing import (
     TYPE_CHECKING,
+    Any,
     ClassVar,
 )
 from urllib.parse import (
@@ -37,6 +39,18 @@ from dl_connector_promql.core.constants import (
     CONNECTION_TYPE_PROMQL,
     PromQLAuthType,
 )
+from dl_connector_promql.core.range_cache import (
+    PromQLRangeCache,
+    PromQLRangeKey,
+    Series,
+    depends_on_range_bounds,
+    get_promql_range_cache,
+    make_connection_key,
+    merge_series,
+    select_points,
+    split_range,
+    to_seconds,
+)
 
 if TYPE_CHECKING:
     from dl_constants.types import TBIChunksGen
@@ -141,7 +155,7 @@ class AsyncPromQLAdapter(AiohttpDBAdapter):
             headers["Authorization"] = self._target_dto.auth_header
         return headers
 
-    async def _run_query(self, dba_query: DBAdapterQuery) -> ClientResponse:
+    def _get_range_params(self, dba_query: DBAdapterQuery) -> dict:
         req_params = {"from", "to", "step"}
         conn_params = dict(dba_query.connector_specific_params or {})
         if conn_params is None or not req_params <= set(conn_params):
@@ -157,19 +171,141 @@ class AsyncPromQLAdapter(AiohttpDBAdapter):
             conn_param = conn_params[param]
             if isinstance(conn_param, datetime):
                 conn_params[param] = int(conn_param.timestamp())
+        return conn_params
 
-        query_text = self.compile_query_for_execution(dba_query.query)
+    async def _run_range_query(self, query_text: str, start: Any, end: Any, step: Any) -> ClientResponse:
         return await self._session.post(
             url=urljoin(self._url, "api/v1/query_range"),
             data={
                 "query": query_text,
-                "start": conn_params["from"],
-                "end": conn_params["to"],
-                "step": conn_params["step"],
+                "start": start,
+                "end": end,
+                "step": step,
             },
             allow_redirects=False,
         )
 
+    async def _run_query(self, dba_query: DBAdapterQuery) -> ClientResponse:
+        conn_params = self._get_range_params(dba_query)
+        query_text = self.compile_query_for_execution(dba_query.query)
+        return await self._run_range_query(query_text, conn_params["from"], conn_params["to"], conn_params["step"])
+
+    async def _check_response_status(self, resp: ClientResponse, dba_query: DBAdapterQuery) -> None:
+        if resp.status != 200:
+            body = await resp.text()
+            body_piece = body[:100] + ("…" if len(body) > 100 else "")  # TODO: depends on db ownership
+            db_exc = self.make_exc(
+                status_code=resp.status,
+                err_body=body_piece,
+                debug_query=dba_query.debug_compiled_query,
+                inspector_query=dba_query.inspector_query,
+            )
+            raise db_exc
+
+    def _get_range_cache(self) -> PromQLRangeCache | None:
+        if self._target_dto.range_cache_bucket_points is None:
+            return None
+        return get_promql_range_cache(max_points=self._target_dto.range_cache_max_points)
+
+    async def _fetch_range_series(
+        self,
+        dba_query: DBAdapterQuery,
+        query_text: str,
+        start: int,
+        end: int,
+        step: int,
+    ) -> list[Series]:
+        with self.wrap_execute_excs(query=dba_query, stage="request"):
+            resp = await self._run_range_query(query_text, start, end, step)
+        await self._check_response_status(resp, dba_query)
+        data = await resp.json()
+        try:
+            if data["data"]["resultType"] != "matrix":
+                raise ValueError(f"Unexpected result type: {data['data']['resultType']}")
+            return [(chunk["metric"], chunk["values"]) for chunk in data["data"]["result"]]
+        except (KeyError, TypeError, ValueError) as err:
+            raise DatabaseQueryError(
+                message=f"Unexpected API response body: {err.args[0]}",
+                db_message=str(data)[:100],
+                query=dba_query.debug_compiled_query,
+                inspector_query=dba_query.inspector_query,
+            ) from err
+
+    async def _get_range_data_cached(self, dba_query: DBAdapterQuery, range_cache: PromQLRangeCache) -> dict | None:
+        """
+        The `data` of the response stitched from the cached buckets and the requests for the rest of the range,
+        `None` if the range can't be cached
+        """
+        conn_params = self._get_range_params(dba_query)
+        start, end, step = (to_seconds(conn_params[param]) for param in ("from", "to", "step"))
+        if start is None or end is None or step is None or step <= 0 or end < start:
+            return None
+
+        query_text = self.compile_query_for_execution(dba_query.query)
+        if depends_on_range_bounds(query_text):
+            return None
+        range_key = PromQLRangeKey(
+            connection=make_connection_key(self._target_dto),
+            query=query_text,
+            step=step,
+            phase=start % step,
+        )
+        bucket_points = self._target_dto.range_cache_bucket_points
+        assert bucket_points is not None
+        bucket_ranges = split_range(
+            start=start,
+            end=end,
+            step=step,
+            bucket_points=bucket_points,
+            closed_before=time.time() - self._target_dto.range_cache_closed_after_sec,
+        )
+
+        def point_ts(point: int) -> int:
+            return range_key.phase + point * step
+
+        parts: list[list[Series] | None] = []
+        for bucket_range in bucket_ranges:
+            bucket = range_cache.get(range_key, bucket_range.bucket_idx) if bucket_range.closed else None
+            if bucket is None:
+                parts.append(None)
+            else:
+                parts.append(
+                    select_points(bucket, point_ts(bucket_range.first_point), point_ts(bucket_range.last_point))
+                )
+
+        cached_buckets = sum(1 for part in parts if part is not None)
+        # A request per run of the buckets that are not in the cache
+        idx = 0
+        while idx < len(bucket_ranges):
+            if parts[idx] is not None:
+                idx += 1
+                continue
+            run_end = idx
+            while run_end + 1 < len(bucket_ranges) and parts[run_end + 1] is None:
+                run_end += 1
+            run_series = await self._fetch_range_series(
+                dba_query,
+                query_text=query_text,
+                start=point_ts(bucket_ranges[idx].first_point),
+                end=point_ts(bucket_ranges[run_end].last_point),
+                step=step,
+            )
+            for bucket_range in bucket_ranges[idx : run_end + 1]:
+                bucket_series = select_points(
+                    run_series, point_ts(bucket_range.first_point), point_ts(bucket_range.last_point)
+                )
+                if bucket_range.closed and bucket_range.complete:
+                    range_cache.put(range_key, bucket_range.bucket_idx, bucket_series)
+                parts[idx] = bucket_series
+                idx += 1
+
+        LOGGER.info(
+            "PromQL range cache: %s of %s buckets taken from the cache",
+            cached_buckets,
+            len(bucket_ranges),
+        )
+        return {"resultType": "matrix", "result": merge_series([part for part in parts if part is not None])}
+
     @staticmethod
     def _parse_response_body_data(data: dict) -> dict:
         rows = []
@@ -191,18 +327,21 @@ class AsyncPromQLAdapter(AiohttpDBAdapter):
 
         return {"rows": rows, "schema": schema}
 
-    async def _parse_response_body(self, resp: ClientResponse, dba_query: DBAdapterQuery) -> dict:
-        data = await resp.json()
+    def _parse_response_data(self, data: dict, dba_query: DBAdapterQuery) -> dict:
         try:
-            return self._parse_response_body_data(data["data"])
+            return self._parse_response_body_data(data)
         except ValueError as err:
             raise DatabaseQueryError(
                 message=f"Unexpected API response body: {err.args[0]}",
-                db_message=data["data"]["result"][:100],
+                db_message=data["result"][:100],
                 query=dba_query.debug_compiled_query,
                 inspector_query=dba_query.inspector_query,
             ) from err
 
+    async def _parse_response_body(self, resp: ClientResponse, dba_query: DBAdapterQuery) -> dict:
+        data = await resp.json()
+        return self._parse_response_data(data["data"], dba_query)
+
     @staticmethod
     def make_exc(  # TODO:  Move to ErrorTransformer
         status_code: int,
@@ -221,21 +360,18 @@ class AsyncPromQLAdapter(AiohttpDBAdapter):
 
     @generic_profiler_async("db-full")  # type: ignore  # TODO: fix
     async def execute(self, dba_query: DBAdapterQuery) -> AsyncRawExecutionResult:
-        with self.wrap_execute_excs(query=dba_query, stage="request"):
-            resp = await self._run_query(dba_query)
-
-        if resp.status != 200:
-            body = await resp.text()
-            body_piece = body[:100] + ("…" if len(body) > 100 else "")  # TODO: depends on db ownership
-            db_exc = self.make_exc(
-                status_code=resp.status,
-                err_body=body_piece,
-                debug_query=dba_query.debug_compiled_query,
-                inspector_query=dba_query.inspector_query,
-            )
-            raise db_exc
-
-        rd = await self._parse_response_body(resp, dba_query=dba_query)
+        range_data = None
+        range_cache = self._get_range_cache()
+        if range_cache is not None:
+            range_data = await self._get_range_data_cached(dba_query, range_cache)
+
+        if range_data is not None:
+            rd = self._parse_response_data(range_data, dba_query)
+        else:
+            with self.wrap_execute_excs(query=dba_query, stage="request"):
+                resp = await self._run_query(dba_query)
+            await self._check_response_status(resp, dba_query)
+            rd = await self._parse_response_body(resp, dba_query=dba_query)
 
         async def chunk_gen(
             chunk_size: int = dba_query.chunk_size or self._default_chunk_size,
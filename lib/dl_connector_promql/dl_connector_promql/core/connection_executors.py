@@ -11,6 +11,11 @@ from dl_connector_promql.core.adapter import (
     AsyncPromQLAdapter,
     PromQLAdapter,
 )
+from dl_connector_promql.core.constants import CONNECTION_TYPE_PROMQL
+from dl_connector_promql.core.settings import (
+    PromQLConnectorSettings,
+    PromQLRangeCacheSettings,
+)
 from dl_connector_promql.core.target_dto import PromQLConnTargetDTO
 
 if TYPE_CHECKING:
@@ -49,7 +54,23 @@ class PromQLAsyncAdapterConnExecutor(DefaultSqlAlchemyConnExecutor[AsyncPromQLAd
 
     _conn_dto: PromQLConnDTO = attr.ib()
 
+    def _get_range_cache_settings(self) -> PromQLRangeCacheSettings | None:
+        if self._services_registry is None:
+            return None
+        connector_settings = self._services_registry.get_connectors_settings(CONNECTION_TYPE_PROMQL)
+        if not isinstance(connector_settings, PromQLConnectorSettings) or not connector_settings.RANGE_CACHE.ENABLED:
+            return None
+        return connector_settings.RANGE_CACHE
+
     async def _make_target_conn_dto_pool(self) -> Sequence[PromQLConnTargetDTO]:
+        range_cache_params: dict[str, int] = {}
+        range_cache_settings = self._get_range_cache_settings()
+        if range_cache_settings is not None:
+            range_cache_params = {
+                "range_cache_bucket_points": range_cache_settings.BUCKET_POINTS,
+                "range_cache_closed_after_sec": range_cache_settings.CLOSED_AFTER_SEC,
+                "range_cache_max_points": range_cache_settings.MAX_POINTS,
+            }
         return [
             PromQLConnTargetDTO(
                 conn_id=self._conn_dto.conn_id,
@@ -65,5 +86,6 @@ class PromQLAsyncAdapterConnExecutor(DefaultSqlAlchemyConnExecutor[AsyncPromQLAd
                 protocol=self._conn_dto.protocol,
                 db_name=self._conn_dto.db_name,
                 ca_data=self._ca_data.decode("ascii"),
+                **range_cache_params,
             )
         ]
@@ -19,6 +19,7 @@ from dl_connector_promql.core.constants import (
     SOURCE_TYPE_PROMQL,
 )
 from dl_connector_promql.core.data_source import PromQLDataSource
+from dl_connector_promql.core.settings import PromQLSettingDefinition
 from dl_connector_promql.core.storage_schemas.connection import PromQLConnectionDataStorageSchema
 from dl_connector_promql.core.type_transformer import PromQLTypeTransformer
 from dl_connector_promql.core.us_connection import PromQLConnection
@@ -34,6 +35,7 @@ class PromQLCoreConnectionDefinition(CoreConnectionDefinition):
     dialect_string = "bi_promql"
     custom_dashsql_key_names = frozenset(("from", "to", "step"))
     allow_export = True
+    settings_definition = PromQLSettingDefinition
 
 
 class PromQLCoreSourceDefinition(CoreSourceDefinition):
@@ -0,0 +1,204 @@
+"""
+Cache of the `api/v1/query_range` results split into time buckets.
+
+The points of a range query are evaluated at `start + k * step`, and the value at a point doesn't depend
+on the rest of the range, so the results of the queries on the same grid (same step and `start % step`)
+can be split into the buckets of `bucket_points` points and reused. Only the closed buckets are cached:
+the ones that end at least `closed_after_sec` before the time of the query, when the samples are not expected
+to be changed (or added) anymore. The rest of the range (usually the newest bucket) is requested every time.
+
+The queries with the `@ start()` / `@ end()` modifiers are evaluated at the bounds of the whole range,
+so their values do depend on the rest of the range, and they are not cached.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Sequence
+import hashlib
+import re
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
+
+import attr
+
+if TYPE_CHECKING:
+    from dl_connector_promql.core.target_dto import PromQLConnTargetDTO
+
+# `(labels, [[timestamp, value], ...])` of the series of the `matrix` result
+Series = tuple[dict[str, str], list[list[Any]]]
+
+# Might be matched in a string literal too: such queries are just not cached
+_RANGE_BOUND_MODIFIER_RE = re.compile(r"@\s*(?:start|end)\s*\(\s*\)")
+
+
+@attr.s(frozen=True)
+class PromQLRangeKey:
+    connection: str = attr.ib()
+    query: str = attr.ib()
+    step: int = attr.ib()
+    # `start % step`: the grid of the points
+    phase: int = attr.ib()
+
+
+@attr.s(frozen=True)
+class BucketRange:
+    bucket_idx: int = attr.ib()
+    # Point indexes on the grid: the part of the bucket within the requested range
+    first_point: int = attr.ib()
+    last_point: int = attr.ib()
+    # Can be taken from the cache
+    closed: bool = attr.ib()
+    # The part is the whole bucket (and can be put into the cache if it is closed)
+    complete: bool = attr.ib()
+
+
+def make_connection_key(target_dto: PromQLConnTargetDTO) -> str:
+    """The location of the data and a digest of the credentials: the results are visible with those only"""
+    credentials = f"{target_dto.auth_type.value}:{target_dto.username}:{target_dto.password}:{target_dto.auth_header}"
+    credentials_digest = hashlib.sha256(credentials.encode()).hexdigest()
+    return f"{target_dto.protocol}://{target_dto.host}:{target_dto.port}/{target_dto.path}#{credentials_digest}"
+
+
+def depends_on_range_bounds(query_text: str) -> bool:
+    """Whether the query uses the `@ start()` / `@ end()` modifiers"""
+    return _RANGE_BOUND_MODIFIER_RE.search(query_text) is not None
+
+
+def to_seconds(value: Any) -> int | None:
+    """Integer seconds of a `from`/`to`/`step` value, `None` if it can't be cached (e.g. a duration string)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, int):
+        return value
+    return None
+
+
+def split_range(
+    start: int,
+    end: int,
+    step: int,
+    bucket_points: int,
+    closed_before: float,
+) -> list[BucketRange]:
+    """The buckets of the points of the range, `closed_before` is the time the closed buckets end before"""
+    if end < start:
+        return []
+    phase = start % step
+    first_point = (start - phase) // step
+    last_point = first_point + (end - start) // step
+    result = []
+    for bucket_idx in range(first_point // bucket_points, last_point // bucket_points + 1):
+        bucket_first_point = bucket_idx * bucket_points
+        bucket_last_point = bucket_first_point + bucket_points - 1
+        part_first_point = max(first_point, bucket_first_point)
+        part_last_point = min(last_point, bucket_last_point)
+        result.append(
+            BucketRange(
+                bucket_idx=bucket_idx,
+                first_point=part_first_point,
+                last_point=part_last_point,
+                closed=phase + bucket_last_point * step < closed_before,
+                complete=part_first_point == bucket_first_point and part_last_point == bucket_last_point,
+            )
+        )
+    return result
+
+
+def select_points(series: Sequence[Series], first_ts: float, last_ts: float) -> list[Series]:
+    result = []
+    for labels, values in series:
+        selected = [value for value in values if first_ts <= value[0] <= last_ts]
+        if selected:
+            result.append((labels, selected))
+    return result
+
+
+def merge_series(parts: Sequence[Sequence[Series]]) -> list[dict[str, Any]]:
+    """Concatenate the consecutive parts of the result into the `matrix` result, in the order of the first points"""
+    merged: dict[tuple[tuple[str, str], ...], dict[str, Any]] = {}
+    for part in parts:
+        for labels, values in part:
+            labels_key = tuple(sorted(labels.items()))
+            if labels_key in merged:
+                merged[labels_key]["values"].extend(values)
+            else:
+                merged[labels_key] = {"metric": labels, "values": list(values)}
+    return list(merged.values())
+
+
+class PromQLRangeCacheStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+
+class PromQLRangeCache:
+    """Process-wide LRU of the closed buckets, limited by the total number of the points"""
+
+    def __init__(self, max_points: int) -> None:
+        self.max_points = max_points
+        self.stats = PromQLRangeCacheStats()
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[tuple[PromQLRangeKey, int], tuple[Series, ...]] = OrderedDict()
+        self._points = 0
+
+    @staticmethod
+    def _count_points(bucket: Sequence[Series]) -> int:
+        # Empty buckets take some space too
+        return max(sum(len(values) for _, values in bucket), 1)
+
+    @property
+    def points(self) -> int:
+        return self._points
+
+    def get(self, range_key: PromQLRangeKey, bucket_idx: int) -> tuple[Series, ...] | None:
+        with self._lock:
+            bucket = self._buckets.get((range_key, bucket_idx))
+            if bucket is None:
+                self.stats.misses += 1
+                return None
+            self._buckets.move_to_end((range_key, bucket_idx))
+            self.stats.hits += 1
+            return bucket
+
+    def put(self, range_key: PromQLRangeKey, bucket_idx: int, bucket: Sequence[Series]) -> None:
+        bucket = tuple(bucket)
+        points = self._count_points(bucket)
+        if points > self.max_points:
+            return
+        with self._lock:
+            previous = self._buckets.pop((range_key, bucket_idx), None)
+            if previous is not None:
+                self._points -= self._count_points(previous)
+            self._buckets[(range_key, bucket_idx)] = bucket
+            self._points += points
+            while self._points > self.max_points:
+                _, evicted = self._buckets.popitem(last=False)
+                self._points -= self._count_points(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._points = 0
+
+
+_RANGE_CACHE: PromQLRangeCache | None = None
+
+
+def get_promql_range_cache(max_points: int) -> PromQLRangeCache:
+    """The cache of the process, created with the size of the first caller"""
+    global _RANGE_CACHE
+    if _RANGE_CACHE is None:
+        _RANGE_CACHE = PromQLRangeCache(max_points=max_points)
+    return _RANGE_CACHE
@@ -0,0 +1,28 @@
+import pydantic
+
+from dl_core.connectors.settings.base import ConnectorSettings
+from dl_core.connectors.settings.primitives import ConnectorSettingsDefinition
+import dl_settings
+
+from dl_connector_promql.core.constants import CONNECTION_TYPE_PROMQL
+
+
+class PromQLRangeCacheSettings(dl_settings.BaseSettings):
+    """Cache of the closed time buckets of the range queries results (see `dl_connector_promql.core.range_cache`)"""
+
+    ENABLED: bool = False
+    BUCKET_POINTS: int = 60
+    # The buckets that end earlier than that before the query are not expected to be changed
+    CLOSED_AFTER_SEC: int = 300
+    # Process-wide
+    MAX_POINTS: int = 1_000_000
+
+
+class PromQLConnectorSettings(ConnectorSettings):
+    type: str = CONNECTION_TYPE_PROMQL.value
+
+    RANGE_CACHE: PromQLRangeCacheSettings = pydantic.Field(default_factory=PromQLRangeCacheSettings)
+
+
+class PromQLSettingDefinition(ConnectorSettingsDefinition):
+    pydantic_settings_class = PromQLConnectorSettings
@@ -23,6 +23,10 @@ class PromQLConnTargetDTO(BaseSQLConnTargetDTO, BaseAiohttpConnTargetDTO):
     protocol: str = attr.ib()
     auth_type: PromQLAuthType = attr.ib()
     auth_header: str | None = attr.ib(repr=False)
+    # `None` if the range cache is disabled
+    range_cache_bucket_points: int | None = attr.ib(default=None)
+    range_cache_closed_after_sec: int = attr.ib(default=300)
+    range_cache_max_points: int = attr.ib(default=1_000_000)
 
     @classmethod
     def _from_jsonable_dict(cls, data: dict) -> Self:
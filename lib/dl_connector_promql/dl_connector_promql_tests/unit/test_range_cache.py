@@ -0,0 +1,170 @@
+from collections.abc import AsyncGenerator
+import time
+from typing import Any
+
+import pytest
+import pytest_asyncio
+
+from dl_core.connection_executors.models.db_adapter_data import DBAdapterQuery
+from dl_core.connection_executors.models.scoped_rci import DBAdapterScopedRCI
+from dl_testing.utils import get_root_certificates
+
+from dl_connector_promql.core.adapter import AsyncPromQLAdapter
+from dl_connector_promql.core.constants import PromQLAuthType
+import dl_connector_promql.core.range_cache as range_cache_mod
+from dl_connector_promql.core.range_cache import (
+    BucketRange,
+    PromQLRangeCache,
+    PromQLRangeKey,
+    depends_on_range_bounds,
+    split_range,
+)
+from dl_connector_promql.core.target_dto import PromQLConnTargetDTO
+
+STEP = 10
+BUCKET_POINTS = 60
+
+
+class _FakeResponse:
+    status = 200
+
+    def __init__(self, data: dict) -> None:
+        self._data = data
+
+    async def json(self) -> dict:
+        return self._data
+
+
+def _evaluate(start: int, end: int, step: int) -> dict:
+    """A gauge and a series that appears later, on the same grid as Prometheus would have it"""
+    timestamps = list(range(start, end + 1, step))
+    result = [
+        {"metric": {"__name__": "up", "job": "a"}, "values": [[ts, str(ts / 10)] for ts in timestamps]},
+        {"metric": {"__name__": "up", "job": "b"}, "values": [[ts, "1"] for ts in timestamps if ts >= 3000]},
+    ]
+    return {
+        "status": "success",
+        "data": {"resultType": "matrix", "result": [item for item in result if item["values"]]},
+    }
+
+
+@pytest_asyncio.fixture(name="adapter")
+async def fixture_adapter(monkeypatch: pytest.MonkeyPatch) -> AsyncGenerator[AsyncPromQLAdapter, None]:
+    monkeypatch.setattr(range_cache_mod, "_RANGE_CACHE", None)
+    target_dto = PromQLConnTargetDTO(
+        conn_id=None,
+        host="localhost",
+        port=9090,
+        username="user",
+        password="secret",
+        db_name=None,
+        ca_data=get_root_certificates().decode("ascii"),
+        path="/",
+        protocol="http",
+        auth_type=PromQLAuthType.password,
+        auth_header=None,
+        range_cache_bucket_points=BUCKET_POINTS,
+        range_cache_closed_after_sec=300,
+    )
+    adapter = AsyncPromQLAdapter(target_dto=target_dto, req_ctx_info=DBAdapterScopedRCI(), default_chunk_size=1000)
+    adapter.requests = []  # type: ignore[attr-defined]
+
+    async def run_range_query(query_text: str, start: Any, end: Any, step: Any) -> _FakeResponse:
+        adapter.requests.append((start, end))  # type: ignore[attr-defined]
+        return _FakeResponse(_evaluate(start, end, step))
+
+    monkeypatch.setattr(adapter, "_run_range_query", run_range_query)
+    monkeypatch.setattr(adapter, "compile_query_for_execution", lambda query: str(query))
+    yield adapter
+    await adapter.close()
+
+
+async def _execute(adapter: AsyncPromQLAdapter, start: int, end: int, query: str = "up") -> list[list[Any]]:
+    dba_query = DBAdapterQuery(query=query, connector_specific_params={"from": start, "to": end, "step": STEP})
+    result = await adapter.execute(dba_query)
+    return [row async for chunk in result.raw_chunk_generator for row in chunk]
+
+
+def _expected_rows(start: int, end: int) -> list[list[Any]]:
+    return AsyncPromQLAdapter._parse_response_body_data(_evaluate(start, end, STEP)["data"])["rows"]
+
+
+def test_split_range() -> None:
+    # Points 100..400 of 60-point buckets, the ones that end before 2500 are closed
+    assert split_range(start=1000, end=4000, step=STEP, bucket_points=BUCKET_POINTS, closed_before=2500) == [
+        BucketRange(bucket_idx=1, first_point=100, last_point=119, closed=True, complete=False),
+        BucketRange(bucket_idx=2, first_point=120, last_point=179, closed=True, complete=True),
+        BucketRange(bucket_idx=3, first_point=180, last_point=239, closed=True, complete=True),
+        BucketRange(bucket_idx=4, first_point=240, last_point=299, closed=False, complete=True),
+        BucketRange(bucket_idx=5, first_point=300, last_point=359, closed=False, complete=True),
+        BucketRange(bucket_idx=6, first_point=360, last_point=400, closed=False, complete=False),
+    ]
+    # Another grid
+    (bucket_range,) = split_range(start=1003, end=1005, step=STEP, bucket_points=BUCKET_POINTS, closed_before=0)
+    assert (bucket_range.first_point, bucket_range.last_point) == (100, 100)
+    assert split_range(start=1000, end=990, step=STEP, bucket_points=BUCKET_POINTS, closed_before=0) == []
+
+
+def test_cache_limited_by_points() -> None:
+    cache = PromQLRangeCache(max_points=5)
+    key = PromQLRangeKey(connection="conn", query="up", step=STEP, phase=0)
+    series = ({"job": "a"}, [[0, "1"], [10, "2"]])
+    cache.put(key, 1, [series])
+    cache.put(key, 2, [series])
+    assert cache.get(key, 1) == (series,)
+    cache.put(key, 3, [series])
+    assert cache.get(key, 2) is None
+    assert cache.get(key, 1) == (series,)
+    assert cache.points == 4
+
+
+def test_depends_on_range_bounds() -> None:
+    assert depends_on_range_bounds("rate(http_requests_total[5m] @ end())")
+    assert depends_on_range_bounds("up @start( )")
+    assert not depends_on_range_bounds("up @ 1609746000")
+    assert not depends_on_range_bounds('up{job="end()"}')
+
+
+@pytest.mark.asyncio
+async def test_execute_fetches_only_missing_buckets(
+    monkeypatch: pytest.MonkeyPatch,
+    adapter: AsyncPromQLAdapter,
+) -> None:
+    monkeypatch.setattr(time, "time", lambda: 10_000)
+
+    assert await _execute(adapter, 1000, 4000) == _expected_rows(1000, 4000)
+    assert adapter.requests == [(1000, 4000)]  # type: ignore[attr-defined]
+
+    # Buckets 2..5 (points 120..359) are in the cache now
+    adapter.requests.clear()  # type: ignore[attr-defined]
+    assert await _execute(adapter, 1600, 4600) == _expected_rows(1600, 4600)
+    assert adapter.requests == [(3600, 4600)]  # type: ignore[attr-defined]
+
+    # Not on the same grid
+    adapter.requests.clear()  # type: ignore[attr-defined]
+    assert await _execute(adapter, 1605, 4605) == _expected_rows(1605, 4605)
+    assert adapter.requests == [(1605, 4605)]  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_execute_refetches_open_buckets(monkeypatch: pytest.MonkeyPatch, adapter: AsyncPromQLAdapter) -> None:
+    # Only the bucket of the points 120..179 ends before 2100
+    monkeypatch.setattr(time, "time", lambda: 2400)
+
+    assert await _execute(adapter, 1000, 2400) == _expected_rows(1000, 2400)
+    adapter.requests.clear()  # type: ignore[attr-defined]
+    assert await _execute(adapter, 1000, 2400) == _expected_rows(1000, 2400)
+    assert adapter.requests == [(1000, 1190), (1800, 2400)]  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_execute_not_cached_with_range_bounds(
+    monkeypatch: pytest.MonkeyPatch,
+    adapter: AsyncPromQLAdapter,
+) -> None:
+    monkeypatch.setattr(time, "time", lambda: 10_000)
+
+    for _ in range(2):
+        assert await _execute(adapter, 1000, 4000, query="up @ start()") == _expected_rows(1000, 4000)
+    assert adapter.requests == [(1000, 4000), (1000, 4000)]  # type: ignore[attr-defined]
+    assert range_cache_mod.get_promql_range_cache(max_points=1).points == 0
@@ -344,6 +344,7 @@ class ProcessorType(Enum):
     SOURCE_DB = auto()
     ASYNCPG = auto()
     AIOPG = auto()
+    SQLITE = auto()
 
 
 @unique
@@ -12,16 +12,27 @@ from dl_api_commons.aiohttp.aiohttp_wrappers import (
     RequiredResource,
     RequiredResourceCommon,
 )
+from dl_cache_engine.processing_helper import get_locked_cache_stats
+import dl_logging
 
 
 class MetricsView(DLRequestView):
     REQUIRED_RESOURCES: ClassVar[frozenset[RequiredResource]] = frozenset({RequiredResourceCommon.SKIP_AUTH})
 
+    def get_extra_metrics(self) -> list[tuple[str, int | float]]:
+        """Application-specific metrics, as `(label, value)`"""
+        return []
+
     async def get(self) -> web.Response:
         result = []
         if os.environ.get("UWSGI_STATS"):
             uwsgi_metrics = uwsgi_prometheus(label_prefix="uwsgi_")
             result.extend(uwsgi_metrics)
+        log_queue = dl_logging.get_log_queue()
+        if log_queue is not None:
+            result.extend(log_queue.get_metrics())
+        result.extend(get_locked_cache_stats().get_metrics())
+        result.extend(self.get_extra_metrics())
 
         body = "".join(dump_for_prometheus(result))
         return web.Response(text=body)
@@ -22,7 +22,10 @@ from dl_core.enums import USApiType
 from dl_core.services_registry.top_level import DummyServiceRegistry
 from dl_core.us_manager.dynamic_token_factory import DynamicUSMasterTokenFactory
 from dl_core.us_manager.factory import USMFactory
-from dl_core.us_manager.us_manager_async import AsyncUSManager
+from dl_core.us_manager.us_manager_async import (
+    DEFAULT_DEPENDENCIES_LOAD_CONCURRENCY,
+    AsyncUSManager,
+)
 import dl_retrier
 from dl_utils.aio import shield_wait_for_complete
 
@@ -129,12 +132,16 @@ def us_manager_middleware(
     ca_data: bytes,
     retry_policy_factory: dl_retrier.BaseRetryPolicyFactory,
     embed: bool = False,
+    dependencies_load_concurrency: int = DEFAULT_DEPENDENCIES_LOAD_CONCURRENCY,
+    batch_get_entries: bool = False,
 ) -> Middleware:
     usm_factory = USMFactory(
         us_base_url=us_base_url,
         crypto_keys_config=crypto_keys_config,
         ca_data=ca_data,
         retry_policy_factory=retry_policy_factory,
+        dependencies_load_concurrency=dependencies_load_concurrency,
+        batch_get_entries=batch_get_entries,
     )
 
     @web.middleware
@@ -167,6 +174,8 @@ def public_us_manager_middleware(
     crypto_keys_config: CryptoKeysConfig,
     ca_data: bytes,
     retry_policy_factory: dl_retrier.BaseRetryPolicyFactory,
+    dependencies_load_concurrency: int = DEFAULT_DEPENDENCIES_LOAD_CONCURRENCY,
+    batch_get_entries: bool = False,
 ) -> Middleware:
     """
     Middleware to create public US manager. Works with committed RCI.
@@ -179,6 +188,8 @@ def public_us_manager_middleware(
         us_public_token=us_public_token,
         ca_data=ca_data,
         retry_policy_factory=retry_policy_factory,
+        dependencies_load_concurrency=dependencies_load_concurrency,
+        batch_get_entries=batch_get_entries,
     )
 
     @web.middleware
@@ -211,6 +222,8 @@ def service_us_manager_middleware(
     env_specific_kwargs: dict[str, Any] | None = None,
     dynamic_token_factory: DynamicUSMasterTokenFactory | None = None,
     master_token_authorization_enabled: bool = True,
+    dependencies_load_concurrency: int = DEFAULT_DEPENDENCIES_LOAD_CONCURRENCY,
+    batch_get_entries: bool = False,
 ) -> Middleware:
     env_specific_kwargs = env_specific_kwargs or {}
     usm_factory = us_manager_factory_class(
@@ -221,6 +234,8 @@ def service_us_manager_middleware(
         retry_policy_factory=retry_policy_factory,
         dynamic_token_factory=dynamic_token_factory,
         master_token_authorization_enabled=master_token_authorization_enabled,
+        dependencies_load_concurrency=dependencies_load_concurrency,
+        batch_get_entries=batch_get_entries,
         **env_specific_kwargs,
     )
 
@@ -48,6 +48,7 @@ from dl_core.connection_executors.models.common import (
 )
 from dl_core.connection_executors.models.constants import (
     HEADER_BODY_SIGNATURE,
+    HEADER_QE_STREAM_FORMAT,
     HEADER_REQUEST_ID,
     HEADER_USE_NEW_QE_SERIALIZER,
 )
@@ -62,6 +63,10 @@ from dl_core.connection_executors.qe_serializer import (
     ResponseTypes,
 )
 from dl_core.connection_executors.qe_serializer import dba_actions as dba_actions
+from dl_core.connection_executors.qe_serializer.stream_framing import (
+    STREAM_FORMAT_FRAMED_V1,
+    FramedEventDecoder,
+)
 from dl_core.connection_models.conn_options import ConnectOptions
 from dl_core.enums import RQEEventType
 from dl_dashsql.typed_query.primitives import (
@@ -140,6 +145,7 @@ class RemoteAsyncAdapter(AsyncDBAdapter):
         req_obj: dba_actions.RemoteDBAdapterAction,
         rel_path: str | None = None,
         use_new_qe_serializer: str | None = None,
+        stream_format: str | None = None,
     ) -> aiohttp.ClientResponse:
         if rel_path is None:
             rel_path = self.DEFAULT_REL_PATH
@@ -162,6 +168,8 @@ class RemoteAsyncAdapter(AsyncDBAdapter):
         }
         if use_new_qe_serializer is not None:
             headers[HEADER_USE_NEW_QE_SERIALIZER] = use_new_qe_serializer
+        if stream_format is not None:
+            headers[HEADER_QE_STREAM_FORMAT] = stream_format
         if self._req_ctx_info.request_id:
             headers[HEADER_REQUEST_ID] = self._req_ctx_info.request_id
 
@@ -299,9 +307,35 @@ class RemoteAsyncAdapter(AsyncDBAdapter):
             raw_chunk_generator=data_generator(),
         )
 
+    @staticmethod
+    def _make_framed_event_gen(
+        resp: aiohttp.ClientResponse,
+        query: DBAdapterQuery,
+    ) -> AsyncGenerator[tuple[RQEEventType, Any], None]:
+        async def event_gen() -> AsyncGenerator[tuple[RQEEventType, Any], None]:
+            decoder = FramedEventDecoder()
+            while True:
+                try:
+                    raw_data = await resp.content.readany()
+                except asyncio.CancelledError as err:
+                    raise common_exc.SourceTimeoutError(
+                        db_message="Source timed out",
+                        query=query.debug_compiled_query,
+                        inspector_query=query.inspector_query,
+                    ) from err
+                if not raw_data:
+                    if decoder.has_pending_data:
+                        raise QueryExecutorError("QE parse: stream ended in the middle of a frame")
+                    return
+
+                for event in decoder.feed(raw_data):
+                    yield event
+
+        return event_gen()
+
     # Here we have some async problem:
     #  "qe" stage will be finished before some nested stages in RQE (e.g. "qe/fetch")
-    async def _execute_stream(self, query: DBAdapterQuery) -> AsyncRawExecutionResult:
+    async def _execute_stream(self, query: DBAdapterQuery, framed: bool = False) -> AsyncRawExecutionResult:
         resp = await self._make_request(
             dba_actions.ActionExecuteQuery(
                 db_adapter_query=query,
@@ -309,6 +343,7 @@ class RemoteAsyncAdapter(AsyncDBAdapter):
                 dba_cls=self._dba_cls,
                 req_ctx_info=self._req_ctx_info,
             ),
+            stream_format=STREAM_FORMAT_FRAMED_V1 if framed else None,
         )
 
         if resp.status != 200:
@@ -316,6 +351,10 @@ class RemoteAsyncAdapter(AsyncDBAdapter):
             exc = self._parse_exception(resp_body_json)
             raise exc
 
+        # An older RQE would ignore the requested format.
+        if resp.headers.get(HEADER_QE_STREAM_FORMAT) == STREAM_FORMAT_FRAMED_V1:
+            return await self._get_execution_result(self._make_framed_event_gen(resp, query))
+
         async def event_gen() -> AsyncGenerator[tuple[RQEEventType, Any], None]:
             buf = b""
 
@@ -381,8 +420,11 @@ class RemoteAsyncAdapter(AsyncDBAdapter):
 
     @generic_profiler_async("qe")  # type: ignore  # TODO: fix
     async def execute(self, query: DBAdapterQuery) -> AsyncRawExecutionResult:
-        if self._rqe_data.execute_request_mode == RQEExecuteRequestMode.STREAM:
+        execute_request_mode = self._rqe_data.execute_request_mode
+        if execute_request_mode == RQEExecuteRequestMode.STREAM:
             return await self._execute_stream(query)
+        if execute_request_mode == RQEExecuteRequestMode.STREAM_FRAMED:
+            return await self._execute_stream(query, framed=True)
 
         return await self._execute_non_stream(query)
 
@@ -0,0 +1,212 @@
+"""
+Process-wide storage of the database connection pools.
+
+Connection executors (and their adapters) live only as long as the services registry of one request,
+so the pools owned by the adapters are created (and closed) on every request.
+Adapters can borrow their pools from the `ConnPoolManager` instead:
+the pools are kept between the requests and are closed when they become idle.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+)
+from contextlib import asynccontextmanager
+import logging
+import time
+from typing import Any
+
+import attr
+
+LOGGER = logging.getLogger(__name__)
+
+
+@attr.s
+class _PoolEntry[POOL_TV]:
+    loop: asyncio.AbstractEventLoop = attr.ib(kw_only=True)
+    lock: asyncio.Lock = attr.ib(kw_only=True, factory=asyncio.Lock)
+    pool: POOL_TV | None = attr.ib(kw_only=True, default=None)
+    closer: Callable[[POOL_TV], Awaitable[None]] | None = attr.ib(kw_only=True, default=None)
+    borrowed: int = attr.ib(kw_only=True, default=0)
+    last_used_ts: float = attr.ib(kw_only=True, factory=time.monotonic)
+    last_checked_ts: float = attr.ib(kw_only=True, factory=time.monotonic)
+
+
+@attr.s
+class ConnPoolManager:
+    """
+    Keeps one connection pool per connection key and event loop.
+
+    The key should identify everything that the pool connections depend on:
+    adapter class, hosts, database, credentials (or their hash) and connection options.
+    The pools are created by the factory passed by the adapter with `max_size` as the size limit.
+    Pools that have not been used for `idle_timeout_sec` are closed by a sweep
+    that runs on borrow (at most once per `sweep_interval_sec`).
+    If there are more than `max_pools` pools, the least recently used idle ones are closed.
+    A pool that has not been checked for `health_check_interval_sec` is checked before it is lent;
+    if the check fails, the pool is recreated.
+    """
+
+    _max_size: int = attr.ib(kw_only=True, default=10)
+    _max_pools: int = attr.ib(kw_only=True, default=100)
+    _idle_timeout_sec: float = attr.ib(kw_only=True, default=300.0)
+    _health_check_interval_sec: float = attr.ib(kw_only=True, default=30.0)
+    _sweep_interval_sec: float = attr.ib(kw_only=True, default=10.0)
+    _close_timeout_sec: float = attr.ib(kw_only=True, default=2.5)
+
+    _entries: OrderedDict[tuple[int, Hashable], _PoolEntry[Any]] = attr.ib(init=False, factory=OrderedDict)
+    _last_sweep_ts: float = attr.ib(init=False, factory=time.monotonic)
+    _sweeping: bool = attr.ib(init=False, default=False)
+
+    _created_count: int = attr.ib(init=False, default=0)
+    _reused_count: int = attr.ib(init=False, default=0)
+    _evicted_count: int = attr.ib(init=False, default=0)
+    _health_check_failed_count: int = attr.ib(init=False, default=0)
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    async def _close_entry(self, entry: _PoolEntry[Any]) -> None:
+        pool, entry.pool = entry.pool, None
+        if pool is None or entry.closer is None:
+            return
+        try:
+            await asyncio.wait_for(entry.closer(pool), timeout=self._close_timeout_sec)
+        except Exception:
+            LOGGER.warning("Failed to close a connection pool", exc_info=True)
+
+    async def _evict(self, entry_key: tuple[int, Hashable], entry: _PoolEntry[Any]) -> None:
+        # The entry could be borrowed or replaced while the previous ones were being closed
+        if entry.borrowed > 0 or self._entries.get(entry_key) is not entry:
+            return
+        self._entries.pop(entry_key, None)
+        self._evicted_count += 1
+        if entry.loop is asyncio.get_running_loop():
+            await self._close_entry(entry)
+        else:
+            # Pools can only be closed in their own loop; the closed loop takes the connections with it
+            entry.pool = None
+
+    async def _sweep(self, now: float) -> None:
+        loop = asyncio.get_running_loop()
+        stale_entries = [
+            (entry_key, entry)
+            for entry_key, entry in self._entries.items()
+            if entry.borrowed == 0
+            and (entry.loop.is_closed() or (entry.loop is loop and now - entry.last_used_ts > self._idle_timeout_sec))
+        ]
+        for entry_key, entry in stale_entries:
+            await self._evict(entry_key, entry)
+
+        excess = len(self._entries) - self._max_pools
+        if excess > 0:
+            lru_entries = [
+                (entry_key, entry)
+                for entry_key, entry in self._entries.items()  # oldest first
+                if entry.borrowed == 0 and entry.loop is loop
+            ][:excess]
+            for entry_key, entry in lru_entries:
+                await self._evict(entry_key, entry)
+
+    async def _check_health[
+        POOL_TV
+    ](self, entry: _PoolEntry[POOL_TV], health_check: Callable[[POOL_TV], Awaitable[None]] | None, now: float,) -> None:
+        if entry.pool is None or health_check is None or now - entry.last_checked_ts < self._health_check_interval_sec:
+            return
+        if entry.borrowed > 1:
+            # The pool is being used by someone else right now, so it can't be recreated anyway
+            return
+        try:
+            await health_check(entry.pool)
+        except Exception:
+            LOGGER.warning("Connection pool health check failed, the pool will be recreated", exc_info=True)
+            self._health_check_failed_count += 1
+            await self._close_entry(entry)
+        entry.last_checked_ts = now
+
+    @asynccontextmanager
+    async def borrow[
+        POOL_TV
+    ](
+        self,
+        key: Hashable,
+        factory: Callable[[int], Awaitable[POOL_TV]],
+        closer: Callable[[POOL_TV], Awaitable[None]],
+        health_check: Callable[[POOL_TV], Awaitable[None]] | None = None,
+    ) -> AsyncIterator[POOL_TV]:
+        """
+        Lend the pool for `key` (creating it with `factory(max_size)` if needed).
+        The pool is not closed while it is borrowed and must not be closed by the borrower.
+        """
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        if not self._sweeping and (
+            now - self._last_sweep_ts > self._sweep_interval_sec or len(self._entries) > self._max_pools
+        ):
+            # One sweep at a time: the concurrent borrowers don't wait for it
+            self._sweeping = True
+            self._last_sweep_ts = now
+            try:
+                await self._sweep(now)
+            finally:
+                self._sweeping = False
+
+        entry_key = (id(loop), key)
+        entry = self._entries.get(entry_key)
+        if entry is None or entry.loop is not loop:  # loop ids can be reused by new loops
+            entry = _PoolEntry(loop=loop, closer=closer)
+            self._entries[entry_key] = entry
+        self._entries.move_to_end(entry_key)
+
+        entry.borrowed += 1
+        try:
+            async with entry.lock:
+                await self._check_health(entry, health_check=health_check, now=now)
+                if entry.pool is None:
+                    entry.pool = await factory(self._max_size)
+                    entry.closer = closer
+                    entry.last_checked_ts = time.monotonic()
+                    self._created_count += 1
+                else:
+                    self._reused_count += 1
+            yield entry.pool
+        finally:
+            entry.borrowed -= 1
+            entry.last_used_ts = time.monotonic()
+
+    async def close(self) -> None:
+        """Close all pools of the current event loop"""
+        loop = asyncio.get_running_loop()
+        for entry_key in [entry_key for entry_key, entry in self._entries.items() if entry.loop is loop]:
+            entry = self._entries.pop(entry_key)
+            await self._close_entry(entry)
+
+    def get_metrics(self) -> list[tuple[str, int | float]]:
+        return [
+            ("conn_pool_manager_pools", len(self._entries)),
+            ("conn_pool_manager_borrowed", sum(entry.borrowed for entry in self._entries.values())),
+            ("conn_pool_manager_created", self._created_count),
+            ("conn_pool_manager_reused", self._reused_count),
+            ("conn_pool_manager_evicted", self._evicted_count),
+            ("conn_pool_manager_health_check_failed", self._health_check_failed_count),
+        ]
+
+
+_CONN_POOL_MANAGER: ConnPoolManager | None = None
+
+
+def get_conn_pool_manager() -> ConnPoolManager | None:
+    return _CONN_POOL_MANAGER
+
+
+def set_conn_pool_manager(manager: ConnPoolManager | None) -> None:
+    """Make the adapters that support it borrow their connection pools from `manager` (`None` to disable)"""
+    global _CONN_POOL_MANAGER
+    _CONN_POOL_MANAGER = manager
@@ -1,3 +1,4 @@
 HEADER_BODY_SIGNATURE = "X-DL-QEBodySignature"
 HEADER_REQUEST_ID = "X-Request-Id"
 HEADER_USE_NEW_QE_SERIALIZER = "X-DL-QEUseNewSerialzer"
+HEADER_QE_STREAM_FORMAT = "X-DL-QEStreamFormat"
@@ -0,0 +1,179 @@
+"""
+Framed binary format of the streamed query results (`ActionExecuteQuery`) of the RQE.
+
+Negotiated per request: the client asks for it with the `HEADER_QE_STREAM_FORMAT` request header,
+and the RQE confirms it with the same response header; otherwise the stream is
+a sequence of pickled `(event_type, data)` pairs as before.
+
+Each event is a frame: `>BI` header (event code, payload length) followed by the msgpack payload.
+Data chunks are packed by columns, `[row_count, [column_values, ...], [column_codec, ...]]`,
+which is more compact (no per-row array headers) and is decoded by msgpack in one go.
+The columns of the commonly used non-msgpack types (dates, naive datetimes, decimals)
+are converted as a whole rather than value by value through the serializer hooks.
+The events with the values that msgpack can't pass as they are (integers out of the 64-bit range,
+tuples, sets, unknown types, ...) are pickled as in the old format, and marked so in the event code.
+"""
+
+from __future__ import annotations
+
+from collections.abc import (
+    Callable,
+    Sequence,
+)
+import datetime
+import decimal
+import pickle
+import struct
+from typing import Any
+
+import msgpack
+
+from dl_core.connection_executors.models.exc import QueryExecutorError
+from dl_core.enums import RQEEventType
+from dl_model_tools.msgpack import DLMessagePackSerializer
+
+STREAM_FORMAT_FRAMED_V1 = "framed-v1"
+
+_FRAME_HEADER = struct.Struct(">BI")
+_EVENT_TYPE_TO_CODE: dict[RQEEventType, int] = {
+    RQEEventType.raw_cursor_info: 1,
+    RQEEventType.raw_chunk: 2,
+    RQEEventType.error_dump: 3,
+    RQEEventType.finished: 4,
+}
+_CODE_TO_EVENT_TYPE: dict[int, RQEEventType] = {code: event_type for event_type, code in _EVENT_TYPE_TO_CODE.items()}
+# Set in the event code of the pickled events
+_PICKLED_FLAG = 0x80
+
+_NONE_TYPE = type(None)
+_PLAIN_TYPES = frozenset((_NONE_TYPE, int, float, str, bool, bytes))
+# column value type -> (codec name, encode, decode)
+_COLUMN_CODECS: dict[type, tuple[str, Callable[[Any], Any], Callable[[Any], Any]]] = {
+    datetime.date: ("date", datetime.date.toordinal, datetime.date.fromordinal),
+    datetime.datetime: ("datetime", datetime.datetime.isoformat, datetime.datetime.fromisoformat),
+    decimal.Decimal: ("decimal", str, decimal.Decimal),
+}
+_COLUMN_DECODERS: dict[str, Callable[[Any], Any]] = {name: decode for name, _, decode in _COLUMN_CODECS.values()}
+
+
+def _encode_column(column: Sequence[Any]) -> tuple[Sequence[Any], str | None]:
+    value_types = set(map(type, column))
+    if value_types <= _PLAIN_TYPES:
+        return list(column), None
+
+    value_types.discard(_NONE_TYPE)
+    if len(value_types) == 1:
+        value_type = value_types.pop()
+        codec = _COLUMN_CODECS.get(value_type)
+        # Only the naive datetimes survive the isoformat roundtrip as is.
+        if codec is not None and (
+            value_type is not datetime.datetime or all(value.tzinfo is None for value in column if value is not None)
+        ):
+            codec_name, encode, _ = codec
+            return [None if value is None else encode(value) for value in column], codec_name
+
+    return list(column), None  # to be serialized value by value
+
+
+def _decode_column(column: list[Any], codec_name: str | None) -> list[Any]:
+    if codec_name is None:
+        return column
+    decode = _COLUMN_DECODERS[codec_name]
+    return [None if value is None else decode(value) for value in column]
+
+
+class _StrictMessagePackSerializer(DLMessagePackSerializer):
+    """Raises `TypeError` on the values that would not be decoded as they are (e.g. tuples)"""
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=self._default, strict_types=True)
+
+
+class FramedEventEncoder:
+    def __init__(self) -> None:
+        self._serializer = _StrictMessagePackSerializer()
+
+    @staticmethod
+    def _chunk_to_columns(chunk: Sequence[Sequence[Any]]) -> list[Any]:
+        encoded_columns = [_encode_column(column) for column in zip(*chunk, strict=True)]
+        return [
+            len(chunk),
+            [column for column, _ in encoded_columns],
+            [codec_name for _, codec_name in encoded_columns],
+        ]
+
+    def encode_event(self, event_type: RQEEventType, data: Any) -> bytes:
+        code = _EVENT_TYPE_TO_CODE[event_type]
+        try:
+            payload = self._serializer.dumps(
+                self._chunk_to_columns(data) if event_type == RQEEventType.raw_chunk else data
+            )
+        except (TypeError, ValueError, OverflowError):
+            payload = pickle.dumps(data)
+            code |= _PICKLED_FLAG
+        return _FRAME_HEADER.pack(code, len(payload)) + payload
+
+
+class FramedEventDecoder:
+    """
+    Incremental decoder: can be fed with the data as it is received,
+    regardless of how the frames are split into the network chunks.
+    """
+
+    def __init__(self) -> None:
+        self._serializer = DLMessagePackSerializer()
+        self._buf = bytearray()
+
+    @property
+    def has_pending_data(self) -> bool:
+        return bool(self._buf)
+
+    @staticmethod
+    def _columns_to_chunk(data: Any) -> list[Sequence[Any]]:
+        if not isinstance(data, list) or len(data) != 3:
+            raise QueryExecutorError(f"QE parse: unexpected columnar chunk: {type(data)}")
+        row_count, columns, codec_names = data
+        if not columns:
+            return [()] * row_count
+        columns = [_decode_column(column, codec_name) for column, codec_name in zip(columns, codec_names, strict=True)]
+        return list(zip(*columns, strict=True))
+
+    def _decode_payload(self, event_type: RQEEventType, code: int, payload: memoryview) -> Any:
+        if code & _PICKLED_FLAG:
+            try:
+                return pickle.loads(payload)  # noqa: S301  # trusted internal RQE payload
+            except Exception as err:
+                raise QueryExecutorError("QE parse: failed to unpickle a frame") from err
+
+        try:
+            event_data = self._serializer.loads(payload)
+        except Exception as err:
+            raise QueryExecutorError("QE parse: failed to decode a frame") from err
+        if event_type == RQEEventType.raw_chunk:
+            event_data = self._columns_to_chunk(event_data)
+        return event_data
+
+    def feed(self, data: bytes) -> list[tuple[RQEEventType, Any]]:
+        buf = self._buf
+        buf += data
+        events: list[tuple[RQEEventType, Any]] = []
+        pos = 0
+        header_size = _FRAME_HEADER.size
+        with memoryview(buf) as buf_view:
+            while len(buf) - pos >= header_size:
+                code, payload_size = _FRAME_HEADER.unpack_from(buf_view, pos)
+                frame_end = pos + header_size + payload_size
+                if len(buf) < frame_end:
+                    break
+
+                event_type = _CODE_TO_EVENT_TYPE.get(code & ~_PICKLED_FLAG)
+                if event_type is None:
+                    raise QueryExecutorError(f"QE parse: unknown event code: {code!r}")
+                with buf_view[pos + header_size : frame_end] as payload:
+                    event_data = self._decode_payload(event_type, code, payload)
+
+                events.append((event_type, event_data))
+                pos = frame_end
+
+        del buf[:pos]
+        return events
@@ -36,6 +36,7 @@ from dl_core.connection_executors.adapters.async_adapters_sync_wrapper import As
 from dl_core.connection_executors.adapters.common_base import CommonBaseDirectAdapter
 from dl_core.connection_executors.models.constants import (
     HEADER_BODY_SIGNATURE,
+    HEADER_QE_STREAM_FORMAT,
     HEADER_REQUEST_ID,
     HEADER_USE_NEW_QE_SERIALIZER,
 )
@@ -46,6 +47,10 @@ from dl_core.connection_executors.qe_serializer import (
     ResponseTypes,
 )
 from dl_core.connection_executors.qe_serializer import dba_actions as act
+from dl_core.connection_executors.qe_serializer.stream_framing import (
+    STREAM_FORMAT_FRAMED_V1,
+    FramedEventEncoder,
+)
 from dl_core.connection_executors.remote_query_executor.commons import (
     DEFAULT_CHUNK_SIZE,
     SUPPORTED_ADAPTER_CLS,
@@ -159,21 +164,24 @@ class ActionHandlingView(BaseView):
             response.enable_chunked_encoding()
             # TODO FIX: Use schema/custom JSON encoder
 
+            serialize_event = self.serialize_event
+            if self.request.headers.get(HEADER_QE_STREAM_FORMAT) == STREAM_FORMAT_FRAMED_V1:
+                serialize_event = FramedEventEncoder().encode_event
+                response.headers[HEADER_QE_STREAM_FORMAT] = STREAM_FORMAT_FRAMED_V1
+
             await response.prepare(self.request)
             # After this point, `error_handling_middleware` does not work, so
             # send errors into the events stream:
             try:
-                await response.write(self.serialize_event(RQEEventType.raw_cursor_info, result.raw_cursor_info))
+                await response.write(serialize_event(RQEEventType.raw_cursor_info, result.raw_cursor_info))
 
                 async for raw_chunk in result.raw_chunk_generator:
-                    await response.write(self.serialize_event(RQEEventType.raw_chunk, raw_chunk))
+                    await response.write(serialize_event(RQEEventType.raw_chunk, raw_chunk))
 
             except Exception as err:
-                await response.write(
-                    self.serialize_event(RQEEventType.error_dump, ActionSerializer().serialize_exc(err))
-                )
+                await response.write(serialize_event(RQEEventType.error_dump, ActionSerializer().serialize_exc(err)))
             # Proper chunked close should also indicate this, but making an explicit end-of-stream at this
-            await response.write(self.serialize_event(RQEEventType.finished, None))
+            await response.write(serialize_event(RQEEventType.finished, None))
 
         return response
 
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import (
+    Callable,
+    Iterable,
+)
 import ipaddress
 import logging
 import pickle
@@ -28,6 +31,7 @@ from dl_core import profiling_middleware
 from dl_core.connection_executors.adapters.adapters_base import SyncDirectDBAdapter
 from dl_core.connection_executors.models.constants import (
     HEADER_BODY_SIGNATURE,
+    HEADER_QE_STREAM_FORMAT,
     HEADER_USE_NEW_QE_SERIALIZER,
 )
 from dl_core.connection_executors.qe_serializer import (
@@ -35,6 +39,10 @@ from dl_core.connection_executors.qe_serializer import (
     ResponseTypes,
 )
 from dl_core.connection_executors.qe_serializer import dba_actions as act
+from dl_core.connection_executors.qe_serializer.stream_framing import (
+    STREAM_FORMAT_FRAMED_V1,
+    FramedEventEncoder,
+)
 from dl_core.connection_executors.remote_query_executor.commons import (
     DEFAULT_CHUNK_SIZE,
     SUPPORTED_ADAPTER_CLS,
@@ -147,20 +155,28 @@ class ActionHandlingView(flask.views.View):
     def serialize_event(event: RQEEventType, data: Any) -> bytes:
         return pickle.dumps((event.value, data))
 
-    def response_events_gen(self, db_result: DBAdapterQueryResult, dba: SyncDirectDBAdapter) -> Iterable[bytes]:
+    def response_events_gen(
+        self,
+        db_result: DBAdapterQueryResult,
+        dba: SyncDirectDBAdapter,
+        serialize_event: Callable[[RQEEventType, Any], bytes] | None = None,
+    ) -> Iterable[bytes]:
+        if serialize_event is None:
+            serialize_event = self.serialize_event
+
         try:
-            yield self.serialize_event(RQEEventType.raw_cursor_info, db_result.cursor_info)
+            yield serialize_event(RQEEventType.raw_cursor_info, db_result.cursor_info)
 
             for raw_chunk in db_result.data_chunks:
-                yield self.serialize_event(RQEEventType.raw_chunk, raw_chunk)
+                yield serialize_event(RQEEventType.raw_chunk, raw_chunk)
 
         except Exception as err:
-            yield self.serialize_event(RQEEventType.error_dump, ActionSerializer().serialize_exc(err))
+            yield serialize_event(RQEEventType.error_dump, ActionSerializer().serialize_exc(err))
 
         finally:
             dba.close()
 
-        yield self.serialize_event(RQEEventType.finished, None)
+        yield serialize_event(RQEEventType.finished, None)
 
     def execute_execute_action(
         self,
@@ -173,11 +189,18 @@ class ActionHandlingView(flask.views.View):
             self.try_close_dba(dba)
             raise
 
+        headers = {
+            "Transfer-Encoding": "Chunked",
+        }
+        serialize_event = None
+        # Note: the events generator runs outside of the request context.
+        if flask.request.headers.get(HEADER_QE_STREAM_FORMAT) == STREAM_FORMAT_FRAMED_V1:
+            serialize_event = FramedEventEncoder().encode_event
+            headers[HEADER_QE_STREAM_FORMAT] = STREAM_FORMAT_FRAMED_V1
+
         return flask.Response(
-            chunked_wrap(self.response_events_gen(db_result=db_result, dba=dba)),
-            headers={
-                "Transfer-Encoding": "Chunked",
-            },
+            chunked_wrap(self.response_events_gen(db_result=db_result, dba=dba, serialize_event=serialize_event)),
+            headers=headers,
         )
 
     def execute_non_stream_execute_action(
@@ -1,4 +1,5 @@
 import contextlib
+import hashlib
 import logging
 import os
 import typing
@@ -31,6 +32,26 @@ class BaseSSLCertAdapter:
             self.__get_filename(),
         )
 
+    def get_shared_ssl_cert_path(self, ssl_ca: str | None) -> str:
+        """
+        Path to the root CA that is not bound to the adapter's lifetime (for the pools shared between adapters).
+        The file is named by the content hash, so it is written only once per process and CA.
+        """
+        if ssl_ca is None:
+            return bi_config_utils.get_root_certificates_path()
+
+        crt_path = os.path.join(
+            bi_config_utils.get_temp_root_certificates_folder_path(),
+            f"shared-{hashlib.sha256(ssl_ca.encode()).hexdigest()}.crt",
+        )
+        if not os.path.exists(crt_path):
+            tmp_path = f"{crt_path}.{uuid.uuid4()}"
+            with open(tmp_path, "x", encoding="utf-8") as f:
+                LOGGER.debug("Writing shared root CA to %s", crt_path)
+                f.write(ssl_ca)
+            os.replace(tmp_path, crt_path)
+        return crt_path
+
     @contextlib.contextmanager
     def ssl_cert_context(self, ssl_ca: str | None) -> typing.Generator[None, None, None]:
         assert ssl_ca is not None, "Root CA can't be None for ssl connection context"
@@ -38,6 +38,7 @@ class CacheExecAdapter(ProcessorDbExecAdapterBase):
     _main_processor: ExecutorBasedOperationProcessor = attr.ib(kw_only=True)
     _use_cache: bool = attr.ib(kw_only=True)
     _use_locked_cache: bool = attr.ib(kw_only=True)
+    _use_streaming_cache: bool = attr.ib(kw_only=True)
     _cache_engine_factory: CacheEngineFactory = attr.ib(kw_only=True)
 
     def _save_data_proc_cache_info_reporting_record(self, ctx: OpExecutionContext, cache_full_hit: bool | None) -> None:
@@ -94,6 +95,7 @@ class CacheExecAdapter(ProcessorDbExecAdapterBase):
                 generate_func=_get_from_source,
                 cache_options=cache_options,
                 use_locked_cache=self._use_locked_cache,
+                use_streaming_cache=self._use_streaming_cache,
             )
             if situation == CacheSituation.full_hit:
                 cache_full_hit = True
@@ -105,17 +107,32 @@ class CacheExecAdapter(ProcessorDbExecAdapterBase):
 
         return typing.cast(AsyncChunkedBase, result_iter)
 
+    async def get_uploaded_table(
+        self,
+        *,
+        data_key: LocalKeyRepresentation,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+    ) -> str | None:
+        return await self._main_processor.db_ex_adapter.get_uploaded_table(
+            data_key=data_key,
+            names=names,
+            user_types=user_types,
+        )
+
     async def create_table(
         self,
         *,
         table_name: str,
         names: Sequence[str],
         user_types: Sequence[UserDataType],
+        data_key: LocalKeyRepresentation | None = None,
     ) -> None:
         await self._main_processor.db_ex_adapter.create_table(
             table_name=table_name,
             names=names,
             user_types=user_types,
+            data_key=data_key,
         )
 
     async def insert_data_into_table(
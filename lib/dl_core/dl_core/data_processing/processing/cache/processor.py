@@ -19,6 +19,7 @@ class CacheOperationProcessor(ExecutorBasedOperationProcessor):
     _main_processor: ExecutorBasedOperationProcessor = attr.ib(kw_only=True)
     _use_cache: bool = attr.ib(kw_only=True, default=True)
     _use_locked_cache: bool = attr.ib(kw_only=True, default=True)
+    _use_streaming_cache: bool = attr.ib(kw_only=True, default=False)
     _cache_engine_factory: CacheEngineFactory = attr.ib(kw_only=True)
 
     def _make_cache_options_builder(self) -> CacheOptionsBuilderBase:  # type: ignore  # 2024-01-24 # TODO: Return type "CacheOptionsBuilderBase" of "_make_cache_options_builder" incompatible with return type "DatasetOptionsBuilder" in supertype "OperationProcessorAsyncBase"  [override]
@@ -33,9 +34,13 @@ class CacheOperationProcessor(ExecutorBasedOperationProcessor):
             main_processor=self._main_processor,
             use_cache=self._use_cache,
             use_locked_cache=self._use_locked_cache,
+            use_streaming_cache=self._use_streaming_cache,
             cache_engine_factory=self._cache_engine_factory,
         )
 
+    def get_max_concurrent_operations(self) -> int:
+        return self._main_processor.get_max_concurrent_operations()
+
     async def ping(self) -> int | None:
         return await self._main_processor.ping()
 
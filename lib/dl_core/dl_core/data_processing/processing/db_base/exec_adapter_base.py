@@ -8,12 +8,14 @@ from collections.abc import (
     Sequence,
 )
 import logging
+import time
 from typing import (
     TYPE_CHECKING,
     ClassVar,
 )
 
 import attr
+import shortuuid
 import sqlalchemy as sa
 from sqlalchemy.sql.selectable import Select
 
@@ -39,6 +41,24 @@ if TYPE_CHECKING:
 LOGGER = logging.getLogger(__name__)
 DEFAULT_CHUNK_SIZE = 1000
 
+# The tables that can be kept after the data processing (see `create_table`) are named
+# with this prefix and the creation time, so that the ones left behind can be found and dropped.
+REUSABLE_TABLE_NAME_PREFIX = "dl_compeng_upload_"
+
+
+def make_reusable_table_name() -> str:
+    return f"{REUSABLE_TABLE_NAME_PREFIX}{int(time.time())}_{shortuuid.uuid().lower()}"
+
+
+def get_reusable_table_created_at(table_name: str) -> float | None:
+    """Creation time (unix timestamp) of a table named with `make_reusable_table_name`"""
+    if not table_name.startswith(REUSABLE_TABLE_NAME_PREFIX):
+        return None
+    created_at, _, _ = table_name.removeprefix(REUSABLE_TABLE_NAME_PREFIX).partition("_")
+    if not created_at.isdigit():
+        return None
+    return float(created_at)
+
 
 @attr.s
 class ProcessorDbExecAdapterBase(abc.ABC):
@@ -141,14 +161,32 @@ class ProcessorDbExecAdapterBase(abc.ABC):
             col_names=[f"col_{i}" for i in range(len(user_types))],
         )
 
+    async def get_uploaded_table(
+        self,
+        *,
+        data_key: LocalKeyRepresentation,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+    ) -> str | None:
+        """
+        Name of a table with the same data uploaded by another data processing (see `create_table`)
+        that can be read by this one, or `None`.
+        """
+        return None  # By default the tables are not reused
+
     async def create_table(
         self,
         *,
         table_name: str,
         names: Sequence[str],
         user_types: Sequence[UserDataType],
+        data_key: LocalKeyRepresentation | None = None,
     ) -> None:
-        """Create table"""
+        """
+        Create table.
+        With `data_key` the table can be kept to be reused by other data processings (if supported);
+        such a table should be named with `make_reusable_table_name`.
+        """
         raise NotImplementedError  # By default DDL is not supported
 
     async def insert_data_into_table(
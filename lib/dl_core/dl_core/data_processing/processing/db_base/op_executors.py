@@ -24,7 +24,10 @@ from dl_core.data_processing.prepared_components.primitives import (
     PreparedSingleFromInfo,
 )
 from dl_core.data_processing.processing.context import OpExecutionContext
-from dl_core.data_processing.processing.db_base.exec_adapter_base import ProcessorDbExecAdapterBase
+from dl_core.data_processing.processing.db_base.exec_adapter_base import (
+    ProcessorDbExecAdapterBase,
+    make_reusable_table_name,
+)
 from dl_core.data_processing.processing.operation import (
     BaseOp,
     CalcOp,
@@ -293,8 +296,33 @@ class UploadOpExecutorAsync(OpExecutorAsync):
         source_stream = self.ctx.get_stream(op.source_stream_id)
         assert isinstance(source_stream, DataStreamAsync)
 
-        table_name = shortuuid.uuid().lower()
-        executed = False
+        data_key = self.make_data_key(op=op)
+
+        # The data can be shared between the data processings on the same terms as the query cache
+        reusable_data_key: LocalKeyRepresentation | None = None
+        data_source_list = source_stream.meta.data_source_list
+        if data_key.key_parts and data_source_list and all(dsrc.cache_enabled for dsrc in data_source_list):
+            reusable_data_key = data_key
+
+        uploaded_table_name: str | None = None
+        if reusable_data_key is not None:
+            uploaded_table_name = await self.db_ex_adapter.get_uploaded_table(
+                data_key=reusable_data_key,
+                names=source_stream.names,
+                user_types=source_stream.user_types,
+            )
+
+        if uploaded_table_name is not None:
+            table_name = uploaded_table_name
+        elif reusable_data_key is not None:
+            table_name = make_reusable_table_name()
+        else:
+            table_name = shortuuid.uuid().lower()
+        executed = uploaded_table_name is not None
+        if executed:
+            LOGGER.info("Reusing uploaded table %s", table_name)
+            # The source data is not going to be read
+            await source_stream.data.close()
 
         async def upload_data() -> None:
             nonlocal executed
@@ -308,6 +336,7 @@ class UploadOpExecutorAsync(OpExecutorAsync):
                 table_name=table_name,
                 names=source_stream.names,
                 user_types=source_stream.user_types,
+                data_key=reusable_data_key,
             )
             await self.db_ex_adapter.insert_data_into_table(
                 table_name=table_name,
@@ -320,8 +349,6 @@ class UploadOpExecutorAsync(OpExecutorAsync):
         alias = op.alias
         sql_source = sa.alias(sa.table(table_name), alias)
 
-        data_key = self.make_data_key(op=op)
-
         prep_src_info = PreparedSingleFromInfo(
             id=op.result_id,
             alias=alias,
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import abc
+import asyncio
 from collections.abc import Collection
 import logging
 import time
 from types import TracebackType
 from typing import (
     TYPE_CHECKING,
+    ClassVar,
     Self,
 )
 
@@ -15,6 +17,7 @@ import shortuuid
 
 from dl_api_commons.reporting.models import (
     DataProcessingEndReportingRecord,
+    DataProcessingOperationReportingRecord,
     DataProcessingStartReportingRecord,
 )
 from dl_core.data_processing.cache.utils import DatasetOptionsBuilder
@@ -44,6 +47,8 @@ class OperationProcessorAsyncBase(abc.ABC):
     _cache_options_builder: DatasetOptionsBuilder = attr.ib(init=False)
     _db_ex_adapter: ProcessorDbExecAdapterBase | None = attr.ib(init=False, default=None)
 
+    max_concurrent_operations: ClassVar[int] = 4
+
     def __attrs_post_init__(self) -> None:
         self._cache_options_builder = self._make_cache_options_builder()
         self._db_ex_adapter = self._make_db_ex_adapter()
@@ -110,27 +115,78 @@ class OperationProcessorAsyncBase(abc.ABC):
                 f"that is not supported for output by operation {type(op)}"
             )
 
+    def get_max_concurrent_operations(self) -> int:
+        """The number of the operations of a run that can be executed at the same time"""
+        return self.max_concurrent_operations
+
+    def _get_source_stream_ids(self, op: BaseOp) -> set[str]:
+        if isinstance(op, MultiSourceOp):
+            return set(op.source_stream_ids)
+        assert isinstance(op, SingleSourceOp)
+        return {op.source_stream_id}
+
+    async def _execute_operation_reported(self, op: BaseOp, ctx: OpExecutionContext) -> AbstractStream:
+        start_timestamp = time.time()
+        exec_exception: BaseException | None = None
+        try:
+            return await self.execute_operation(op=op, ctx=ctx)
+        except BaseException as fired_exception:
+            exec_exception = fired_exception
+            raise
+        finally:
+            report = DataProcessingOperationReportingRecord(
+                timestamp=time.time(),
+                processing_id=ctx.processing_id,
+                operation_type=type(op).__name__,
+                dest_stream_id=op.dest_stream_id,
+                start_timestamp=start_timestamp,
+                exception=exec_exception,
+            )
+            self._reporting_registry.save_reporting_record(report=report)
+
     async def execute_operations(
         self,
         ctx: OpExecutionContext,
         output_stream_ids: Collection[str],
     ) -> list[DataStreamAsync]:
+        """
+        Execute the operations that generate the output streams.
+
+        An operation is started as soon as all of its source streams are ready,
+        so the independent branches of the graph are executed concurrently
+        (up to `get_max_concurrent_operations()` operations at a time).
+        On the first failure the rest of the running operations are cancelled.
+        """
+
         ready_streams: dict[str, AbstractStream] = {stream.id: stream for stream in ctx.streams}
         assert all(ready_streams.values())
 
-        async def _make_output_streams_ready_recursive(req_out_stream_ids: Collection[str]) -> None:
-            for out_stream_id in sorted(req_out_stream_ids):
+        # The operations to execute, by their destination stream IDs
+        pending_ops: dict[str, BaseOp] = {}
+
+        def _collect_operations(req_out_stream_ids: Collection[str]) -> None:
+            for out_stream_id in req_out_stream_ids:
+                if out_stream_id in pending_ops:
+                    continue
                 op = ctx.get_generating_operation(stream_id=out_stream_id)
+                pending_ops[out_stream_id] = op
+                _collect_operations(
+                    [stream_id for stream_id in self._get_source_stream_ids(op) if stream_id not in ready_streams]
+                )
 
-                if isinstance(op, MultiSourceOp):
-                    source_stream_ids = op.source_stream_ids
-                else:
-                    assert isinstance(op, SingleSourceOp)
-                    source_stream_ids = {op.source_stream_id}
+        _collect_operations(output_stream_ids)
 
-                if not source_stream_ids.issubset(set(ready_streams)):  # type: ignore  # TODO: fix
-                    # Make these streams ready
-                    await _make_output_streams_ready_recursive(source_stream_ids)
+        max_concurrent_operations = self.get_max_concurrent_operations()
+        running: dict[asyncio.Task[AbstractStream], BaseOp] = {}
+
+        def _start_ready_operations() -> None:
+            for out_stream_id in sorted(pending_ops):
+                if len(running) >= max_concurrent_operations:
+                    return
+                op = pending_ops[out_stream_id]
+                source_stream_ids = self._get_source_stream_ids(op)
+                if not source_stream_ids.issubset(ready_streams):
+                    continue
 
                 # All streams are ready for this operation
                 for source_stream_id in source_stream_ids:
@@ -139,12 +195,33 @@ class OperationProcessorAsyncBase(abc.ABC):
                     if isinstance(source_stream, DataStreamAsync):  # These streams are not reusable
                         del ready_streams[source_stream_id]
 
-                new_stream = await self.execute_operation(op=op, ctx=ctx)
-                self._validate_output_stream(new_stream, op)
-                ctx.add_stream(new_stream)
-                ready_streams[new_stream.id] = new_stream
+                del pending_ops[out_stream_id]
+                task = asyncio.create_task(
+                    self._execute_operation_reported(op=op, ctx=ctx),
+                    name=f"{type(op).__name__}:{op.dest_stream_id}",
+                )
+                running[task] = op
 
-        await _make_output_streams_ready_recursive(output_stream_ids)
+        try:
+            _start_ready_operations()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    op = running.pop(task)
+                    new_stream = task.result()  # re-raises the operation error, the rest is cancelled below
+                    self._validate_output_stream(new_stream, op)
+                    ctx.add_stream(new_stream)
+                    ready_streams[new_stream.id] = new_stream
+                _start_ready_operations()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        if pending_ops:
+            # E.g. a data stream that is used by several operations: it is consumed by the first one
+            raise ValueError(f"Source streams are not available for the operations of streams {sorted(pending_ops)}")
         LOGGER.info("Done processing operations")
         return [ready_streams[stream_id] for stream_id in sorted(output_stream_ids)]  # type: ignore  # 2024-01-30 # TODO: List comprehension has incompatible type List[AbstractStream]; expected List[DataStreamAsync]  [misc]
 
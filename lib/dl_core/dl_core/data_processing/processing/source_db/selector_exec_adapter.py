@@ -143,7 +143,8 @@ class SourceDbExecAdapter(ProcessorDbExecAdapterBase):
             return wrapped_result_iter  # type: ignore  # TODO: fix
 
         async def finalize_data_stream() -> None:
-            pass
+            # The query is already running, so it is stopped if the data is not read to the end
+            await wrapped_result_iter.close()
 
         result_iter: AsyncChunkedBase = LazyAsyncChunked(
             initializer=initialize_data_stream,
@@ -10,6 +10,7 @@ from typing import (
 import attr
 
 from dl_cache_engine.engine import EntityCacheEngineAsync
+from dl_cache_engine.local_cache import LocalResultCache
 from dl_core.utils import FutureRef
 
 if TYPE_CHECKING:
@@ -29,6 +30,7 @@ class CacheEngineFactory(metaclass=abc.ABCMeta):
 class DefaultCacheEngineFactory(CacheEngineFactory):
     _services_registry_ref: FutureRef[ServicesRegistry] = attr.ib()
     cache_save_background: bool | None = attr.ib(default=None)
+    local_cache: LocalResultCache | None = attr.ib(default=None)
 
     @property
     def service_registry(self) -> ServicesRegistry:
@@ -56,5 +58,6 @@ class DefaultCacheEngineFactory(CacheEngineFactory):
             entity_id=entity_id,
             rc=redis_client,
             rc_slave=redis_client_slave,
+            local_cache=self.local_cache,
             **kwargs,
         )
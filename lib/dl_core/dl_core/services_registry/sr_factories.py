@@ -40,6 +40,7 @@ if TYPE_CHECKING:
     from redis.asyncio import Redis
 
     from dl_api_commons.base_models import RequestContextInfo
+    from dl_cache_engine.local_cache import LocalResultCache
     from dl_cache_engine.primitives import CacheTTLConfig
     from dl_configs.rqe import RQEConfig
     from dl_core.aio.web_app_services.data_processing.data_processor import DataProcessorService
@@ -49,6 +50,7 @@ if TYPE_CHECKING:
     from dl_core.services_registry.inst_specific_sr import InstallationSpecificServiceRegistryFactory
     from dl_core.services_registry.typing import ConnectOptionsFactory
     from dl_core.us_connection_base import ConnectionBase
+    from dl_core.us_manager.mutation_cache.usentry_mutation_cache import MemoryCacheEngine
 
 
 LOGGER = logging.getLogger(__name__)
@@ -98,6 +100,8 @@ class DefaultSRFactory(SRFactory[SERVICE_REGISTRY_TV]):
     required_services: set[RequiredService] = attr.ib(factory=set)
     inst_specific_sr_factory: InstallationSpecificServiceRegistryFactory | None = attr.ib(default=None)
     exports_history_url_path: str | None = attr.ib(default=None)
+    local_query_cache: LocalResultCache | None = attr.ib(default=None)
+    mutations_memory_cache_engine: MemoryCacheEngine | None = attr.ib(default=None)
     service_registry_cls: ClassVar[type[SERVICE_REGISTRY_TV]] = DefaultServicesRegistry  # type: ignore  # TODO: fix
 
     def is_bleeding_edge_user(self, request_context_info: RequestContextInfo) -> bool:
@@ -192,6 +196,8 @@ class DefaultSRFactory(SRFactory[SERVICE_REGISTRY_TV]):
                 else None
             ),
             exports_history_url_path=self.exports_history_url_path,
+            local_query_cache=self.local_query_cache,
+            mutations_memory_cache_engine=self.mutations_memory_cache_engine,
             **self.additional_sr_constructor_kwargs(request_context_info, sr_ref),
         )
         sr_ref.fulfill(sr)
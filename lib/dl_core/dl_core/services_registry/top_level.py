@@ -14,6 +14,7 @@ import redis.asyncio
 
 from dl_api_commons.base_models import RequestContextInfo
 from dl_api_commons.reporting.registry import ReportingRegistry
+from dl_cache_engine.local_cache import LocalResultCache
 from dl_cache_engine.primitives import CacheTTLConfig
 from dl_configs.enums import RequiredService
 from dl_constants import ProcessorType
@@ -36,7 +37,10 @@ from dl_core.us_manager.mutation_cache.engine_factory import (
     DefaultMutationCacheEngineFactory,
     MutationCacheEngineFactory,
 )
-from dl_core.us_manager.mutation_cache.usentry_mutation_cache import GenericCacheEngine
+from dl_core.us_manager.mutation_cache.usentry_mutation_cache import (
+    GenericCacheEngine,
+    MemoryCacheEngine,
+)
 from dl_core.us_manager.mutation_cache.usentry_mutation_cache_factory import USEntryMutationCacheFactory
 from dl_core.utils import FutureRef
 import dl_extract
@@ -124,6 +128,14 @@ class ServicesRegistry(metaclass=abc.ABCMeta):
     def get_cache_engine_factory(self, allow_slave: bool = False) -> CacheEngineFactory | None:
         pass
 
+    @abc.abstractmethod
+    def get_local_query_cache(self) -> LocalResultCache | None:
+        pass
+
+    @abc.abstractmethod
+    def get_mutations_memory_cache_engine(self) -> MemoryCacheEngine | None:
+        pass
+
     @abc.abstractmethod
     def get_mutation_cache_engine_factory(self, cache_type: type[GenericCacheEngine]) -> MutationCacheEngineFactory:
         pass
@@ -175,6 +187,8 @@ class DefaultServicesRegistry(ServicesRegistry):
     _reporting_registry: ReportingRegistry = attr.ib()
     _mutations_cache_factory: USEntryMutationCacheFactory | None = attr.ib()
     _mutations_redis_client_factory: Callable[[bool], redis.asyncio.Redis | None] | None = attr.ib(default=None)
+    # Process-wide, unlike the registry itself.
+    _mutations_memory_cache_engine: MemoryCacheEngine | None = attr.ib(default=None)
     _default_cache_ttl_config: CacheTTLConfig | None = attr.ib(default=None)
     _conn_exec_factory: ConnExecutorFactory | None = attr.ib(default=None)
     _caches_redis_client_factory: Callable[[bool], redis.asyncio.Redis | None] | None = attr.ib(default=None)
@@ -182,6 +196,8 @@ class DefaultServicesRegistry(ServicesRegistry):
         default=None
     )
     _compute_executor: ComputeExecutor = attr.ib()
+    # Process-wide, unlike the registry itself.
+    _local_query_cache: LocalResultCache | None = attr.ib(default=None)
     _cache_engine_factory: CacheEngineFactory = attr.ib()
     _cache_invalidation_engine_factory: CacheInvalidationEngineFactory = attr.ib()
     _mutation_cache_engine_factory: MutationCacheEngineFactory = attr.ib(default=None)
@@ -202,7 +218,10 @@ class DefaultServicesRegistry(ServicesRegistry):
 
     @_cache_engine_factory.default
     def _default_cache_engine_factory(self) -> CacheEngineFactory:
-        return DefaultCacheEngineFactory(services_registry_ref=FutureRef.fulfilled(self))
+        return DefaultCacheEngineFactory(
+            services_registry_ref=FutureRef.fulfilled(self),
+            local_cache=self._local_query_cache,
+        )
 
     @_cache_invalidation_engine_factory.default
     def _default_cache_invalidation_engine_factory(self) -> CacheInvalidationEngineFactory:
@@ -253,15 +272,25 @@ class DefaultServicesRegistry(ServicesRegistry):
     def get_cache_engine_factory(self) -> CacheEngineFactory | None:  # type: ignore  # TODO: fix
         return self._cache_engine_factory
 
+    def get_local_query_cache(self) -> LocalResultCache | None:
+        return self._local_query_cache
+
     def get_cache_invalidation_engine_factory(self) -> CacheInvalidationEngineFactory:
         return self._cache_invalidation_engine_factory
 
     def get_mutation_cache_factory(self) -> USEntryMutationCacheFactory | None:
         return self._mutations_cache_factory
 
+    def get_mutations_memory_cache_engine(self) -> MemoryCacheEngine | None:
+        return self._mutations_memory_cache_engine
+
     def get_mutation_cache_engine_factory(self, cache_type: type[GenericCacheEngine]) -> MutationCacheEngineFactory:
         # TODO: Save already created CacheEngine's?
-        return DefaultMutationCacheEngineFactory(services_registry_ref=FutureRef.fulfilled(self), cache_type=cache_type)
+        return DefaultMutationCacheEngineFactory(
+            services_registry_ref=FutureRef.fulfilled(self),
+            cache_type=cache_type,
+            memory_cache_engine=self._mutations_memory_cache_engine,
+        )
 
     def get_data_processor_service_factory(self) -> Callable[[ProcessorType], DataProcessorService] | None:
         return self._data_processor_service_factory
@@ -370,9 +399,15 @@ class DummyServiceRegistry(ServicesRegistry):
     def get_cache_engine_factory(self) -> CacheEngineFactory | None:  # type: ignore  # TODO: fix
         raise NotImplementedError(self.NOT_IMPLEMENTED_MSG)
 
+    def get_local_query_cache(self) -> LocalResultCache | None:
+        raise NotImplementedError(self.NOT_IMPLEMENTED_MSG)
+
     def get_mutation_cache_factory(self) -> USEntryMutationCacheFactory | None:
         raise NotImplementedError(self.NOT_IMPLEMENTED_MSG)
 
+    def get_mutations_memory_cache_engine(self) -> MemoryCacheEngine | None:
+        raise NotImplementedError(self.NOT_IMPLEMENTED_MSG)
+
     def get_mutation_cache_engine_factory(self, cache_type: type[GenericCacheEngine]) -> MutationCacheEngineFactory:
         raise NotImplementedError(self.NOT_IMPLEMENTED_MSG)
 
@@ -602,8 +602,17 @@ class UStorageClientBase:
         page: int = 0,
         created_at_from: float = 0,
         limit: int | None = None,
+        include_links: bool = False,
+        include_permissions: bool = False,
+        branch: USEntryBranch | None = None,
     ) -> RequestData:
         req_params: dict[Any, Any] = {"scope": scope, "includeData": int(include_data)}
+        if include_links:
+            req_params["includeLinks"] = 1
+        if include_permissions:
+            req_params["includePermissionsInfo"] = 1
+        if branch is not None:
+            req_params["branch"] = branch.value
         if entry_type:
             req_params.update(type=entry_type)
         meta = meta or {}
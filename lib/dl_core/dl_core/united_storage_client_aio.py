@@ -3,8 +3,13 @@ from __future__ import annotations
 import asyncio
 from collections.abc import (
     AsyncGenerator,
+    Awaitable,
+    Callable,
+    Collection,
+    Hashable,
     Iterable,
 )
+import copy
 from datetime import (
     datetime,
     timedelta,
@@ -12,9 +17,13 @@ from datetime import (
 import json
 import logging
 import time
-from typing import Any
+from typing import (
+    Any,
+    ClassVar,
+)
 
 import aiohttp
+import attr
 
 from dl_api_commons.aiohttp.aiohttp_client import BIAioHTTPClient
 from dl_api_commons.retrier.aiohttp import AiohttpPolicyRetrier
@@ -38,8 +47,77 @@ import dl_retrier
 
 LOGGER = logging.getLogger(__name__)
 
+# The fields of an entry that are used by the US manager, as returned by `get_entry`
+_COMPLETE_ENTRY_FIELD_TYPES: dict[str, type] = {
+    "entryId": str,
+    "key": str,
+    "scope": str,
+    "type": str,
+    "meta": dict,
+    "hidden": bool,
+    "data": dict,
+    "unversionedData": dict,
+    "permissions": dict,
+}
+
+
+def _is_complete_entry(entry: dict) -> bool:
+    return all(isinstance(entry.get(field), field_type) for field, field_type in _COMPLETE_ENTRY_FIELD_TYPES.items())
+
+
+class InFlightRequests:
+    """
+    Deduplication of the identical requests running concurrently:
+    the first one is performed and its response is shared with the rest.
+
+    Only the successful responses are shared, each waiter gets its own copy;
+    if the request fails or gets cancelled, the waiters perform it by themselves.
+    """
+
+    @attr.s(auto_attribs=True, slots=True)
+    class _Request:
+        future: asyncio.Future[dict]
+        waiters: int = 0
+
+    def __init__(self) -> None:
+        self._requests: dict[Hashable, InFlightRequests._Request] = {}
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[dict]]) -> dict:
+        request = self._requests.get(key)
+        if request is not None:
+            fut = request.future
+            request.waiters += 1
+            await asyncio.wait([fut])
+            if not fut.cancelled() and fut.exception() is None:
+                return copy.deepcopy(fut.result())
+            return await func()
+
+        fut = asyncio.get_running_loop().create_future()
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())  # mark the exception as retrieved
+        request = self._requests[key] = self._Request(future=fut)
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as err:
+            fut.set_exception(err)
+            raise
+        else:
+            # The response is going to be mutated by the caller before the waiters wake up
+            fut.set_result(copy.deepcopy(result) if request.waiters else result)
+            return result
+        finally:
+            del self._requests[key]
+
 
 class UStorageClientAIO(UStorageClientBase):
+    # Shared by all the clients of the process
+    _in_flight_requests: ClassVar[InFlightRequests] = InFlightRequests()
+
     class ResponseAdapter(UStorageClientBase.ResponseAdapter):
         def __init__(
             self,
@@ -122,6 +200,7 @@ class UStorageClientAIO(UStorageClientBase):
         context_forwarded_for: str | None = None,
         context_real_ip: str | None = None,
         context_workbook_id: str | None = None,
+        batch_get_entries: bool = False,
     ) -> None:
         super().__init__(
             host=host,
@@ -141,6 +220,31 @@ class UStorageClientAIO(UStorageClientBase):
             raise_for_status=False,
             ca_data=ca_data,
         )
+        self._batch_get_entries = batch_get_entries
+
+    @property
+    def supports_batch_get_entries(self) -> bool:
+        return self._batch_get_entries
+
+    def _get_in_flight_key(self, request_data: UStorageClientBase.RequestData, context_name: str | None) -> Hashable:
+        # Everything that affects the response, but the request ID
+        headers = {
+            **self._default_headers,
+            **self._extra_headers,
+            **(self._named_contexts.get(context_name, {}) if context_name else {}),
+        }
+        headers.pop("X-Request-Id", None)
+        return (
+            id(asyncio.get_running_loop()),
+            self.host,
+            self.prefix,
+            request_data.method,
+            request_data.relative_url,
+            # The values are not necessarily hashable
+            json.dumps(request_data.params, sort_keys=True, default=repr),
+            json.dumps(headers, sort_keys=True, default=repr),
+            json.dumps(self._cookies, sort_keys=True, default=repr),
+        )
 
     async def _request(
         self,
@@ -193,19 +297,47 @@ class UStorageClientAIO(UStorageClientBase):
         context_name: str | None = None,
         branch: USEntryBranch = USEntryBranch.published,
     ) -> dict:
-        return await self._request(
-            self._req_data_get_entry(
-                entry_id=entry_id,
-                params=params,
-                include_permissions=include_permissions,
-                include_links=include_links,
-                include_favorite=include_favorite,
-                branch=branch,
-            ),
-            retry_policy_name="get_entry",
-            context_name=context_name,
+        request_data = self._req_data_get_entry(
+            entry_id=entry_id,
+            params=params,
+            include_permissions=include_permissions,
+            include_links=include_links,
+            include_favorite=include_favorite,
+            branch=branch,
+        )
+        self._raise_for_disabled_interactions()
+        return await self._in_flight_requests.run(
+            self._get_in_flight_key(request_data, context_name),
+            lambda: self._request(request_data, retry_policy_name="get_entry", context_name=context_name),
         )
 
+    async def get_entries(
+        self,
+        entry_ids: Collection[str],
+        scope: str,
+        branch: USEntryBranch = USEntryBranch.published,
+    ) -> dict[str, dict]:
+        """
+        Fetch several entries with their data, links and permissions in one go.
+        Requires the storage support (see `supports_batch_get_entries`).
+
+        Only the found and accessible entries of the same shape as the `get_entry` responses are returned,
+        so the rest should be requested by `get_entry` (to get the proper errors, if any).
+        """
+        assert self._batch_get_entries, "Batch get is not supported by the storage"
+        result: dict[str, dict] = {}
+        async for entry in self.entries_iterator(
+            scope,
+            include_data=True,
+            include_links=True,
+            include_permissions=True,
+            ids=sorted(entry_ids),
+            branch=branch,
+        ):
+            if entry.get("entryId") in entry_ids and entry.get("scope") == scope and _is_complete_entry(entry):
+                result[entry["entryId"]] = entry
+        return result
+
     async def create_entry(
         self,
         key: EntryLocation,
@@ -283,6 +415,9 @@ class UStorageClientAIO(UStorageClientBase):
         ids: Iterable[str] | None = None,
         creation_time: dict[str, str | int | None] | None = None,
         limit: int | None = None,
+        include_links: bool = False,
+        include_permissions: bool = False,
+        branch: USEntryBranch | None = None,
     ) -> AsyncGenerator[dict, None]:
         """
         implements 2-in-1 pagination:
@@ -296,6 +431,9 @@ class UStorageClientAIO(UStorageClientBase):
         :param include_data: Return full US entry data. False by default.
         :param ids: Filter entries by uuid.
         :param creation_time: Filter entries by creation_time. Available filters: eq, ne, gt, gte, lt, lte
+        :param include_links: Return entry links along with the data. False by default.
+        :param include_permissions: Return entry permissions info. False by default.
+        :param branch: Entry data branch. Storage default if not specified.
         :return:
         """
         created_at_from: datetime = datetime(1970, 1, 1)  # for creation time pagination
@@ -319,6 +457,9 @@ class UStorageClientAIO(UStorageClientBase):
                     page=page,
                     created_at_from=created_at_from_ts,
                     limit=limit,
+                    include_links=include_links,
+                    include_permissions=include_permissions,
+                    branch=branch,
                 ),
                 retry_policy_name="entries_iterator",
             )
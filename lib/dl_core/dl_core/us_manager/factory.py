@@ -15,7 +15,10 @@ from dl_core.united_storage_client import (
     USAuthContextRegular,
 )
 from dl_core.us_manager.dynamic_token_factory import DynamicUSMasterTokenFactory
-from dl_core.us_manager.us_manager_async import AsyncUSManager
+from dl_core.us_manager.us_manager_async import (
+    DEFAULT_DEPENDENCIES_LOAD_CONCURRENCY,
+    AsyncUSManager,
+)
 from dl_core.us_manager.us_manager_sync import SyncUSManager
 import dl_retrier
 
@@ -30,6 +33,8 @@ class USMFactory:
     us_public_token: str | None = attr.ib(default=None, repr=False)
     dynamic_token_factory: DynamicUSMasterTokenFactory | None = attr.ib(default=None)
     master_token_authorization_enabled: bool = attr.ib(default=True)
+    dependencies_load_concurrency: int = attr.ib(default=DEFAULT_DEPENDENCIES_LOAD_CONCURRENCY)
+    batch_get_entries: bool = attr.ib(default=False)
 
     @classmethod
     def get_regular_us_auth_ctx_from_rci(cls, rci: RequestContextInfo) -> USAuthContextRegular:
@@ -102,6 +107,8 @@ class USMFactory:
             services_registry=services_registry,
             ca_data=self.get_ca_data(),
             retry_policy_factory=self.retry_policy_factory,
+            dependencies_load_concurrency=self.dependencies_load_concurrency,
+            batch_get_entries=self.batch_get_entries,
         )
 
     async def get_master_async_usm(
@@ -117,6 +124,8 @@ class USMFactory:
             services_registry=services_registry,
             ca_data=self.get_ca_data(),
             retry_policy_factory=self.retry_policy_factory,
+            dependencies_load_concurrency=self.dependencies_load_concurrency,
+            batch_get_entries=self.batch_get_entries,
         )
 
     async def get_public_async_usm(
@@ -136,6 +145,8 @@ class USMFactory:
             services_registry=services_registry,
             ca_data=self.get_ca_data(),
             retry_policy_factory=self.retry_policy_factory,
+            dependencies_load_concurrency=self.dependencies_load_concurrency,
+            batch_get_entries=self.batch_get_entries,
         )
 
     # Sync
@@ -180,6 +191,8 @@ class USMFactory:
             services_registry=services_registry,
             ca_data=self.get_ca_data(),
             retry_policy_factory=self.retry_policy_factory,
+            dependencies_load_concurrency=self.dependencies_load_concurrency,
+            batch_get_entries=self.batch_get_entries,
         )
 
     async def get_async_usm(
@@ -31,6 +31,8 @@ class MutationCacheEngineFactory(metaclass=abc.ABCMeta):
 class DefaultMutationCacheEngineFactory(MutationCacheEngineFactory):
     _services_registry_ref: FutureRef["ServicesRegistry"] = attr.ib()
     cache_type: type[GenericCacheEngine] = attr.ib()
+    # Process-wide configured engine; otherwise a default one is created once per process
+    _memory_cache_engine: MemoryCacheEngine | None = attr.ib(default=None, kw_only=True)
     _saved_inmemory_engine: MemoryCacheEngine | None = None
 
     @classmethod
@@ -54,6 +56,8 @@ class DefaultMutationCacheEngineFactory(MutationCacheEngineFactory):
 
     def get_cache_engine(self, allow_slave: bool) -> GenericCacheEngine:
         if self.cache_type == MemoryCacheEngine:
+            if self._memory_cache_engine is not None:
+                return self._memory_cache_engine
             return self._get_memory_cache_engine_singleton()
         if self.cache_type == RedisCacheEngine:
             redis_cache_engine = self._get_redis_cache_engine(allow_slave)
@@ -1,8 +1,12 @@
 import abc
+import collections
+from collections.abc import Callable
+import copy
 import datetime
 import json
 import logging
 import time
+from typing import Any
 
 import attr
 from redis.asyncio import Redis
@@ -14,6 +18,9 @@ from dl_core.us_manager.us_manager import USManagerBase
 
 LOGGER = logging.getLogger(__name__)
 
+# Rough size of a deserialized entry relative to its serialized form
+DESERIALIZED_ENTRY_SIZE_FACTOR = 2
+
 
 class GenericCacheEngine(metaclass=abc.ABCMeta):
     @abc.abstractmethod
@@ -25,22 +32,146 @@ class GenericCacheEngine(metaclass=abc.ABCMeta):
         raise NotImplementedError()
 
 
+@attr.s(auto_attribs=True, slots=True)
+class _MemoryCacheItem:
+    data: str
+    expires_at: float
+    size_bytes: int
+    # Deserialized entry, if stored (see `USEntryMutationCache`)
+    entry: Any = None
+
+
+@attr.s(auto_attribs=True, slots=True)
+class MemoryCacheEngineStats:
+    hits: int = 0
+    misses: int = 0
+    entry_hits: int = 0  # hits served with the deserialized entry
+    evictions: int = 0  # size-bound evictions only
+    expirations: int = 0
+
+
+@attr.s
 class MemoryCacheEngine(GenericCacheEngine):
-    def __init__(self) -> None:
-        # Dict[ Key: (expired_time, cached value) ]
-        self._cache: dict[str, tuple[float, str]] = {}
+    """
+    Process-wide LRU of the mutation cache entries, bounded by their total (estimated) size.
+
+    Expired entries are dropped when accessed, and by a sweep over the whole cache
+    which is done on save at most once in `sweep_interval_sec`.
+
+    With `store_entries`, the deserialized entries can be kept along with their serialized form,
+    which saves the deserialization on the subsequent hits.
+    """
+
+    max_size_bytes: int = attr.ib(kw_only=True, default=64 * 1024**2)
+    sweep_interval_sec: float = attr.ib(kw_only=True, default=60.0)
+    store_entries: bool = attr.ib(kw_only=True, default=False)
+    _clock: Callable[[], float] = attr.ib(kw_only=True, default=time.monotonic)
+
+    _items: collections.OrderedDict[str, _MemoryCacheItem] = attr.ib(init=False, factory=collections.OrderedDict)
+    _size_bytes: int = attr.ib(init=False, default=0)
+    _last_sweep_at: float = attr.ib(init=False)
+    _stats: MemoryCacheEngineStats = attr.ib(init=False, factory=MemoryCacheEngineStats)
+
+    @_last_sweep_at.default
+    def _default_last_sweep_at(self) -> float:
+        return self._clock()
+
+    @property
+    def stats(self) -> MemoryCacheEngineStats:
+        return self._stats
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def __len__(self) -> int:
+        return len(self._items)
 
     async def save(self, key: str, data: str, ttl: float) -> None:
-        self._cache[key] = (time.monotonic() + ttl, data)
+        now = self._clock()
+        if now - self._last_sweep_at >= self.sweep_interval_sec:
+            self.sweep()
+
+        self._remove(key)
+        size_bytes = len(data)  # `ensure_ascii=True`, see `USEntryMutationCache._dump_raw_cache_data`
+        if ttl <= 0 or size_bytes > self.max_size_bytes:
+            return
+        self._items[key] = _MemoryCacheItem(data=data, expires_at=now + ttl, size_bytes=size_bytes)
+        self._size_bytes += size_bytes
+        self._evict()
 
     async def load(self, key: str) -> str | None:
-        cached = self._cache.get(key)
-        if not cached:
+        item = self._get_item(key)
+        if item is None:
+            return None
+        return item.data
+
+    def load_with_entry(self, key: str) -> tuple[str, Any] | None:
+        """Returns the serialized data along with the stored deserialized entry, if any"""
+        item = self._get_item(key)
+        if item is None:
+            return None
+        if item.entry is not None:
+            self._stats.entry_hits += 1
+        return item.data, item.entry
+
+    def store_entry(self, key: str, data: str, entry: Any) -> None:
+        """Keep the deserialized `entry` of the cached `data`, unless `data` has been replaced or evicted since"""
+        item = self._items.get(key)
+        if not self.store_entries or item is None or item.data is not data or item.entry is not None:
+            return
+        entry_size_bytes = len(data) * DESERIALIZED_ENTRY_SIZE_FACTOR
+        if item.size_bytes + entry_size_bytes > self.max_size_bytes:
+            return
+        item.entry = entry
+        item.size_bytes += entry_size_bytes
+        self._size_bytes += entry_size_bytes
+        self._evict()
+
+    def sweep(self) -> None:
+        now = self._clock()
+        self._last_sweep_at = now
+        expired_keys = [key for key, item in self._items.items() if item.expires_at <= now]
+        for key in expired_keys:
+            self._remove(key)
+        self._stats.expirations += len(expired_keys)
+
+    def get_metrics(self) -> list[tuple[str, int]]:
+        """In the `(label, value)` form of the `/metrics` views"""
+        stats = self._stats
+        return [
+            ("mutation_cache_memory_hits_total", stats.hits),
+            ("mutation_cache_memory_misses_total", stats.misses),
+            ("mutation_cache_memory_entry_hits_total", stats.entry_hits),
+            ("mutation_cache_memory_evictions_total", stats.evictions),
+            ("mutation_cache_memory_expirations_total", stats.expirations),
+            ("mutation_cache_memory_entries", len(self._items)),
+            ("mutation_cache_memory_size_bytes", self._size_bytes),
+        ]
+
+    def _get_item(self, key: str) -> _MemoryCacheItem | None:
+        item = self._items.get(key)
+        if item is None:
+            self._stats.misses += 1
             return None
-        expires_in, cached_value = cached
-        if expires_in < time.monotonic():
+        if item.expires_at <= self._clock():
+            self._remove(key)
+            self._stats.expirations += 1
+            self._stats.misses += 1
             return None
-        return cached_value
+        self._items.move_to_end(key)
+        self._stats.hits += 1
+        return item
+
+    def _remove(self, key: str) -> None:
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._size_bytes -= item.size_bytes
+
+    def _evict(self) -> None:
+        while self._size_bytes > self.max_size_bytes:
+            self._remove(next(iter(self._items)))
+            self._stats.evictions += 1
 
 
 class MutationCacheError(redis.exceptions.ConnectionError):
@@ -77,6 +208,16 @@ class USEntryMutationCacheKey:
         return f"{self.scope}:{self.entry_id}:{self.entry_revision_id}:{self.mutation_key_hash}"
 
 
+@attr.s(auto_attribs=True, frozen=True)
+class _StoredEntry:
+    collision_meta: str
+    entry: USEntry
+
+
+# Stands for the (request-bound) US manager in the stored deserialized entries
+_US_MANAGER_PLACEHOLDER = object()
+
+
 @attr.s()
 class USEntryMutationCache:
     _usm: USManagerBase = attr.ib()
@@ -94,6 +235,54 @@ class USEntryMutationCache:
         entry_dict = json.loads(data)
         return self._usm._entry_dict_to_obj(entry_dict)
 
+    def _detach_entry(self, entry: USEntry) -> USEntry | None:
+        """A copy of the entry to be shared between requests, not bound to the current US manager"""
+        memo = {id(self._usm): _US_MANAGER_PLACEHOLDER, id(entry._us_manager): _US_MANAGER_PLACEHOLDER}
+        try:
+            return copy.deepcopy(entry, memo)
+        except Exception:
+            LOGGER.warning("Could not copy the entry for the mutation cache", exc_info=True)
+            return None
+
+    def _attach_entry(self, detached_entry: USEntry) -> USEntry | None:
+        """A copy of the shared entry, bound to the current US manager"""
+        try:
+            return copy.deepcopy(detached_entry, {id(_US_MANAGER_PLACEHOLDER): self._usm})
+        except Exception:
+            LOGGER.warning("Could not copy the entry from the mutation cache", exc_info=True)
+            return None
+
+    def _get_entry_from_memory_cache(
+        self,
+        cache_engine: MemoryCacheEngine,
+        key: str,
+        mutation_key: MutationKey,
+    ) -> USEntry | None:
+        cached = cache_engine.load_with_entry(key)
+        if cached is None:
+            return None
+
+        data, stored_entry = cached
+        if stored_entry is not None:
+            assert isinstance(stored_entry, _StoredEntry)
+            if stored_entry.collision_meta != mutation_key.get_collision_tier_breaker():
+                return None
+            attached_entry = self._attach_entry(stored_entry.entry)
+            if attached_entry is not None:
+                return attached_entry
+            # Otherwise rebuild it from the serialized data
+
+        collision_meta, us_entry_data = self._load_raw_cache_data(data)
+        if collision_meta != mutation_key.get_collision_tier_breaker():
+            return None
+        entry = self._restore_entry_from_cache_representation(us_entry_data)
+        if stored_entry is not None:
+            return entry
+        detached_entry = self._detach_entry(entry)
+        if detached_entry is not None:
+            cache_engine.store_entry(key, data, _StoredEntry(collision_meta=collision_meta, entry=detached_entry))
+        return entry
+
     async def save_mutation_cache(self, entry: USEntry, mutation_key: MutationKey) -> None:
         assert entry.uuid is not None
         assert entry.scope is not None
@@ -144,6 +333,9 @@ class USEntryMutationCache:
             mutation_key_hash=mutation_key.get_hash(),
         )
 
+        if isinstance(self._cache_engine, MemoryCacheEngine) and self._cache_engine.store_entries:
+            return self._get_entry_from_memory_cache(self._cache_engine, key.to_string(), mutation_key)
+
         try:
             data = await self._cache_engine.load(key.to_string())
         except MutationCacheError:
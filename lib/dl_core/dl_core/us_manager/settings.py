@@ -17,3 +17,7 @@ class USClientSettings(dl_settings.BaseSettings):
     )
     DYNAMIC_AUTH_TOKEN_LIFETIME_SEC: int = 3600
     DYNAMIC_AUTH_MIN_TTL_SEC: float = 900.0
+    # Max number of the dataset dependencies loaded concurrently
+    DEPENDENCIES_LOAD_CONCURRENCY: int = 8
+    # Whether the storage supports fetching several entries with their data and links in one request
+    BATCH_GET_ENTRIES_ENABLED: bool = False
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from collections.abc import (
     AsyncGenerator,
     AsyncIterable,
@@ -56,10 +57,15 @@ LOGGER = logging.getLogger(__name__)
 
 _ENTRY_TV = TypeVar("_ENTRY_TV", bound=USEntry)
 
+DEFAULT_DEPENDENCIES_LOAD_CONCURRENCY = 8
+
 
 class AsyncUSManager(USManagerBase):
     _us_client: UStorageClientAIO
     _ca_data: bytes
+    _dependencies_load_concurrency: int
+    # Raw entries fetched in batch, to be picked up by `get_migrated_entry`
+    _prefetched_us_resps: dict[str, dict[str, Any]]
 
     def __init__(
         self,
@@ -73,6 +79,8 @@ class AsyncUSManager(USManagerBase):
         us_api_prefix: str | None = None,
         lifecycle_manager_factory: EntryLifecycleManagerFactoryBase | None = None,
         schema_migration_factory: EntrySchemaMigrationFactoryBase | None = None,
+        dependencies_load_concurrency: int = DEFAULT_DEPENDENCIES_LOAD_CONCURRENCY,
+        batch_get_entries: bool = False,
     ) -> None:
         self._us_client = UStorageClientAIO(
             host=us_base_url,
@@ -84,8 +92,11 @@ class AsyncUSManager(USManagerBase):
             context_workbook_id=bi_context.workbook_id,
             ca_data=ca_data,
             retry_policy_factory=retry_policy_factory,
+            batch_get_entries=batch_get_entries,
         )
         self._ca_data = ca_data
+        self._dependencies_load_concurrency = dependencies_load_concurrency
+        self._prefetched_us_resps = {}
 
         super().__init__(
             bi_context=bi_context,
@@ -115,6 +126,8 @@ class AsyncUSManager(USManagerBase):
             schema_migration_factory=self._schema_migration_factory,
             ca_data=self._ca_data,
             retry_policy_factory=self._retry_policy_factory,
+            dependencies_load_concurrency=self._dependencies_load_concurrency,
+            batch_get_entries=self._us_client.supports_batch_get_entries,
         )
 
     async def close(self) -> None:
@@ -212,12 +225,16 @@ class AsyncUSManager(USManagerBase):
         context_name: str | None = None,
         branch: USEntryBranch = USEntryBranch.published,
     ) -> dict[str, Any]:
-        us_resp = await self._us_client.get_entry(
-            entry_id,
-            params=params,
-            context_name=context_name,
-            branch=branch,
-        )
+        us_resp = None
+        if params is None and branch == USEntryBranch.published:
+            us_resp = self._prefetched_us_resps.pop(entry_id, None)
+        if us_resp is None:
+            us_resp = await self._us_client.get_entry(
+                entry_id,
+                params=params,
+                context_name=context_name,
+                branch=branch,
+            )
         return await self._migrate_response(us_resp)
 
     async def _migrate_response(self, us_resp: dict) -> dict:
@@ -511,30 +528,68 @@ class AsyncUSManager(USManagerBase):
                 sources_to_load[entry_ref] = None
 
         processed_sources: dict[ConnectionRef, DataSourceType | None] = {}
+        semaphore = asyncio.Semaphore(self._dependencies_load_concurrency)
+
+        async def load_source(ref: ConnectionRef, source_type: DataSourceType | None) -> ConnectionBase | None:
+            async with semaphore:
+                try:
+                    return await self.ensure_source_preloaded(
+                        conn_ref=ref,
+                        referrer=dataset,
+                        source_type=source_type,
+                    )
+                except Exception:
+                    LOGGER.exception("Can not load linked US entry %s for entry %s", ref, dataset.uuid)
+                    raise
 
+        # Breadth-first: the entries of each level of the dependencies are loaded concurrently
         while sources_to_load:
-            ref, source_type = sources_to_load.popitem()
-            processed_sources[ref] = source_type
+            wave = sources_to_load
+            sources_to_load = {}
+            processed_sources.update(wave)
 
+            await self._prefetch_sources(wave)
+            tasks = [asyncio.create_task(load_source(ref, source_type)) for ref, source_type in wave.items()]
             try:
-                resolved_ref = await self.ensure_source_preloaded(
-                    conn_ref=ref,
-                    referrer=dataset,
-                    source_type=source_type,
-                )
-            except Exception:
-                LOGGER.exception("Can not load linked US entry %s for entry %s", ref, dataset.uuid)
+                resolved_refs = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
                 raise
 
-            # Preload entries for loaded entry
-            new_links = self._get_entry_links(resolved_ref)
+            for resolved_ref in resolved_refs:
+                # Preload entries for loaded entry
+                new_links = self._get_entry_links(resolved_ref)
+
+                # Add new entries to queue
+                for connection_ref in new_links:
 
-            # Add new entries to queue
-            for connection_ref in new_links:
+                    # Ignore already processed and already queued
+                    if (connection_ref not in processed_sources) and (connection_ref not in sources_to_load):
+                        sources_to_load[connection_ref] = None
 
-                # Ignore already processed and already queued
-                if (connection_ref not in processed_sources) and (connection_ref not in sources_to_load):
-                    sources_to_load[connection_ref] = None
+    async def _prefetch_sources(self, sources: dict[ConnectionRef, DataSourceType | None]) -> None:
+        """Fetch the raw connections of a dependencies level in one request, if the storage supports it"""
+
+        if not self._us_client.supports_batch_get_entries:
+            return
+
+        conn_ids = set()
+        for ref, source_type in sources.items():
+            if ref in self._loaded_entries or not isinstance(ref, DefaultConnectionRef):
+                continue
+            connection_type = get_connection_type_for_source_type(source_type)
+            if connection_type is not None and get_connection_class(connection_type).is_virtual:
+                continue
+            conn_ids.add(ref.conn_id)
+        if len(conn_ids) < 2:
+            return
+
+        try:
+            self._prefetched_us_resps.update(await self._us_client.get_entries(conn_ids, scope="connection"))
+        except exc.USReqError:
+            # Not critical: the entries are going to be fetched one by one
+            LOGGER.warning("Failed to fetch connections %s in batch", sorted(conn_ids), exc_info=True)
 
     def get_raw_collection(
         self,
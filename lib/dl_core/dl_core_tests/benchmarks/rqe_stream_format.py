@@ -0,0 +1,112 @@
+"""
+Compare the pickle and the framed (`STREAM_FRAMED`) formats of the RQE result stream:
+encoding + decoding throughput and peak RSS (each case in a separate process).
+
+    python -m dl_core_tests.benchmarks.rqe_stream_format [--rows N] [--chunk-size N]
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import (
+    Callable,
+    Iterable,
+)
+import concurrent.futures
+import datetime
+import decimal
+import multiprocessing
+import pickle
+import resource
+import time
+from typing import Any
+
+from dl_core.connection_executors.qe_serializer.stream_framing import (
+    FramedEventDecoder,
+    FramedEventEncoder,
+)
+from dl_core.enums import RQEEventType
+
+NETWORK_CHUNK_SIZE = 64 * 1024
+
+
+def make_chunks(rows: int, chunk_size: int) -> list[list[tuple[Any, ...]]]:
+    start_date = datetime.date(2024, 1, 1)
+    all_rows = [
+        (
+            idx,
+            f"name_{idx % 1000}",
+            idx * 0.5,
+            start_date + datetime.timedelta(days=idx % 365),
+            decimal.Decimal(idx) / 100,
+            None if idx % 10 == 0 else idx % 7,
+        )
+        for idx in range(rows)
+    ]
+    return [all_rows[pos : pos + chunk_size] for pos in range(0, rows, chunk_size)]
+
+
+def _split(data: bytes) -> Iterable[bytes]:
+    for pos in range(0, len(data), NETWORK_CHUNK_SIZE):
+        yield data[pos : pos + NETWORK_CHUNK_SIZE]
+
+
+def run_pickle(chunks: list[list[tuple[Any, ...]]]) -> int:
+    row_count = 0
+    for chunk in chunks:
+        # As in the RQE: a pickled pair per chunk; the reader waits for the end of the HTTP chunk.
+        encoded = pickle.dumps((RQEEventType.raw_chunk.value, chunk))
+        buf = b""
+        for network_chunk in _split(encoded):
+            buf += network_chunk
+        _, rows = pickle.loads(buf)  # noqa: S301
+        row_count += len(rows)
+    return row_count
+
+
+def run_framed(chunks: list[list[tuple[Any, ...]]]) -> int:
+    encoder = FramedEventEncoder()
+    decoder = FramedEventDecoder()
+    row_count = 0
+    for chunk in chunks:
+        encoded = encoder.encode_event(RQEEventType.raw_chunk, chunk)
+        for network_chunk in _split(encoded):
+            for _, rows in decoder.feed(network_chunk):
+                row_count += len(rows)
+    return row_count
+
+
+CASES: dict[str, Callable[[list[list[tuple[Any, ...]]]], int]] = {
+    "pickle": run_pickle,
+    "framed": run_framed,
+}
+
+
+def run_case(case_name: str, rows: int, chunk_size: int) -> tuple[float, int, int]:
+    chunks = make_chunks(rows=rows, chunk_size=chunk_size)
+    started = time.perf_counter()
+    row_count = CASES[case_name](chunks)
+    elapsed = time.perf_counter() - started
+    assert row_count == rows
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, row_count, max_rss_kb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    mp_context = multiprocessing.get_context("spawn")
+    for case_name in CASES:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as executor:
+            elapsed, row_count, max_rss_kb = executor.submit(run_case, case_name, args.rows, args.chunk_size).result()
+        print(
+            f"{case_name:>8}: {row_count / elapsed:>12,.0f} rows/sec, "
+            f"{elapsed:.3f} sec, peak RSS {max_rss_kb / 1024:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
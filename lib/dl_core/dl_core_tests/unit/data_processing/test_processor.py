@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+from typing import ClassVar
+
+import attr
+import pytest
+
+from dl_api_commons.base_models import RequestContextInfo
+from dl_api_commons.reporting.models import DataProcessingOperationReportingRecord
+from dl_api_commons.reporting.registry import DefaultReportingRegistry
+from dl_cache_engine.primitives import LocalKeyRepresentation
+from dl_core.data_processing.cache.utils import DatasetOptionsBuilder
+from dl_core.data_processing.processing.context import OpExecutionContext
+from dl_core.data_processing.processing.db_base.exec_adapter_base import ProcessorDbExecAdapterBase
+from dl_core.data_processing.processing.operation import (
+    BaseOp,
+    MultiSourceOp,
+)
+from dl_core.data_processing.processing.processor import OperationProcessorAsyncBase
+from dl_core.data_processing.stream_base import (
+    AbstractStream,
+    DataRequestMetaInfo,
+)
+
+
+@attr.s(frozen=True)
+class FakeOp(MultiSourceOp):
+    supported_source_types = (AbstractStream,)
+    supported_dest_types = (AbstractStream,)
+
+    duration: float = attr.ib(kw_only=True, default=0.05)
+    fail: bool = attr.ib(kw_only=True, default=False)
+
+
+@attr.s
+class FakeOperationProcessor(OperationProcessorAsyncBase):
+    events: list[tuple[str, str]] = attr.ib(init=False, factory=list)
+
+    max_concurrent_operations: ClassVar[int] = 4
+
+    def _make_cache_options_builder(self) -> DatasetOptionsBuilder:
+        return None  # type: ignore  # not used
+
+    def _make_db_ex_adapter(self) -> ProcessorDbExecAdapterBase | None:
+        return None
+
+    async def ping(self) -> int | None:
+        return 1
+
+    async def execute_operation(self, op: BaseOp, ctx: OpExecutionContext) -> AbstractStream:
+        assert isinstance(op, FakeOp)
+        self.events.append(("start", op.dest_stream_id))
+        try:
+            await asyncio.sleep(op.duration)
+        except asyncio.CancelledError:
+            self.events.append(("cancel", op.dest_stream_id))
+            raise
+        if op.fail:
+            raise ValueError(f"{op.dest_stream_id} failed")
+        self.events.append(("end", op.dest_stream_id))
+        return _make_stream(op.dest_stream_id)
+
+
+@attr.s
+class SequentialFakeOperationProcessor(FakeOperationProcessor):
+    max_concurrent_operations: ClassVar[int] = 1
+
+
+def _make_stream(stream_id: str) -> AbstractStream:
+    return AbstractStream(
+        id=stream_id,
+        names=[],
+        user_types=[],
+        data_key=LocalKeyRepresentation(),
+        meta=DataRequestMetaInfo(),
+    )
+
+
+def _make_processor(processor_cls: type[FakeOperationProcessor]) -> FakeOperationProcessor:
+    return processor_cls(reporting_registry=DefaultReportingRegistry(rci=RequestContextInfo.create_empty()))
+
+
+def _make_operations(fail: bool = False) -> list[BaseOp]:
+    # Two independent branches joined at the end
+    return [
+        FakeOp(dest_stream_id="a", source_stream_ids={"src_1"}, fail=fail),
+        FakeOp(dest_stream_id="b", source_stream_ids={"src_2"}, duration=0.2),
+        FakeOp(dest_stream_id="c", source_stream_ids={"a", "b"}),
+    ]
+
+
+def _make_context(operations: list[BaseOp]) -> OpExecutionContext:
+    return OpExecutionContext(
+        processing_id="test",
+        streams=[_make_stream("src_1"), _make_stream("src_2")],
+        operations=operations,
+    )
+
+
+@pytest.mark.asyncio
+async def test_execute_operations_concurrently() -> None:
+    processor = _make_processor(FakeOperationProcessor)
+    result = await processor.execute_operations(ctx=_make_context(_make_operations()), output_stream_ids=["c"])
+
+    assert [stream.id for stream in result] == ["c"]
+    assert processor.events == [
+        ("start", "a"),
+        ("start", "b"),
+        ("end", "a"),
+        ("end", "b"),
+        ("start", "c"),
+        ("end", "c"),
+    ]
+    records = processor._reporting_registry.get_records_of_type(DataProcessingOperationReportingRecord)
+    assert [record.dest_stream_id for record in records] == ["a", "b", "c"]
+    assert all(record.exception is None and record.start_timestamp <= record.timestamp for record in records)
+
+
+@pytest.mark.asyncio
+async def test_execute_operations_concurrency_limit() -> None:
+    processor = _make_processor(SequentialFakeOperationProcessor)
+    await processor.execute_operations(ctx=_make_context(_make_operations()), output_stream_ids=["c"])
+
+    assert processor.events == [
+        ("start", "a"),
+        ("end", "a"),
+        ("start", "b"),
+        ("end", "b"),
+        ("start", "c"),
+        ("end", "c"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_execute_operations_cancels_on_failure() -> None:
+    processor = _make_processor(FakeOperationProcessor)
+    with pytest.raises(ValueError, match="a failed"):
+        await processor.execute_operations(ctx=_make_context(_make_operations(fail=True)), output_stream_ids=["c"])
+
+    assert processor.events == [("start", "a"), ("start", "b"), ("cancel", "b")]
+    records = processor._reporting_registry.get_records_of_type(DataProcessingOperationReportingRecord)
+    assert {record.dest_stream_id: type(record.exception) for record in records} == {
+        "a": ValueError,
+        "b": asyncio.CancelledError,
+    }
@@ -116,3 +116,44 @@ async def test_async_chunked_lazy():
     data = await chunked.all()
     assert data == list(range(97))
     assert started_cnt == finished_cnt == 3
+
+
+@pytest.mark.asyncio
+async def test_async_chunked_close():
+    started_cnt = 0
+    finished_cnt = 0
+    closed = False
+
+    async def chunk_gen():
+        nonlocal closed
+        try:
+            for chunk in chunked_range(97, 10):
+                yield chunk
+        finally:
+            closed = True
+
+    async def make_range() -> AsyncChunked[int]:
+        nonlocal started_cnt
+        started_cnt += 1
+        return AsyncChunked(chunked_data=chunk_gen())
+
+    async def finalize() -> None:
+        nonlocal finished_cnt
+        finished_cnt += 1
+
+    # Not read at all
+    chunked = LazyAsyncChunked(initializer=make_range, finalizer=finalize).limit(
+        max_count=53,
+        limit_exception=exc.ResultRowCountLimitExceededError,
+    )
+    await chunked.close()
+    assert (started_cnt, finished_cnt) == (0, 1)
+
+    # Read partially
+    chunked = LazyAsyncChunked(initializer=make_range, finalizer=finalize)
+    chunks = aiter(chunked.chunks)
+    assert list(await anext(chunks)) == list(range(10))
+    await chunked.close()
+    assert closed
+    await chunks.aclose()  # type: ignore
+    assert (started_cnt, finished_cnt) == (1, 2)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from collections.abc import (
+    AsyncGenerator,
+    Sequence,
+)
+import time
+from typing import Any
+
+import attr
+import pytest
+from sqlalchemy.engine.default import DefaultDialect
+
+from dl_api_commons.base_models import RequestContextInfo
+from dl_api_commons.reporting.registry import DefaultReportingRegistry
+from dl_cache_engine.primitives import LocalKeyRepresentation
+from dl_compeng_pg.compeng_pg_base.uploaded_tables import (
+    UploadedTableRegistry,
+    make_uploaded_table_key,
+)
+from dl_constants import UserDataType
+from dl_core.connectors.base.query_compiler import QueryCompiler
+from dl_core.data_processing.processing.context import OpExecutionContext
+from dl_core.data_processing.processing.db_base.exec_adapter_base import (
+    ProcessorDbExecAdapterBase,
+    get_reusable_table_created_at,
+    make_reusable_table_name,
+)
+from dl_core.data_processing.processing.db_base.op_executors import UploadOpExecutorAsync
+from dl_core.data_processing.processing.operation import UploadOp
+from dl_core.data_processing.stream_base import (
+    DataRequestMetaInfo,
+    DataSourceVS,
+    DataStreamAsync,
+)
+from dl_core.data_processing.types import TValuesChunkStream
+from dl_utils.streaming import (
+    AsyncChunked,
+    AsyncChunkedBase,
+)
+
+NAMES = ["a", "b"]
+USER_TYPES = [UserDataType.integer, UserDataType.string]
+DATA_KEY = LocalKeyRepresentation().extend(part_type="query", part_content="select 1")
+
+
+@attr.s(frozen=True)
+class FakeDataSource:
+    cache_enabled: bool = attr.ib(default=True)
+
+
+@attr.s
+class FakeExecAdapter(ProcessorDbExecAdapterBase):
+    registry: UploadedTableRegistry = attr.ib(kw_only=True)
+    created: list[tuple[str, LocalKeyRepresentation | None]] = attr.ib(init=False, factory=list)
+    inserted: list[str] = attr.ib(init=False, factory=list)
+
+    async def _execute_and_fetch(self, **kwargs: Any) -> TValuesChunkStream:
+        raise NotImplementedError
+
+    def get_query_compiler(self) -> QueryCompiler:
+        return QueryCompiler(dialect=DefaultDialect())
+
+    async def get_uploaded_table(
+        self,
+        *,
+        data_key: LocalKeyRepresentation,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+    ) -> str | None:
+        return self.registry.acquire(make_uploaded_table_key(data_key, names, user_types))
+
+    async def create_table(
+        self,
+        *,
+        table_name: str,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+        data_key: LocalKeyRepresentation | None = None,
+    ) -> None:
+        self.created.append((table_name, data_key))
+
+    async def insert_data_into_table(
+        self,
+        *,
+        table_name: str,
+        names: Sequence[str],
+        user_types: Sequence[UserDataType],
+        data: AsyncChunkedBase,
+    ) -> None:
+        self.inserted.append(table_name)
+
+
+def _make_adapter(registry: UploadedTableRegistry) -> FakeExecAdapter:
+    return FakeExecAdapter(
+        registry=registry,
+        cache_options_builder=None,  # type: ignore  # not used
+        reporting_registry=DefaultReportingRegistry(rci=RequestContextInfo.create_empty()),
+    )
+
+
+async def _upload(
+    adapter: FakeExecAdapter,
+    cache_enabled: bool = True,
+    data: AsyncChunkedBase | None = None,
+) -> str:
+    source_stream = DataStreamAsync(
+        id="src",
+        names=NAMES,
+        user_types=USER_TYPES,
+        data=data if data is not None else AsyncChunked.from_chunked_iterable([[[1, "x"]]]),
+        data_key=DATA_KEY,
+        meta=DataRequestMetaInfo(data_source_list=[FakeDataSource(cache_enabled=cache_enabled)]),  # type: ignore
+    )
+    ctx = OpExecutionContext(processing_id="test", streams=[source_stream], operations=[])
+    op = UploadOp(dest_stream_id="dst", source_stream_id="src", result_id="avatar", alias="t")
+    result = await UploadOpExecutorAsync(ctx=ctx, db_ex_adapter=adapter).execute(op)
+    assert isinstance(result, DataSourceVS)
+    await result.prepare()
+    return result.prep_src_info.sql_source.element.name  # type: ignore
+
+
+def _time_shift(monkeypatch: pytest.MonkeyPatch, shift: float) -> None:
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + shift)
+
+
+def test_registry_acquire_and_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = UploadedTableRegistry(ttl_sec=10, max_tables=10)
+    key = make_uploaded_table_key(DATA_KEY, NAMES, USER_TYPES)
+    assert registry.acquire(key) is None
+
+    registry.publish(key, "t1")
+    assert registry.acquire(key) == "t1"
+    assert registry.acquire(make_uploaded_table_key(DATA_KEY, NAMES, [UserDataType.integer] * 2)) is None
+    # Uploaded by another data processing at the same time
+    registry.publish(key, "t2")
+    assert registry.pop_tables_to_drop() == ["t2"]
+
+    _time_shift(monkeypatch, 20)
+    assert registry.acquire(key) is None
+    # Still read
+    assert registry.pop_tables_to_drop() == []
+    registry.release("t1")
+    assert registry.pop_tables_to_drop() == ["t1"]
+    assert (registry.stats.hits, registry.stats.misses, registry.stats.published) == (1, 3, 1)
+
+
+def test_registry_eviction() -> None:
+    registry = UploadedTableRegistry(ttl_sec=10, max_tables=2)
+    keys = [
+        make_uploaded_table_key(DATA_KEY.extend(part_type="n", part_content=idx), NAMES, USER_TYPES) for idx in range(4)
+    ]
+    registry.publish(keys[0], "t0")
+    registry.publish(keys[1], "t1")
+    assert registry.acquire(keys[0]) == "t0"
+
+    # The oldest one that is not read is evicted
+    registry.publish(keys[2], "t2")
+    assert registry.pop_tables_to_drop() == ["t1"]
+    assert registry.acquire(keys[0]) == "t0"
+    registry.release("t0")
+    registry.release("t0")
+
+    registry.publish(keys[3], "t3")
+    assert registry.pop_tables_to_drop() == ["t0"]
+    assert sorted(registry.pop_all_tables()) == ["t2", "t3"]
+    assert registry.acquire(keys[3]) is None
+
+
+def test_registry_select_stale_tables(monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = UploadedTableRegistry(ttl_sec=10, max_tables=10)
+    now = time.time()
+    old_name, known_name = make_reusable_table_name(), make_reusable_table_name()
+    registry.publish(make_uploaded_table_key(DATA_KEY, NAMES, USER_TYPES), known_name)
+    assert get_reusable_table_created_at(old_name) == pytest.approx(now, abs=1)
+
+    monkeypatch.setattr(time, "time", lambda: now + 100)
+    new_name = make_reusable_table_name()
+    table_names = [old_name, known_name, new_name, "other_table", "dl_compeng_upload_x"]
+    assert registry.select_stale_tables(table_names, max_age_sec=50) == [old_name]
+
+
+@pytest.mark.asyncio
+async def test_upload_reuses_published_table() -> None:
+    registry = UploadedTableRegistry(ttl_sec=10, max_tables=10)
+    adapter = _make_adapter(registry)
+
+    table_name = await _upload(adapter)
+    assert get_reusable_table_created_at(table_name) is not None
+    assert adapter.created == [(table_name, DATA_KEY)]
+    assert adapter.inserted == [table_name]
+
+    registry.publish(make_uploaded_table_key(DATA_KEY, NAMES, USER_TYPES), table_name)
+    source_events: list[str] = []
+
+    async def source_data() -> AsyncGenerator[list[list[Any]], None]:
+        source_events.append("started")
+        try:
+            yield [[1, "x"]]
+        finally:
+            source_events.append("closed")
+
+    data = AsyncChunked(chunked_data=source_data())
+    assert await _upload(adapter, data=data) == table_name
+    assert len(adapter.created) == len(adapter.inserted) == 1
+    # The source data is released without being read
+    assert source_events == []
+    assert [chunk async for chunk in data.chunks] == []
+
+
+@pytest.mark.asyncio
+async def test_upload_not_reused_without_cache() -> None:
+    registry = UploadedTableRegistry(ttl_sec=10, max_tables=10)
+    adapter = _make_adapter(registry)
+    registry.publish(make_uploaded_table_key(DATA_KEY, NAMES, USER_TYPES), "published")
+
+    table_name = await _upload(adapter, cache_enabled=False)
+    assert table_name != "published"
+    assert get_reusable_table_created_at(table_name) is None
+    assert adapter.created == [(table_name, None)]
+    assert registry.stats.hits == 0
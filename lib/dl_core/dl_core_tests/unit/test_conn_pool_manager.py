@@ -0,0 +1,118 @@
+import asyncio
+
+import attr
+import pytest
+
+from dl_core.connection_executors.adapters.conn_pool_manager import ConnPoolManager
+
+
+@attr.s
+class FakePool:
+    max_size: int = attr.ib()
+    healthy: bool = attr.ib(default=True)
+    closed: bool = attr.ib(default=False)
+
+
+@attr.s
+class FakePoolFactory:
+    pools: list[FakePool] = attr.ib(factory=list)
+
+    async def create(self, max_size: int) -> FakePool:
+        pool = FakePool(max_size=max_size)
+        self.pools.append(pool)
+        return pool
+
+    @staticmethod
+    async def close(pool: FakePool) -> None:
+        pool.closed = True
+
+    @staticmethod
+    async def close_slowly(pool: FakePool) -> None:
+        await asyncio.sleep(0.01)
+        pool.closed = True
+
+    @staticmethod
+    async def check(pool: FakePool) -> None:
+        if not pool.healthy:
+            raise ConnectionError("Pool is broken")
+
+
+async def _borrow(manager: ConnPoolManager, factory: FakePoolFactory, key: str) -> FakePool:
+    async with manager.borrow(key, factory=factory.create, closer=factory.close, health_check=factory.check) as pool:
+        return pool
+
+
+@pytest.mark.asyncio
+async def test_pool_is_shared_by_key() -> None:
+    manager = ConnPoolManager(max_size=3)
+    factory = FakePoolFactory()
+
+    pool_1 = await _borrow(manager, factory, "db_1")
+    pool_2 = await _borrow(manager, factory, "db_1")
+    pool_3 = await _borrow(manager, factory, "db_2")
+    assert pool_1 is pool_2
+    assert pool_1 is not pool_3
+    assert pool_1.max_size == 3
+    assert dict(manager.get_metrics())["conn_pool_manager_pools"] == 2
+
+    await manager.close()
+    assert all(pool.closed for pool in factory.pools)
+    assert dict(manager.get_metrics())["conn_pool_manager_pools"] == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_and_excess_pools_are_closed() -> None:
+    manager = ConnPoolManager(max_pools=2, idle_timeout_sec=3600.0)
+    factory = FakePoolFactory()
+
+    async with manager.borrow("db_1", factory=factory.create, closer=factory.close) as borrowed_pool:
+        # The borrowed pool is never evicted, so the least recently used idle one goes
+        pool_2 = await _borrow(manager, factory, "db_2")
+        pool_3 = await _borrow(manager, factory, "db_3")
+        await _borrow(manager, factory, "db_4")
+        assert pool_2.closed
+        assert not pool_3.closed
+        assert not borrowed_pool.closed
+
+    manager = ConnPoolManager(idle_timeout_sec=0.0, sweep_interval_sec=0.0)
+    idle_pool = await _borrow(manager, factory, "db_1")
+    await _borrow(manager, factory, "db_2")
+    assert idle_pool.closed
+    assert dict(manager.get_metrics())["conn_pool_manager_evicted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_pool_is_recreated() -> None:
+    manager = ConnPoolManager(health_check_interval_sec=0.0)
+    factory = FakePoolFactory()
+
+    pool = await _borrow(manager, factory, "db_1")
+    assert await _borrow(manager, factory, "db_1") is pool
+
+    pool.healthy = False
+    new_pool = await _borrow(manager, factory, "db_1")
+    assert new_pool is not pool
+    assert pool.closed
+    assert dict(manager.get_metrics())["conn_pool_manager_health_check_failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sweeps() -> None:
+    manager = ConnPoolManager(max_pools=1, idle_timeout_sec=0.0, sweep_interval_sec=3600.0)
+    factory = FakePoolFactory()
+    for key in ("db_1", "db_2"):
+        async with manager.borrow(key, factory=factory.create, closer=factory.close_slowly):
+            pass
+
+    async def borrow_and_hold(key: str) -> FakePool:
+        async with manager.borrow(key, factory=factory.create, closer=factory.close_slowly) as pool:
+            await asyncio.sleep(0.05)
+            assert not pool.closed
+            return pool
+
+    # The first borrower sweeps both idle pools, closing them one by one; the others don't sweep meanwhile,
+    # and "db_2" is borrowed again before the sweep gets to it
+    pools = await asyncio.gather(*(borrow_and_hold(key) for key in ("db_3", "db_2", "db_4", "db_5")))
+    assert factory.pools[0].closed
+    assert pools[1] is factory.pools[1]
+    assert dict(manager.get_metrics())["conn_pool_manager_evicted"] == 1
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from dl_core.connection_executors.models.exc import QueryExecutorError
+from dl_core.connection_executors.qe_serializer.stream_framing import (
+    FramedEventDecoder,
+    FramedEventEncoder,
+)
+from dl_core.enums import RQEEventType
+
+_CHUNKS = [
+    [(1, "a", datetime.date(2024, 1, 1), Decimal("1.5")), (2, None, None, Decimal(-2))],
+    [],
+    [(3, "c", datetime.date(2024, 1, 3), None)],
+]
+_DATETIME_CHUNK = [
+    (datetime.datetime(2024, 1, 1, 12, 30), datetime.datetime(2024, 1, 1, 12, 30, tzinfo=datetime.UTC)),
+    (None, None),
+]
+
+
+def _encode_all() -> bytes:
+    encoder = FramedEventEncoder()
+    events = [
+        encoder.encode_event(RQEEventType.raw_cursor_info, {"names": ["id", "name", "dt", "num"]}),
+        *(encoder.encode_event(RQEEventType.raw_chunk, chunk) for chunk in _CHUNKS),
+        encoder.encode_event(RQEEventType.finished, None),
+    ]
+    return b"".join(events)
+
+
+@pytest.mark.parametrize("split_size", [1, 7, 1024])
+def test_framed_roundtrip(split_size: int) -> None:
+    data = _encode_all()
+    decoder = FramedEventDecoder()
+    events = []
+    for pos in range(0, len(data), split_size):
+        events.extend(decoder.feed(data[pos : pos + split_size]))
+
+    assert not decoder.has_pending_data
+    assert events == [
+        (RQEEventType.raw_cursor_info, {"names": ["id", "name", "dt", "num"]}),
+        *((RQEEventType.raw_chunk, chunk) for chunk in _CHUNKS),
+        (RQEEventType.finished, None),
+    ]
+
+
+def test_framed_datetime_columns() -> None:
+    encoder = FramedEventEncoder()
+    decoder = FramedEventDecoder()
+    events = decoder.feed(encoder.encode_event(RQEEventType.raw_chunk, _DATETIME_CHUNK))
+    assert events == [(RQEEventType.raw_chunk, _DATETIME_CHUNK)]
+
+
+@pytest.mark.parametrize(
+    "chunk",
+    [
+        [(2**70, 1), (None, 2)],
+        [(frozenset([1]), (1, 2))],
+        [("a", [1, 2]), (b"b", (3, 4))],
+    ],
+)
+def test_framed_values_not_supported_by_msgpack(chunk: list[tuple]) -> None:
+    encoder = FramedEventEncoder()
+    decoder = FramedEventDecoder()
+    events = decoder.feed(
+        encoder.encode_event(RQEEventType.raw_cursor_info, {"names": ("a", "b")})
+        + encoder.encode_event(RQEEventType.raw_chunk, chunk)
+    )
+    assert events == [
+        (RQEEventType.raw_cursor_info, {"names": ("a", "b")}),
+        (RQEEventType.raw_chunk, chunk),
+    ]
+    assert type(events[0][1]["names"]) is tuple
+    assert [type(value) for value in events[1][1][-1]] == [type(value) for value in chunk[-1]]
+
+
+def test_framed_unknown_event_code() -> None:
+    decoder = FramedEventDecoder()
+    with pytest.raises(QueryExecutorError):
+        decoder.feed(b"\xff\x00\x00\x00\x00")
@@ -0,0 +1,165 @@
+import types
+from typing import Any
+import uuid
+
+import attr
+import pytest
+
+from dl_api_commons.base_models import RequestContextInfo
+from dl_configs.crypto_keys import CryptoKeysConfig
+from dl_core.base_models import PathEntryLocation
+from dl_core.fields import (
+    BIField,
+    FormulaCalculationSpec,
+)
+from dl_core.services_registry.top_level import ServicesRegistry
+from dl_core.us_dataset import Dataset
+from dl_core.us_manager.mutation_cache import usentry_mutation_cache
+from dl_core.us_manager.mutation_cache.mutation_key_base import MutationKey
+from dl_core.us_manager.mutation_cache.usentry_mutation_cache import (
+    MemoryCacheEngine,
+    USEntryMutationCache,
+)
+from dl_core.us_manager.us_manager_sync_mock import MockedSyncUSManager
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@attr.s(auto_attribs=True, kw_only=True, frozen=True)
+class MutationKeyForTest(MutationKey):
+    _value: str
+    _collision_meta: str = "meta"
+
+    def get_collision_tier_breaker(self) -> Any:
+        return self._collision_meta
+
+    def get_hash(self) -> str:
+        return self._value
+
+
+@pytest.fixture
+def clock() -> _Clock:
+    return _Clock()
+
+
+@pytest.mark.asyncio
+async def test_lru_and_ttl(clock: _Clock) -> None:
+    engine = MemoryCacheEngine(max_size_bytes=10, sweep_interval_sec=100, clock=clock)
+    await engine.save("a", "aaaa", ttl=10)
+    await engine.save("b", "bbbb", ttl=20)
+    assert await engine.load("a") == "aaaa"  # now "b" is the least recently used
+
+    await engine.save("c", "cccc", ttl=10)
+    assert await engine.load("b") is None
+    assert engine.size_bytes == 8
+    assert engine.stats.evictions == 1
+
+    await engine.save("d", "d" * 11, ttl=10)  # too large
+    assert await engine.load("d") is None
+
+    clock.now += 10
+    assert await engine.load("a") is None
+    assert engine.stats.expirations == 1
+    assert len(engine) == 1
+
+    # Expired "c" is swept on save once the sweep interval has passed
+    clock.now += 100
+    await engine.save("e", "ee", ttl=10)
+    assert len(engine) == 1
+    assert engine.size_bytes == 2
+    assert engine.stats.expirations == 2
+
+    metrics = dict(engine.get_metrics())
+    assert metrics["mutation_cache_memory_hits_total"] == 1
+    assert metrics["mutation_cache_memory_misses_total"] == 3
+    assert metrics["mutation_cache_memory_size_bytes"] == 2
+
+
+@pytest.mark.asyncio
+async def test_store_entry(clock: _Clock) -> None:
+    engine = MemoryCacheEngine(max_size_bytes=100, store_entries=True, clock=clock)
+    await engine.save("a", "aaaa", ttl=10)
+    data, entry = engine.load_with_entry("a")  # type: ignore  # not None
+    assert entry is None
+
+    engine.store_entry("a", data, "entry")
+    assert engine.load_with_entry("a") == ("aaaa", "entry")
+    assert engine.size_bytes > 4
+    assert engine.stats.entry_hits == 1
+
+    # Not stored for the replaced data
+    await engine.save("a", "bbbb", ttl=10)
+    engine.store_entry("a", data, "entry")
+    assert engine.load_with_entry("a") == ("bbbb", None)
+
+
+@pytest.mark.asyncio
+async def test_mutation_cache_with_stored_entries(
+    bi_context: RequestContextInfo,
+    crypto_keys_config: CryptoKeysConfig,
+    default_service_registry: ServicesRegistry,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def make_usm() -> MockedSyncUSManager:
+        return MockedSyncUSManager(
+            bi_context=bi_context,
+            crypto_keys_config=crypto_keys_config,
+            services_registry=default_service_registry,
+        )
+
+    usm = make_usm()
+    dataset = Dataset.create_from_dict(
+        Dataset.DataModel(name="test_dataset"),
+        ds_key=PathEntryLocation("/test/dataset"),
+        us_manager=usm,
+    )
+    dataset.result_schema.add(
+        BIField.make(guid=str(uuid.uuid4()), title="Field", calc_spec=FormulaCalculationSpec(formula="1")),
+        idx=0,
+    )
+    usm.create(dataset)
+
+    engine = MemoryCacheEngine(store_entries=True)
+    mutation_key = MutationKeyForTest(value="hash")
+    await USEntryMutationCache(usm=usm, cache_engine=engine, default_ttl=60).save_mutation_cache(dataset, mutation_key)
+
+    loaded: list[Dataset] = []
+    for _ in range(3):
+        request_usm = make_usm()
+        cache = USEntryMutationCache(usm=request_usm, cache_engine=engine, default_ttl=60)
+        entry = await cache.get_mutated_entry_from_cache(Dataset, dataset.uuid, dataset.revision_id or "", mutation_key)
+        assert isinstance(entry, Dataset)
+        assert entry.us_manager is request_usm
+        assert [field.guid for field in entry.result_schema] == [field.guid for field in dataset.result_schema]
+        loaded.append(entry)
+
+    assert engine.stats.entry_hits == 2
+    # Same as deserialized, but every request gets its own copy
+    assert loaded[1].result_schema == loaded[0].result_schema
+    assert loaded[2].result_schema == loaded[0].result_schema
+    loaded[1].data.name = "changed"
+    assert loaded[2].data.name == "test_dataset"
+
+    collided_key = MutationKeyForTest(value="hash", collision_meta="other")
+    cache = USEntryMutationCache(usm=make_usm(), cache_engine=engine, default_ttl=60)
+    assert (
+        await cache.get_mutated_entry_from_cache(Dataset, dataset.uuid, dataset.revision_id or "", collided_key) is None
+    )
+
+    # A stored entry that cannot be copied is restored from the serialized data
+    def failing_deepcopy(value: Any, memo: dict) -> Any:
+        raise TypeError("Cannot copy")
+
+    monkeypatch.setattr(usentry_mutation_cache, "copy", types.SimpleNamespace(deepcopy=failing_deepcopy))
+    request_usm = make_usm()
+    cache = USEntryMutationCache(usm=request_usm, cache_engine=engine, default_ttl=60)
+    entry = await cache.get_mutated_entry_from_cache(Dataset, dataset.uuid, dataset.revision_id or "", mutation_key)
+    assert isinstance(entry, Dataset)
+    assert entry.us_manager is request_usm
+    assert entry.result_schema == loaded[0].result_schema
@@ -1,3 +1,6 @@
+import asyncio
+from typing import Any
+
 from aiohttp import web
 import pytest
 import responses
@@ -92,3 +95,124 @@ def test_us_sync_client_retry_count_matches_policy() -> None:
         client.close()
 
     assert len(responses.calls) == 3
+
+
+def _make_aio_client(
+    mock,
+    root_certificates: bytes,
+    auth_ctx: USAuthContextMaster | None = None,
+    batch_get_entries: bool = False,
+) -> UStorageClientAIO:
+    return UStorageClientAIO(
+        auth_ctx=auth_ctx or USAuthContextMaster(us_master_token="fake_token"),
+        host=f"http://{mock.host}:{mock.port}",
+        prefix="api/private",
+        ca_data=root_certificates,
+        retry_policy_factory=dl_retrier.DefaultRetryPolicyFactory(),
+        batch_get_entries=batch_get_entries,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_entry_in_flight_deduplication(aiohttp_client, root_certificates):
+    requests_count = 0
+
+    async def get_entry(request):
+        nonlocal requests_count
+        requests_count += 1
+        await asyncio.sleep(0.1)
+        return web.json_response({"entryId": request.match_info["entry_id"], "data": {"value": 1}})
+
+    app = web.Application()
+    app.router.add_get("/api/private/entries/{entry_id}", get_entry)
+    mock = await aiohttp_client(app)
+
+    clients = [
+        _make_aio_client(mock, root_certificates),
+        _make_aio_client(mock, root_certificates),
+        _make_aio_client(mock, root_certificates, auth_ctx=USAuthContextMaster(us_master_token="other_token")),
+    ]
+    try:
+        results = await asyncio.gather(
+            *(client.get_entry("entry_1") for client in clients),
+            clients[0].get_entry("entry_2"),
+        )
+    finally:
+        await asyncio.gather(*(client.close() for client in clients))
+
+    # The same entry is requested once with the same auth
+    assert requests_count == 3
+    assert results[0] == results[1] == results[2]
+    assert results[0] is not results[1]
+    assert results[3]["entryId"] == "entry_2"
+    assert len(UStorageClientAIO._in_flight_requests) == 0
+
+
+def _make_entry(entry_id: str, **updates: Any) -> dict[str, Any]:
+    return {
+        "entryId": entry_id,
+        "key": f"conns/{entry_id}",
+        "scope": "connection",
+        "type": "postgres",
+        "meta": {},
+        "hidden": False,
+        "data": {},
+        "unversionedData": {},
+        "permissions": {"read": True},
+        "links": {},
+        **updates,
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_entries(aiohttp_client, root_certificates):
+    async def list_entries(request):
+        assert request.query["includeData"] == "1"
+        assert request.query["includeLinks"] == "1"
+        assert request.query["includePermissionsInfo"] == "1"
+        assert request.query.getall("ids") == ["conn_1", "conn_2", "conn_3"]
+        return web.json_response(
+            {
+                "entries": [
+                    _make_entry("conn_1"),
+                    {"entryId": "conn_2"},  # without data
+                    _make_entry("conn_3", unversionedData=None),
+                    _make_entry("conn_4"),  # not requested
+                ]
+            }
+        )
+
+    app = web.Application()
+    app.router.add_get("/api/private/entries", list_entries)
+    mock = await aiohttp_client(app)
+
+    client = _make_aio_client(mock, root_certificates, batch_get_entries=True)
+    try:
+        assert client.supports_batch_get_entries
+        result = await client.get_entries({"conn_3", "conn_1", "conn_2"}, scope="connection")
+    finally:
+        await client.close()
+
+    assert list(result) == ["conn_1"]
+
+
+@pytest.mark.asyncio
+async def test_in_flight_key_with_unhashable_params(root_certificates):
+    client = UStorageClientAIO(
+        auth_ctx=USAuthContextMaster(us_master_token="fake_token"),
+        host="http://us.example.com",
+        prefix="api/private",
+        ca_data=root_certificates,
+        retry_policy_factory=dl_retrier.DefaultRetryPolicyFactory(),
+    )
+    try:
+        request_data = [
+            UStorageClientAIO.RequestData(method="get", relative_url="/entries", params=params, json=None)
+            for params in ({"ids": ["a", "b"], "x": 1}, {"x": 1, "ids": ["a", "b"]}, {"ids": ["b", "a"], "x": 1})
+        ]
+        keys = [client._get_in_flight_key(rq_data, context_name=None) for rq_data in request_data]
+    finally:
+        await client.close()
+
+    assert keys[0] == keys[1]
+    assert keys[0] != keys[2]
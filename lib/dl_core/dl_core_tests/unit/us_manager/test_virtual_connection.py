@@ -1,4 +1,6 @@
+import asyncio
 from typing import (
+    Any,
     ClassVar,
     Self,
 )
@@ -455,3 +457,43 @@ def test_sync_load_dataset_dependencies_without_respect_sources_falls_through_to
 
     # Broken link is loaded in cache
     assert sync_us_manager.get_by_id.call_args.args[0] == conn_id
+
+
+@pytest.mark.asyncio
+async def test_async_load_dataset_dependencies_concurrently(
+    async_us_manager: AsyncUSManager,
+    virtual_source_type: DataSourceType,
+) -> None:
+    conn_ids = [f"conn-concurrent-{idx}" for idx in range(5)]
+    dataset = make_dataset_with_source(async_us_manager, conn_ids[0], virtual_source_type)
+    dataset.data.source_collections = [
+        DataSourceCollectionSpec(
+            id=f"src-{idx}",
+            origin=DataSourceSpec(
+                source_type=virtual_source_type,
+                connection_ref=DefaultConnectionRef(conn_id=conn_id),
+            ),
+        )
+        for idx, conn_id in enumerate(conn_ids)
+    ]
+
+    running = 0
+    max_running = 0
+
+    async def get_by_id(entry_id: str, *args: Any, **kwargs: Any) -> FakeNonVirtualConn:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return FakeNonVirtualConn(uuid=entry_id, us_manager=async_us_manager, type_=ConnectionType.unknown.value)
+
+    async_us_manager.get_by_id = AsyncMock(side_effect=get_by_id)
+    async_us_manager._dependencies_load_concurrency = 3
+
+    await async_us_manager.load_dataset_dependencies(dataset, respect_sources=False)
+
+    assert sorted(call.args[0] for call in async_us_manager.get_by_id.call_args_list) == conn_ids
+    assert max_running == 3
+    for conn_id in conn_ids:
+        assert async_us_manager.get_loaded_us_connection(conn_id).uuid == conn_id
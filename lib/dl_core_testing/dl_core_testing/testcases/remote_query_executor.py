@@ -78,7 +78,9 @@ class BaseRemoteQueryExecutorTestClass[CONN_TV: ConnectionBase](BaseConnectionEx
         ).sync_rqe_netloc_subprocess_cm() as sync_rqe_config:
             yield sync_rqe_config
 
-    @pytest.fixture(params=[RQEExecuteRequestMode.STREAM, RQEExecuteRequestMode.NON_STREAM])
+    @pytest.fixture(
+        params=[RQEExecuteRequestMode.STREAM, RQEExecuteRequestMode.STREAM_FRAMED, RQEExecuteRequestMode.NON_STREAM]
+    )
     def query_executor_options(
         self,
         query_executor_app: TestClient,
@@ -13,14 +13,18 @@ from dl_cache_engine.primitives import (
     LocalKeyRepresentation,
 )
 from dl_cache_engine.processing_helper import CacheProcessingHelper
+from dl_constants import (
+    DashSQLQueryType,
+    UserDataType,
+)
 from dl_constants.types import TJSONExt
 from dl_dashsql.typed_query.primitives import (
     TypedQuery,
     TypedQueryResult,
+    TypedQueryResultColumnHeader,
 )
 from dl_dashsql.typed_query.processor.base import TypedQueryProcessorBase
 from dl_dashsql.typed_query.query_serialization import get_typed_query_serializer
-from dl_dashsql.typed_query.result_serialization import get_typed_query_result_serializer
 from dl_utils.streaming import (
     AsyncChunked,
     AsyncChunkedBase,
@@ -43,6 +47,36 @@ class DefaultTypedQueryCacheKeyBuilder(TypedQueryCacheKeyBuilderBase):
         return self.base_key.extend(part_type="typed_query_data", part_content=serialized_query)
 
 
+def dump_typed_query_result_rows(typed_query_result: TypedQueryResult) -> list[list[TJSONExt]]:
+    """
+    The cache payload of a result: a row with the query type and the column headers, followed by the data rows,
+    so that the cache engine serializes the data only once.
+    """
+    header_row: list[TJSONExt] = [
+        typed_query_result.query_type.value,
+        [[header.name, header.user_type.name] for header in typed_query_result.column_headers],
+    ]
+    return [header_row, *(list(row) for row in typed_query_result.data_rows)]
+
+
+def load_typed_query_result_rows(rows: Sequence[TJSONExt]) -> TypedQueryResult:
+    assert rows, "at least the header row is expected"
+    header_row, *data_rows = rows
+    assert isinstance(header_row, (list, tuple))
+    assert len(header_row) == 2
+    query_type, column_headers = header_row
+    assert isinstance(query_type, str)
+    assert isinstance(column_headers, (list, tuple))
+    return TypedQueryResult(
+        query_type=DashSQLQueryType(query_type),
+        column_headers=[
+            TypedQueryResultColumnHeader(name=name, user_type=UserDataType[user_type])
+            for name, user_type in column_headers  # type: ignore  # TODO: fix
+        ],
+        data_rows=data_rows,  # type: ignore  # TODO: fix
+    )
+
+
 @attr.s
 class CachedTypedQueryProcessor(TypedQueryProcessorBase):
     _main_processor: TypedQueryProcessorBase = attr.ib(kw_only=True)
@@ -50,9 +84,13 @@ class CachedTypedQueryProcessor(TypedQueryProcessorBase):
     _cache_ttl_config: CacheTTLConfig = attr.ib(kw_only=True)
     _refresh_ttl_on_read: bool = attr.ib(kw_only=True)
     _cache_key_builder: TypedQueryCacheKeyBuilderBase = attr.ib(kw_only=True)
+    # Concurrent requests for the same uncached query wait for the first one instead of querying the source
+    _use_locked_cache: bool = attr.ib(kw_only=True, default=False)
 
     def get_cache_options(self, typed_query: TypedQuery) -> BIQueryCacheOptions:
         local_key_rep = self._cache_key_builder.get_cache_key(typed_query=typed_query)
+        # Not to read the entries of the previous payload format (a single serialized string)
+        local_key_rep = local_key_rep.extend(part_type="typed_query_payload", part_content="rows")
         return BIQueryCacheOptions(
             cache_enabled=True,
             ttl_sec=self._cache_ttl_config.ttl_sec_direct,
@@ -61,14 +99,9 @@ class CachedTypedQueryProcessor(TypedQueryProcessorBase):
         )
 
     async def process_typed_query(self, typed_query: TypedQuery) -> TypedQueryResult:
-        tq_result_serializer = get_typed_query_result_serializer(query_type=typed_query.query_type)
-
         async def generate_func() -> AsyncChunkedBase[TJSONExt] | None:
             source_typed_query_result = await self._main_processor.process_typed_query(typed_query=typed_query)
-            # Pack everything into a single string value and wrap that into a stream
-            dumped_serialized_data = tq_result_serializer.serialize(source_typed_query_result)
-            # 1 chunk of length 1, containing a row with 1 item
-            chunked_data: Iterable[Sequence[list[TJSONExt]]] = [[[dumped_serialized_data]]]
+            chunked_data: Iterable[Sequence[list[TJSONExt]]] = [dump_typed_query_result_rows(source_typed_query_result)]
             return AsyncChunked.from_chunked_iterable(chunked_data)
 
         cache_helper = CacheProcessingHelper(cache_engine=self._cache_engine)
@@ -77,20 +110,11 @@ class CachedTypedQueryProcessor(TypedQueryProcessorBase):
             generate_func=generate_func,
             cache_options=cache_options,
             allow_cache_read=True,
-            use_locked_cache=False,
+            use_locked_cache=self._use_locked_cache,
         )
 
         # TODO: Some logging? For instance, log `cache_situation`
 
         assert chunked_stream is not None
-        data_rows = await chunked_stream.all()
-
-        # Extract the serialized data
-        assert len(data_rows) == 1
-        first_row = data_rows[0]
-        assert isinstance(first_row, (list, tuple))
-        assert len(first_row) == 1
-        loaded_serialized_data = first_row[0]
-        assert isinstance(loaded_serialized_data, str)
-
-        return tq_result_serializer.deserialize(loaded_serialized_data)
+        rows = await chunked_stream.all()
+        return load_typed_query_result_rows(rows)
@@ -5,6 +5,7 @@ from collections.abc import (
     Generator,
     Sequence,
 )
+import os
 from typing import NamedTuple
 
 from dl_formula.core.datatype import DataType
@@ -13,6 +14,9 @@ from dl_formula.core.dialect import StandardDialect as D
 import dl_formula.core.exc as exc
 import dl_formula.definitions.base as op_base
 from dl_formula.definitions.scope import Scope
+from dl_formula.utils.caching import MultiCacheManager
+
+DEFINITION_CACHE_SIZE = int(os.environ.get("FORMULA_DEFINITION_CACHE_SIZE", 10000))
 
 
 class FuncKey(NamedTuple):
@@ -25,9 +29,22 @@ class FuncKey(NamedTuple):
         return self._replace(arg_cnt=None)
 
 
+class OperationRegistryStats(NamedTuple):
+    definition_cache_hits: int
+    definition_cache_misses: int
+    definition_cache_maxsize: int | None
+    definition_cache_currsize: int
+
+
 class OperationRegistry:
     def __init__(self) -> None:
         self.ops: dict[FuncKey, list[op_base.NodeTranslation]] = {}
+        # Lookup results (and errors) by the full signature, cleared on (un)registration
+        self._definition_cache: MultiCacheManager[None] = MultiCacheManager(
+            wrapped_function=self._find_definition,
+            maxsize=DEFINITION_CACHE_SIZE,
+            cache_exceptions=(exc.TranslationUnknownFunctionError, exc.DataTypeError),
+        )
 
     def __contains__(self, key: FuncKey) -> bool:
         return key in self.ops
@@ -56,6 +73,7 @@ class OperationRegistry:
             self.ops[func_key] = []
         if def_item not in self.ops[func_key]:
             self.ops[func_key].append(def_item)
+        self._definition_cache.cache_clear()
 
     def unregister(self, def_item: op_base.NodeTranslation) -> None:
         if def_item.name is None:
@@ -64,6 +82,7 @@ class OperationRegistry:
         self.ops[func_key].remove(def_item)
         if not self.ops[func_key]:
             del self.ops[func_key]
+        self._definition_cache.cache_clear()
 
     def get_definition(
         self,
@@ -82,7 +101,18 @@ class OperationRegistry:
                 "Either dialect should be provided or for_any_dialect be set to True. Cannot provide both."
             )
 
-        arg_types = list(arg_types)
+        find_definition = self._definition_cache.get_cached_wrapper_for_args()
+        return find_definition(name.lower(), tuple(arg_types), is_window, dialect, required_scopes)
+
+    def _find_definition(
+        self,
+        name: str,
+        arg_types_tuple: tuple[DataType, ...],
+        is_window: bool,
+        dialect: DialectCombo | None,
+        required_scopes: int,
+    ) -> op_base.NodeTranslation:
+        arg_types = list(arg_types_tuple)
         func_key = FuncKey(name=name.lower(), arg_cnt=len(arg_types), is_window=is_window)
 
         # to also find versions of the F with unlimited number of args:
@@ -102,8 +132,7 @@ class OperationRegistry:
 
         for func_translation in translations:
             if func_translation.match_types(arg_types):
-                if dialect is None:
-                    assert for_any_dialect
+                if dialect is None:  # for_any_dialect
                     return func_translation
                 if func_translation.match_dialect(dialect):
                     return func_translation
@@ -125,6 +154,15 @@ class OperationRegistry:
         ]
         raise exc.DataTypeError("; ".join(message_parts) + ".")
 
+    def get_usage_stats(self) -> OperationRegistryStats:
+        cache_info = self._definition_cache.cache_info().get(None)
+        return OperationRegistryStats(
+            definition_cache_hits=cache_info.hits if cache_info else 0,
+            definition_cache_misses=cache_info.misses if cache_info else 0,
+            definition_cache_maxsize=DEFINITION_CACHE_SIZE,
+            definition_cache_currsize=cache_info.currsize if cache_info else 0,
+        )
+
     def keys(self) -> list[FuncKey]:
         """Sorted function keys (like ``dict.keys()``)"""
         return sorted(
@@ -10,6 +10,7 @@ import dl_formula.core.exc as exc
 import dl_formula.core.nodes as nodes
 from dl_formula.core.position import PositionConverter
 from dl_formula.parser.antlr.visitor import CustomDataLensVisitor
+from dl_formula.parser.ast_cache import get_formula_ast_store
 from dl_formula.parser.base import (
     FORMULA_CACHE_SIZE,
     FormulaParser,
@@ -24,12 +25,7 @@ except ImportError as e:
     raise exc.ParserNotFoundError() from e
 
 
-@multi_cached_with_errors(
-    FORMULA_CACHE_SIZE,
-    cache_exceptions=(exc.ParseError,),
-    cache_qualifier=parser_cache_qualifier,
-)
-def parse(formula: str) -> nodes.Formula:
+def _parse_with_antlr(formula: str) -> nodes.Formula:
     pos_conv = PositionConverter(text=formula)
 
     if not formula.strip():
@@ -58,6 +54,23 @@ def parse(formula: str) -> nodes.Formula:
     return CustomDataLensVisitor(text=formula).visitParse(tree)
 
 
+@multi_cached_with_errors(
+    FORMULA_CACHE_SIZE,
+    cache_exceptions=(exc.ParseError,),
+    cache_qualifier=parser_cache_qualifier,
+)
+def parse(formula: str) -> nodes.Formula:
+    ast_store = get_formula_ast_store()
+    if ast_store is None:
+        return _parse_with_antlr(formula)
+
+    result = ast_store.get(formula)
+    if result is None:
+        result = _parse_with_antlr(formula)
+        ast_store.put(formula, result)
+    return result
+
+
 class AntlrPyFormulaParser(FormulaParser):
     def _parse(self, formula: str) -> nodes.Formula:
         try:
@@ -68,4 +81,10 @@ class AntlrPyFormulaParser(FormulaParser):
             ) from err
 
     def _get_global_stats(self) -> dict[str, _CacheInfo]:
-        return parse.cache_info()  # type: ignore  # 2024-01-30 # TODO: "Callable[..., Any]" has no attribute "cache_info"  [attr-defined]
+        stats: dict[str, _CacheInfo] = parse.cache_info()  # type: ignore  # 2024-01-30 # TODO: "Callable[..., Any]" has no attribute "cache_info"  [attr-defined]
+        ast_store = get_formula_ast_store()
+        if ast_store is not None:
+            stats["persistent"] = _CacheInfo(
+                hits=ast_store.stats.hits, misses=ast_store.stats.misses, maxsize=None, currsize=0
+            )
+        return stats
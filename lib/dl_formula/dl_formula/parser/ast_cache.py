@@ -0,0 +1,334 @@
+"""
+Second-level (persistent, shared between processes) cache of the parsed formulas.
+
+The in-process cache of the parser is lost on every restart and is not shared between worker processes,
+so the same formulas get parsed by the (slow) ANTLR runtime over and over again.
+The parsed formulas are stored in a compact serialized form, keyed by a hash of the formula text
+and of the parser version (see `get_parser_fingerprint`), so that the processes of different versions
+sharing the cache (e.g. during a deployment) don't use the formulas parsed by each other.
+
+The serialized form contains only the node types, the internal values and the positions of the nodes
+(as offsets in the formula text); the other parts of the node meta are restored from the formula text.
+Formulas that can't be restored exactly (which is not expected for the parser output) are not stored.
+
+The formulas are parsed synchronously (also on the event loop), so the store never waits for the locks
+of the other processes: a formula that can't be read or written right away is a miss or is not stored.
+"""
+
+from __future__ import annotations
+
+import abc
+import datetime
+import functools
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import pathlib
+import sqlite3
+import threading
+from typing import Any
+import uuid
+
+import attr
+
+import dl_formula.core.nodes as nodes
+from dl_formula.core.position import (
+    Position,
+    PositionConverter,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+# Must be bumped whenever the serialized form changes
+# (the parser changes are taken into account by `get_parser_fingerprint`)
+FORMULA_AST_CACHE_VERSION = 1
+
+FORMULA_AST_CACHE_PATH = os.environ.get("FORMULA_AST_CACHE_PATH") or None
+FORMULA_AST_CACHE_MAX_ENTRIES = int(os.environ.get("FORMULA_AST_CACHE_MAX_ENTRIES", 100000))
+
+
+class FormulaSerializationError(ValueError):
+    pass
+
+
+def _collect_node_classes() -> dict[str, type[nodes.FormulaItem]]:
+    result: dict[str, type[nodes.FormulaItem]] = {}
+    pending: list[type[nodes.FormulaItem]] = [nodes.FormulaItem]
+    while pending:
+        node_cls = pending.pop()
+        if node_cls.__module__ == nodes.__name__:
+            result[node_cls.__name__] = node_cls
+        pending.extend(node_cls.__subclasses__())
+    return result
+
+
+_NODE_CLASSES = _collect_node_classes()
+
+
+def _dump_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None and type(value.tzinfo) is not datetime.timezone:
+            raise FormulaSerializationError(f"Unsupported tzinfo: {value.tzinfo!r}")
+        return {"dt": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"d": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"u": str(value)}
+    if isinstance(value, tuple):
+        return [_dump_value(item) for item in value]
+    if isinstance(value, frozenset):
+        return {"fs": sorted((_dump_value(item) for item in value), key=repr)}
+    raise FormulaSerializationError(f"Unsupported value type: {type(value)}")
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_load_value(item) for item in value)
+    if isinstance(value, dict):
+        ((tag, tagged_value),) = value.items()
+        if tag == "dt":
+            return datetime.datetime.fromisoformat(tagged_value)
+        if tag == "d":
+            return datetime.date.fromisoformat(tagged_value)
+        if tag == "u":
+            return uuid.UUID(tagged_value)
+        if tag == "fs":
+            return frozenset(_load_value(item) for item in tagged_value)
+        raise FormulaSerializationError(f"Unknown value tag: {tag}")
+    return value
+
+
+def _dump_node(node: nodes.FormulaItem, text: str) -> list:
+    if _NODE_CLASSES.get(type(node).__name__) is not type(node):
+        raise FormulaSerializationError(f"Unsupported node type: {type(node)}")
+
+    meta = node.meta
+    start, end = meta.position.start, meta.position.end
+    if meta.level_tag is not None:
+        raise FormulaSerializationError("Level tags are not supported")
+    if start is None:
+        if meta.position != Position() or meta.original_text is not None:
+            raise FormulaSerializationError("Node meta can't be restored")
+    elif meta.original_text != text[start:end]:
+        raise FormulaSerializationError("Node meta can't be restored")
+
+    return [
+        type(node).__name__,
+        start,
+        end,
+        _dump_value(node.internal_value),
+        [_dump_node(child, text) for child in node.children],
+    ]
+
+
+def _load_node(data: list, text: str, pos_conv: PositionConverter) -> nodes.FormulaItem:
+    type_name, start, end, internal_value, children = data
+    meta: nodes.NodeMeta | None = None
+    if start is not None:
+        meta = nodes.NodeMeta(
+            position=pos_conv.merge_positions(
+                start_position=pos_conv.idx_to_position(start),
+                end_position=pos_conv.idx_to_position(end),
+            ),
+            original_text=text[start:end],
+        )
+    return _NODE_CLASSES[type_name](
+        *(_load_node(child, text, pos_conv) for child in children),
+        internal_value=_load_value(internal_value),
+        meta=meta,
+    )
+
+
+def dump_formula(formula: nodes.Formula, text: str) -> bytes:
+    """Serialize the formula parsed from `text`, raises `FormulaSerializationError` if it can't be done exactly"""
+    return json.dumps(_dump_node(formula, text), separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def load_formula(data: bytes, text: str) -> nodes.Formula:
+    formula = _load_node(json.loads(data), text, PositionConverter(text=text))
+    assert isinstance(formula, nodes.Formula)
+    return formula
+
+
+@functools.cache
+def get_parser_fingerprint() -> str:
+    """
+    Version of the package and a hash of the modules that define the parser output:
+    the parser itself (including the generated one) and the nodes.
+    """
+    try:
+        version = importlib.metadata.version("dl-formula")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+
+    package_dir = pathlib.Path(nodes.__file__).parent.parent
+    paths = [
+        *sorted((package_dir / "parser").rglob("*.py")),
+        package_dir / "core" / "nodes.py",
+        package_dir / "core" / "position.py",
+    ]
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.relative_to(package_dir).as_posix().encode())
+        digest.update(path.read_bytes())
+    return f"{version}:{digest.hexdigest()}"
+
+
+def get_formula_key(text: str) -> str:
+    return hashlib.sha256(f"{FORMULA_AST_CACHE_VERSION}:{get_parser_fingerprint()}:{text}".encode()).hexdigest()
+
+
+@attr.s(auto_attribs=True, slots=True)
+class FormulaAstStoreStats:
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    # Reads and writes skipped because the database was locked by another process
+    busy: int = 0
+
+
+@attr.s
+class FormulaAstStore(abc.ABC):
+    _stats: FormulaAstStoreStats = attr.ib(init=False, factory=FormulaAstStoreStats)
+
+    @property
+    def stats(self) -> FormulaAstStoreStats:
+        return self._stats
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _put(self, key: str, data: bytes) -> None:
+        raise NotImplementedError
+
+    def get(self, text: str) -> nodes.Formula | None:
+        """Never fails: the cache is an optimization, so any error is a miss"""
+        try:
+            data = self._get(get_formula_key(text))
+            formula = load_formula(data, text) if data is not None else None
+        except Exception:
+            LOGGER.warning("Failed to get a parsed formula from the store", exc_info=True)
+            self._stats.errors += 1
+            formula = None
+
+        if formula is None:
+            self._stats.misses += 1
+        else:
+            self._stats.hits += 1
+        return formula
+
+    def put(self, text: str, formula: nodes.Formula) -> None:
+        try:
+            data = dump_formula(formula, text)
+        except FormulaSerializationError:
+            LOGGER.info("Parsed formula can't be stored", exc_info=True)
+            return
+        try:
+            self._put(get_formula_key(text), data)
+        except Exception:
+            LOGGER.warning("Failed to put a parsed formula to the store", exc_info=True)
+            self._stats.errors += 1
+
+
+@attr.s
+class SqliteFormulaAstStore(FormulaAstStore):
+    """
+    Store in an SQLite database file, to be shared by all the processes of the host (and kept between restarts).
+    When there are more than `max_entries` entries, the oldest ones are removed on startup.
+    """
+
+    _path: str = attr.ib(kw_only=True)
+    _max_entries: int = attr.ib(kw_only=True, default=FORMULA_AST_CACHE_MAX_ENTRIES)
+    # Waiting for a lock blocks the caller, so by default the busy database is not waited for at all
+    _timeout_sec: float = attr.ib(kw_only=True, default=0.0)
+    # Creation and cleanup are done once, on startup
+    _init_timeout_sec: float = attr.ib(kw_only=True, default=1.0)
+
+    _local: threading.local = attr.ib(init=False, factory=threading.local)
+
+    def __attrs_post_init__(self) -> None:
+        conn = self._connect(timeout_sec=self._init_timeout_sec)
+        try:
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS formula_ast (key TEXT PRIMARY KEY, data BLOB NOT NULL)")
+                conn.execute(
+                    "DELETE FROM formula_ast WHERE rowid <= (SELECT MAX(rowid) FROM formula_ast) - ?",
+                    (self._max_entries,),
+                )
+        finally:
+            conn.close()
+
+    def _connect(self, timeout_sec: float) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, timeout=timeout_sec, isolation_level=None)
+        # Readers don't block the writer (and vice versa)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # Connections can't be shared between threads
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect(timeout_sec=self._timeout_sec)
+            self._local.conn = conn
+        return conn
+
+    def _get(self, key: str) -> bytes | None:
+        try:
+            row = self._get_connection().execute("SELECT data FROM formula_ast WHERE key = ?", (key,)).fetchone()
+        except sqlite3.OperationalError as err:
+            if not _is_busy_error(err):
+                raise
+            self._stats.busy += 1
+            return None
+        return row[0] if row is not None else None
+
+    def _put(self, key: str, data: bytes) -> None:
+        try:
+            self._get_connection().execute(
+                "INSERT OR IGNORE INTO formula_ast (key, data) VALUES (?, ?)",
+                (key, data),
+            )
+        except sqlite3.OperationalError as err:
+            if not _is_busy_error(err):
+                raise
+            # Another process is writing, the formula will be stored next time it's parsed
+            self._stats.busy += 1
+
+
+def _is_busy_error(err: sqlite3.OperationalError) -> bool:
+    # Extended result codes keep the primary one in the lower byte
+    return (err.sqlite_errorcode & 0xFF) in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+
+_FORMULA_AST_STORE: FormulaAstStore | None = None
+_FORMULA_AST_STORE_LOCK = threading.Lock()
+_FORMULA_AST_STORE_CONFIGURED = False
+
+
+def get_formula_ast_store() -> FormulaAstStore | None:
+    """The store configured by `FORMULA_AST_CACHE_PATH`, if any (unless overridden by `set_formula_ast_store`)"""
+    global _FORMULA_AST_STORE, _FORMULA_AST_STORE_CONFIGURED
+    if not _FORMULA_AST_STORE_CONFIGURED:
+        with _FORMULA_AST_STORE_LOCK:
+            if not _FORMULA_AST_STORE_CONFIGURED:
+                if FORMULA_AST_CACHE_PATH is not None:
+                    try:
+                        _FORMULA_AST_STORE = SqliteFormulaAstStore(path=FORMULA_AST_CACHE_PATH)
+                    except Exception:
+                        LOGGER.exception("Failed to open the formula AST store at %s", FORMULA_AST_CACHE_PATH)
+                _FORMULA_AST_STORE_CONFIGURED = True
+    return _FORMULA_AST_STORE
+
+
+def set_formula_ast_store(store: FormulaAstStore | None) -> None:
+    global _FORMULA_AST_STORE, _FORMULA_AST_STORE_CONFIGURED
+    with _FORMULA_AST_STORE_LOCK:
+        _FORMULA_AST_STORE = store
+        _FORMULA_AST_STORE_CONFIGURED = True
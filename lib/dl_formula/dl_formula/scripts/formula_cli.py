@@ -2,10 +2,17 @@ from __future__ import annotations
 
 import argparse
 from collections import defaultdict
-from collections.abc import Generator
+from collections.abc import (
+    Generator,
+    Iterable,
+)
 import inspect
+import json
 import sys
-from typing import TYPE_CHECKING
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
 
 from dl_formula.core import exc
 from dl_formula.core.datatype import DataType
@@ -21,6 +28,11 @@ import dl_formula.dot
 import dl_formula.inspect.expression
 import dl_formula.inspect.function
 from dl_formula.loader import load_formula_lib
+from dl_formula.parser.ast_cache import (
+    FORMULA_AST_CACHE_PATH,
+    SqliteFormulaAstStore,
+    set_formula_ast_store,
+)
 from dl_formula.parser.factory import get_parser
 from dl_formula.slicing.schema import (
     AggregateFunctionLevelBoundary,
@@ -116,6 +128,19 @@ slice_parser.add_argument("--levels", type=list_type, help="Formula levels")
 
 registry_parser = subparsers.add_parser("registry", help="List function definitions in registry")
 
+warm_cache_parser = subparsers.add_parser(
+    "warm-cache", help="Parse formulas of datasets and save them to the persistent formula cache"
+)
+warm_cache_parser.add_argument(
+    "datasets", nargs="+", help="JSON files with datasets (US entries or API responses), '-' for STDIN"
+)
+warm_cache_parser.add_argument(
+    "--cache-path",
+    default=FORMULA_AST_CACHE_PATH,
+    required=FORMULA_AST_CACHE_PATH is None,
+    help="Path of the cache file (FORMULA_AST_CACHE_PATH by default)",
+)
+
 
 ERROR_TOKEN = "#ERROR"
 
@@ -294,6 +319,49 @@ class FormulaCliTool:
                     print(f"    # {item.name}")
                 print(f"    {type(item).__name__},")
 
+    @classmethod
+    def _iter_dataset_formulas(cls, data: Any) -> Generator[str, None, None]:
+        """Formulas of the fields of all the datasets (``result_schema`` lists) found in the JSON document"""
+        if isinstance(data, dict):
+            result_schema = data.get("result_schema")
+            if isinstance(result_schema, list):
+                for field in result_schema:
+                    if isinstance(field, dict) and field.get("calc_mode") == "formula" and field.get("formula"):
+                        yield field["formula"]
+            for key, value in data.items():
+                if key != "result_schema":
+                    yield from cls._iter_dataset_formulas(value)
+        elif isinstance(data, list):
+            for item in data:
+                yield from cls._iter_dataset_formulas(item)
+
+    @classmethod
+    def warm_cache(cls, datasets: Iterable[str], cache_path: str) -> None:
+        # Not on the event loop, so it can wait for the other processes
+        store = SqliteFormulaAstStore(path=cache_path, timeout_sec=5.0)
+        set_formula_ast_store(store)
+
+        formulas: dict[str, None] = {}
+        for filename in datasets:
+            if filename == "-":
+                data = json.load(sys.stdin)
+            else:
+                with open(filename) as file:
+                    data = json.load(file)
+            formulas.update(dict.fromkeys(cls._iter_dataset_formulas(data)))
+
+        error_count = 0
+        for formula in formulas:
+            try:
+                formula_parser.parse(formula)
+            except exc.ParseError:
+                error_count += 1
+
+        print(
+            f"Formulas: {len(formulas)}, already cached: {store.stats.hits}, "
+            f"parsed: {store.stats.misses - error_count}, invalid: {error_count}"
+        )
+
     @classmethod
     def run(cls, args: argparse.Namespace) -> None:
         tool = cls()
@@ -331,6 +399,9 @@ class FormulaCliTool:
         elif args.command == "registry":
             tool.print_registry()
 
+        elif args.command == "warm-cache":
+            tool.warm_cache(datasets=args.datasets, cache_path=args.cache_path)
+
 
 def main() -> None:
     load_formula_lib()
@@ -0,0 +1,35 @@
+import pytest
+
+from dl_formula.core.datatype import DataType
+from dl_formula.core.dialect import StandardDialect as D
+import dl_formula.core.exc as exc
+from dl_formula.definitions.registry import (
+    OPERATION_REGISTRY,
+    OperationRegistry,
+)
+
+
+def test_definition_cache() -> None:
+    arg_types = [DataType.STRING, DataType.STRING]
+    translation = OPERATION_REGISTRY.get_definition(name="concat", arg_types=arg_types, for_any_dialect=True)
+    registry = OperationRegistry()
+    registry.register(translation)
+
+    definition = registry.get_definition(name="CONCAT", arg_types=arg_types, for_any_dialect=True)
+    assert definition is translation
+    assert registry.get_definition(name="concat", arg_types=arg_types, for_any_dialect=True) is definition
+    stats = registry.get_usage_stats()
+    assert stats.definition_cache_hits == 1
+    assert stats.definition_cache_misses == 1
+
+    # Errors are cached too
+    for _ in range(2):
+        with pytest.raises(exc.TranslationUnknownFunctionError):
+            registry.get_definition(name="concat", arg_types=arg_types, is_window=True, dialect=D.DUMMY)
+    assert registry.get_usage_stats().definition_cache_hits == 2
+
+    # (Un)registration invalidates the cache
+    registry.unregister(translation)
+    assert registry.get_usage_stats().definition_cache_currsize == 0
+    with pytest.raises(exc.TranslationUnknownFunctionError):
+        registry.get_definition(name="concat", arg_types=arg_types, for_any_dialect=True)
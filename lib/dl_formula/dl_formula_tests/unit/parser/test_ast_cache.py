@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+
+import pytest
+
+import dl_formula.core.nodes as nodes
+from dl_formula.parser.antlr.main import (
+    _parse_with_antlr,
+    parse,
+)
+import dl_formula.parser.ast_cache as ast_cache
+from dl_formula.parser.ast_cache import (
+    SqliteFormulaAstStore,
+    dump_formula,
+    get_formula_ast_store,
+    load_formula,
+    set_formula_ast_store,
+)
+
+FORMULAS = (
+    "1",
+    "-1.5e3 + 2 * (3 - [my field])",
+    "'string' + \"other\\nstring\"",
+    "#2019-01-02# > #2019-01-02 03:04:05#",
+    "##2020-01-01T01:02:03## < NOW()",
+    "NULL IS NULL OR TRUE AND NOT FALSE",
+    "[a] IN (1, 2, 3) AND [b] NOT BETWEEN 1 AND 10",
+    "IF [a] > 1 THEN 'a'\nELSEIF [a] < 0 THEN 'b'\nELSE 'c' END",
+    "CASE [x] WHEN 1 THEN 'one' WHEN 2 THEN 'two' ELSE 'many' END",
+    "SUM(SUM([x] INCLUDE [y]) FIXED [z] BEFORE FILTER BY [w])",
+    "RSUM(SUM([x]) TOTAL ORDER BY [y] DESC, [z])",
+    "RANK(COUNTD([user_id]) AMONG [city], [date])",
+    "MAVG([x] WITHIN [y] ORDER BY [z] BEFORE FILTER BY [v], [w])",
+    "AGO([x] IGNORE DIMENSIONS [y], [z])",
+)
+
+
+def _node_metas(node: nodes.FormulaItem) -> list[tuple[type, nodes.NodeMeta, str | None]]:
+    result = [(type(node), node.meta.position, node.original_text)]
+    for child in node.children:
+        result.extend(_node_metas(child))
+    return result
+
+
+@pytest.mark.parametrize("text", FORMULAS)
+def test_dump_load_same_as_parsed(text: str) -> None:
+    formula = _parse_with_antlr(text)
+    loaded = load_formula(dump_formula(formula, text), text)
+    assert loaded == formula
+    assert loaded.stringify(with_meta=True) == formula.stringify(with_meta=True)
+    assert _node_metas(loaded) == _node_metas(formula)
+
+
+def test_sqlite_store(tmp_path) -> None:
+    path = str(tmp_path / "formula_ast.sqlite")
+    store = SqliteFormulaAstStore(path=path)
+    text = FORMULAS[1]
+    assert store.get(text) is None
+    store.put(text, _parse_with_antlr(text))
+    assert store.get(text) == _parse_with_antlr(text)
+    assert store.stats.hits == 1
+    assert store.stats.misses == 1
+
+    # Shared with another process (and kept between restarts)
+    other_store = SqliteFormulaAstStore(path=path, max_entries=1)
+    assert other_store.get(text) == _parse_with_antlr(text)
+    other_store.put(FORMULAS[2], _parse_with_antlr(FORMULAS[2]))
+    # The oldest entries are removed on startup
+    assert SqliteFormulaAstStore(path=path, max_entries=1).get(text) is None
+
+
+def test_sqlite_store_doesnt_wait_for_locks(tmp_path) -> None:
+    path = str(tmp_path / "formula_ast.sqlite")
+    store = SqliteFormulaAstStore(path=path)
+    text = FORMULAS[1]
+    store.put(text, _parse_with_antlr(text))
+
+    # Another process is writing
+    other_conn = sqlite3.connect(path, isolation_level=None)
+    other_conn.execute("BEGIN IMMEDIATE")
+    try:
+        start = time.monotonic()
+        store.put(FORMULAS[2], _parse_with_antlr(FORMULAS[2]))
+        # Readers are not blocked
+        assert store.get(text) is not None
+        assert time.monotonic() - start < 0.5
+        assert store.stats.busy == 1
+        assert store.stats.errors == 0
+    finally:
+        other_conn.rollback()
+        other_conn.close()
+
+    assert store.get(FORMULAS[2]) is None
+    store.put(FORMULAS[2], _parse_with_antlr(FORMULAS[2]))
+    assert store.get(FORMULAS[2]) is not None
+
+
+def test_store_keyed_by_parser_version(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert ast_cache.get_parser_fingerprint() == ast_cache.get_parser_fingerprint()
+    store = SqliteFormulaAstStore(path=str(tmp_path / "formula_ast.sqlite"))
+    text = FORMULAS[1]
+    store.put(text, _parse_with_antlr(text))
+    assert store.get(text) is not None
+
+    monkeypatch.setattr(ast_cache, "get_parser_fingerprint", lambda: "other_version")
+    assert store.get(text) is None
+
+
+def test_parse_uses_store(tmp_path) -> None:
+    original_store = get_formula_ast_store()
+    store = SqliteFormulaAstStore(path=str(tmp_path / "formula_ast.sqlite"))
+    set_formula_ast_store(store)
+    try:
+        text = "test_parse_uses_store([x]) + 1"  # not in the in-process cache yet
+        formula = parse(text)
+        assert store.stats.misses == 1
+        assert store.get(text) == formula
+    finally:
+        set_formula_ast_store(original_store)
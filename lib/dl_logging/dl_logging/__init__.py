@@ -19,13 +19,25 @@ from .format import (
     JsonFormatter,
     StdoutFormatter,
 )
-from .settings import Settings
+from .queue_handler import (
+    LogQueue,
+    QueuedHandler,
+    get_log_queue,
+    install_log_queue,
+)
+from .settings import (
+    LoggingQueueSettings,
+    Settings,
+)
 
 __all__ = (
     "DeployJsonFormatter",
     "FastLogsFilter",
     "JsonFormatter",
     "LogContext",
+    "LogQueue",
+    "LoggingQueueSettings",
+    "QueuedHandler",
     "Settings",
     "StdoutFormatter",
     "add_log_context",
@@ -33,6 +45,8 @@ __all__ = (
     "configure_logging",
     "configure_logging_from_settings",
     "get_log_context",
+    "get_log_queue",
+    "install_log_queue",
     "logcfg_process_stream_human_readable",
     "pop_from_context",
     "put_to_context",
@@ -13,6 +13,7 @@ import statcommons.log_config
 import statcommons.logs
 
 import dl_logging.context
+import dl_logging.queue_handler
 import dl_logging.settings
 
 LOGGER = logging.getLogger(__name__)
@@ -205,6 +206,7 @@ def configure_logging(
     jaeger_service_name: str | None = None,
     log_level: dl_logging.settings.LogLevel | None = None,
     custom_logger_levels: Mapping[str, str] | None = None,
+    queue_settings: dl_logging.settings.LoggingQueueSettings | None = None,
 ) -> None:
     """
     Make sure the global logging state is configured.
@@ -217,6 +219,8 @@ def configure_logging(
     Iterable of Callables `(log_cfg, **context) -> log_cfg`.
     Context includes `common_handlers`.
     Example: see `logcfg_process_enable_handler`.
+
+    `queue_settings`: when enabled, the stdout logs are formatted and written by a background thread.
     """
     if for_development is None:
         for_development = os.environ.get("DEV_LOGGING", "0").lower() in ("1", "true")
@@ -231,6 +235,9 @@ def configure_logging(
     LOGMUTATORS.add_mutator("log_context", add_log_context)
     LOGMUTATORS.add_mutator("update_tags", update_tags)
 
+    if queue_settings is not None and queue_settings.ENABLED and not for_development:
+        dl_logging.queue_handler.install_log_queue(dl_logging.queue_handler.LogQueue(max_size=queue_settings.MAX_SIZE))
+
     if use_jaeger_tracer:
         effective_service_name = app_name if jaeger_service_name is None else jaeger_service_name
         setup_jaeger_client(effective_service_name)
@@ -246,6 +253,7 @@ def configure_logging_from_settings() -> None:
         for_development=logging_settings.IS_DEVELOPMENT,
         log_level=logging_settings.LEVEL,
         custom_logger_levels=logging_settings.logger_levels,
+        queue_settings=logging_settings.QUEUE,
     )
 
     LOGGER.info("Logging configured with settings: %s", settings.model_formatted_repr())
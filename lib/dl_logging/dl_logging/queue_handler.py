@@ -0,0 +1,228 @@
+"""
+Off-loop logging: the records are captured by the logging thread (e.g. the event loop) and handed over to
+a background thread that does the formatting (including the obfuscation) and the writing.
+
+The formatting depends on the context of the logging thread (the log context, the request obfuscation engine),
+so the context is captured with the record: `contextvars.copy_context()` is cheap,
+the (mutable) log context is copied as `record.log_context`, the request obfuscation engine is replaced
+by its snapshot (the secret keeper of the request is changed by the request handling),
+and the message is interpolated on capture, so that the arguments are not accessed from another thread.
+
+The logging thread never waits for the queue: the records that don't fit are dropped and counted.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextvars
+import logging
+import os
+import queue
+import threading
+
+import dl_logging.context as context
+from dl_obfuscator import (
+    get_request_obfuscation_engine,
+    set_request_obfuscation_engine,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+# The handlers that write to stdout (see `statcommons.log_config.BASE_LOGGING_CONFIG`)
+DEFAULT_QUEUED_HANDLER_NAMES = ("stream", "stream_info", "stream_err")
+
+
+_QueueItem = tuple[contextvars.Context, logging.Handler, logging.LogRecord]
+
+
+class LogQueueStats:
+    # Updated without locking, so these might be slightly off under contention
+    def __init__(self) -> None:
+        self.enqueued = 0
+        self.processed = 0
+        self.dropped = 0
+        # Of them, the ones of WARNING and above
+        self.dropped_warnings = 0
+        self.max_depth = 0
+
+
+class LogQueue:
+    """Bounded queue of the records with the background thread that handles them with the target handlers"""
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        flush_timeout: float = 1.0,
+    ) -> None:
+        self.max_size = max_size
+        self.flush_timeout = flush_timeout
+        self.stats = LogQueueStats()
+
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[_QueueItem | None] = queue.Queue(maxsize=max_size)
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def _ensure_started(self) -> None:
+        # The thread does not survive a fork, and the records of the parent are not for the child to write
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._thread is not None:
+                self._queue = queue.Queue(maxsize=self.max_size)
+            self._thread = threading.Thread(target=self._run, name="dl-logging-queue", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        log_queue = self._queue
+        while True:
+            item = log_queue.get()
+            try:
+                if item is None:
+                    return
+                ctx, handler, record = item
+                try:
+                    ctx.run(handler.handle, record)
+                except Exception:
+                    handler.handleError(record)
+                self.stats.processed += 1
+            finally:
+                log_queue.task_done()
+
+    def put(self, handler: logging.Handler, record: logging.LogRecord, ctx: contextvars.Context) -> None:
+        """Never waits: the record is dropped if the queue is full"""
+        self._ensure_started()
+        stats = self.stats
+        try:
+            self._queue.put_nowait((ctx, handler, record))
+        except queue.Full:
+            stats.dropped += 1
+            if record.levelno >= logging.WARNING:
+                stats.dropped_warnings += 1
+            return
+
+        stats.enqueued += 1
+        depth = self._queue.qsize()
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait for the queued records to be handled, returns `False` on timeout"""
+        if self._pid != os.getpid():
+            return True
+        log_queue = self._queue
+        with log_queue.all_tasks_done:
+            return log_queue.all_tasks_done.wait_for(lambda: log_queue.unfinished_tasks == 0, timeout=timeout)
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Handle the queued records and stop the background thread"""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid() or not thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout=timeout)
+        with self._lock:
+            # Started again on the next record
+            self._pid = None
+            self._thread = None
+
+    def get_metrics(self) -> list[tuple[str, int | float]]:
+        """In the `(label, value)` form of the `/metrics` views"""
+        stats = self.stats
+        return [
+            ("log_queue_depth", self.depth),
+            ("log_queue_max_depth", stats.max_depth),
+            ("log_queue_enqueued_total", stats.enqueued),
+            ("log_queue_processed_total", stats.processed),
+            ("log_queue_dropped_total", stats.dropped),
+            ("log_queue_dropped_warnings_total", stats.dropped_warnings),
+        ]
+
+
+class QueuedHandler(logging.Handler):
+    """Hands the records over to the target handler through the queue"""
+
+    def __init__(self, target: logging.Handler, log_queue: LogQueue) -> None:
+        # The target level is checked here to not enqueue the records that would be discarded anyway
+        super().__init__(level=target.level)
+        self.name = target.name
+        self.target = target
+        self.log_queue = log_queue
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if not hasattr(record, "log_context"):
+            record.log_context = context.get_log_context()
+        return record
+
+    def capture_context(self) -> contextvars.Context:
+        ctx = contextvars.copy_context()
+        engine = get_request_obfuscation_engine()
+        if engine is not None:
+            ctx.run(set_request_obfuscation_engine, engine.snapshot())
+        return ctx
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.log_queue.put(self.target, self.prepare(record), self.capture_context())
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.log_queue.flush(timeout=self.log_queue.flush_timeout)
+
+    def close(self) -> None:
+        self.log_queue.stop()
+        self.target.close()
+        super().close()
+
+
+_LOG_QUEUE: LogQueue | None = None
+
+
+def get_log_queue() -> LogQueue | None:
+    return _LOG_QUEUE
+
+
+def install_log_queue(
+    log_queue: LogQueue,
+    handler_names: tuple[str, ...] = DEFAULT_QUEUED_HANDLER_NAMES,
+) -> None:
+    """
+    Replace the configured handlers with the given names by the ones that use the queue, for all the loggers.
+    To be called after the logging is configured.
+    """
+    global _LOG_QUEUE
+
+    queued_handlers: dict[logging.Handler, QueuedHandler] = {}
+    for handler_name in handler_names:
+        handler = logging.getHandlerByName(handler_name)
+        if handler is not None and not isinstance(handler, QueuedHandler):
+            queued_handlers[handler] = QueuedHandler(target=handler, log_queue=log_queue)
+    if not queued_handlers:
+        LOGGER.warning("No handlers to put behind the log queue: %s", handler_names)
+        return
+
+    loggers: list[logging.Logger] = [logging.getLogger()]
+    loggers.extend(
+        logger for logger in logging.Logger.manager.loggerDict.values() if isinstance(logger, logging.Logger)
+    )
+    for logger in loggers:
+        if any(handler in queued_handlers for handler in logger.handlers):
+            logger.handlers = [queued_handlers.get(handler, handler) for handler in logger.handlers]
+
+    if _LOG_QUEUE is not None and _LOG_QUEUE is not log_queue:
+        _LOG_QUEUE.stop()
+    _LOG_QUEUE = log_queue
+    atexit.register(log_queue.stop)
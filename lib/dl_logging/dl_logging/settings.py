@@ -11,12 +11,20 @@ class LoggerSettings(dl_settings.BaseSettings):
     LEVEL: LogLevel
 
 
+class LoggingQueueSettings(dl_settings.BaseSettings):
+    """Off-loop formatting and writing of the stdout logs (see `dl_logging.queue_handler`)"""
+
+    ENABLED: bool = False
+    MAX_SIZE: int = 10000
+
+
 class LoggingSettings(dl_settings.BaseSettings):
     APP_NAME: str
     IS_DEVELOPMENT: bool = False
     LEVEL: LogLevel | None = None
 
     LOGGERS: dict[str, LoggerSettings] = pydantic.Field(default_factory=dict)
+    QUEUE: LoggingQueueSettings = pydantic.Field(default_factory=LoggingQueueSettings)
 
     @property
     def logger_levels(self) -> dict[str, LogLevel]:
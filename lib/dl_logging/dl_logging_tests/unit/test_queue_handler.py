@@ -0,0 +1,124 @@
+from collections.abc import Generator
+import io
+import logging
+import threading
+
+import pytest
+
+import dl_json
+import dl_logging
+from dl_obfuscator import (
+    ObfuscationEngine,
+    SecretKeeper,
+    SecretObfuscator,
+    clear_request_obfuscation_engine,
+    set_request_obfuscation_engine,
+)
+
+
+class _CapturingHandler(logging.Handler):
+    def __init__(self, unblock: threading.Event | None = None) -> None:
+        super().__init__()
+        self.records: list[tuple[str, str]] = []
+        self.unblock = unblock
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.unblock is not None:
+            self.unblock.wait(timeout=5)
+        self.records.append((threading.current_thread().name, self.format(record)))
+
+
+@pytest.fixture(name="logger")
+def fixture_logger() -> Generator[logging.Logger, None, None]:
+    logger = logging.getLogger("dl_logging_tests.queue_handler")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger
+    logger.handlers = []
+
+
+def test_formatted_in_background_with_logging_context(
+    monkeypatch: pytest.MonkeyPatch,
+    logger: logging.Logger,
+) -> None:
+    monkeypatch.setenv("DEPLOY_BOX_ID", "1")
+    target = _CapturingHandler()
+    target.setFormatter(dl_logging.StdoutFormatter())
+    log_queue = dl_logging.LogQueue()
+    logger.addHandler(dl_logging.QueuedHandler(target=target, log_queue=log_queue))
+
+    keeper = SecretKeeper()
+    keeper.add_secret("abc123def456", "token")
+    engine = ObfuscationEngine()
+    engine.add_request_obfuscator(SecretObfuscator(keeper=keeper))
+    args = ["abc123def456"]
+    set_request_obfuscation_engine(engine)
+    try:
+        with dl_logging.LogContext({"request_id": "rid-1"}):
+            logger.info("Token: %s", args)
+        args.append("changed after logging")
+        # As at the end of the request
+        keeper.clear()
+    finally:
+        clear_request_obfuscation_engine()
+
+    assert log_queue.flush(timeout=5)
+    log_queue.stop()
+
+    ((thread_name, formatted),) = target.records
+    assert thread_name != threading.current_thread().name
+    result = dl_json.loads_str(formatted)
+    assert result["message"] == "Token: ['***token***']"
+    assert result["@fields"]["context"]["request_id"] == "rid-1"
+    assert log_queue.get_metrics() == [
+        ("log_queue_depth", 0),
+        ("log_queue_max_depth", 1),
+        ("log_queue_enqueued_total", 1),
+        ("log_queue_processed_total", 1),
+        ("log_queue_dropped_total", 0),
+        ("log_queue_dropped_warnings_total", 0),
+    ]
+
+
+def test_overflow_drops(logger: logging.Logger) -> None:
+    release = threading.Event()
+    target = _CapturingHandler(unblock=release)
+    log_queue = dl_logging.LogQueue(max_size=2)
+    logger.addHandler(dl_logging.QueuedHandler(target=target, log_queue=log_queue))
+
+    # Blocks the background thread
+    logger.info("message 0")
+    assert log_queue.flush(timeout=0.1) is False
+    for idx in range(1, 3):
+        logger.info("message %d", idx)
+    for idx in range(3, 6):
+        logger.info("message %d", idx)
+    # Doesn't wait either
+    logger.warning("message 6")
+    release.set()
+
+    assert log_queue.flush(timeout=5)
+    log_queue.stop()
+    assert (log_queue.stats.dropped, log_queue.stats.dropped_warnings) == (4, 1)
+    assert [formatted for _, formatted in target.records] == ["message 0", "message 1", "message 2"]
+
+
+def test_install_log_queue(logger: logging.Logger) -> None:
+    target = logging.StreamHandler(io.StringIO())
+    target.name = "dl_logging_tests_stream"
+    logger.addHandler(target)
+    log_queue = dl_logging.LogQueue()
+
+    dl_logging.install_log_queue(log_queue, handler_names=("dl_logging_tests_stream",))
+    try:
+        assert target not in logger.handlers
+        (queued_handler,) = [handler for handler in logger.handlers if isinstance(handler, dl_logging.QueuedHandler)]
+        assert queued_handler.target is target
+        assert dl_logging.get_log_queue() is log_queue
+
+        logger.info("message")
+        assert log_queue.flush(timeout=5)
+        assert target.stream.getvalue() == "message\n"
+    finally:
+        log_queue.stop()
+        target.name = None
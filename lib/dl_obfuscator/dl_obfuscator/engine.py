@@ -29,6 +29,12 @@ class OnObfuscationError(enum.Enum):
     RETURN_ORIGINAL = "RETURN_ORIGINAL"
 
 
+def _are_same(left: list[BaseObfuscator], right: list[BaseObfuscator]) -> bool:
+    return len(left) == len(right) and all(
+        left_item is right_item for left_item, right_item in zip(left, right, strict=True)
+    )
+
+
 @attr.s
 class ObfuscationEngine:
     """Core engine responsible for applying obfuscation rules"""
@@ -36,6 +42,7 @@ class ObfuscationEngine:
     _base_obfuscators: list[BaseObfuscator] = attr.ib(factory=list)
     _request_obfuscators: list[BaseObfuscator] = attr.ib(factory=list)
     _obfuscation_error_message: str = attr.ib(default="!OBFUSCATION ERROR!")
+    _snapshot: "ObfuscationEngine | None" = attr.ib(init=False, default=None, repr=False)
 
     def add_base_obfuscator(self, obfuscator: BaseObfuscator) -> None:
         self._base_obfuscators.append(obfuscator)
@@ -43,6 +50,28 @@ class ObfuscationEngine:
     def add_request_obfuscator(self, obfuscator: BaseObfuscator) -> None:
         self._request_obfuscators.append(obfuscator)
 
+    def snapshot(self) -> "ObfuscationEngine":
+        """
+        An engine with the snapshots of the obfuscators (see `BaseObfuscator.snapshot`),
+        for the obfuscation in another thread (e.g. the one that writes the logs).
+        The same one is returned until the state of the obfuscators is changed.
+        """
+        base_obfuscators = [obfuscator.snapshot() for obfuscator in self._base_obfuscators]
+        request_obfuscators = [obfuscator.snapshot() for obfuscator in self._request_obfuscators]
+        snapshot = self._snapshot
+        if (
+            snapshot is None
+            or not _are_same(snapshot._base_obfuscators, base_obfuscators)
+            or not _are_same(snapshot._request_obfuscators, request_obfuscators)
+        ):
+            snapshot = ObfuscationEngine(
+                base_obfuscators=base_obfuscators,
+                request_obfuscators=request_obfuscators,
+                obfuscation_error_message=self._obfuscation_error_message,
+            )
+            self._snapshot = snapshot
+        return snapshot
+
     def _obfuscate_text(self, text: str, context: ObfuscationContext) -> str:
         for obfuscator in self._request_obfuscators:
             text = obfuscator.obfuscate(text, context)
@@ -11,3 +11,10 @@ class BaseObfuscator(abc.ABC):
     @abc.abstractmethod
     def obfuscate(self, text: str, context: ObfuscationContext) -> str:
         raise NotImplementedError
+
+    def snapshot(self) -> "BaseObfuscator":
+        """
+        An obfuscator that does the same with the current state and is not affected by the later changes of it,
+        to be used from another thread. Stateless obfuscators are returned as is.
+        """
+        return self
@@ -1,3 +1,4 @@
+from collections.abc import Mapping
 import re
 
 import attr
@@ -21,17 +22,51 @@ DEFAULT_PATTERNS: tuple[str, ...] = (
     OAUTH_TOKEN_REGEX,
 )
 
+# Lowercase substrings, at least one of which is present in any (lowercased) text matched by the pattern.
+# Scanning for a substring is much cheaper than running the pattern (especially the ones without a literal prefix),
+# so the patterns are applied only to the texts that contain their substrings.
+DEFAULT_REQUIRED_SUBSTRINGS: dict[str, tuple[str, ...]] = {
+    JWT_TOKEN_REGEX: ("eyj", "eyk", "eyl"),
+    URL_CREDENTIALS_REGEX: ("://",),
+    AUTHORIZATION_HEADER_REGEX: ("authorization:",),
+    BASIC_AUTH_REGEX: ("basic ",),
+    BEARER_TOKEN_REGEX: ("bearer ",),
+    OAUTH_TOKEN_REGEX: ("oauth ",),
+}
+
 
 @attr.s
 class RegexObfuscator(BaseObfuscator):
     patterns: tuple[str, ...] = attr.ib(default=DEFAULT_PATTERNS)
     _replacement: str = attr.ib(default="***")
-    _compiled_patterns: tuple[re.Pattern[str], ...] = attr.ib(init=False, repr=False)
+    # Patterns that are not in the mapping are always applied
+    _required_substrings: Mapping[str, tuple[str, ...]] = attr.ib(default=DEFAULT_REQUIRED_SUBSTRINGS, repr=False)
+    _compiled_patterns: tuple[tuple[re.Pattern[str], tuple[str, ...] | None], ...] = attr.ib(init=False, repr=False)
+    _recheck_after_sub: bool = attr.ib(init=False, repr=False)
 
     def __attrs_post_init__(self) -> None:
-        self._compiled_patterns = tuple(re.compile(p) for p in self.patterns)
+        # Still applied one by one: a combined alternation is slower for the usual (clean) texts
+        self._compiled_patterns = tuple((re.compile(p), self._required_substrings.get(p)) for p in self.patterns)
+        # A substring can appear after a substitution only if it has common characters with the replacement,
+        # otherwise the substrings found in the original text are still valid
+        replacement_chars = set(self._replacement.lower())
+        self._recheck_after_sub = any(
+            replacement_chars.intersection(substring)
+            for substrings in self._required_substrings.values()
+            for substring in substrings
+        )
 
     def obfuscate(self, text: str, context: ObfuscationContext) -> str:
-        for pattern in self._compiled_patterns:
-            text = pattern.sub(self._replacement, text)
+        lowered: str | None = None
+        for pattern, required_substrings in self._compiled_patterns:
+            if required_substrings is not None:
+                if lowered is None:
+                    lowered = text.lower()
+                if not any(map(lowered.__contains__, required_substrings)):
+                    continue
+            replaced = pattern.sub(self._replacement, text)
+            if replaced is not text:
+                text = replaced
+                if self._recheck_after_sub:
+                    lowered = None
         return text
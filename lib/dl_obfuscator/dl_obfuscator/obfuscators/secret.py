@@ -4,19 +4,73 @@ from dl_obfuscator.context import ObfuscationContext
 from dl_obfuscator.obfuscators.base import BaseObfuscator
 from dl_obfuscator.secret_keeper import SecretKeeper
 
+_Replacements = tuple[tuple[str, str], ...]
+
+
+def _make_replacements(values: dict[str, str]) -> _Replacements:
+    # Longer values first, so that a value containing another one is masked entirely
+    return tuple(
+        (value, f"***{name}***") for value, name in sorted(values.items(), key=lambda item: len(item[0]), reverse=True)
+    )
+
+
+@attr.s(frozen=True)
+class _ReplacementPlan:
+    keeper_version: int = attr.ib()
+    secrets: _Replacements = attr.ib()
+    secrets_and_params: _Replacements = attr.ib()
+
+    def obfuscate(self, text: str, context: ObfuscationContext) -> str:
+        replacements = self.secrets if context == ObfuscationContext.INSPECTOR else self.secrets_and_params
+        for value, replacement in replacements:
+            if value in text:
+                text = text.replace(value, replacement)
+        return text
+
+
+@attr.s(frozen=True)
+class _SecretObfuscatorSnapshot(BaseObfuscator):
+    _plan: _ReplacementPlan = attr.ib(repr=False)
+
+    def obfuscate(self, text: str, context: ObfuscationContext) -> str:
+        return self._plan.obfuscate(text, context)
+
 
 @attr.s
 class SecretObfuscator(BaseObfuscator):
+    """
+    Masks the values of the keeper with their names.
+
+    The replacements are prepared once per state of the keeper.
+    A combined regex (alternation of all the values) was considered, but in CPython it is several times slower
+    than the substring search of `str`, which is done once per value and is cheap for the values that are absent.
+    """
+
     _keeper: SecretKeeper = attr.ib(repr=False)
+    _plan: _ReplacementPlan | None = attr.ib(init=False, default=None, repr=False)
+    _snapshot: _SecretObfuscatorSnapshot | None = attr.ib(init=False, default=None, repr=False)
 
-    def obfuscate(self, text: str, context: ObfuscationContext) -> str:
-        secrets = self._keeper.secrets
-        for secret in secrets:
-            text = text.replace(secret, f"***{secrets[secret]}***")
+    def _get_plan(self) -> _ReplacementPlan:
+        plan = self._plan
+        keeper = self._keeper
+        if plan is None or plan.keeper_version != keeper.version:
+            # A value that is both a secret and a param is masked as a secret
+            plan = _ReplacementPlan(
+                keeper_version=keeper.version,
+                secrets=_make_replacements(keeper.secrets),
+                secrets_and_params=_make_replacements({**keeper.params, **keeper.secrets}),
+            )
+            self._plan = plan
+        return plan
 
-        if context != ObfuscationContext.INSPECTOR:
-            params = self._keeper.params
-            for param in params:
-                text = text.replace(param, f"***{params[param]}***")
+    def obfuscate(self, text: str, context: ObfuscationContext) -> str:
+        return self._get_plan().obfuscate(text, context)
 
-        return text
+    def snapshot(self) -> BaseObfuscator:
+        # The keeper is changed by the request handling, so the snapshot is bound to the prepared replacements
+        plan = self._get_plan()
+        snapshot = self._snapshot
+        if snapshot is None or snapshot._plan is not plan:
+            snapshot = _SecretObfuscatorSnapshot(plan=plan)
+            self._snapshot = snapshot
+        return snapshot
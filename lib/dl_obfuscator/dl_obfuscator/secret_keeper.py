@@ -14,6 +14,8 @@ class SecretKeeper:
     _params: dict[str, str] = attr.ib(factory=dict, repr=False)
     _min_secret_length: int = attr.ib(default=3)
     _min_param_length: int = attr.ib(default=3)
+    # Bumped on every change, so that the obfuscators can keep their prepared state until then
+    _version: int = attr.ib(init=False, default=0)
 
     def add_secret(self, secret: str | None, name: str) -> None:
         if secret is None:
@@ -21,6 +23,7 @@ class SecretKeeper:
             return
         if len(secret) >= self._min_secret_length:
             self._secrets[secret] = name
+            self._version += 1
         else:
             LOGGER.warning("Secret %r is too short (len=%d), skipping", name, len(secret))
 
@@ -30,6 +33,7 @@ class SecretKeeper:
             return
         if len(param) >= self._min_param_length:
             self._params[param] = name
+            self._version += 1
         else:
             LOGGER.warning("Param %r is too short (len=%d), skipping", name, len(param))
 
@@ -43,6 +47,10 @@ class SecretKeeper:
         for name, param in params.items():
             self.add_param(param, name)
 
+    @property
+    def version(self) -> int:
+        return self._version
+
     @property
     def secrets(self) -> dict[str, str]:
         return self._secrets
@@ -54,3 +62,4 @@ class SecretKeeper:
     def clear(self) -> None:
         self._secrets.clear()
         self._params.clear()
+        self._version += 1
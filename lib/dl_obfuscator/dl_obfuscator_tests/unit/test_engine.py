@@ -291,3 +291,50 @@ class TestOnObfuscationError:
         data = {"good": "text", "bad": 42}
         result = engine.obfuscate(data, ObfuscationContext.LOGS, on_error=OnObfuscationError.SKIP)  # type: ignore
         assert result == {"good": "text", "bad": "!OBFUSCATION ERROR!"}
+
+
+class TestSecretObfuscator:
+    def test_keeper_changes_are_applied(self) -> None:
+        keeper = SecretKeeper()
+        obfuscator = SecretObfuscator(keeper=keeper)
+        text = "token=abc123def456 param=user_id=12345"
+        assert obfuscator.obfuscate(text, ObfuscationContext.LOGS) == text
+
+        keeper.add_secret("abc123def456", "master_token")
+        keeper.add_param("user_id=12345", "user_filter")
+        assert obfuscator.obfuscate(text, ObfuscationContext.LOGS) == (
+            "token=***master_token*** param=***user_filter***"
+        )
+        assert obfuscator.obfuscate(text, ObfuscationContext.INSPECTOR) == (
+            "token=***master_token*** param=user_id=12345"
+        )
+
+        keeper.clear()
+        assert obfuscator.obfuscate(text, ObfuscationContext.LOGS) == text
+
+    def test_longer_values_first(self) -> None:
+        keeper = SecretKeeper()
+        keeper.add_secret("abc123", "short")
+        keeper.add_param("xabc123def456", "long_param")
+        keeper.add_secret("abc123def456", "long")
+        obfuscator = SecretObfuscator(keeper=keeper)
+
+        assert obfuscator.obfuscate("abc123def456 abc123", ObfuscationContext.LOGS) == "***long*** ***short***"
+        assert obfuscator.obfuscate("xabc123def456", ObfuscationContext.LOGS) == "***long_param***"
+        assert obfuscator.obfuscate("xabc123def456", ObfuscationContext.INSPECTOR) == "x***long***"
+
+    def test_snapshot_is_not_affected_by_keeper_changes(self) -> None:
+        keeper = SecretKeeper()
+        keeper.add_secret("abc123def456", "master_token")
+        engine = create_request_engine(create_base_obfuscators(), secret_keeper=keeper)
+        text = "token=abc123def456 key=sk-1234567890abcdef"
+
+        snapshot = engine.snapshot()
+        assert engine.snapshot() is snapshot
+        keeper.add_secret("sk-1234567890abcdef", "api_key")
+        assert snapshot.obfuscate(text, ObfuscationContext.LOGS) == "token=***master_token*** key=sk-1234567890abcdef"
+        keeper.clear()
+        assert snapshot.obfuscate(text, ObfuscationContext.LOGS) == "token=***master_token*** key=sk-1234567890abcdef"
+
+        assert engine.snapshot() is not snapshot
+        assert engine.snapshot().obfuscate(text, ObfuscationContext.LOGS) == text
@@ -87,3 +87,18 @@ class TestSecretKeeper:
 
         assert "value-XXXX" in sc.params
         assert None not in sc.params.values()
+
+    def test_version_changes(self) -> None:
+        sc = SecretKeeper()
+        versions = [sc.version]
+
+        sc.add_secret("abc123", "token")
+        versions.append(sc.version)
+        sc.add_secret("ab", "too_short")
+        assert sc.version == versions[-1]
+        sc.add_param("value456", "param")
+        versions.append(sc.version)
+        sc.clear()
+        versions.append(sc.version)
+
+        assert len(set(versions)) == len(versions)
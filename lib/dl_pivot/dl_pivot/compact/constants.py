@@ -0,0 +1,3 @@
+from dl_constants import DataPivotEngineType
+
+PIVOT_ENGINE_TYPE_COMPACT = DataPivotEngineType.declare("compact")
@@ -0,0 +1,113 @@
+"""
+Pivot data frame with the interned dimension keys.
+
+Every distinct row (column) key is stored once and is referred to by its integer id,
+which is the position of the key in `row_keys` (`column_keys`).
+The measure cells are stored in a flat array indexed by `row_id * len(column_keys) + column_id`
+(or in a dict with the same indices if the pivot table is sparse).
+Sorting and pagination only reorder or slice the `row_order` and `column_order` id permutations,
+so neither the keys nor the cells are ever copied.
+"""
+
+from __future__ import annotations
+
+from collections.abc import (
+    Generator,
+    Iterable,
+)
+from itertools import chain
+from typing import TYPE_CHECKING
+
+import attr
+
+from dl_constants import (
+    FieldRole,
+    PivotHeaderRole,
+)
+from dl_pivot.base.data_frame import PivotDataFrame
+from dl_pivot.primitives import (
+    DataCellVector,
+    MeasureValues,
+    PivotHeader,
+    SortAxis,
+)
+
+if TYPE_CHECKING:
+    from dl_query_processing.legend.field_legend import Legend
+
+
+PivotKey = tuple[DataCellVector, ...]
+PivotCells = list[DataCellVector | None] | dict[int, DataCellVector | None]
+
+
+@attr.s
+class CompactPivotDataFrame(PivotDataFrame):
+    row_keys: list[PivotKey] = attr.ib(kw_only=True)  # row_id -> key
+    column_keys: list[PivotKey] = attr.ib(kw_only=True)  # column_id -> key
+    cells: PivotCells = attr.ib(kw_only=True)
+    row_order: list[int] = attr.ib(kw_only=True)  # ids of the rows in the order of output
+    column_order: list[int] = attr.ib(kw_only=True)  # ids of the columns in the order of output
+
+    def get_cell(self, row_id: int, column_id: int) -> DataCellVector | None:
+        idx = row_id * len(self.column_keys) + column_id
+        if isinstance(self.cells, dict):
+            return self.cells.get(idx)
+        return self.cells[idx]
+
+    def get_key_list(self, axis: SortAxis) -> list[PivotKey]:
+        return self.column_keys if axis == SortAxis.columns else self.row_keys
+
+    def get_order(self, axis: SortAxis) -> list[int]:
+        return self.column_order if axis == SortAxis.columns else self.row_order
+
+    def iter_axis_ids_and_headers(self, axis: SortAxis) -> Generator[tuple[int, PivotHeader], None, None]:
+        key_list = self.get_key_list(axis)
+        headers_info = self.headers_info
+        for key_id in self.get_order(axis):
+            values = key_list[key_id]
+            yield key_id, PivotHeader(values=values, info=headers_info[values])
+
+    def iter_column_headers(self) -> Generator[PivotHeader, None, None]:
+        for _, header in self.iter_axis_ids_and_headers(SortAxis.columns):
+            yield header
+
+    def iter_row_headers(self) -> Generator[PivotHeader, None, None]:
+        for _, header in self.iter_axis_ids_and_headers(SortAxis.rows):
+            yield header
+
+    def iter_values_along_axis(self, axis: SortAxis, key_id: int) -> Iterable[DataCellVector | None]:
+        """
+        Iterate over the cells of the column (`axis=SortAxis.rows`)
+        or of the row (`axis=SortAxis.columns`) with the given id
+        """
+        if axis == SortAxis.columns:
+            return (self.get_cell(key_id, column_id) for column_id in self.column_order)
+        return (self.get_cell(row_id, key_id) for row_id in self.row_order)
+
+    def iter_rows(self) -> Generator[tuple[PivotHeader, MeasureValues], None, None]:
+        column_count = len(self.column_keys)
+        column_order = self.column_order
+        cells = self.cells
+        for row_id, row_header in self.iter_axis_ids_and_headers(SortAxis.rows):
+            base_idx = row_id * column_count
+            if isinstance(cells, dict):
+                measure_values = tuple(cells.get(base_idx + column_id) for column_id in column_order)
+            else:
+                row_cells = cells[base_idx : base_idx + column_count]
+                measure_values = tuple(row_cells[column_id] for column_id in column_order)
+            yield row_header, measure_values
+
+    def get_column_count(self) -> int:
+        return len(self.column_order)
+
+    def get_row_count(self) -> int:
+        return len(self.row_order)
+
+    def populate_headers_info(self, legend: Legend) -> None:
+        # Same as in the base class, but without building the rows
+        total_liids = {item.legend_item_id for item in legend.list_for_role(FieldRole.template)}
+        if not total_liids:
+            return
+        for header in chain(self.iter_column_headers(), self.iter_row_headers()):
+            if any(value.main_legend_item_id in total_liids for value in header.values):
+                header.info.role_spec.role = PivotHeaderRole.total
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import attr
+
+from dl_pivot.base.facade import TableDataFacade
+from dl_pivot.compact.data_frame import CompactPivotDataFrame
+from dl_pivot.compact.paginator import CompactPivotPaginator
+from dl_pivot.compact.sorter import CompactPivotSorter
+
+
+@attr.s
+class CompactDataFrameFacade(TableDataFacade):
+    _raw_pivot_dframe: CompactPivotDataFrame = attr.ib(kw_only=True)
+
+    def _make_pivot_dframe(self) -> CompactPivotDataFrame:
+        return self._raw_pivot_dframe
+
+    def _make_sorter(self) -> CompactPivotSorter:
+        return CompactPivotSorter(
+            legend=self._legend,
+            pivot_legend=self._pivot_legend,
+            pivot_dframe=self._pivot_dframe,
+        )
+
+    def _make_paginator(self) -> CompactPivotPaginator:
+        return CompactPivotPaginator()
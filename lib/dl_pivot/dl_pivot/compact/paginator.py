@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from copy import deepcopy
+from typing import TYPE_CHECKING
+
+import attr
+
+from dl_pivot.base.paginator import PivotPaginator
+from dl_pivot.compact.data_frame import (
+    CompactPivotDataFrame,
+    PivotKey,
+)
+from dl_pivot.primitives import PivotHeaderInfo
+
+if TYPE_CHECKING:
+    from dl_pivot.base.data_frame import PivotDataFrame
+
+
+@attr.s
+class CompactPivotPaginator(PivotPaginator):
+    _remove_empty_columns: bool = attr.ib(kw_only=True, default=False)  # See `NativePivotPaginator`
+
+    def paginate(
+        self,
+        pivot_dframe: PivotDataFrame,
+        limit_rows: int | None = None,
+        offset_rows: int | None = None,
+    ) -> PivotDataFrame:
+        assert isinstance(pivot_dframe, CompactPivotDataFrame)
+
+        start = offset_rows
+        end = ((offset_rows or 0) + limit_rows) if limit_rows is not None else None
+
+        # The keys and the cells are shared with the original data frame
+        new_row_order = pivot_dframe.row_order[start:end]
+        new_column_order = pivot_dframe.column_order[:]
+        if self._remove_empty_columns:
+            new_column_order = [
+                column_id
+                for column_id in new_column_order
+                if any(pivot_dframe.get_cell(row_id, column_id) is not None for row_id in new_row_order)
+            ]
+
+        # Headers info is preserved as a whole (as in the pandas engine), but the keys are not copied
+        headers_info: defaultdict[PivotKey, PivotHeaderInfo] = defaultdict(
+            PivotHeaderInfo,
+            ((key, deepcopy(info)) for key, info in pivot_dframe.headers_info.items()),
+        )
+
+        return pivot_dframe.clone(
+            row_order=new_row_order,
+            column_order=new_column_order,
+            headers_info=headers_info,
+        )
@@ -0,0 +1,8 @@
+from dl_pivot.base.plugin import PivotEnginePlugin
+from dl_pivot.compact.constants import PIVOT_ENGINE_TYPE_COMPACT
+from dl_pivot.compact.transformer_factory import CompactPivotTransformerFactory
+
+
+class CompactPivotEnginePlugin(PivotEnginePlugin):
+    pivot_engine_type = PIVOT_ENGINE_TYPE_COMPACT
+    transformer_factory_cls = CompactPivotTransformerFactory
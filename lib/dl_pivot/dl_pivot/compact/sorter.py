@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    cast,
+)
+
+import attr
+
+from dl_constants import (
+    OrderDirection,
+    PivotHeaderRole,
+    PivotRole,
+)
+from dl_pivot.base.sorter import PivotSorter
+from dl_pivot.compact.data_frame import (
+    CompactPivotDataFrame,
+    PivotKey,
+)
+from dl_pivot.pivot_legend import (
+    PivotDimensionRoleSpec,
+    PivotMeasureRoleSpec,
+)
+from dl_pivot.primitives import SortAxis
+from dl_pivot.sort_helpers import invert
+import dl_query_processing.exc as exc
+
+if TYPE_CHECKING:
+    from dl_pivot.primitives import PivotMeasureSortingSettings
+    from dl_pivot.sort_strategy import SortValueNormalizer
+
+
+@attr.s
+class CompactPivotSorter(PivotSorter):
+    """
+    Same ordering as in `NativePivotSorter`,
+    but only the id permutations of the data frame are sorted.
+    """
+
+    @property
+    def _compact_dframe(self) -> CompactPivotDataFrame:
+        assert isinstance(self._pivot_dframe, CompactPivotDataFrame)
+        return self._pivot_dframe
+
+    def _resolve_axis_order(self) -> dict[SortAxis, list[OrderDirection]]:
+        return {
+            SortAxis.columns: [
+                cast(PivotDimensionRoleSpec, f.role_spec).direction
+                for f in self._pivot_legend.list_for_role(role=PivotRole.pivot_column)
+            ],
+            SortAxis.rows: [
+                cast(PivotDimensionRoleSpec, f.role_spec).direction
+                for f in self._pivot_legend.list_for_role(role=PivotRole.pivot_row)
+            ],
+        }
+
+    def _sort_order(self, order: list[int], key_list: list[PivotKey], directions: Sequence[OrderDirection]) -> None:
+        all_descending = all(direct is OrderDirection.desc for direct in directions)
+        # See `NativePivotSorter._sort_key_list` for the `all_descending` optimization
+        normalizers: dict[tuple[int, int], SortValueNormalizer] = {}
+
+        def normalize_key(key_id: int) -> Any:
+            """Convert key to a value that can be sorted natively"""
+            normalized = []
+            for dim_idx, dim_val in enumerate(key_list[key_id]):
+                pivot_item_id = dim_val.main_pivot_item_id
+                direction = directions[dim_idx]
+                normalizer = normalizers.get((dim_idx, pivot_item_id))
+                if normalizer is None:
+                    normalizer = self._dimension_sort_strategy.get_normalizer(
+                        pivot_item_id=pivot_item_id,
+                        direction=direction,
+                    )
+                    normalizers[(dim_idx, pivot_item_id)] = normalizer
+                value = normalizer.normalize_vector_value(dim_val)
+                if not all_descending and direction is OrderDirection.desc:
+                    value = invert(value)
+                normalized.append(value)
+            return tuple(normalized)
+
+        order.sort(key=normalize_key, reverse=all_descending)
+
+    def _single_axis_sort(self, axis: SortAxis, directions: Sequence[OrderDirection]) -> None:
+        self._sort_order(
+            order=self._compact_dframe.get_order(axis),
+            key_list=self._compact_dframe.get_key_list(axis),
+            directions=directions,
+        )
+
+    def _sort_by_measure(self, axis: SortAxis, sorting_piid: int, settings: PivotMeasureSortingSettings) -> None:
+        dframe = self._compact_dframe
+        sorting_key_id: int | None = None
+        other_axis = self._complementary_axis(axis)
+
+        for key_id, header in dframe.iter_axis_ids_and_headers(axis):
+            if header.compare_sorting_settings(settings):
+                if sorting_key_id is None:
+                    sorting_key_id = key_id
+                    header.info.sorting_direction = settings.direction
+                else:  # should never actually occur, as header_values + role_spec uniquely identify sorting_idx
+                    raise exc.PivotSortingRowOrColumnIsAmbiguousError()
+        if sorting_key_id is None:
+            raise exc.PivotSortingRowOrColumnNotFoundError()
+
+        normalizer = self._measure_sort_strategy.get_normalizer(
+            pivot_item_id=sorting_piid, direction=settings.direction
+        )
+
+        # Order the ids of the other axis by the measure values in the selected row/column.
+        # The stable ascending sort is reversed as a whole for the descending direction (as in `NativePivotSorter`).
+        order = dframe.get_order(other_axis)
+        normalized_values = list(
+            map(
+                normalizer.normalize_vector_value,
+                dframe.iter_values_along_axis(axis=other_axis, key_id=sorting_key_id),
+            )
+        )
+        positions = sorted(range(len(order)), key=normalized_values.__getitem__)
+        if settings.direction == OrderDirection.desc:
+            positions.reverse()
+        order[:] = [order[pos] for pos in positions]
+
+        if self._axis_has_total(other_axis):  # hack for totals
+            # Manually put the total at the end
+            total_key_id = next(
+                key_id
+                for key_id, dim_header in dframe.iter_axis_ids_and_headers(other_axis)
+                if dim_header.info.role_spec.role == PivotHeaderRole.total
+            )
+            order.remove(total_key_id)
+            order.append(total_key_id)
+
+    def sort(self) -> None:
+        # First sort by dimension
+        directions_by_axis = self._resolve_axis_order()
+        for axis in (SortAxis.rows, SortAxis.columns):
+            if not directions_by_axis[axis]:
+                # Nothing to sort here
+                continue
+            self._single_axis_sort(axis=axis, directions=directions_by_axis[axis])
+
+        # Now sort by measure (possibly overriding sorting by dimensions)
+        for pivot_item in self._pivot_legend.list_for_role(role=PivotRole.pivot_measure):
+            sorting_settings = cast(PivotMeasureRoleSpec, pivot_item.role_spec).sorting
+            if sorting_settings is None:
+                continue
+            for axis, settings in zip(
+                [SortAxis.columns, SortAxis.rows],
+                [sorting_settings.column, sorting_settings.row],
+                strict=True,
+            ):
+                if settings is not None:
+                    self._sort_by_measure(axis, pivot_item.pivot_item_id, settings)
@@ -0,0 +1,132 @@
+from collections.abc import (
+    Iterable,
+    Sequence,
+)
+from typing import TYPE_CHECKING
+
+import attr
+
+from dl_constants import PivotRole
+from dl_pivot.base.transformer import PivotTransformer
+from dl_pivot.compact.data_frame import (
+    CompactPivotDataFrame,
+    PivotCells,
+    PivotKey,
+)
+from dl_pivot.compact.facade import CompactDataFrameFacade
+from dl_pivot.primitives import (
+    DataCell,
+    DataCellVector,
+)
+from dl_pivot.stream_modifiers import (
+    DataCellConverter,
+    MeasureDataTransposer,
+)
+from dl_pivot.table import PivotTable
+import dl_query_processing.exc as qp_exc
+from dl_query_processing.merging.primitives import MergedQueryDataRow
+
+if TYPE_CHECKING:
+    from dl_pivot.stream_modifiers import TransposedDataRow
+
+# The cells are stored in a dict instead of a flat array
+# if less than `1 / SPARSE_CELLS_RATIO` of the table is filled.
+SPARSE_CELLS_RATIO = 4
+
+
+@attr.s
+class CompactPivotTransformer(PivotTransformer):
+    """
+    Native Python pivot table with the interned dimension keys.
+    The data stream is consumed in a single pass.
+    """
+
+    def _get_pivot_item_ids(self, role: PivotRole) -> list[int]:
+        return [item.pivot_item_id for item in self._pivot_legend.list_for_role(role)]
+
+    def pivot(self, rows: Iterable[MergedQueryDataRow]) -> PivotTable:
+        # Prepare data stream
+        raw_dcell_stream: Iterable[Sequence[DataCell]] = DataCellConverter(
+            rows=rows,
+            cell_packer=self._cell_packer,
+            legend=self._legend,
+            pivot_legend=self._pivot_legend,
+        )
+        # Transpose measures (turn multiple measure fields into a single pseudo-field).
+        transp_stream: Iterable[TransposedDataRow] = MeasureDataTransposer(
+            dcell_stream=raw_dcell_stream,
+            pivot_legend=self._pivot_legend,
+            cell_packer=self._cell_packer,
+        )
+
+        column_piids = self._get_pivot_item_ids(PivotRole.pivot_column)
+        row_piids = self._get_pivot_item_ids(PivotRole.pivot_row)
+        dim_piid_set = set(column_piids + row_piids)
+
+        row_ids: dict[PivotKey, int] = {}
+        column_ids: dict[PivotKey, int] = {}
+        row_id_list: list[int] = []
+        column_id_list: list[int] = []
+        value_list: list[DataCellVector | None] = []
+
+        # The positions of the dimensions are the same in all rows of the stream,
+        # so they are resolved by the first row and only verified for the others.
+        dim_piids: tuple[int, ...] | None = None
+        row_positions: tuple[int, ...] = ()
+        column_positions: tuple[int, ...] = ()
+        for dim_vectors, value_vector in transp_stream:
+            piids = tuple(dim_vector.main_pivot_item_id for dim_vector in dim_vectors)
+            if piids != dim_piids:
+                if len(piids) != len(dim_piid_set) or set(piids) != dim_piid_set:
+                    raise qp_exc.PivotUnevenDataColumnsError(
+                        f"Expected pivot items{sorted(dim_piid_set)}; got: {sorted(piids)}"
+                    )
+                dim_piids = piids
+                row_positions = tuple(piids.index(piid) for piid in row_piids)
+                column_positions = tuple(piids.index(piid) for piid in column_piids)
+
+            row_key = tuple(dim_vectors[pos] for pos in row_positions)
+            row_id = row_ids.setdefault(row_key, len(row_ids))
+            column_key = tuple(dim_vectors[pos] for pos in column_positions)
+            column_id = column_ids.setdefault(column_key, len(column_ids))
+            row_id_list.append(row_id)
+            column_id_list.append(column_id)
+            value_list.append(value_vector)
+
+        # Now that the size is known, the cells can be put in place
+        column_count = len(column_ids)
+        cell_count = len(row_ids) * column_count
+        cell_indices = [
+            row_id * column_count + column_id for row_id, column_id in zip(row_id_list, column_id_list, strict=True)
+        ]
+        cells: PivotCells
+        if cell_count > len(value_list) * SPARSE_CELLS_RATIO:
+            cells = dict(zip(cell_indices, value_list, strict=True))
+            has_duplicates = len(cells) != len(value_list)
+        else:
+            cells = [None] * cell_count
+            filled = bytearray(cell_count)
+            for cell_idx, value in zip(cell_indices, value_list, strict=True):
+                cells[cell_idx] = value
+                filled[cell_idx] = 1
+            has_duplicates = filled.count(1) != len(value_list)
+        if has_duplicates:
+            raise qp_exc.PivotDuplicateDimensionValueError()
+
+        pivot_dframe = CompactPivotDataFrame(
+            row_keys=list(row_ids),
+            column_keys=list(column_ids),
+            cells=cells,
+            row_order=list(range(len(row_ids))),
+            column_order=list(range(column_count)),
+        )
+        facade = CompactDataFrameFacade(
+            raw_pivot_dframe=pivot_dframe,
+            legend=self._legend,
+            pivot_legend=self._pivot_legend,
+        )
+        return PivotTable(
+            facade=facade,
+            pivot_legend=self._pivot_legend,
+            cell_packer=self._cell_packer,
+        )
@@ -0,0 +1,16 @@
+import attr
+
+from dl_pivot.base.transformer_factory import PivotTransformerFactory
+from dl_pivot.compact.transformer import CompactPivotTransformer
+from dl_pivot.pivot_legend import PivotLegend
+from dl_query_processing.legend.field_legend import Legend
+
+
+@attr.s
+class CompactPivotTransformerFactory(PivotTransformerFactory):
+    def get_transformer(self, legend: Legend, pivot_legend: PivotLegend) -> CompactPivotTransformer:
+        return CompactPivotTransformer(
+            legend=legend,
+            pivot_legend=pivot_legend,
+            cell_packer=self._cell_packer,
+        )
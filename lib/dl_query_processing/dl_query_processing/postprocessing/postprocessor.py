@@ -2,8 +2,7 @@ from __future__ import annotations
 
 import abc
 from collections.abc import (
-    Generator,
-    Iterable,
+    Mapping,
     Sequence,
 )
 import logging
@@ -21,8 +20,13 @@ from dl_query_processing.enums import QueryType
 from dl_query_processing.execution.primitives import ExecutedQuery
 from dl_query_processing.legend.block_legend import BlockSpec
 from dl_query_processing.legend.field_legend import TemplateRoleSpec
-from dl_query_processing.postprocessing.postprocessors.all import postprocess_data
+from dl_query_processing.postprocessing.postprocessors.all import (
+    postprocess_column,
+    postprocess_data,
+    transpose_rows,
+)
 from dl_query_processing.postprocessing.primitives import (
+    PostprocessedData,
     PostprocessedQuery,
     PostprocessedQueryMetaInfo,
 )
@@ -46,6 +50,16 @@ class ValueRestorerBase(abc.ABC):
     def restore_value(self, raw_row: Sequence[Any]) -> Any:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_source_indexes(self) -> set[int]:
+        """Indexes of the raw row values that the value is restored from"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def restore_column(self, columns: Mapping[int, Sequence[Any]], row_count: int) -> Sequence[Any]:
+        """Restore the values of all rows from the (source) columns of the data"""
+        raise NotImplementedError
+
 
 @attr.s(frozen=True)
 class IndexValueRestorer(ValueRestorerBase):
@@ -56,6 +70,12 @@ class IndexValueRestorer(ValueRestorerBase):
     def restore_value(self, raw_row: Sequence[Any]) -> Any:
         return raw_row[self.row_idx]
 
+    def get_source_indexes(self) -> set[int]:
+        return {self.row_idx}
+
+    def restore_column(self, columns: Mapping[int, Sequence[Any]], row_count: int) -> Sequence[Any]:
+        return columns[self.row_idx]
+
 
 @attr.s(frozen=True)
 class TemplateValueRestorer(ValueRestorerBase):
@@ -77,6 +97,26 @@ class TemplateValueRestorer(ValueRestorerBase):
 
         return self.template_re.sub(sub_value, self.template)
 
+    def get_source_indexes(self) -> set[int]:
+        if self.template is None:
+            return set()
+        return {self.idx_by_field_id[field_id.strip()] for field_id in self.template_re.findall(self.template)}
+
+    def restore_column(self, columns: Mapping[int, Sequence[Any]], row_count: int) -> Sequence[Any]:
+        if self.template is None:
+            return (None,) * row_count
+
+        columns_by_field_id = {
+            field_id: columns[idx] for field_id, idx in self.idx_by_field_id.items() if idx in columns
+        }
+        return [
+            self.template_re.sub(
+                lambda field_match, row_idx=row_idx: columns_by_field_id[field_match.group("field").strip()][row_idx],
+                self.template,
+            )
+            for row_idx in range(row_count)
+        ]
+
 
 @attr.s
 class DataPostprocessor:
@@ -112,27 +152,39 @@ class DataPostprocessor:
         block_spec: BlockSpec,
     ) -> PostprocessedQuery:
         query_meta = executed_query.meta
-        data: Iterable[Sequence[Any]] = executed_query.rows
+        data: Sequence[Sequence[Any]] = executed_query.rows
 
         ordered_value_restorers = self._make_value_restorers(executed_query=executed_query, block_spec=block_spec)
 
-        def restore_order(data: Iterable[Sequence[Any]]) -> Generator[tuple[Any, ...], None, None]:
-            for row in data:
-                yield tuple(restorer.restore_value(row) for restorer in ordered_value_restorers)
-
         with GenericProfiler(f"{self.profiler_prefix}-response-prepare"):
             result_fields_types = query_meta.detailed_types
             assert result_fields_types is not None
 
-            postprocessed_data = postprocess_data(data, result_fields_types)
-
-            # Filter out phantom fields, restore deduplicated columns, restore column order
-            if executed_query.meta.query_type != QueryType.value_range:
+            # The data is processed column by column: each of the columns is converted once,
+            # and only the ones that are in the result.
+            row_count = len(data)
+            if row_count == 0:
+                postprocessed_data: PostprocessedData = ()
+            elif executed_query.meta.query_type == QueryType.value_range:
                 # FIXME: Dirty hack -> remove this if
                 # If this is a value range query, then
                 # a) restoration isn't necessary;
                 # b) it doesn't work because two columns have the same field_id, but different wrappers (min and max)
-                postprocessed_data = tuple(restore_order(postprocessed_data))
+                postprocessed_data = postprocess_data(data, result_fields_types)
+            else:
+                # Filter out phantom fields, restore deduplicated columns, restore column order
+                source_indexes = set().union(*(restorer.get_source_indexes() for restorer in ordered_value_restorers))
+                columns = transpose_rows(data)
+                postprocessed_columns = {
+                    idx: postprocess_column(columns[idx], result_fields_types[idx]) for idx in source_indexes
+                }
+                result_columns = [
+                    restorer.restore_column(postprocessed_columns, row_count) for restorer in ordered_value_restorers
+                ]
+                if result_columns:
+                    postprocessed_data = tuple(zip(*result_columns, strict=True))
+                else:
+                    postprocessed_data = ((),) * row_count
 
         LOGGER.info(
             "Returning dataset data: %s rows with %s columns",
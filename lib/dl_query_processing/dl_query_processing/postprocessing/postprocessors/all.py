@@ -55,9 +55,10 @@ TYPE_PROCESSORS: dict[UserDataType, Callable[[Any], Any]] = {
 }
 
 
-def get_type_processor(field_type_info: DetailedType | None) -> Callable[[Any], Any]:
+def get_column_processor(field_type_info: DetailedType | None) -> Callable[[Any], Any] | None:
+    """The processor of the values of the type, `None` if they are left as they are"""
     if field_type_info is None:
-        return lambda val: val
+        return None
 
     # Basic
     result = TYPE_PROCESSORS.get(field_type_info.data_type)
@@ -75,11 +76,38 @@ def get_type_processor(field_type_info: DetailedType | None) -> Callable[[Any],
     return stringify_or_null
 
 
+def get_type_processor(field_type_info: DetailedType | None) -> Callable[[Any], Any]:
+    result = get_column_processor(field_type_info)
+    if result is None:
+        return lambda val: val
+    return result
+
+
+def postprocess_column(column: Sequence[Any], field_type_info: DetailedType | None) -> Sequence[Any]:
+    processor = get_column_processor(field_type_info)
+    if processor is None:
+        return column
+    if processor is stringify_or_null and None not in column:
+        return tuple(map(str, column))
+    return tuple(map(processor, column))
+
+
+def transpose_rows(data: Iterable[Sequence[Any]]) -> list[tuple[Any, ...]]:
+    return list(zip(*data, strict=False))
+
+
 # TODO FIX: Turn into generator when response streaming become real
 def postprocess_data(
     data: Iterable[Sequence[Any]],
     field_types: Iterable[DetailedType | None],
 ) -> PostprocessedData:
-    columns_processors = [get_type_processor(ft) for ft in field_types]
-
-    return tuple(tuple(processor(col) for processor, col in zip(columns_processors, row, strict=False)) for row in data)
+    rows = data if isinstance(data, Sequence) else tuple(data)
+    if not rows:
+        return ()
+    columns = [
+        postprocess_column(column, field_type)
+        for column, field_type in zip(transpose_rows(rows), field_types, strict=False)
+    ]
+    if not columns:
+        return ((),) * len(rows)
+    return tuple(zip(*columns, strict=True))
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import bisect
 import datetime
 
 import pytz
 
+NAIVE_DATETIME_MIN = datetime.datetime.min  # noqa: DTZ901
+NAIVE_DATETIME_MAX = datetime.datetime.max  # noqa: DTZ901
+
 
 def postprocess_datetime(value: datetime.datetime) -> str | None:
     if value is None:
@@ -11,7 +15,9 @@ def postprocess_datetime(value: datetime.datetime) -> str | None:
 
     if isinstance(value, str):
         value = datetime.datetime.fromisoformat(value)
-    if value.tzinfo is not None:
+    if value.tzinfo is datetime.UTC or value.tzinfo is pytz.utc:
+        value = value.replace(tzinfo=None)
+    elif value.tzinfo is not None:
         value = value.astimezone(datetime.UTC).replace(tzinfo=None)
 
     return value.isoformat()
@@ -27,15 +33,45 @@ def postprocess_genericdatetime(value: datetime.datetime) -> str | None:
     return value.replace(tzinfo=None).isoformat()
 
 
+def _get_utc_offset_interval(
+    tzobj: datetime.tzinfo,
+    utc_value: datetime.datetime,
+) -> tuple[datetime.datetime, datetime.datetime, datetime.timezone]:
+    """
+    The interval of the (naive) UTC time around `utc_value` in which the UTC offset of `tzobj` is the same,
+    and this offset. Follows `pytz.tzinfo.DstTzInfo.fromutc`.
+    """
+    transition_times = getattr(tzobj, "_utc_transition_times", None)
+    if transition_times is None:
+        # Static offset
+        return NAIVE_DATETIME_MIN, NAIVE_DATETIME_MAX, datetime.timezone(tzobj.utcoffset(utc_value))
+
+    idx = bisect.bisect_right(transition_times, utc_value)
+    start = transition_times[idx - 1] if idx > 0 else NAIVE_DATETIME_MIN
+    end = transition_times[idx] if idx < len(transition_times) else NAIVE_DATETIME_MAX
+    utcoffset = tzobj._transition_info[idx - 1][0]  # type: ignore  # pytz internals
+    return start, end, datetime.timezone(utcoffset)
+
+
 def make_postprocess_datetimetz(tzname: str):  # type: ignore  # TODO: fix
     tzobj = pytz.timezone(tzname)
+    # The UTC offset interval of the last value: the values of a column are usually close to each other
+    last_interval = [NAIVE_DATETIME_MAX, NAIVE_DATETIME_MAX, datetime.UTC]
 
     def _postprocess_datetimetz(value: datetime.datetime, tzobj=tzobj) -> str | None:  # type: ignore  # TODO: fix
         if value is None:
             return value
 
         if value.tzinfo is None:
-            value = value.replace(tzinfo=datetime.UTC)
-        return value.astimezone(tzobj).isoformat()
+            utc_value = value
+        elif value.tzinfo is datetime.UTC or value.tzinfo is pytz.utc:
+            utc_value = value.replace(tzinfo=None)
+        else:
+            return value.astimezone(tzobj).isoformat()
+
+        start, end, tz = last_interval
+        if not start <= utc_value < end:
+            start, end, tz = last_interval[:] = _get_utc_offset_interval(tzobj, utc_value)
+        return (utc_value + tz.utcoffset(None)).replace(tzinfo=tz).isoformat()
 
     return _postprocess_datetimetz
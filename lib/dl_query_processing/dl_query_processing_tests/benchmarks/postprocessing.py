@@ -0,0 +1,159 @@
+"""
+Throughput of the dataset data postprocessing (`DataPostprocessor.get_postprocessed_data`)
+for a long (many rows) and a wide (many columns) result, with the type conversion and the column order
+restoration done row by row (as it used to be done) and column by column; each case in a separate process.
+
+    python -m dl_query_processing_tests.benchmarks.postprocessing [--cells N] [--wide-columns N]
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import (
+    Callable,
+    Sequence,
+)
+import concurrent.futures
+import datetime
+import multiprocessing
+import resource
+import time
+from typing import Any
+
+from dl_constants import (
+    FieldType,
+    UserDataType,
+)
+from dl_formula.core.datatype import (
+    DataType,
+    DataTypeParams,
+)
+from dl_query_processing.execution.primitives import (
+    ExecutedQuery,
+    ExecutedQueryMetaInfo,
+)
+from dl_query_processing.legend.block_legend import BlockSpec
+from dl_query_processing.legend.field_legend import (
+    FieldObjSpec,
+    Legend,
+    LegendItem,
+)
+from dl_query_processing.postprocessing.postprocessor import DataPostprocessor
+from dl_query_processing.postprocessing.postprocessors.all import get_type_processor
+from dl_query_processing.translation.primitives import DetailedType
+
+START_DT = datetime.datetime(2024, 1, 1)
+COLUMN_KINDS: list[tuple[DetailedType, Callable[[int], Any]]] = [
+    (DetailedType(field_id="", data_type=UserDataType.integer), lambda idx: idx),
+    (DetailedType(field_id="", data_type=UserDataType.string), lambda idx: f"name_{idx % 1000}"),
+    (DetailedType(field_id="", data_type=UserDataType.float), lambda idx: None if idx % 10 == 0 else idx * 0.5),
+    (
+        DetailedType(field_id="", data_type=UserDataType.datetime),
+        lambda idx: START_DT + datetime.timedelta(minutes=idx),
+    ),
+    (
+        DetailedType(
+            field_id="",
+            data_type=UserDataType.datetimetz,
+            formula_data_type=DataType.DATETIMETZ,
+            formula_data_type_params=DataTypeParams(timezone="Europe/Moscow"),
+        ),
+        lambda idx: START_DT + datetime.timedelta(minutes=idx),
+    ),
+]
+# Every this column is a phantom one (not in the result)
+PHANTOM_EVERY = 6
+
+
+def make_query(rows: int, columns: int) -> tuple[ExecutedQuery, BlockSpec]:
+    detailed_types = []
+    makers = []
+    for col_idx in range(columns):
+        detailed_type, maker = COLUMN_KINDS[col_idx % len(COLUMN_KINDS)]
+        detailed_types.append(detailed_type._replace(field_id=f"field_{col_idx}"))
+        makers.append(maker)
+    data = [[maker(row_idx) for maker in makers] for row_idx in range(rows)]
+
+    # Reversed order, without the phantom columns
+    legend_items = [
+        LegendItem(
+            legend_item_id=col_idx,
+            obj=FieldObjSpec(id=f"field_{col_idx}", title=f"field_{col_idx}"),
+            data_type=detailed_types[col_idx].data_type,
+            field_type=FieldType.DIMENSION,
+        )
+        for col_idx in reversed(range(columns))
+        if col_idx % PHANTOM_EVERY != PHANTOM_EVERY - 1
+    ]
+    executed_query = ExecutedQuery(
+        rows=data,
+        meta=ExecutedQueryMetaInfo(
+            field_order=[(col_idx, f"field_{col_idx}") for col_idx in range(columns)],
+            detailed_types=detailed_types,
+        ),
+    )
+    block_spec = BlockSpec(
+        block_id=0,
+        parent_block_id=None,
+        legend_item_ids=[item.legend_item_id for item in legend_items],
+        legend=Legend(items=legend_items),
+    )
+    return executed_query, block_spec
+
+
+def run_rowwise(executed_query: ExecutedQuery, block_spec: BlockSpec) -> Sequence[Sequence[Any]]:
+    postprocessor = DataPostprocessor(profiler_prefix="benchmark")
+    restorers = postprocessor._make_value_restorers(executed_query=executed_query, block_spec=block_spec)
+    assert executed_query.meta.detailed_types is not None
+    processors = [get_type_processor(field_type) for field_type in executed_query.meta.detailed_types]
+    postprocessed_data = tuple(
+        tuple(processor(col) for processor, col in zip(processors, row, strict=False)) for row in executed_query.rows
+    )
+    return tuple(tuple(restorer.restore_value(row) for restorer in restorers) for row in postprocessed_data)
+
+
+def run_columnar(executed_query: ExecutedQuery, block_spec: BlockSpec) -> Sequence[Sequence[Any]]:
+    postprocessor = DataPostprocessor(profiler_prefix="benchmark")
+    return postprocessor.get_postprocessed_data(executed_query=executed_query, block_spec=block_spec).postprocessed_data
+
+
+CASES: dict[str, Callable[[ExecutedQuery, BlockSpec], Sequence[Sequence[Any]]]] = {
+    "rowwise": run_rowwise,
+    "columnar": run_columnar,
+}
+
+
+def run_case(case_name: str, rows: int, columns: int) -> tuple[float, int, int]:
+    executed_query, block_spec = make_query(rows=rows, columns=columns)
+    expected = run_rowwise(*make_query(rows=100, columns=columns))
+    assert CASES[case_name](*make_query(rows=100, columns=columns)) == expected
+
+    started = time.perf_counter()
+    result = CASES[case_name](executed_query, block_spec)
+    elapsed = time.perf_counter() - started
+    assert len(result) == rows
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, rows * columns, max_rss_kb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cells", type=int, default=2_000_000)
+    parser.add_argument("--wide-columns", type=int, default=200)
+    args = parser.parse_args()
+
+    mp_context = multiprocessing.get_context("spawn")
+    for columns in (len(COLUMN_KINDS) + 1, args.wide_columns):
+        rows = args.cells // columns
+        print(f"{rows} rows, {columns} columns")
+        for case_name in CASES:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as executor:
+                elapsed, cells, max_rss_kb = executor.submit(run_case, case_name, rows, columns).result()
+            print(
+                f"{case_name:>10}: {cells / elapsed:>12,.0f} cells/sec, "
+                f"{elapsed:.3f} sec, peak RSS {max_rss_kb / 1024:.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
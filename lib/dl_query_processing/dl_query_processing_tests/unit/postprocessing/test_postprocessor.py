@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import datetime
+import random
+
+import pytest
+import pytz
+
+from dl_constants import (
+    FieldType,
+    UserDataType,
+)
+from dl_formula.core.datatype import (
+    DataType,
+    DataTypeParams,
+)
+from dl_query_processing.enums import QueryType
+from dl_query_processing.execution.primitives import (
+    ExecutedQuery,
+    ExecutedQueryMetaInfo,
+)
+from dl_query_processing.legend.block_legend import BlockSpec
+from dl_query_processing.legend.field_legend import (
+    FieldObjSpec,
+    Legend,
+    LegendItem,
+    PlaceholderObjSpec,
+    TemplateRoleSpec,
+)
+from dl_query_processing.postprocessing.postprocessor import DataPostprocessor
+from dl_query_processing.postprocessing.postprocessors.all import postprocess_data
+from dl_query_processing.postprocessing.postprocessors.datetime import make_postprocess_datetimetz
+from dl_query_processing.translation.primitives import DetailedType
+
+DT = datetime.datetime(2024, 3, 31, 0, 30)
+DETAILED_TYPES = [
+    DetailedType(field_id="num", data_type=UserDataType.integer),
+    DetailedType(field_id="phantom", data_type=UserDataType.string),
+    DetailedType(
+        field_id="dttz",
+        data_type=UserDataType.datetimetz,
+        formula_data_type=DataType.DATETIMETZ,
+        formula_data_type_params=DataTypeParams(timezone="Europe/Amsterdam"),
+    ),
+    DetailedType(field_id="arr", data_type=UserDataType.array_int),
+    None,
+]
+ROWS = [
+    [1, "a", DT, [1, 2], "raw"],
+    [None, "b", DT + datetime.timedelta(hours=1), None, 2],
+    [3, "c", DT.replace(hour=2, tzinfo=datetime.UTC), [], None],
+]
+
+
+def _make_block_spec(legend_items: list[tuple[str, LegendItem]]) -> BlockSpec:
+    legend = Legend(items=[item for _, item in legend_items])
+    return BlockSpec(
+        block_id=0,
+        parent_block_id=None,
+        legend_item_ids=[item.legend_item_id for _, item in legend_items],
+        legend=legend,
+    )
+
+
+def _field_item(legend_item_id: int, field_id: str) -> tuple[str, LegendItem]:
+    return field_id, LegendItem(
+        legend_item_id=legend_item_id,
+        obj=FieldObjSpec(id=field_id, title=field_id),
+        data_type=UserDataType.string,
+        field_type=FieldType.DIMENSION,
+    )
+
+
+def _postprocess(block_spec: BlockSpec, query_type: QueryType = QueryType.result) -> tuple:
+    executed_query = ExecutedQuery(
+        rows=ROWS,
+        meta=ExecutedQueryMetaInfo(
+            query_type=query_type,
+            field_order=[(idx, dt.field_id if dt else "raw") for idx, dt in enumerate(DETAILED_TYPES)],
+            detailed_types=DETAILED_TYPES,
+        ),
+    )
+    postprocessor = DataPostprocessor(profiler_prefix="test")
+    return postprocessor.get_postprocessed_data(executed_query=executed_query, block_spec=block_spec).postprocessed_data
+
+
+def test_postprocess_data() -> None:
+    assert postprocess_data(ROWS, DETAILED_TYPES) == (
+        ("1", "a", "2024-03-31T01:30:00+01:00", "[1, 2]", "raw"),
+        (None, "b", "2024-03-31T03:30:00+02:00", None, 2),
+        ("3", "c", "2024-03-31T04:30:00+02:00", "[]", None),
+    )
+    assert postprocess_data([], DETAILED_TYPES) == ()
+    assert postprocess_data(iter([[], []]), []) == ((), ())
+
+
+def test_postprocessed_data_restores_order() -> None:
+    block_spec = _make_block_spec(
+        [
+            _field_item(0, "arr"),
+            _field_item(1, "num"),
+            _field_item(2, "dttz"),
+            _field_item(3, "num"),
+            (
+                "template",
+                LegendItem(
+                    legend_item_id=4,
+                    obj=PlaceholderObjSpec(),
+                    role_spec=TemplateRoleSpec(template="{{ num }}-{{phantom}}"),
+                    data_type=UserDataType.string,
+                    field_type=FieldType.DIMENSION,
+                ),
+            ),
+            _field_item(5, "raw"),
+        ]
+    )
+    assert _postprocess(block_spec) == (
+        ("[1, 2]", "1", "2024-03-31T01:30:00+01:00", "1", "1-a", "raw"),
+        (None, None, "2024-03-31T03:30:00+02:00", None, "-b", 2),
+        ("[]", "3", "2024-03-31T04:30:00+02:00", "3", "3-c", None),
+    )
+
+
+def test_postprocessed_data_value_range() -> None:
+    block_spec = _make_block_spec([_field_item(0, "num")])
+    assert _postprocess(block_spec, query_type=QueryType.value_range) == postprocess_data(ROWS, DETAILED_TYPES)
+
+
+def test_postprocessed_data_no_columns() -> None:
+    assert _postprocess(_make_block_spec([])) == ((), (), ())
+
+
+@pytest.mark.parametrize("tzname", ["Europe/Moscow", "America/New_York", "Australia/Lord_Howe", "Asia/Kolkata", "UTC"])
+def test_postprocess_datetimetz(tzname: str) -> None:
+    tzobj = pytz.timezone(tzname)
+    postprocess_datetimetz = make_postprocess_datetimetz(tzname)
+    rnd = random.Random(tzname)
+    values = sorted(
+        datetime.datetime(1900, 1, 1) + datetime.timedelta(seconds=rnd.randrange(200 * 365 * 86400))
+        for _ in range(1000)
+    )
+    # Shuffled values switch between the offset intervals
+    values += rnd.sample(values, len(values))
+    values += [value.replace(tzinfo=datetime.UTC) for value in values[:100]]
+    for value in values:
+        expected = value.replace(tzinfo=datetime.UTC).astimezone(tzobj).isoformat()
+        assert postprocess_datetimetz(value) == expected
+    assert postprocess_datetimetz(None) is None
+    value = datetime.datetime(2024, 1, 1, tzinfo=pytz.timezone("Asia/Tokyo"))
+    assert postprocess_datetimetz(value) == value.astimezone(tzobj).isoformat()
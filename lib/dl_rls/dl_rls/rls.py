@@ -6,6 +6,7 @@ Module implements RLS management functionality
 
 from __future__ import annotations
 
+import itertools
 from typing import (
     NamedTuple,
     cast,
@@ -26,10 +27,88 @@ class FieldRestrictions(NamedTuple):
     allowed_values: list[str]
 
 
+@attr.s(slots=True)
+class _FieldIndex:
+    """Positions of the field's entries in the RLS items, by the subjects they match"""
+
+    # `*` subjects and `userid: userid` entries match any user
+    any_subject: list[int] = attr.ib(factory=list)
+    by_user_id: dict[str, list[int]] = attr.ib(factory=dict)
+    by_group_id: dict[str, list[int]] = attr.ib(factory=dict)
+
+    def get_positions(self, user_id: str, groups: set[str]) -> list[int]:
+        buckets = [self.any_subject, self.by_user_id.get(user_id, [])]
+        if len(groups) < len(self.by_group_id):
+            buckets.extend(self.by_group_id[group] for group in groups if group in self.by_group_id)
+        else:
+            buckets.extend(positions for group, positions in self.by_group_id.items() if group in groups)
+        buckets = [positions for positions in buckets if positions]
+
+        if len(buckets) == 1:
+            return buckets[0]
+        # keep the original order of the entries
+        return sorted(itertools.chain.from_iterable(buckets))
+
+
+_EntryFingerprint = tuple[str, str | None, RLSPatternType, RLSSubjectType, str]
+
+
+def _make_fingerprint(items: list[RLSEntry]) -> list[_EntryFingerprint]:
+    """The contents of the entries the index depends on: the entries are mutable and might be changed in place"""
+    return [
+        (item.field_guid, item.allowed_value, item.pattern_type, item.subject.subject_type, item.subject.subject_id)
+        for item in items
+    ]
+
+
+@attr.s(slots=True)
+class _RLSIndex:
+    items: list[RLSEntry] = attr.ib()
+    # Of the items the index was built from, to detect the changes
+    fingerprint: list[_EntryFingerprint] = attr.ib()
+    fields: dict[str, _FieldIndex] = attr.ib()
+    user_restrictions: dict[tuple[str, frozenset[str]], dict[str, list[str]]] = attr.ib(factory=dict)
+
+    @classmethod
+    def build(cls, items: list[RLSEntry]) -> _RLSIndex:
+        fields: dict[str, _FieldIndex] = {}
+        subject_type_all, subject_type_user, subject_type_group = (
+            RLSSubjectType.all,
+            RLSSubjectType.user,
+            RLSSubjectType.group,
+        )
+        pattern_type_userid = RLSPatternType.userid
+        for position, item in enumerate(items):
+            field_index = fields.get(item.field_guid)
+            if field_index is None:
+                field_index = fields[item.field_guid] = _FieldIndex()
+            subject = item.subject
+            subject_type = subject.subject_type
+            if subject_type is subject_type_all or item.pattern_type is pattern_type_userid:
+                field_index.any_subject.append(position)
+            elif subject_type is subject_type_user:
+                field_index.by_user_id.setdefault(subject.subject_id, []).append(position)
+            elif subject_type is subject_type_group:
+                field_index.by_group_id.setdefault(subject.subject_id, []).append(position)
+        return cls(items=list(items), fingerprint=_make_fingerprint(items), fields=fields)
+
+    def is_actual(self, items: list[RLSEntry]) -> bool:
+        return _make_fingerprint(items) == self.fingerprint
+
+    def get_entries(self, field_guid: str, user_id: str, groups: set[str]) -> list[RLSEntry]:
+        field_index = self.fields.get(field_guid)
+        if field_index is None:
+            return []
+        items = self.items
+        return [items[position] for position in field_index.get_positions(user_id=user_id, groups=groups)]
+
+
 @attr.s
 class RLS:
     items: list[RLSEntry] = attr.ib(factory=list)
     allowed_groups: set[str] = attr.ib(factory=set)
+    # Built on demand, rebuilt when `items` are changed
+    _index: _RLSIndex | None = attr.ib(default=None, init=False, repr=False, eq=False)
 
     @property
     def has_restrictions(self) -> bool:
@@ -39,30 +118,22 @@ class RLS:
     def fields_with_rls(self) -> list[str]:
         return list({item.field_guid for item in self.items})
 
+    def _get_index(self) -> _RLSIndex:
+        if self._index is None or not self._index.is_actual(self.items):
+            self._index = _RLSIndex.build(self.items)
+        return self._index
+
     def get_entries(self, field_guid: str, user_id: str) -> list[RLSEntry]:
-        return [
-            item
-            for item in self.items
-            if item.field_guid == field_guid
-            and (
-                # same user
-                (item.subject.subject_type == RLSSubjectType.user and item.subject.subject_id == user_id)
-                # user is in the group
-                or (
-                    item.subject.subject_type == RLSSubjectType.group and item.subject.subject_id in self.allowed_groups
-                )
-                # 'all subjects' matches any subject.
-                or item.subject.subject_type == RLSSubjectType.all
-                # `userid: userid`
-                or item.pattern_type == RLSPatternType.userid
-            )
-        ]
+        return self._get_index().get_entries(field_guid=field_guid, user_id=user_id, groups=self.allowed_groups)
 
     def get_field_restriction_for_user(self, field_guid: str, user_id: str) -> FieldRestrictions:
         """
         For user and field, return `allow_all_values, allowed_values`.
         """
-        rls_entries = self.get_entries(field_guid=field_guid, user_id=user_id)
+        return self._get_field_restriction_for_user(self._get_index(), field_guid=field_guid, user_id=user_id)
+
+    def _get_field_restriction_for_user(self, index: _RLSIndex, field_guid: str, user_id: str) -> FieldRestrictions:
+        rls_entries = index.get_entries(field_guid=field_guid, user_id=user_id, groups=self.allowed_groups)
 
         # There's a `*: {current_user}` entry, no need to filter.
         if any(rls_entry.pattern_type == RLSPatternType.all for rls_entry in rls_entries):
@@ -98,10 +169,18 @@ class RLS:
         return FieldRestrictions(allow_all_values=False, allow_userid=allow_userid, allowed_values=allowed_values)
 
     def get_user_restrictions(self, user_id: str) -> dict[str, list[str]]:
+        index = self._get_index()
+        cache_key = (user_id, frozenset(self.allowed_groups))
+        result = index.user_restrictions.get(cache_key)
+        if result is None:
+            result = index.user_restrictions[cache_key] = self._make_user_restrictions(index, user_id=user_id)
+        return {field_guid: list(allowed_values) for field_guid, allowed_values in result.items()}
+
+    def _make_user_restrictions(self, index: _RLSIndex, user_id: str) -> dict[str, list[str]]:
         result = {}
-        for field_guid in self.fields_with_rls:
-            allow_all_values, allow_userid, allowed_values = self.get_field_restriction_for_user(
-                field_guid=field_guid, user_id=user_id
+        for field_guid in index.fields:
+            allow_all_values, allow_userid, allowed_values = self._get_field_restriction_for_user(
+                index, field_guid=field_guid, user_id=user_id
             )
             if allow_all_values:
                 # `*: subject` => 'not restricted'
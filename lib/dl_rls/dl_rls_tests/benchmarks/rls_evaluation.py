@@ -0,0 +1,161 @@
+"""
+Evaluation throughput of the per-user RLS restrictions (`RLS.get_user_restrictions`) by the number of RLS entries,
+for the linear scan of the entries per field (as it used to be done), the index built for a new `RLS` object
+(as for a freshly loaded dataset) and the repeated evaluation with the memoized results;
+each case in a separate process.
+
+    python -m dl_rls_tests.benchmarks.rls_evaluation [--entries N ...] [--fields N] [--evaluations N]
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+import concurrent.futures
+import multiprocessing
+import random
+import resource
+import time
+
+from dl_constants import (
+    RLSPatternType,
+    RLSSubjectType,
+)
+from dl_rls.models import (
+    RLSEntry,
+    RLSSubject,
+)
+from dl_rls.rls import RLS
+
+USERS_COUNT = 1000
+GROUPS_COUNT = 50
+USER_GROUPS_COUNT = 5
+
+
+def make_items(entries: int, fields: int, seed: int = 0) -> list[RLSEntry]:
+    rnd = random.Random(seed)
+    items = []
+    for idx in range(entries):
+        field_guid = f"field_{idx % fields}"
+        kind = rnd.random()
+        if kind < 0.01:
+            subject = RLSSubject(subject_type=RLSSubjectType.all, subject_id="*", subject_name="*")
+        elif kind < 0.1:
+            group_id = f"group_{rnd.randrange(GROUPS_COUNT)}"
+            subject = RLSSubject(
+                subject_type=RLSSubjectType.group, subject_id=group_id, subject_name=f"@group:{group_id}"
+            )
+        else:
+            user_id = f"user_{rnd.randrange(USERS_COUNT)}"
+            subject = RLSSubject(subject_type=RLSSubjectType.user, subject_id=user_id, subject_name=user_id)
+        items.append(RLSEntry(field_guid=field_guid, allowed_value=f"value_{idx}", subject=subject))
+
+    # A superuser for the first field
+    items.append(
+        RLSEntry(
+            field_guid="field_0",
+            allowed_value=None,
+            pattern_type=RLSPatternType.all,
+            subject=RLSSubject(subject_type=RLSSubjectType.user, subject_id="user_0", subject_name="user_0"),
+        )
+    )
+    return items
+
+
+def _linear_user_restrictions(rls: RLS, user_id: str) -> dict[str, list[str]]:
+    result = {}
+    for field_guid in rls.fields_with_rls:
+        entries = [
+            item
+            for item in rls.items
+            if item.field_guid == field_guid
+            and (
+                (item.subject.subject_type == RLSSubjectType.user and item.subject.subject_id == user_id)
+                or (item.subject.subject_type == RLSSubjectType.group and item.subject.subject_id in rls.allowed_groups)
+                or item.subject.subject_type == RLSSubjectType.all
+                or item.pattern_type == RLSPatternType.userid
+            )
+        ]
+        if any(entry.pattern_type == RLSPatternType.all for entry in entries):
+            continue
+        result[field_guid] = [entry.allowed_value for entry in entries if entry.pattern_type == RLSPatternType.value]
+    return result  # type: ignore  # allowed values are not None here
+
+
+def _iter_requests(evaluations: int) -> list[tuple[str, set[str]]]:
+    rnd = random.Random(1)
+    return [
+        (
+            f"user_{rnd.randrange(USERS_COUNT)}",
+            {f"group_{rnd.randrange(GROUPS_COUNT)}" for _ in range(USER_GROUPS_COUNT)},
+        )
+        for _ in range(evaluations)
+    ]
+
+
+def run_linear(items: list[RLSEntry], requests: list[tuple[str, set[str]]]) -> int:
+    for user_id, groups in requests:
+        _linear_user_restrictions(RLS(items=items, allowed_groups=groups), user_id=user_id)
+    return len(requests)
+
+
+def run_indexed(items: list[RLSEntry], requests: list[tuple[str, set[str]]]) -> int:
+    for user_id, groups in requests:
+        RLS(items=items, allowed_groups=groups).get_user_restrictions(user_id=user_id)
+    return len(requests)
+
+
+def run_memoized(items: list[RLSEntry], requests: list[tuple[str, set[str]]]) -> int:
+    rls = RLS(items=items)
+    user_id, groups = requests[0]
+    rls.allowed_groups = groups
+    for _ in requests:
+        rls.get_user_restrictions(user_id=user_id)
+    return len(requests)
+
+
+CASES: dict[str, Callable[[list[RLSEntry], list[tuple[str, set[str]]]], int]] = {
+    "linear": run_linear,
+    "indexed": run_indexed,
+    "memoized": run_memoized,
+}
+
+
+def run_case(case_name: str, entries: int, fields: int, evaluations: int) -> tuple[float, int, int]:
+    items = make_items(entries=entries, fields=fields)
+    requests = _iter_requests(evaluations)
+
+    expected = _linear_user_restrictions(RLS(items=items, allowed_groups=requests[0][1]), user_id=requests[0][0])
+    actual = RLS(items=items, allowed_groups=requests[0][1]).get_user_restrictions(user_id=requests[0][0])
+    assert actual == expected
+
+    started = time.perf_counter()
+    evaluated = CASES[case_name](items, requests)
+    elapsed = time.perf_counter() - started
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, evaluated, max_rss_kb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, action="append", help="number of RLS entries (default: 1k, 10k, 100k)")
+    parser.add_argument("--fields", type=int, default=5)
+    parser.add_argument("--evaluations", type=int, default=20)
+    args = parser.parse_args()
+
+    mp_context = multiprocessing.get_context("spawn")
+    for entries in args.entries or [1_000, 10_000, 100_000]:
+        print(f"{entries} entries, {args.fields} fields")
+        for case_name in CASES:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as executor:
+                elapsed, evaluated, max_rss_kb = executor.submit(
+                    run_case, case_name, entries, args.fields, args.evaluations
+                ).result()
+            print(
+                f"{case_name:>12}: {evaluated / elapsed:>12,.1f} evaluations/sec, "
+                f"{elapsed:.3f} sec, peak RSS {max_rss_kb / 1024:.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -350,3 +350,32 @@ def test_rls_groups_with_real_ids() -> None:
     rls.allowed_groups = {"other-id"}
     restrictions = rls.get_user_restrictions(user_id="any-user")
     assert restrictions == {field_guid: []}
+
+
+def test_rls_items_changes() -> None:
+    rls = RLS()
+    _add_rls_restrictions(rls, field_guid="fld1", restrictions=[{"allowed_value": "value_1", "subject_id": "user_1"}])
+
+    restrictions = rls.get_user_restrictions(user_id="user_1")
+    assert restrictions == {"fld1": ["value_1"]}
+    # Results are memoized, but not shared
+    restrictions["fld1"].append("value_2")
+    assert rls.get_user_restrictions(user_id="user_1") == {"fld1": ["value_1"]}
+
+    # Changed in place
+    _add_rls_restrictions(rls, field_guid="fld1", restrictions=[{"allowed_value": "value_2", "subject_id": "user_1"}])
+    assert rls.get_user_restrictions(user_id="user_1") == {"fld1": ["value_1", "value_2"]}
+
+    # Replaced
+    rls.items = [item for item in rls.items if item.allowed_value != "value_1"]
+    _add_rls_restrictions(rls, field_guid="fld2", restrictions=[{"allowed_value": "value_3", "subject_id": "user_2"}])
+    assert rls.get_user_restrictions(user_id="user_1") == {"fld1": ["value_2"], "fld2": []}
+    assert rls.get_entries(field_guid="fld2", user_id="user_2") == [rls.items[-1]]
+    assert rls.get_entries(field_guid="fld3", user_id="user_2") == []
+
+    # Entries changed in place
+    rls.items[-1].subject.subject_id = "user_1"
+    assert rls.get_user_restrictions(user_id="user_1") == {"fld1": ["value_2"], "fld2": ["value_3"]}
+    rls.items[-1].allowed_value = "value_4"
+    assert rls.get_user_restrictions(user_id="user_1") == {"fld1": ["value_2"], "fld2": ["value_4"]}
+    assert rls.get_entries(field_guid="fld2", user_id="user_2") == []
@@ -45,6 +45,9 @@ class AsyncChunkedBase[ENTRY_TV]:
     def limit(self, max_count: int, limit_exception: type[Exception]) -> AsyncChunkedLimited[ENTRY_TV]:
         return AsyncChunkedLimited(chunked=self, max_count=max_count, limit_exc_to_raise=limit_exception)
 
+    async def close(self) -> None:
+        """Release the source of the data that is not going to be read (to the end)"""
+
 
 @attr.s
 class AsyncChunked(AsyncChunkedBase[ENTRY_TV]):
@@ -74,6 +77,11 @@ class AsyncChunked(AsyncChunkedBase[ENTRY_TV]):
     def chunks(self) -> AsyncIterable[TChunk[ENTRY_TV]]:
         return self._chunked_data
 
+    async def close(self) -> None:
+        aclose = getattr(self._chunked_data, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
 
 @attr.s
 class AsyncChunkedLimited(AsyncChunkedBase[ENTRY_TV]):
@@ -115,6 +123,9 @@ class AsyncChunkedLimited(AsyncChunkedBase[ENTRY_TV]):
 
         return async_chunk_gen()
 
+    async def close(self) -> None:
+        await self._chunked.close()
+
 
 @attr.s
 class LazyAsyncChunked(AsyncChunkedBase[ENTRY_TV]):
@@ -125,6 +136,12 @@ class LazyAsyncChunked(AsyncChunkedBase[ENTRY_TV]):
     _initializer: Callable[[], Awaitable[AsyncChunkedBase[ENTRY_TV]]] = attr.ib(repr=False)
     _finalizer: Callable[[], Awaitable[Any]] = attr.ib(repr=False)
     _chunked: Awaitable[AsyncChunkedBase[ENTRY_TV]] | None = attr.ib(init=False, default=None)
+    _finalized: bool = attr.ib(init=False, default=False)
+
+    async def _finalize(self) -> None:
+        if not self._finalized:
+            self._finalized = True
+            await self._finalizer()
 
     @property
     def items(self) -> AsyncIterable[ENTRY_TV]:
@@ -135,7 +152,7 @@ class LazyAsyncChunked(AsyncChunkedBase[ENTRY_TV]):
                 async for item in self._chunked.items:  # type: ignore  # TODO: fix
                     yield item
             finally:
-                await self._finalizer()
+                await self._finalize()
 
         return item_gen()
 
@@ -148,14 +165,22 @@ class LazyAsyncChunked(AsyncChunkedBase[ENTRY_TV]):
                 async for chunk in self._chunked.chunks:  # type: ignore  # TODO: fix
                     yield chunk
             finally:
-                await self._finalizer()
+                await self._finalize()
 
         return chunk_gen()
 
+    async def close(self) -> None:
+        # Not initialized, if it was never read
+        try:
+            if self._chunked is not None:
+                await self._chunked.close()  # type: ignore  # TODO: fix
+        finally:
+            await self._finalize()
+
 
-async def chunkify_by_one[CBO_ITEM_TV](
-    items: AsyncIterable[CBO_ITEM_TV],
-) -> AsyncIterable[Sequence[CBO_ITEM_TV]]:
+async def chunkify_by_one[
+    CBO_ITEM_TV
+](items: AsyncIterable[CBO_ITEM_TV],) -> AsyncIterable[Sequence[CBO_ITEM_TV]]:
     """Helper to wrap an iterable into a chunked iterable with one item per chunk"""
     async for item in items:
         yield (item,)